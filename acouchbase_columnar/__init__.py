@@ -14,12 +14,12 @@
 #  limitations under the License.
 
 import asyncio
-import selectors
 from asyncio import AbstractEventLoop
 from typing import Optional
 
 from couchbase_columnar.common import JSONType as JSONType  # noqa: F401
 from couchbase_columnar.protocol import configure_logging as configure_logging  # noqa: F401
+from couchbase_columnar.protocol import get_dropped_log_message_count as get_dropped_log_message_count  # noqa: F401
 
 
 class _LoopValidator:
@@ -27,20 +27,28 @@ class _LoopValidator:
     **INTERNAL**
     """
 
-    REQUIRED_METHODS = {'add_reader', 'remove_reader',
-                        'add_writer', 'remove_writer'}
+    # The C++ core does its IO on its own threads and hands completions to the event loop via call_soon_threadsafe(),
+    # the event loop is not required to implement add_reader()/add_writer().  Any asyncio compatible event loop
+    # (e.g. uvloop, ProactorEventLoop) is valid.
+    REQUIRED_METHODS = {'call_soon_threadsafe', 'create_future', 'create_task'}
 
     @staticmethod
     def _get_working_loop() -> AbstractEventLoop:
         """
         **INTERNAL**
         """
+        try:
+            # prefer the running event loop, it is never replaced
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
         evloop = asyncio.get_event_loop()
-        gen_new_loop = not _LoopValidator._is_valid_loop(evloop)
-        if gen_new_loop:
-            evloop.close()
-            selector = selectors.SelectSelector()
-            new_loop = asyncio.SelectorEventLoop(selector)
+        if evloop.is_closed() or not _LoopValidator._is_valid_loop(evloop):
+            if not evloop.is_closed():
+                evloop.close()
+            # respects the event loop policy, e.g. uvloop.EventLoopPolicy
+            new_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(new_loop)
             return new_loop
 
@@ -55,8 +63,8 @@ class _LoopValidator:
             return False
         for meth in _LoopValidator.REQUIRED_METHODS:
             abs_meth, actual_meth = (
-                getattr(asyncio.AbstractEventLoop, meth), getattr(evloop.__class__, meth))
-            if abs_meth == actual_meth:
+                getattr(asyncio.AbstractEventLoop, meth), getattr(evloop.__class__, meth, None))
+            if actual_meth is None or abs_meth == actual_meth:
                 return False
         return True
 
@@ -81,9 +89,10 @@ class _LoopValidator:
 def get_event_loop(evloop: Optional[AbstractEventLoop] = None) -> AbstractEventLoop:
     """
     Get an event loop compatible with acouchbase_columnar.
-    Some Event loops, such as ProactorEventLoop (the default asyncio event
-    loop for Python 3.8 on Windows) are not compatible with acouchbase_columnar as
-    they don't implement all members in the abstract base class.
+    Any asyncio compatible event loop, including uvloop and ProactorEventLoop, can
+    be used.  If no event loop is provided, the running event loop is returned, otherwise
+    the current event loop (a new event loop is created, per the event loop policy, if the
+    current event loop is closed).
 
     :param evloop: preferred event loop
     :return: The preferred event loop, if compatible, otherwise, a compatible
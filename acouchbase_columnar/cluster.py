@@ -29,7 +29,10 @@ from couchbase_columnar.result import AsyncQueryResult
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
+    from datetime import timedelta
 
+    from acouchbase_columnar.metrics import MetricsSnapshot
+    from acouchbase_columnar.result import WarmUpResult
     from couchbase_columnar.credential import Credential
     from couchbase_columnar.options import ClusterOptions
 
@@ -148,6 +151,59 @@ class AsyncCluster:
         """  # noqa: E501
         return self._impl.execute_query(statement, *args, **kwargs)
 
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        """Returns a snapshot of the cluster's built-in query metrics.
+
+        Built-in metrics are recorded per statement fingerprint (the statement w/ literals stripped) and outcome.  They
+        are only recorded if enabled via the `enable_metrics` (or `metrics_report_interval`) cluster option, otherwise the
+        returned snapshot is empty.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Returns:
+            :class:`~acouchbase_columnar.metrics.MetricsSnapshot`: A snapshot of the query latency, time to first row, rows and bytes
+            histograms.
+
+        Examples:
+            Log the p99 query latency per statement fingerprint::
+
+                snapshot = cluster.metrics_snapshot()
+                for entry in snapshot.entries:
+                    print(f'{entry.fingerprint} ({entry.outcome}): p99={entry.latency.percentiles["p99"]}us')
+
+        """  # noqa: E501
+        return self._impl.metrics_snapshot()
+
+    async def warm_up(self, connections: int = 1, timeout: Optional[timedelta] = None) -> WarmUpResult:
+        """Opens (and TLS-handshakes) connections to the query service ahead of the application's first queries.
+
+        Each connection is established by executing a lightweight query, the queries are executed concurrently so that
+        a separate connection is used for each.  Once warmed up, the connections are kept open for subsequent queries.
+        Warm-up can also be done when the cluster is created via the `warmup_connections` cluster option, in which case
+        the warm-up runs in the background on the cluster's event loop.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Args:
+            connections: The number of connections to open (at most 64). Defaults to 1.
+            timeout: The timeout for each warm-up query. Defaults to `None` (10 seconds).
+
+        Returns:
+            :class:`~acouchbase_columnar.result.WarmUpResult`: The number of connections that were successfully opened,
+            any errors raised and how long the warm-up took.
+
+        Raises:
+            ValueError: If ``connections`` is not a positive int or is greater than 64.
+
+        Examples:
+            Warm up 4 connections::
+
+                res = await cluster.warm_up(4)
+                print(f'Warmed up {res.succeeded}/{res.connections} connections in {res.elapsed}')
+
+        """
+        return await self._impl.warm_up(connections, timeout)
+
     def shutdown(self) -> None:
         """Shuts down this cluster instance. Cleaning up all resources associated with it.
 
@@ -159,6 +215,55 @@ class AsyncCluster:
         """
         return self._impl.shutdown()
 
+    @classmethod
+    async def connect(cls,
+                      connstr: str,
+                      credential: Credential,
+                      options: Optional[ClusterOptions] = None,
+                      loop: Optional[AbstractEventLoop] = None,
+                      **kwargs: object) -> AsyncCluster:
+        """Create an AsyncCluster instance, connecting to the cluster w/o blocking the event loop.
+
+        Unlike :meth:`.AsyncCluster.create_instance`, which blocks the event loop while the SDK bootstraps (DNS SRV
+        resolution, TLS handshake and config fetch), the bootstrap happens on the SDK's IO thread and other coroutines
+        continue to run.  If the `warmup_connections` cluster option is set, the warm-up is also awaited.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Args:
+            connstr:
+                The connection string to use for connecting to the cluster.
+                The format of the connection string is the *scheme* (``couchbases`` as TLS enabled connections are _required_), followed a hostname
+            credential: User credentials.
+            options: Global options to set for the cluster.
+                Some operations allow the global options to be overriden by passing in options to the operation.
+            loop: The asycio event loop. Defaults to `None` (the running event loop).
+            **kwargs: Keyword arguments that can be used in place or to overrride provided :class:`~acouchbase_columnar.options.ClusterOptions`
+
+        Returns:
+            A connected Capella Columnar AsyncCluster instance.
+
+        Raises:
+            ValueError: If incorrect connstr is provided.
+            ValueError: If incorrect options are provided.
+
+        Examples:
+            Connect multiple clusters concurrently::
+
+                from acouchbase_columnar.cluster import AsyncCluster
+                from acouchbase_columnar.credential import Credential
+
+                async def main() -> None:
+                    cred = Credential.from_username_and_password('username', 'password')
+                    cluster1, cluster2 = await asyncio.gather(AsyncCluster.connect('couchbases://hostname1', cred),
+                                                              AsyncCluster.connect('couchbases://hostname2', cred))
+
+        """  # noqa: E501
+        from acouchbase_columnar.protocol.cluster import AsyncCluster as _AsyncCluster
+        cluster = cls.__new__(cls)
+        cluster._impl = await _AsyncCluster.connect(connstr, credential, options, loop, **kwargs)
+        return cluster
+
     @classmethod
     def create_instance(cls,
                         connstr: str,
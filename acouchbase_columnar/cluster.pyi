@@ -15,7 +15,8 @@
 
 import sys
 from asyncio import AbstractEventLoop, Future
-from typing import overload
+from datetime import timedelta
+from typing import Optional, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -23,12 +24,13 @@ else:
     from typing import Unpack
 
 from acouchbase_columnar.database import AsyncDatabase
+from acouchbase_columnar.metrics import MetricsSnapshot
 from couchbase_columnar.credential import Credential
 from couchbase_columnar.options import (ClusterOptions,
                                         ClusterOptionsKwargs,
                                         QueryOptions,
                                         QueryOptionsKwargs)
-from couchbase_columnar.result import AsyncQueryResult
+from couchbase_columnar.result import AsyncQueryResult, WarmUpResult
 
 class AsyncCluster:
     @overload
@@ -120,6 +122,46 @@ class AsyncCluster:
 
     def shutdown(self) -> None: ...
 
+    def metrics_snapshot(self) -> MetricsSnapshot: ...
+
+    async def warm_up(self, connections: int = ..., timeout: Optional[timedelta] = ...) -> WarmUpResult: ...
+
+    @overload
+    @classmethod
+    async def connect(cls,
+                      connstr: str,
+                      credential: Credential,
+                      *,
+                      loop: Optional[AbstractEventLoop] = ...) -> AsyncCluster: ...
+
+    @overload
+    @classmethod
+    async def connect(cls,
+                      connstr: str,
+                      credential: Credential,
+                      options: ClusterOptions,
+                      *,
+                      loop: Optional[AbstractEventLoop] = ...) -> AsyncCluster: ...
+
+    @overload
+    @classmethod
+    async def connect(cls,
+                      connstr: str,
+                      credential: Credential,
+                      *,
+                      loop: Optional[AbstractEventLoop] = ...,
+                      **kwargs: Unpack[ClusterOptionsKwargs]) -> AsyncCluster: ...
+
+    @overload
+    @classmethod
+    async def connect(cls,
+                      connstr: str,
+                      credential: Credential,
+                      options: ClusterOptions,
+                      *,
+                      loop: Optional[AbstractEventLoop] = ...,
+                      **kwargs: Unpack[ClusterOptionsKwargs]) -> AsyncCluster: ...
+
     @overload
     @classmethod
     def create_instance(cls, connstr: str, credential: Credential) -> AsyncCluster: ...
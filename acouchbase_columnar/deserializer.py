@@ -15,4 +15,7 @@
 
 from couchbase_columnar.common.deserializer import DefaultJsonDeserializer as DefaultJsonDeserializer  # noqa: F401
 from couchbase_columnar.common.deserializer import Deserializer as Deserializer  # noqa: F401
+from couchbase_columnar.common.deserializer import LazyRow as LazyRow  # noqa: F401
+from couchbase_columnar.common.deserializer import LazyRowDeserializer as LazyRowDeserializer  # noqa: F401
 from couchbase_columnar.common.deserializer import PassthroughDeserializer as PassthroughDeserializer  # noqa: F401
+from couchbase_columnar.common.deserializer import TypedDeserializer as TypedDeserializer  # noqa: F401
@@ -13,8 +13,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from couchbase_columnar.common.errors import CircuitOpenError as CircuitOpenError  # noqa: F401
 from couchbase_columnar.common.errors import ColumnarError as ColumnarError  # noqa: F401
+from couchbase_columnar.common.errors import DeadlineExceededError as DeadlineExceededError  # noqa: F401
+from couchbase_columnar.common.errors import IdleRowTimeoutError as IdleRowTimeoutError  # noqa: F401
 from couchbase_columnar.common.errors import InternalSDKError as InternalSDKError  # noqa: F401
 from couchbase_columnar.common.errors import InvalidCredentialError as InvalidCredentialError  # noqa: F401
 from couchbase_columnar.common.errors import QueryError as QueryError  # noqa: F401
+from couchbase_columnar.common.errors import QueryRejectedError as QueryRejectedError  # noqa: F401
+from couchbase_columnar.common.errors import ResultLimitExceededError as ResultLimitExceededError  # noqa: F401
 from couchbase_columnar.common.errors import TimeoutError as TimeoutError  # noqa: F401
@@ -13,6 +13,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from couchbase_columnar.common.circuit_breaker import CircuitBreakerConfig as CircuitBreakerConfig  # noqa: F401
 from couchbase_columnar.common.enums import IpProtocol as IpProtocol  # noqa: F401
 from couchbase_columnar.common.options import ClusterOptions as ClusterOptions  # noqa: F401
 from couchbase_columnar.common.options import ClusterOptionsKwargs as ClusterOptionsKwargs  # noqa: F401
@@ -22,3 +23,4 @@ from couchbase_columnar.common.options import SecurityOptions as SecurityOptions
 from couchbase_columnar.common.options import SecurityOptionsKwargs as SecurityOptionsKwargs  # noqa: F401
 from couchbase_columnar.common.options import TimeoutOptions as TimeoutOptions  # noqa: F401
 from couchbase_columnar.common.options import TimeoutOptionsKwargs as TimeoutOptionsKwargs  # noqa: F401
+from couchbase_columnar.common.retry import RetryPolicy as RetryPolicy  # noqa: F401
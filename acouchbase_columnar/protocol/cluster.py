@@ -15,10 +15,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import sys
+import time
 from asyncio import Future
+from dataclasses import replace
 from functools import partial
-from typing import TYPE_CHECKING, Optional
+from typing import (TYPE_CHECKING,
+                    Dict,
+                    Optional)
 
 if sys.version_info < (3, 10):
     from typing_extensions import TypeAlias
@@ -27,13 +32,19 @@ else:
 
 from acouchbase_columnar.protocol.core.client_adapter import _ClientAdapter
 from acouchbase_columnar.protocol.query import _AsyncQueryStreamingExecutor
-from couchbase_columnar.common.result import AsyncQueryResult
+from couchbase_columnar.common.result import AsyncQueryResult, WarmUpResult
 from couchbase_columnar.protocol.core.request import ClusterRequestBuilder
+from couchbase_columnar.protocol.warm_up import (WARM_UP_STATEMENT,
+                                                 build_warm_up_query_options,
+                                                 build_warm_up_result,
+                                                 log_warm_up_result)
 
 if TYPE_CHECKING:
-    from asyncio import AbstractEventLoop
+    from asyncio import AbstractEventLoop, Task
+    from datetime import timedelta
 
     from couchbase_columnar.common.credential import Credential
+    from couchbase_columnar.common.metrics import MetricsSnapshot
     from couchbase_columnar.options import ClusterOptions
 
 
@@ -48,6 +59,29 @@ class AsyncCluster:
         self._client_adapter = _ClientAdapter(connstr, credential, options, loop, **kwargs)
         self._request_builder = ClusterRequestBuilder(self._client_adapter)
         self._connect()
+        self._warm_up_task: Optional[Task[None]] = None
+        warmup_connections = self._client_adapter.connection_details.warmup_connections
+        if warmup_connections is not None:
+            # the constructor is not a coroutine, the warm-up runs in the background on the cluster's event loop
+            self._warm_up_task = self._client_adapter.loop.create_task(self._warm_up_on_create(warmup_connections))
+
+    @classmethod
+    async def connect(cls,
+                      connstr: str,
+                      credential: Credential,
+                      options: Optional[ClusterOptions] = None,
+                      loop: Optional[AbstractEventLoop] = None,
+                      **kwargs: object) -> AsyncCluster:
+        # bypass __init__, it opens the connection w/ a blocking call
+        cluster = cls.__new__(cls)
+        cluster._client_adapter = _ClientAdapter(connstr, credential, options, loop, **kwargs)
+        cluster._request_builder = ClusterRequestBuilder(cluster._client_adapter)
+        cluster._warm_up_task = None
+        await cluster._connect_in_background()
+        warmup_connections = cluster._client_adapter.connection_details.warmup_connections
+        if warmup_connections is not None:
+            await cluster._warm_up_on_create(warmup_connections)
+        return cluster
 
     @property
     def client_adapter(self) -> _ClientAdapter:
@@ -70,6 +104,7 @@ class AsyncCluster:
         req = self._request_builder.build_close_connection_request()
         self._client_adapter.close_connection(req)
         self._client_adapter.reset_client()
+        self._client_adapter.query_instrumentation.close()
 
     def _connect(self) -> None:
         """
@@ -78,6 +113,13 @@ class AsyncCluster:
         req = self._request_builder.build_connection_request()
         self._client_adapter.connect(req)
 
+    async def _connect_in_background(self) -> None:
+        """
+            **INTERNAL**
+        """
+        req = self._request_builder.build_connection_request()
+        await self._client_adapter.connect_in_background(req)
+
     def shutdown(self) -> None:
         """Shuts down this cluster instance. Cleaning up all resources associated with it.
 
@@ -93,15 +135,67 @@ class AsyncCluster:
             # TODO: log warning
             print('Cluster does not have a connection.  Ignoring')
 
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        """
+            **INTERNAL**
+        """
+        snapshot = self._client_adapter.query_instrumentation.metrics_snapshot()
+        limiter = self._client_adapter.concurrency_limiter
+        tenant_throttle = self._client_adapter.tenant_throttle
+        circuit_breakers = self._client_adapter.circuit_breakers
+        return replace(snapshot,
+                       hedging=self._client_adapter.hedging_budget.stats(),
+                       concurrency=limiter.stats() if limiter is not None else None,
+                       retries=self._client_adapter.retry_engine.stats(),
+                       tenants=tenant_throttle.stats() if tenant_throttle is not None else [],
+                       circuit_breakers=circuit_breakers.stats() if circuit_breakers is not None else [])
+
+    async def _warm_up_connection(self, query_opts: Dict[str, object]) -> Optional[Exception]:
+        """
+            **INTERNAL**
+        """
+        try:
+            req, _ = self._request_builder.build_query_request(WARM_UP_STATEMENT, **query_opts)
+            # not recorded by the query instrumentation, warm-up queries are not the application's queries
+            executor = _AsyncQueryStreamingExecutor(self.client_adapter.client,
+                                                    self.client_adapter.loop,
+                                                    req,
+                                                    scheduler=self.client_adapter.scheduler)
+            res = await executor.submit_query()
+            await res.get_all_rows()
+        except Exception as ex:
+            return ex
+        return None
+
+    async def _warm_up_on_create(self, connections: int) -> None:
+        """
+            **INTERNAL**
+        """
+        log_warm_up_result(await self.warm_up(connections))
+
+    async def warm_up(self, connections: int = 1, timeout: Optional[timedelta] = None) -> WarmUpResult:
+        query_opts = build_warm_up_query_options(connections, timeout)
+        start = time.perf_counter()
+        results = await asyncio.gather(*[self._warm_up_connection(query_opts) for _ in range(connections)])
+        return build_warm_up_result(connections, start, list(results))
+
     def _query_done_callback(self, executor: _AsyncQueryStreamingExecutor, ft: Future) -> None:
         if ft.cancelled():
             executor.cancel()
 
     def execute_query(self, statement: str, *args: object, **kwargs: object) -> Future[AsyncQueryResult]:
+        tracker = self.client_adapter.query_instrumentation.start_query(statement)
         req, _ = self._request_builder.build_query_request(statement, *args, **kwargs)
         executor = _AsyncQueryStreamingExecutor(self.client_adapter.client,
                                                 self.client_adapter.loop,
-                                                req)
+                                                req,
+                                                tracker=tracker,
+                                                scheduler=self.client_adapter.scheduler,
+                                                hedging_budget=self.client_adapter.hedging_budget,
+                                                concurrency_limiter=self.client_adapter.concurrency_limiter,
+                                                tenant_throttle=self.client_adapter.tenant_throttle,
+                                                retry_engine=self.client_adapter.retry_engine,
+                                                circuit_breakers=self.client_adapter.circuit_breakers)
         ft = executor.submit_query()
         ft.add_done_callback(partial(self._query_done_callback, executor))
         return ft
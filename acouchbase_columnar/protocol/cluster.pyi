@@ -25,6 +25,7 @@ else:
 from acouchbase_columnar.protocol.core.client_adapter import _ClientAdapter
 from acouchbase_columnar.protocol.database import AsyncDatabase
 from couchbase_columnar.common.credential import Credential
+from couchbase_columnar.common.metrics import MetricsSnapshot
 from couchbase_columnar.common.result import AsyncQueryResult
 from couchbase_columnar.options import (ClusterOptions,
                                         ClusterOptionsKwargs,
@@ -90,6 +91,8 @@ class AsyncCluster:
 
     def shutdown(self) -> None: ...
 
+    def metrics_snapshot(self) -> MetricsSnapshot: ...
+
     def database(self, name: str) -> AsyncDatabase: ...
 
     @overload
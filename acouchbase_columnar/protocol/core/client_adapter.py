@@ -16,8 +16,8 @@
 from __future__ import annotations
 
 import sys
-from asyncio import AbstractEventLoop
-from functools import wraps
+from asyncio import AbstractEventLoop, Future
+from functools import partial, wraps
 from typing import (Any,
                     Callable,
                     Dict,
@@ -31,15 +31,23 @@ else:
     from typing import TypeAlias
 
 from acouchbase_columnar import get_event_loop
+from acouchbase_columnar.protocol.core.scheduler import _CompletionScheduler
 from couchbase_columnar.common.credential import Credential
 from couchbase_columnar.common.deserializer import Deserializer
 from couchbase_columnar.common.errors import ColumnarError, InternalSDKError
+from couchbase_columnar.protocol.admission import AdaptiveConcurrencyLimiter
+from couchbase_columnar.protocol.circuit_breaker import CircuitBreakers
 from couchbase_columnar.protocol.connection import _ConnectionDetails
+from couchbase_columnar.protocol.core import PyCapsuleType
 from couchbase_columnar.protocol.core.client import _CoreClient
 from couchbase_columnar.protocol.core.request import CloseConnectionRequest, ConnectRequest
 from couchbase_columnar.protocol.core.result import CoreResult
 from couchbase_columnar.protocol.errors import CoreColumnarError, ErrorMapper
+from couchbase_columnar.protocol.hedging import HedgingBudget
+from couchbase_columnar.protocol.instrumentation import QueryInstrumentation
 from couchbase_columnar.protocol.options import OptionsBuilder
+from couchbase_columnar.protocol.retry import RetryEngine
+from couchbase_columnar.protocol.tenancy import TenantThrottle
 
 ReqT = TypeVar('ReqT', ConnectRequest, CloseConnectionRequest)
 
@@ -87,6 +95,7 @@ class _ClientAdapter:
                  **kwargs: object) -> None:
 
         self._loop = self._get_loop(loop)
+        self._scheduler = _CompletionScheduler(self._loop)
         self._cluster_info = None
         self._server_version = None
         self._opts_builder = OptionsBuilder()
@@ -95,6 +104,34 @@ class _ClientAdapter:
                                                        credential,
                                                        options,
                                                        **kwargs)
+        self._query_instrumentation = QueryInstrumentation(
+            tracer=self._conn_details.tracer,
+            meter=self._conn_details.meter,
+            enable_metrics=self._conn_details.enable_metrics,
+            metrics_report_interval=self._conn_details.metrics_report_interval,
+            slow_query_threshold=self._conn_details.slow_query_threshold)
+        self._hedging_budget = HedgingBudget(self._conn_details.hedging_budget)
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if self._conn_details.max_concurrent_queries is not None:
+            queue_timeout = self._conn_details.concurrency_queue_timeout
+            # the queue timeout option is transformed to microseconds
+            self._concurrency_limiter = AdaptiveConcurrencyLimiter(
+                self._conn_details.max_concurrent_queries,
+                queue_timeout=queue_timeout / 1e6 if queue_timeout is not None else None,
+                reserved_priority_slots=self._conn_details.reserved_priority_slots or 0)
+        self._tenant_throttle: Optional[TenantThrottle] = None
+        if (self._conn_details.tenant_rate_limit is not None
+                or self._conn_details.tenant_max_concurrent_queries is not None):
+            queue_timeout = self._conn_details.concurrency_queue_timeout
+            self._tenant_throttle = TenantThrottle(
+                rate=self._conn_details.tenant_rate_limit,
+                burst=self._conn_details.tenant_burst,
+                max_concurrent=self._conn_details.tenant_max_concurrent_queries,
+                queue_timeout=queue_timeout / 1e6 if queue_timeout is not None else None)
+        self._retry_engine = RetryEngine(self._conn_details.retry_policy, self._conn_details.retry_budget)
+        self._circuit_breakers: Optional[CircuitBreakers] = None
+        if self._conn_details.circuit_breaker is not None:
+            self._circuit_breakers = CircuitBreakers(self._conn_details.circuit_breaker)
 
     @property
     def client(self) -> _CoreClient:
@@ -133,6 +170,55 @@ class _ClientAdapter:
         """
         return self._loop
 
+    @property
+    def scheduler(self) -> _CompletionScheduler:
+        """
+            **INTERNAL**
+        """
+        return self._scheduler
+
+    @property
+    def query_instrumentation(self) -> QueryInstrumentation:
+        """
+            **INTERNAL**
+        """
+        return self._query_instrumentation
+
+    @property
+    def hedging_budget(self) -> HedgingBudget:
+        """
+            **INTERNAL**
+        """
+        return self._hedging_budget
+
+    @property
+    def concurrency_limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        """
+            **INTERNAL**
+        """
+        return self._concurrency_limiter
+
+    @property
+    def tenant_throttle(self) -> Optional[TenantThrottle]:
+        """
+            **INTERNAL**
+        """
+        return self._tenant_throttle
+
+    @property
+    def retry_engine(self) -> RetryEngine:
+        """
+            **INTERNAL**
+        """
+        return self._retry_engine
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakers]:
+        """
+            **INTERNAL**
+        """
+        return self._circuit_breakers
+
     @property
     def options_builder(self) -> OptionsBuilder:
         """
@@ -153,6 +239,62 @@ class _ClientAdapter:
             raise ErrorMapper.build_error(ret)
         self._client.connection = ret
 
+    def connect_in_background(self, req: ConnectRequest) -> Future[None]:
+        """
+            **INTERNAL**
+
+        Opens the connection w/o blocking the event loop.  The C++ core calls back from its IO thread, the result is
+        handed to the returned future via the completion scheduler.
+        """
+        if not hasattr(self, '_client'):
+            self._client = _CoreClient()
+
+        ft: Future[None] = self._loop.create_future()
+        try:
+            self._client.connect_in_background(req,
+                                               partial(self._connect_callback, ft),
+                                               partial(self._connect_errback, ft))
+        except ColumnarError:
+            raise
+        except CoreColumnarError as err:
+            raise ErrorMapper.build_error(err) from None
+        except Exception as ex:
+            raise InternalSDKError(str(ex)) from None
+        return ft
+
+    def _connect_callback(self, ft: Future[None], conn: PyCapsuleType) -> None:
+        """
+            **INTERNAL**
+        """
+        self._scheduler.call_soon_threadsafe(self._set_connection, ft, conn)
+
+    def _connect_errback(self, ft: Future[None], err: object) -> None:
+        """
+            **INTERNAL**
+        """
+        if isinstance(err, CoreColumnarError):
+            exc: Exception = ErrorMapper.build_error(err)
+        else:
+            exc = InternalSDKError(str(err))
+        self._scheduler.call_soon_threadsafe(self._set_connection_error, ft, exc)
+
+    def _set_connection(self, ft: Future[None], conn: PyCapsuleType) -> None:
+        """
+            **INTERNAL**
+        """
+        if ft.done():
+            # cancelled, the connection is closed once the capsule is released
+            return
+        self._client.connection = conn
+        ft.set_result(None)
+
+    def _set_connection_error(self, ft: Future[None], exc: Exception) -> None:
+        """
+            **INTERNAL**
+        """
+        if not ft.done():
+            ft.set_exception(exc)
+
     def close_connection(self, req: CloseConnectionRequest) -> bool:
         """
             **INTERNAL**
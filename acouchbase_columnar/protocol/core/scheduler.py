@@ -0,0 +1,107 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from collections import deque
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    Deque,
+                    Tuple)
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+
+
+class _CompletionScheduler:
+    """
+        **INTERNAL**
+
+    Hands completions from the C++ core's IO threads to the event loop.
+
+    Every ``loop.call_soon_threadsafe()`` call wakes up the event loop (a write to the loop's self-pipe).  Completions
+    are queued instead and a single wakeup is scheduled per batch, completions that arrive (from any IO thread) before
+    the event loop runs the batch are handled by the same wakeup.
+    """
+
+    def __init__(self, loop: AbstractEventLoop) -> None:
+        self._loop = loop
+        self._pending: Deque[Tuple[Callable[..., Any], Tuple[Any, ...]]] = deque()
+        self._wakeup_scheduled = False
+        self._wakeups = 0
+        self._completions = 0
+
+    @property
+    def loop(self) -> AbstractEventLoop:
+        """
+            **INTERNAL**
+        """
+        return self._loop
+
+    @property
+    def wakeups(self) -> int:
+        """
+            **INTERNAL**
+        """
+        return self._wakeups
+
+    @property
+    def completions(self) -> int:
+        """
+            **INTERNAL**
+        """
+        return self._completions
+
+    def call_soon_threadsafe(self, callback: Callable[..., Any], *args: Any) -> None:
+        """
+            **INTERNAL**
+
+        Same contract as :meth:`asyncio.AbstractEventLoop.call_soon_threadsafe`, callbacks are run in FIFO order.
+        """
+        # The completion is queued before the flag is checked and the flag is reset before the queue is drained, a
+        # completion is either run by the pending wakeup or schedules one.  Two IO threads racing on the flag can
+        # schedule an extra (empty) wakeup, which is cheaper than taking a lock per completion.
+        self._pending.append((callback, args))
+        if self._wakeup_scheduled:
+            return
+        self._wakeup_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._run_pending)
+        except RuntimeError:
+            # the event loop is closed
+            self._wakeup_scheduled = False
+            raise
+
+    def _run_pending(self) -> None:
+        """
+            **INTERNAL**
+        """
+        self._wakeup_scheduled = False
+        self._wakeups += 1
+        pending = self._pending
+        while pending:
+            callback, args = pending.popleft()
+            self._completions += 1
+            try:
+                callback(*args)
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as ex:
+                # same handling as asyncio.Handle, one failing callback must not drop the rest of the batch
+                self._loop.call_exception_handler({
+                    'message': f'Exception in callback {callback!r}',
+                    'exception': ex,
+                })
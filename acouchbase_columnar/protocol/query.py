@@ -15,25 +15,59 @@
 
 from __future__ import annotations
 
-from asyncio import Future
+import weakref
+from asyncio import (CancelledError,
+                     Future,
+                     TimerHandle)
 from threading import Event
+from time import perf_counter_ns
 from typing import (TYPE_CHECKING,
                     Any,
                     Optional,
+                    TypeVar,
                     Union)
 
-from couchbase_columnar.common.errors import ColumnarError, InternalSDKError
+from couchbase_columnar.common.deserializer import Deserializer
+from couchbase_columnar.common.errors import (CircuitOpenError,
+                                              ColumnarError,
+                                              DeadlineExceededError,
+                                              InternalSDKError,
+                                              QueryRejectedError)
 from couchbase_columnar.common.query import QueryMetadata
 from couchbase_columnar.common.result import AsyncQueryResult
-from couchbase_columnar.common.streaming import StreamingExecutor, StreamingState
+from couchbase_columnar.common.streaming import (ResultLimits,
+                                                 StreamingExecutor,
+                                                 StreamingState)
 from couchbase_columnar.protocol.core.result import CoreQueryIterator
+from couchbase_columnar.protocol.deadline import (PHASE_DISPATCH,
+                                                  PHASE_QUEUE,
+                                                  PHASE_STREAMING,
+                                                  Deadline)
 from couchbase_columnar.protocol.errors import CoreColumnarError, ErrorMapper
+from couchbase_columnar.protocol.hedging import (HedgedQueryIterator,
+                                                 HedgingBudget,
+                                                 get_hedge_after)
+from couchbase_columnar.protocol.instrumentation import fingerprint_statement
+from couchbase_columnar.protocol.tenancy import get_tenant
+from couchbase_columnar.protocol.watchdog import get_idle_row_timeout, idle_row_timeout_error
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
 
+    from acouchbase_columnar.protocol.core.scheduler import _CompletionScheduler
+    from couchbase_columnar.protocol.admission import (AdaptiveConcurrencyLimiter,
+                                                       AdmissionPermit,
+                                                       _Waiter)
+    from couchbase_columnar.protocol.circuit_breaker import CircuitBreakerPermit, CircuitBreakers
     from couchbase_columnar.protocol.core.client import _CoreClient
     from couchbase_columnar.protocol.core.request import QueryRequest
+    from couchbase_columnar.protocol.instrumentation import QueryTracker
+    from couchbase_columnar.protocol.retry import RetryEngine
+    from couchbase_columnar.protocol.tenancy import (TenantPermit,
+                                                     TenantThrottle,
+                                                     _TenantWaiter)
+
+ErrT = TypeVar('ErrT', bound=Exception)
 
 
 class _AsyncQueryStreamingExecutor(StreamingExecutor):
@@ -44,15 +78,57 @@ class _AsyncQueryStreamingExecutor(StreamingExecutor):
     def __init__(self,
                  client: _CoreClient,
                  loop: AbstractEventLoop,
-                 request: QueryRequest) -> None:
+                 request: QueryRequest,
+                 tracker: Optional[QueryTracker] = None,
+                 scheduler: Optional[_CompletionScheduler] = None,
+                 hedging_budget: Optional[HedgingBudget] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 tenant_throttle: Optional[TenantThrottle] = None,
+                 retry_engine: Optional[RetryEngine] = None,
+                 circuit_breakers: Optional[CircuitBreakers] = None) -> None:
         self._client = client
         self._loop = loop
+        # completions from the C++ core's IO threads, coalesced into a single event loop wakeup per batch if possible
+        self._call_soon_threadsafe = (scheduler.call_soon_threadsafe if scheduler is not None
+                                      else loop.call_soon_threadsafe)
         self._request = request
-        self._query_iter: CoreQueryIterator
+        self._hedging_budget = hedging_budget
+        self._hedge_after = get_hedge_after(request.options)
+        self._hedge_handle: Optional[TimerHandle] = None
+        self._concurrency_limiter = concurrency_limiter
+        self._permit: Optional[AdmissionPermit] = None
+        # high priority queries are granted most of the slots released while queries wait for a slot
+        self._priority = request.options is not None and request.options.get('priority', None) is True
+        self._waiter: Optional[_Waiter] = None
+        self._queue_timeout_handle: Optional[TimerHandle] = None
+        self._tenant_throttle = tenant_throttle
+        self._tenant = get_tenant(request.options)
+        self._tenant_permit: Optional[TenantPermit] = None
+        self._tenant_waiter: Optional[_TenantWaiter] = None
+        # the tenant's rate limit delay or, once waiting for one of the tenant's slots, the queue timeout
+        self._tenant_handle: Optional[TimerHandle] = None
+        self._tenant_enqueued_ns = 0
+        self._retries = retry_engine.start_query(request.options) if retry_engine is not None else None
+        self._circuit_breakers = circuit_breakers
+        self._breaker_permit: Optional[CircuitBreakerPermit] = None
+        self._retry_handle: Optional[TimerHandle] = None
+        self._deadline = Deadline.from_query_options(request.options)
+        self._deadline_handle: Optional[TimerHandle] = None
+        # the deadline error of a query that exceeded its deadline while the application was not awaiting a row
+        self._deadline_error: Optional[DeadlineExceededError] = None
+        self._idle_row_timeout = get_idle_row_timeout(request.options)
+        # a single timer checks whether the executor is still waiting for a row, it is re-armed lazily (not per row)
+        self._idle_handle: Optional[TimerHandle] = None
+        self._row_wait_ns: Optional[int] = None
+        self._query_iter: Union[CoreQueryIterator, HedgedQueryIterator]
         self._deserializer = request.deserializer
         self._metadata: Optional[QueryMetadata] = None
         self._streaming_state = StreamingState.NotStarted
         self._row_ft: Future[Any]
+        self._result_limits = ResultLimits.from_query_options(request.options)
+        self._tracker = tracker
+        if self._tracker is not None:
+            self._tracker.request_encoded(request)
 
     @property
     def cancel_token(self) -> Optional[Event]:
@@ -61,6 +137,13 @@ class _AsyncQueryStreamingExecutor(StreamingExecutor):
         """
         return None
 
+    @property
+    def deserializer(self) -> Deserializer:
+        """
+            **INTERNAL**
+        """
+        return self._deserializer
+
     @property
     def cancel_poll_interval(self) -> Optional[float]:
         """
@@ -83,10 +166,14 @@ class _AsyncQueryStreamingExecutor(StreamingExecutor):
         return self._streaming_state
 
     def cancel(self) -> None:
+        self._cancel_timers()
         if self._query_iter is None:
             return
         self._query_iter.cancel()
         self._streaming_state = StreamingState.Cancelled
+        if self._tracker is not None:
+            self._tracker.cancel()
+        self._release_permits(sample=False)
 
     def get_metadata(self) -> QueryMetadata:
         # TODO:  Maybe not needed if we get metadata automatically?
@@ -118,48 +205,431 @@ class _AsyncQueryStreamingExecutor(StreamingExecutor):
             raise RuntimeError('Query has been canceled or previously executed.')
 
         self._streaming_state = StreamingState.Started
+        # the future must exist before the query is dispatched, the core's IO thread can call back immediately
+        self._iter_ft: Future[AsyncQueryResult] = self._loop.create_future()
+        if self._circuit_breakers is not None:
+            # fail fast, w/o waiting for an in-flight slot, while the circuit is open
+            try:
+                self._breaker_permit = self._circuit_breakers.acquire(self._request.statement)
+            except CircuitOpenError as err:
+                self._iter_ft.set_exception(self._query_failed(err))
+                return self._iter_ft
+            weakref.finalize(self, self._breaker_permit.release, None, False)
+        throttled = self._tenant_throttle is not None and self._tenant is not None
+        if throttled or self._concurrency_limiter is not None:
+            self._iter_ft.add_done_callback(self._cancel_queued)
+        if self._retries is not None:
+            self._iter_ft.add_done_callback(self._cancel_retry)
+        if self._deadline is not None:
+            # the query is cancelled at its deadline, whether it is queued, dispatched or streaming
+            self._deadline_handle = self._loop.call_later(self._deadline.remaining(), self._deadline_exceeded)
+            self._iter_ft.add_done_callback(self._cancel_deadline_on_failure)
+        if throttled:
+            self._throttle_tenant()
+        else:
+            self._admit()
+        return self._iter_ft
+
+    def _throttle_tenant(self) -> None:
+        if self._tenant_throttle is None or self._tenant is None:
+            return
+        # the query is delayed (w/o blocking the event loop) until its tenant's rate limit allows it
+        self._tenant_enqueued_ns = perf_counter_ns()
+        try:
+            delay = self._tenant_throttle.reserve(self._tenant, self._deadline)
+        except (QueryRejectedError, DeadlineExceededError) as err:
+            self._set_future_exception(self._iter_ft, self._query_failed(err))
+            return
+        if delay > 0:
+            self._tenant_handle = self._loop.call_later(delay, self._acquire_tenant_slot)
+        else:
+            self._acquire_tenant_slot()
+
+    def _acquire_tenant_slot(self) -> None:
+        self._tenant_handle = None
+        if self._tenant_throttle is None or self._tenant is None or self._iter_ft.done():
+            return
+        try:
+            permit = self._tenant_throttle.try_acquire(self._tenant, self._tenant_enqueued_ns)
+            if permit is not None:
+                self._tenant_admitted(permit)
+                return
+            # the query waits for one of its tenant's in-flight slots
+            self._tenant_waiter = self._tenant_throttle.enqueue(self._tenant,
+                                                                self._tenant_permit_granted,
+                                                                self._tenant_enqueued_ns)
+        except QueryRejectedError as err:
+            # the tenant could not be tracked
+            self._set_future_exception(self._iter_ft, self._query_failed(err))
+            return
+        if self._tenant_waiter is not None:
+            queue_timeout = self._tenant_throttle.remaining_queue_timeout(self._tenant_enqueued_ns)
+            if queue_timeout is not None:
+                self._tenant_handle = self._loop.call_later(queue_timeout, self._tenant_queue_timed_out)
+
+    def _tenant_permit_granted(self, permit: TenantPermit) -> None:
+        # NOTE: called from the thread that released the tenant's slot (possibly the C++ core's IO thread)
+        self._call_soon_threadsafe(self._start_tenant_queued, permit)
+
+    def _start_tenant_queued(self, permit: TenantPermit) -> None:
+        self._tenant_waiter = None
+        if self._tenant_handle is not None:
+            self._tenant_handle.cancel()
+            self._tenant_handle = None
+        if self._iter_ft.done():
+            # the application cancelled the query while it was waiting for a slot
+            permit.release()
+            return
+        self._tenant_admitted(permit)
+
+    def _tenant_admitted(self, permit: TenantPermit) -> None:
+        self._tenant_permit = permit
+        # a result that is never iterated to the end must not hold on to its tenant's slot
+        weakref.finalize(self, permit.release)
+        try:
+            self._admit()
+        except Exception as ex:
+            self._set_future_exception(self._iter_ft, ex)
+
+    def _tenant_queue_timed_out(self) -> None:
+        self._tenant_handle = None
+        if self._tenant_waiter is None or self._tenant_throttle is None or self._tenant is None:
+            return
+        # the waiter might have been granted a slot, in which case the query continues as usual
+        if self._tenant_throttle.cancel_waiter(self._tenant, self._tenant_waiter):
+            self._tenant_waiter = None
+            exc = self._query_failed(self._tenant_throttle.rejected_error(self._tenant))
+            self._set_future_exception(self._iter_ft, exc)
+
+    def _admit(self) -> None:
+        if self._concurrency_limiter is None:
+            self._dispatch()
+            return
+
+        fingerprint = fingerprint_statement(self._request.statement)
+        permit = self._concurrency_limiter.try_acquire(fingerprint, priority=self._priority)
+        if permit is not None:
+            self._set_permit(permit)
+            self._dispatch()
+            return
+
+        # the query waits for an in-flight slot w/o blocking the event loop
+        self._waiter = self._concurrency_limiter.enqueue(fingerprint, self._permit_granted, priority=self._priority)
+        if self._waiter is not None:
+            queue_timeout = self._concurrency_limiter.queue_timeout
+            if queue_timeout is not None:
+                self._queue_timeout_handle = self._loop.call_later(queue_timeout, self._queue_timed_out)
+
+    def _dispatch(self) -> None:
+        self._apply_deadline()
+        if self._tracker is not None:
+            self._tracker.dispatch_started()
+        if self._breaker_permit is not None:
+            self._breaker_permit.dispatch_started()
         try:
-            self._query_iter = self._client.columnar_query_op(self._request,
-                                                              callback=self._set_query_core_result,
-                                                              row_callback=self._row_callback)
+            if self._hedging_budget is not None and self._hedge_after is not None:
+                self._query_iter = HedgedQueryIterator(self._client,
+                                                       self._request,
+                                                       self._hedge_after,
+                                                       self._hedging_budget,
+                                                       callback=self._set_query_core_result,
+                                                       row_callback=self._row_callback,
+                                                       retry=self._retries is not None and self._retries.attempts > 1)
+            else:
+                self._query_iter = self._client.columnar_query_op(self._request,
+                                                                  callback=self._set_query_core_result,
+                                                                  row_callback=self._row_callback)
         except Exception as ex:
             # suppress context, we know we have raised an error from the bindings
             if isinstance(ex, CoreColumnarError):
-                raise ErrorMapper.build_error(ex) from None
-            raise InternalSDKError(str(ex)) from None
+                raise self._query_failed(self._build_error(ex)) from None
+            raise self._query_failed(InternalSDKError(str(ex))) from None
 
-        self._iter_ft: Future[AsyncQueryResult] = self._loop.create_future()
-        return self._iter_ft
+        if isinstance(self._query_iter, HedgedQueryIterator):
+            self._hedge_handle = self._loop.call_later(self._query_iter.hedge_after, self._query_iter.hedge)
+            self._iter_ft.add_done_callback(self._cancel_hedge)
+
+    def _set_permit(self, permit: AdmissionPermit) -> None:
+        self._permit = permit
+        # a result that is never iterated to the end must not hold on to its slot
+        weakref.finalize(self, permit.release, None, False)
+
+    def _permit_granted(self, permit: AdmissionPermit) -> None:
+        # NOTE: called from the thread that released the slot (possibly the C++ core's IO thread)
+        self._call_soon_threadsafe(self._start_queued, permit)
+
+    def _start_queued(self, permit: AdmissionPermit) -> None:
+        self._waiter = None
+        if self._queue_timeout_handle is not None:
+            self._queue_timeout_handle.cancel()
+            self._queue_timeout_handle = None
+        if self._iter_ft.done():
+            # the application cancelled the query while it was waiting for a slot
+            permit.release(sample=False)
+            self._release_permits(sample=False)
+            return
+        self._set_permit(permit)
+        try:
+            self._dispatch()
+        except Exception as ex:
+            self._set_future_exception(self._iter_ft, ex)
+
+    def _queue_timed_out(self) -> None:
+        self._queue_timeout_handle = None
+        if self._waiter is None or self._concurrency_limiter is None:
+            return
+        # the waiter might have been granted a slot, in which case the query is dispatched as usual
+        if self._concurrency_limiter.cancel_waiter(self._waiter):
+            self._waiter = None
+            exc = self._query_failed(self._concurrency_limiter.rejected_error())
+            self._set_future_exception(self._iter_ft, exc)
+
+    def _cancel_queued(self, ft: Future[AsyncQueryResult]) -> None:
+        if not ft.cancelled():
+            return
+        self._cancel_waiting()
+
+    def _cancel_waiting(self) -> None:
+        if self._tenant_handle is not None:
+            self._tenant_handle.cancel()
+            self._tenant_handle = None
+        if self._tenant_waiter is not None and self._tenant_throttle is not None and self._tenant is not None:
+            if self._tenant_throttle.cancel_waiter(self._tenant, self._tenant_waiter, rejected=False):
+                self._tenant_waiter = None
+        if self._waiter is None or self._concurrency_limiter is None:
+            return
+        if self._concurrency_limiter.cancel_waiter(self._waiter, rejected=False):
+            self._waiter = None
+            if self._queue_timeout_handle is not None:
+                self._queue_timeout_handle.cancel()
+                self._queue_timeout_handle = None
+
+    def _schedule_retry(self, delay: float) -> None:
+        if self._iter_ft.done():
+            # the application cancelled the query while the core was executing it
+            self._release_permits(sample=False)
+            return
+        # the query keeps its in-flight slots while backing off
+        self._retry_handle = self._loop.call_later(delay, self._retry_dispatch)
+
+    def _retry_dispatch(self) -> None:
+        self._retry_handle = None
+        if self._iter_ft.done():
+            return
+        self._cancel_hedge(self._iter_ft)
+        try:
+            self._dispatch()
+        except Exception as ex:
+            self._set_future_exception(self._iter_ft, ex)
+
+    def _cancel_retry(self, ft: Future[AsyncQueryResult]) -> None:
+        if not ft.cancelled() or self._retry_handle is None:
+            return
+        self._retry_handle.cancel()
+        self._retry_handle = None
+        self._release_permits(sample=False)
+
+    def _retry_delay(self, err: Exception) -> Optional[float]:
+        if self._retries is None:
+            return None
+        # a retry must be dispatched before the deadline
+        max_delay = self._deadline.remaining() if self._deadline is not None else None
+        delay = self._retries.next_delay(err, max_delay)
+        if delay is not None and self._tracker is not None:
+            self._tracker.dispatch_retried(self._retries.attempts)
+        return delay
+
+    def _cancel_hedge(self, _: Future[AsyncQueryResult]) -> None:
+        if self._hedge_handle is not None:
+            self._hedge_handle.cancel()
+            self._hedge_handle = None
+
+    def _deadline_exceeded(self) -> None:
+        self._deadline_handle = None
+        if self._deadline is None or not StreamingState.okay_to_iterate(self._streaming_state):
+            return
+        err = self._deadline.exceeded_error()
+        if not self._iter_ft.done():
+            if self._deadline.phase == PHASE_QUEUE:
+                self._cancel_waiting()
+            else:
+                # the query is backing off before a retry or waiting for the server to respond
+                if self._retry_handle is not None:
+                    self._retry_handle.cancel()
+                    self._retry_handle = None
+                self._query_iter.cancel()
+            self._set_future_exception(self._iter_ft, self._query_failed(err))
+            return
+        # record the deadline error as the outcome, cancelling would otherwise record a cancellation
+        self._query_failed(err)
+        self.cancel()
+        if hasattr(self, '_row_ft') and not self._row_ft.done():
+            self._row_ft.set_exception(err)
+        else:
+            # raised once the application requests the next row
+            self._deadline_error = err
+
+    def _watch_idle(self) -> None:
+        if self._idle_row_timeout is None:
+            return
+        self._row_wait_ns = perf_counter_ns()
+        if self._idle_handle is None:
+            self._idle_handle = self._loop.call_later(self._idle_row_timeout, self._check_idle)
+
+    def _check_idle(self) -> None:
+        self._idle_handle = None
+        if (self._idle_row_timeout is None or self._row_wait_ns is None
+                or not StreamingState.okay_to_iterate(self._streaming_state)):
+            # the next wait for a row re-arms the timer
+            return
+        idle = (perf_counter_ns() - self._row_wait_ns) / 1e9
+        if idle < self._idle_row_timeout:
+            self._idle_handle = self._loop.call_later(self._idle_row_timeout - idle, self._check_idle)
+            return
+        # record the idle row timeout as the outcome, cancelling would otherwise record a cancellation
+        err = self._query_failed(idle_row_timeout_error(self._idle_row_timeout))
+        self.cancel()
+        self._set_future_exception(self._row_ft, err)
+
+    def _cancel_timers(self) -> None:
+        if self._deadline_handle is not None:
+            self._deadline_handle.cancel()
+            self._deadline_handle = None
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _cancel_deadline_on_failure(self, ft: Future[AsyncQueryResult]) -> None:
+        if ft.cancelled() or ft.exception() is not None:
+            self._cancel_timers()
 
     async def get_next_row(self) -> Any:
+        row = await self._get_next_row()
+        if self._tracker is None:
+            return self._deserializer.deserialize(row)
+        start_ns = perf_counter_ns()
+        deserialized_row = self._deserializer.deserialize(row)
+        self._tracker.row_deserialized(perf_counter_ns() - start_ns)
+        return deserialized_row
+
+    async def get_next_raw_row(self) -> bytes:
         return await self._get_next_row()
 
+    def _query_failed(self, err: ErrT) -> ErrT:
+        if self._tracker is not None:
+            self._tracker.finish(err)
+        self._release_permits(err)
+        return err
+
+    def _release_permits(self, error: Optional[BaseException] = None, sample: bool = True) -> None:
+        if self._permit is not None:
+            self._permit.release(error, sample)
+        if self._tenant_permit is not None:
+            self._tenant_permit.release()
+        if self._breaker_permit is not None:
+            self._breaker_permit.release(error, sample)
+
+    def _apply_deadline(self) -> None:
+        if self._deadline is None:
+            return
+        # the server times out the query once the time remaining until the deadline has elapsed
+        try:
+            self._deadline.apply(self._request)
+        except DeadlineExceededError as err:
+            raise self._query_failed(err) from None
+        self._deadline.enter(PHASE_DISPATCH)
+
+    def _build_error(self, core_error: CoreColumnarError) -> Exception:
+        err = ErrorMapper.build_error(core_error)
+        if self._deadline is not None:
+            return self._deadline.check_error(err)
+        return err
+
     def _set_query_core_result(self, res:  Union[bool, ColumnarError]) -> None:
         if self._iter_ft.cancelled():
+            self._release_permits(sample=False)
             return
 
+        # NOTE: callbacks are called from the C++ core's IO thread
         if isinstance(res, CoreColumnarError):
-            exc = ErrorMapper.build_error(res)
-            self._loop.call_soon_threadsafe(self._iter_ft.set_exception, exc)
+            err = self._build_error(res)
+            delay = self._retry_delay(err)
+            if delay is not None:
+                self._call_soon_threadsafe(self._schedule_retry, delay)
+                return
+            exc = self._query_failed(err)
+            self._call_soon_threadsafe(self._set_future_exception, self._iter_ft, exc)
         else:
-            self._loop.call_soon_threadsafe(self._iter_ft.set_result, AsyncQueryResult(self))
+            if self._tracker is not None:
+                self._tracker.dispatch_completed()
+            if self._permit is not None:
+                self._permit.dispatch_completed()
+            if self._breaker_permit is not None:
+                self._breaker_permit.dispatch_completed()
+            if self._retries is not None:
+                self._retries.dispatch_succeeded()
+            if self._deadline is not None:
+                self._deadline.enter(PHASE_STREAMING)
+            self._call_soon_threadsafe(self._set_future_result, self._iter_ft, AsyncQueryResult(self))
 
     def _row_callback(self, row: Any) -> None:
         if isinstance(row, CoreColumnarError):
-            exc = ErrorMapper.build_error(row)
-            self._loop.call_soon_threadsafe(self._row_ft.set_exception, exc)
+            exc = self._query_failed(self._build_error(row))
+            self._call_soon_threadsafe(self._set_future_exception, self._row_ft, exc)
         else:
-            self._loop.call_soon_threadsafe(self._row_ft.set_result, row)
+            self._call_soon_threadsafe(self._set_future_result, self._row_ft, row)
+
+    def _set_future_result(self, ft: Future[Any], result: Any) -> None:
+        # the future is cancelled if the task awaiting it was cancelled prior to the core calling back
+        if not ft.done():
+            ft.set_result(result)
 
-    async def _get_next_row(self) -> Any:
+    def _set_future_exception(self, ft: Future[Any], exc: BaseException) -> None:
+        if not ft.done():
+            ft.set_exception(exc)
+
+    def _streaming_completed(self) -> None:
+        self._cancel_timers()
+        self._streaming_state = StreamingState.Completed
+        if self._tracker is not None:
+            self._tracker.finish(get_metadata=self.get_metadata)
+        self._release_permits()
+
+    async def _get_next_row(self) -> bytes:
+        if self._deadline_error is not None:
+            deadline_err, self._deadline_error = self._deadline_error, None
+            raise deadline_err
         if self._query_iter is None or not StreamingState.okay_to_iterate(self._streaming_state):
             raise StopAsyncIteration
 
         self._row_ft = self._loop.create_future()
         next(self._query_iter)
-        row = await self._row_ft
+        # only time spent waiting for the row counts as idle, not time the application spends processing rows
+        self._watch_idle()
+        try:
+            row = await self._row_ft
+        except CancelledError:
+            # the task awaiting the row was cancelled, stop the core from streaming (and buffering) the remaining rows
+            self.cancel()
+            raise
+        except Exception:
+            self._cancel_timers()
+            raise
+        finally:
+            self._row_wait_ns = None
         if row is None:
-            self._done_streaming = True
+            self._streaming_completed()
             raise StopAsyncIteration
 
-        return self._deserializer.deserialize(row)
+        if self._tracker is not None:
+            self._tracker.row_received(row)
+
+        if self._result_limits is not None:
+            limit_err = self._result_limits.add_row(row)
+            if limit_err is not None:
+                # record the limit error as the outcome, cancelling would otherwise record a cancellation
+                self._query_failed(limit_err)
+                self.cancel()
+                raise limit_err
+
+        return row  # type: ignore[no-any-return]
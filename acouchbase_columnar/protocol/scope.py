@@ -60,10 +60,18 @@ class AsyncScope:
             executor.cancel()
 
     def execute_query(self, statement: str, *args: object, **kwargs: object) -> Future[AsyncQueryResult]:
+        tracker = self.client_adapter.query_instrumentation.start_query(statement)
         req, _ = self._request_builder.build_query_request(statement, *args, **kwargs)
         executor = _AsyncQueryStreamingExecutor(self.client_adapter.client,
                                                 self.client_adapter.loop,
-                                                req)
+                                                req,
+                                                tracker=tracker,
+                                                scheduler=self.client_adapter.scheduler,
+                                                hedging_budget=self.client_adapter.hedging_budget,
+                                                concurrency_limiter=self.client_adapter.concurrency_limiter,
+                                                tenant_throttle=self.client_adapter.tenant_throttle,
+                                                retry_engine=self.client_adapter.retry_engine,
+                                                circuit_breakers=self.client_adapter.circuit_breakers)
         ft = executor.submit_query()
         ft.add_done_callback(partial(self._query_done_callback, executor))
         return ft
@@ -13,6 +13,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from couchbase_columnar.common.enums import QueryRowFormat as QueryRowFormat  # noqa: F401
 from couchbase_columnar.common.enums import QueryScanConsistency as QueryScanConsistency  # noqa: F401
 from couchbase_columnar.common.query import CancelToken as CancelToken  # noqa: F401
 from couchbase_columnar.common.query import QueryMetadata as QueryMetadata  # noqa: F401
@@ -0,0 +1,636 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    Iterator,
+                    List,
+                    Optional)
+
+import pytest
+
+from acouchbase_columnar.cluster import AsyncCluster
+from acouchbase_columnar.credential import Credential
+from acouchbase_columnar.errors import (CircuitOpenError,
+                                        ColumnarError,
+                                        DeadlineExceededError,
+                                        IdleRowTimeoutError,
+                                        QueryError,
+                                        QueryRejectedError,
+                                        TimeoutError)
+from acouchbase_columnar.options import (CircuitBreakerConfig,
+                                         ClusterOptions,
+                                         QueryOptions,
+                                         RetryPolicy)
+from acouchbase_columnar.result import WarmUpResult
+from couchbase_columnar.common.streaming import StreamingState
+from couchbase_columnar.protocol.warm_up import MAX_WARM_UP_CONNECTIONS
+from tests import YieldFixture
+from tests.emulator import (ColumnarEmulator,
+                            EmulatorResponse,
+                            QueryContext)
+from tests.environments.base_environment import cluster_transport, get_security_options
+
+if TYPE_CHECKING:
+    from tests.environments.base_environment import AsyncTestEnvironment
+
+
+class EmulatorTestSuite:
+    TEST_MANIFEST = [
+        'test_aclose_rows',
+        'test_cancel_while_streaming',
+        'test_circuit_breaker',
+        'test_concurrency_limit',
+        'test_concurrency_limit_queue_timeout',
+        'test_connect',
+        'test_context_manager',
+        'test_context_manager_completed',
+        'test_deadline',
+        'test_deadline_while_queued',
+        'test_error_after_rows',
+        'test_hedged_query',
+        'test_hedged_query_not_read_only',
+        'test_idle_row_timeout',
+        'test_mid_stream_disconnect',
+        'test_project',
+        'test_retry',
+        'test_retry_cancelled_during_backoff',
+        'test_row_format_tuple',
+        'test_streamed_results',
+        'test_task_cancelled_while_streaming',
+        'test_tenant_rate_limit',
+        'test_tenant_throttle',
+        'test_timeout_while_streaming',
+        'test_warm_up',
+        'test_warnings',
+    ]
+
+    @pytest.fixture(scope='class')
+    def emulator(self, test_env: AsyncTestEnvironment) -> YieldFixture[ColumnarEmulator]:
+        if test_env.emulator is None:
+            pytest.skip('Test requires the Columnar emulator (PYCBCC_EMULATOR=ON).')
+        yield test_env.emulator
+        test_env.emulator.clear_handlers()
+
+    @staticmethod
+    async def create_cluster(test_env: AsyncTestEnvironment,
+                             emulator: ColumnarEmulator,
+                             **kwargs: Any) -> AsyncCluster:
+        username, pw = test_env.config.get_username_and_pw()
+        cred = Credential.from_username_and_password(username, pw)
+        opts = ClusterOptions(security_options=get_security_options(test_env.config, emulator))
+        with cluster_transport(emulator):
+            return await AsyncCluster.connect(emulator.connection_string, cred, opts, **kwargs)
+
+    @staticmethod
+    def slow_then_fast_handler() -> Callable[[QueryContext], Optional[EmulatorResponse]]:
+        responses: Iterator[EmulatorResponse] = iter([EmulatorResponse(rows=[{'hedge': False}], first_row_delay=2),
+                                                      EmulatorResponse(rows=[{'hedge': True}])])
+
+        def handler(ctx: QueryContext) -> Optional[EmulatorResponse]:
+            return next(responses, None)
+        return handler
+
+    @staticmethod
+    def fail_then_succeed_handler(failures: int) -> Callable[[QueryContext], Optional[EmulatorResponse]]:
+        responses: Iterator[EmulatorResponse] = iter([EmulatorResponse(errors=[{'code': 23007,
+                                                                                'msg': 'Job queue is full'}])]
+                                                     * failures)
+
+        def handler(ctx: QueryContext) -> Optional[EmulatorResponse]:
+            return next(responses, None)
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_aclose_rows(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.05)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        result_rows = result.rows()
+        try:
+            async for row in result_rows:
+                rows.append(row)
+                if len(rows) == 5:
+                    break
+        finally:
+            await result_rows.aclose()
+        assert len(rows) == 5
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_streaming(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.05)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        async for row in result.rows():
+            rows.append(row)
+            if len(rows) == 5:
+                result.cancel()
+        assert len(rows) == 5
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        config = CircuitBreakerConfig(min_queries=2, open_duration=timedelta(milliseconds=200), half_open_probes=1)
+        cluster = await self.create_cluster(test_env, emulator, circuit_breaker=config)
+        try:
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(2))
+            for _ in range(2):
+                with pytest.raises(QueryError):
+                    await cluster.execute_query('SELECT 1;')
+            request_count = emulator.request_count
+            # the circuit is open, queries fail w/o being sent to the server
+            with pytest.raises(CircuitOpenError):
+                await cluster.execute_query('SELECT 1;')
+            assert emulator.request_count == request_count
+            await asyncio.sleep(0.2)
+            # the probe query succeeds and closes the circuit
+            result = await cluster.execute_query('SELECT 1;')
+            assert await result.get_all_rows() == [{'$1': 1}]
+            result = await cluster.execute_query('SELECT 1;')
+            assert await result.get_all_rows() == [{'$1': 1}]
+            stats = cluster.metrics_snapshot().circuit_breakers
+            assert len(stats) == 1
+            assert stats[0].state == 'closed'
+            assert stats[0].opened == 1
+            assert stats[0].rejected == 1
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = await self.create_cluster(test_env, emulator, max_concurrent_queries=1)
+        try:
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.05)
+            result = await cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+            # the second query waits (w/o blocking the event loop) for the first query's slot
+            queued_ft = cluster.execute_query('SELECT 1;')
+            await asyncio.sleep(0.1)
+            assert not queued_ft.done()
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.in_flight == 1
+            assert stats.queued == 1
+            assert len(await result.get_all_rows()) == 20
+            queued_result = await asyncio.wait_for(queued_ft, timeout=5)
+            assert await queued_result.get_all_rows() == [{'$1': 1}]
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.in_flight == 0
+            assert stats.queued == 0
+            assert stats.admitted == 2
+        finally:
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_tenant_rate_limit(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = await self.create_cluster(test_env, emulator, tenant_rate_limit=10, tenant_burst=1)
+        try:
+            start = time.perf_counter()
+            results = await asyncio.gather(*[cluster.execute_query('SELECT 1;', tenant='tenant-a') for _ in range(3)])
+            # the tenant's queries are spaced out at its rate, w/o blocking the event loop
+            assert time.perf_counter() - start >= 0.19
+            for result in results:
+                assert await result.get_all_rows() == [{'$1': 1}]
+            start = time.perf_counter()
+            await cluster.execute_query('SELECT 1;', tenant='tenant-b')
+            assert time.perf_counter() - start < 0.1
+            stats = {s.tenant: s for s in cluster.metrics_snapshot().tenants}
+            assert stats['tenant-a'].admitted == 3
+            assert stats['tenant-a'].queue_wait.max >= 190000
+        finally:
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_tenant_throttle(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = await self.create_cluster(test_env, emulator, tenant_max_concurrent_queries=1)
+        try:
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.05)
+            result = await cluster.execute_query('SELECT * FROM emulator',
+                                                 QueryOptions(raw=response.to_raw(), tenant='tenant-a'))
+            # the tenant's second query waits (w/o blocking the event loop) for the tenant's first query's slot
+            queued_ft = cluster.execute_query('SELECT 1;', tenant='tenant-a')
+            await asyncio.sleep(0.1)
+            assert not queued_ft.done()
+            # other tenants are not affected
+            other_result = await asyncio.wait_for(cluster.execute_query('SELECT 1;', tenant='tenant-b'), timeout=1)
+            assert await other_result.get_all_rows() == [{'$1': 1}]
+            stats = {s.tenant: s for s in cluster.metrics_snapshot().tenants}
+            assert stats['tenant-a'].in_flight == 1
+            assert stats['tenant-a'].queued == 1
+            assert len(await result.get_all_rows()) == 20
+            queued_result = await asyncio.wait_for(queued_ft, timeout=5)
+            assert await queued_result.get_all_rows() == [{'$1': 1}]
+            stats = {s.tenant: s for s in cluster.metrics_snapshot().tenants}
+            assert stats['tenant-a'].in_flight == 0
+            assert stats['tenant-a'].queued == 0
+            assert stats['tenant-a'].admitted == 2
+            assert stats['tenant-a'].queue_wait.max >= 100000
+        finally:
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_queue_timeout(self,
+                                                   test_env: AsyncTestEnvironment,
+                                                   emulator: ColumnarEmulator) -> None:
+        cluster = await self.create_cluster(test_env,
+                                            emulator,
+                                            max_concurrent_queries=1,
+                                            concurrency_queue_timeout=timedelta(milliseconds=100))
+        try:
+            request_count = emulator.request_count
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.5)
+            result = await cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+            with pytest.raises(QueryRejectedError):
+                await cluster.execute_query('SELECT 1;')
+            assert emulator.request_count == request_count + 1
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.rejected == 1
+            result.cancel()
+            # the cancelled query released its slot
+            queued_result = await cluster.execute_query('SELECT 1;')
+            assert await queued_result.get_all_rows() == [{'$1': 1}]
+        finally:
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_deadline(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        # the server is sent the time remaining until the deadline as the query's timeout
+        result = await test_env.cluster.execute_query('SELECT 1;', deadline=timedelta(seconds=2))
+        assert await result.get_all_rows() == [{'$1': 1}]
+        timeout = emulator.requests[-1]['timeout']
+        assert timeout.endswith('us') and 0 < int(timeout[:-2]) <= 2000000
+        # the server does not respond in time
+        response = EmulatorResponse(row_count=10, first_row_delay=2)
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceededError) as ex:
+            await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                 QueryOptions(raw=response.to_raw(),
+                                                              deadline=timedelta(milliseconds=300)))
+        assert ex.value.phase == 'dispatch'
+        assert time.perf_counter() - start < 1.5
+        # the server streams the rows too slowly
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.2)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                      QueryOptions(raw=response.to_raw(),
+                                                                   deadline=timedelta(seconds=1)))
+        rows = []
+        with pytest.raises(DeadlineExceededError) as ex:
+            async for row in result.rows():
+                rows.append(row)
+        assert ex.value.phase == 'streaming'
+        assert 0 < len(rows) < 100
+        # the application iterates the rows too slowly, the stream is cancelled at the deadline
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.05)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                      QueryOptions(raw=response.to_raw(),
+                                                                   deadline=timedelta(milliseconds=200)))
+        rows = []
+        with pytest.raises(DeadlineExceededError) as ex:
+            async for row in result.rows():
+                rows.append(row)
+                await asyncio.sleep(0.3)
+        assert ex.value.phase == 'streaming'
+        assert len(rows) == 1
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    @pytest.mark.asyncio
+    async def test_deadline_while_queued(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        policy = RetryPolicy(initial_backoff=timedelta(milliseconds=200), jitter=False)
+        cluster = await self.create_cluster(test_env, emulator, max_concurrent_queries=1, retry_policy=policy)
+        try:
+            request_count = emulator.request_count
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.05)
+            result = await cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+            # the first query holds the only in-flight slot until its rows have been streamed
+            with pytest.raises(DeadlineExceededError) as ex:
+                await cluster.execute_query('SELECT 1;', deadline=timedelta(milliseconds=100))
+            assert ex.value.phase == 'queue'
+            assert emulator.request_count == request_count + 1
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.queued == 0
+            assert stats.rejected == 0
+            assert len(await result.get_all_rows()) == 20
+            # the query is not retried if the backoff would not be over before the deadline
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(1))
+            request_count = emulator.request_count
+            with pytest.raises(QueryError) as query_ex:
+                await cluster.execute_query('SELECT 1;', deadline=timedelta(milliseconds=150))
+            assert query_ex.value.code == 23007
+            assert emulator.request_count == request_count + 1
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.in_flight == 0
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_connect(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        username, pw = test_env.config.get_username_and_pw()
+        cred = Credential.from_username_and_password(username, pw)
+        opts = ClusterOptions(security_options=get_security_options(test_env.config, emulator))
+        request_count = emulator.request_count
+        with cluster_transport(emulator):
+            cluster = await AsyncCluster.connect(emulator.connection_string, cred, opts, warmup_connections=2)
+        assert isinstance(cluster, AsyncCluster)
+        # the warm-up is awaited by connect()
+        assert emulator.request_count == request_count + 2
+        result = await cluster.execute_query('SELECT 1;')
+        assert await result.get_all_rows() == [{'$1': 1}]
+        cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_context_manager(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.05)
+        rows = []
+        with pytest.raises(ValueError):
+            async with await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                            QueryOptions(raw=response.to_raw())) as result:
+                async for row in result:
+                    rows.append(row)
+                    if len(rows) == 5:
+                        raise ValueError('Stop streaming')
+        assert len(rows) == 5
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    @pytest.mark.asyncio
+    async def test_context_manager_completed(self,
+                                             test_env: AsyncTestEnvironment,
+                                             emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=10)
+        async with await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                        QueryOptions(raw=response.to_raw())) as result:
+            rows = await result.get_all_rows()
+        assert len(rows) == 10
+        # a completed stream is not cancelled, the metadata is still available
+        assert result._executor.streaming_state == StreamingState.Completed
+        assert result.metadata().metrics().result_count() == 10
+
+    @pytest.mark.asyncio
+    async def test_error_after_rows(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=10, errors=[{'code': 25000, 'msg': 'Internal error'}])
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        with pytest.raises(QueryError) as ex:
+            async for row in result.rows():
+                rows.append(row)
+        assert len(rows) == 10
+        assert ex.value.code == 25000
+
+    @pytest.mark.asyncio
+    async def test_hedged_query(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        # every query can be hedged
+        cluster = await self.create_cluster(test_env, emulator, hedging_budget=1.0)
+        cancelled_count = emulator.cancelled_count
+        emulator.add_handler(r'^SELECT \* FROM hedged$', self.slow_then_fast_handler())
+        try:
+            start = time.perf_counter()
+            result = await cluster.execute_query('SELECT * FROM hedged',
+                                                 QueryOptions(hedge_after=timedelta(milliseconds=100), read_only=True))
+            rows = await result.get_all_rows()
+            # the hedge responded first
+            assert rows == [{'hedge': True}]
+            assert time.perf_counter() - start < 2
+            stats = cluster.metrics_snapshot().hedging
+            assert stats.requests == 1
+            assert stats.hedges_sent == 1
+            assert stats.hedges_won == 1
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+        # the original query is cancelled
+        deadline = time.monotonic() + 5
+        while emulator.cancelled_count == cancelled_count and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert emulator.cancelled_count == cancelled_count + 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_query_not_read_only(self,
+                                              test_env: AsyncTestEnvironment,
+                                              emulator: ColumnarEmulator) -> None:
+        with pytest.raises(ValueError):
+            await test_env.cluster.execute_query('SELECT * FROM hedged',
+                                                 QueryOptions(hedge_after=timedelta(milliseconds=100)))
+
+    @pytest.mark.asyncio
+    async def test_idle_row_timeout(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cancelled_count = emulator.cancelled_count
+        # the stream stalls after the first chunk of rows
+        response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=5)
+        start = time.perf_counter()
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                      QueryOptions(raw=response.to_raw(),
+                                                                   idle_row_timeout=timedelta(milliseconds=200)))
+        rows = []
+        with pytest.raises(IdleRowTimeoutError):
+            async for row in result.rows():
+                rows.append(row)
+        assert len(rows) == 10
+        assert time.perf_counter() - start < 2
+        assert result._executor.streaming_state == StreamingState.Cancelled
+        deadline = time.monotonic() + 5
+        while emulator.cancelled_count == cancelled_count and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert emulator.cancelled_count == cancelled_count + 1
+        # time the application spends processing a row does not count
+        response = EmulatorResponse(row_count=5)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                      QueryOptions(raw=response.to_raw(),
+                                                                   idle_row_timeout=timedelta(milliseconds=100)))
+        rows = []
+        async for row in result.rows():
+            rows.append(row)
+            await asyncio.sleep(0.2)
+        assert len(rows) == 5
+        assert result._executor.streaming_state == StreamingState.Completed
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_disconnect(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, disconnect_after_rows=20)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        with pytest.raises(ColumnarError):
+            async for row in result.rows():
+                rows.append(row)
+        assert len(rows) == 20
+
+    @pytest.mark.asyncio
+    async def test_project(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, row_size=256, rows_per_chunk=7)
+        q_opts = QueryOptions(raw=response.to_raw(), project=['name', 'id', 'payload.size'])
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', q_opts)
+        rows = await result.get_all_rows()
+        assert rows[1] == {'name': 'row-1', 'id': 1}
+        assert [r['id'] for r in rows] == list(range(100))
+
+    @pytest.mark.asyncio
+    async def test_retry(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = await self.create_cluster(test_env,
+                                            emulator,
+                                            retry_policy=RetryPolicy(initial_backoff=timedelta(milliseconds=10)))
+        try:
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(2))
+            request_count = emulator.request_count
+            result = await cluster.execute_query('SELECT 1;')
+            assert await result.get_all_rows() == [{'$1': 1}]
+            assert emulator.request_count == request_count + 3
+            # the query fails once its attempts are used up
+            emulator.clear_handlers()
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(2))
+            with pytest.raises(QueryError) as ex:
+                await cluster.execute_query('SELECT 1;', retry_policy=RetryPolicy(max_attempts=2))
+            assert ex.value.code == 23007
+            stats = cluster.metrics_snapshot().retries
+            assert stats.queries == 2
+            assert stats.retries == 3
+            assert stats.succeeded_after_retry == 1
+            assert stats.failed_after_retry == 1
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_retry_cancelled_during_backoff(self,
+                                                  test_env: AsyncTestEnvironment,
+                                                  emulator: ColumnarEmulator) -> None:
+        policy = RetryPolicy(initial_backoff=timedelta(seconds=1), jitter=False)
+        cluster = await self.create_cluster(test_env, emulator, retry_policy=policy, max_concurrent_queries=1)
+        try:
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(1))
+            request_count = emulator.request_count
+            ft = cluster.execute_query('SELECT 1;')
+            await asyncio.sleep(0.2)
+            assert not ft.done()
+            ft.cancel()
+            await asyncio.sleep(1)
+            # the query is not dispatched again and its in-flight slot is released
+            assert emulator.request_count == request_count + 1
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.in_flight == 0
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_row_format_tuple(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, row_size=64, rows_per_chunk=7)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                      QueryOptions(raw=response.to_raw(), row_format='tuple'))
+        assert result.columns() is None
+        rows = await result.get_all_rows()
+        assert result.columns() == ('id', 'name', 'active', 'score', 'payload')
+        assert all(isinstance(r, tuple) for r in rows)
+        assert [r[0] for r in rows] == list(range(100))
+        assert rows[1][:4] == (1, 'row-1', False, 1.5)
+
+    @pytest.mark.asyncio
+    async def test_streamed_results(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=1000, row_size=128, rows_per_chunk=7)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = await result.get_all_rows()
+        assert [r['id'] for r in rows] == list(range(1000))
+        assert result.metadata().metrics().result_count() == 1000
+
+    @pytest.mark.asyncio
+    async def test_task_cancelled_while_streaming(self,
+                                                  test_env: AsyncTestEnvironment,
+                                                  emulator: ColumnarEmulator) -> None:
+        cancelled_count = emulator.cancelled_count
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.2)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows: List[Any] = []
+
+        async def consume() -> None:
+            async for row in result.rows():
+                rows.append(row)
+
+        task = asyncio.create_task(consume())
+        while len(rows) < 10:
+            await asyncio.sleep(0.01)
+        # the task is waiting on the next chunk
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert result._executor.streaming_state == StreamingState.Cancelled
+        assert 10 <= len(rows) < 100
+        # the emulator notices the client going away the next time it writes (or waits)
+        deadline = time.monotonic() + 5
+        while emulator.cancelled_count == cancelled_count and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert emulator.cancelled_count == cancelled_count + 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_while_streaming(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.2)
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                      QueryOptions(raw=response.to_raw(),
+                                                                   timeout=timedelta(seconds=1)))
+        rows = []
+        with pytest.raises(TimeoutError):
+            async for row in result.rows():
+                rows.append(row)
+        assert 0 < len(rows) < 100
+
+    @pytest.mark.asyncio
+    async def test_warm_up(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        request_count = emulator.request_count
+        result = await test_env.cluster.warm_up(4)
+        assert isinstance(result, WarmUpResult)
+        assert result.succeeded == 4
+        assert result.errors == []
+        assert emulator.request_count == request_count + 4
+
+        with pytest.raises(ValueError):
+            await test_env.cluster.warm_up(0)
+        with pytest.raises(ValueError):
+            await test_env.cluster.warm_up(MAX_WARM_UP_CONNECTIONS + 1)
+
+    @pytest.mark.asyncio
+    async def test_warnings(self, test_env: AsyncTestEnvironment, emulator: ColumnarEmulator) -> None:
+        response = EmulatorResponse(row_count=1, warnings=[{'code': 1, 'msg': 'Emulated warning'}])
+        result = await test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        assert len(await result.get_all_rows()) == 1
+        warnings = result.metadata().warnings()
+        assert len(warnings) == 1
+        assert warnings[0].message() == 'Emulated warning'
+
+
+class EmulatorTests(EmulatorTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(EmulatorTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(EmulatorTests) if valid_test_method(meth)]
+        test_list = set(EmulatorTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
+
+    @pytest.fixture(scope='class', name='test_env')
+    def couchbase_test_environment(self,
+                                   async_test_env: AsyncTestEnvironment) -> YieldFixture[AsyncTestEnvironment]:
+        yield async_test_env
@@ -0,0 +1,138 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from threading import Thread
+from typing import (Any,
+                    Dict,
+                    List)
+
+import pytest
+
+from acouchbase_columnar import get_event_loop
+from acouchbase_columnar.protocol.core.scheduler import _CompletionScheduler
+from tests import YieldFixture
+
+
+class CustomEventLoop(asyncio.SelectorEventLoop):
+    """Stands in for third-party event loops (e.g. uvloop)."""
+
+
+class EventLoopTestSuite:
+    TEST_MANIFEST = [
+        'test_get_event_loop_custom_loop',
+        'test_get_event_loop_running_loop',
+        'test_scheduler_callback_error',
+        'test_scheduler_coalesces_wakeups',
+        'test_scheduler_completions_after_wakeup',
+    ]
+
+    @pytest.fixture()
+    def loop(self) -> YieldFixture[asyncio.AbstractEventLoop]:
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+
+    def test_get_event_loop_custom_loop(self) -> None:
+        loop = CustomEventLoop()
+        try:
+            assert get_event_loop(loop) is loop
+        finally:
+            loop.close()
+
+    def test_get_event_loop_running_loop(self) -> None:
+        loop = CustomEventLoop()
+
+        async def get_loop() -> asyncio.AbstractEventLoop:
+            return get_event_loop()
+
+        try:
+            # the running loop is never replaced (or closed)
+            assert loop.run_until_complete(get_loop()) is loop
+            assert not loop.is_closed()
+        finally:
+            loop.close()
+
+    def test_scheduler_callback_error(self, loop: asyncio.AbstractEventLoop) -> None:
+        scheduler = _CompletionScheduler(loop)
+        errors: List[Dict[str, Any]] = []
+        loop.set_exception_handler(lambda _, ctx: errors.append(ctx))
+        results: List[int] = []
+
+        def fail() -> None:
+            raise ValueError('callback failed')
+
+        scheduler.call_soon_threadsafe(fail)
+        scheduler.call_soon_threadsafe(results.append, 1)
+        loop.run_until_complete(asyncio.sleep(0))
+        assert results == [1]
+        assert len(errors) == 1
+        assert isinstance(errors[0]['exception'], ValueError)
+
+    def test_scheduler_coalesces_wakeups(self, loop: asyncio.AbstractEventLoop) -> None:
+        scheduler = _CompletionScheduler(loop)
+        results: List[int] = []
+
+        def complete(n: int) -> None:
+            for i in range(100):
+                scheduler.call_soon_threadsafe(results.append, n * 100 + i)
+
+        # completions arrive from (multiple) IO threads before the event loop gets to run
+        threads = [Thread(target=complete, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        loop.run_until_complete(asyncio.sleep(0))
+        assert scheduler.completions == 400
+        assert scheduler.wakeups == 1
+        assert sorted(results) == list(range(400))
+        # FIFO per thread
+        for n in range(4):
+            assert [r for r in results if r // 100 == n] == list(range(n * 100, n * 100 + 100))
+
+    def test_scheduler_completions_after_wakeup(self, loop: asyncio.AbstractEventLoop) -> None:
+        scheduler = _CompletionScheduler(loop)
+        results: List[int] = []
+
+        def complete(n: int) -> None:
+            results.append(n)
+            if n < 3:
+                # completion queued while the batch is being run
+                Thread(target=scheduler.call_soon_threadsafe, args=(complete, n + 1)).start()
+
+        async def wait_for_completions() -> None:
+            while len(results) < 4:
+                await asyncio.sleep(0.01)
+
+        scheduler.call_soon_threadsafe(complete, 0)
+        loop.run_until_complete(asyncio.wait_for(wait_for_completions(), timeout=5))
+        assert results == [0, 1, 2, 3]
+        assert scheduler.completions == 4
+
+
+class EventLoopTests(EventLoopTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(EventLoopTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(EventLoopTests) if valid_test_method(meth)]
+        test_list = set(EventLoopTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
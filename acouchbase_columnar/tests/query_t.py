@@ -24,9 +24,9 @@ import pytest
 import pytest_asyncio
 
 from acouchbase_columnar.deserializer import PassthroughDeserializer
-from acouchbase_columnar.errors import QueryError
+from acouchbase_columnar.errors import QueryError, ResultLimitExceededError
 from acouchbase_columnar.options import QueryOptions
-from acouchbase_columnar.result import AsyncQueryResult
+from acouchbase_columnar.result import AsyncQueryResult, SpillableRowSequence
 from couchbase_columnar.common.streaming import StreamingState
 from tests import AsyncYieldFixture
 
@@ -51,6 +51,10 @@ class QueryTestSuite:
         'test_query_raw_options',
         'test_simple_query',
         'test_query_passthrough_deserializer',
+        'test_query_get_all_rows',
+        'test_query_get_all_rows_max_memory',
+        'test_query_max_result_bytes_exceeded',
+        'test_query_max_rows_exceeded',
     ]
 
     @pytest.fixture(scope='class')
@@ -256,6 +260,53 @@ class QueryTestSuite:
             assert json.loads(row) == {'num': idx}
             idx += 1
 
+    @pytest.mark.asyncio
+    async def test_query_get_all_rows(self, test_env: AsyncTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        rows = await result.get_all_rows()
+        assert isinstance(rows, list)
+        assert rows == [{'num': idx} for idx in range(100)]
+
+    @pytest.mark.asyncio
+    async def test_query_get_all_rows_max_memory(self, test_env: AsyncTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = await test_env.cluster_or_scope.execute_query(statement)
+        rows = await result.get_all_rows(max_memory=100)
+        assert isinstance(rows, SpillableRowSequence)
+        with rows:
+            assert rows.spilled is True
+            assert 0 < rows.spilled_count < 100
+            assert len(rows) == 100
+            assert rows[0] == {'num': 0}
+            assert rows[-1] == {'num': 99}
+            assert list(rows) == [{'num': idx} for idx in range(100)]
+
+    @pytest.mark.asyncio
+    async def test_query_max_result_bytes_exceeded(self, test_env: AsyncTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = await test_env.cluster_or_scope.execute_query(statement, QueryOptions(max_result_bytes=50))
+        rows = []
+        with pytest.raises(ResultLimitExceededError) as ex:
+            async for row in result.rows():
+                rows.append(row)
+        assert ex.value.limit_name == 'max_result_bytes'
+        assert 0 < len(rows) < 100
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    @pytest.mark.asyncio
+    async def test_query_max_rows_exceeded(self, test_env: AsyncTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = await test_env.cluster_or_scope.execute_query(statement, max_rows=10)
+        rows = []
+        with pytest.raises(ResultLimitExceededError) as ex:
+            async for row in result.rows():
+                rows.append(row)
+        assert ex.value.limit_name == 'max_rows'
+        assert ex.value.limit == 10
+        assert rows == [{'num': idx} for idx in range(10)]
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
 
 class ClusterQueryTests(QueryTestSuite):
 
@@ -0,0 +1,451 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Query streaming micro-benchmarks.
+
+Usage::
+
+    python -m benchmarks.bench run --scenarios quick --output results.json
+    python -m benchmarks.bench compare baseline.json results.json --threshold 0.05
+
+By default the scenarios run against the Columnar query service emulator (see :mod:`tests.emulator`), started in a
+separate process so that its CPU usage is not attributed to the SDK.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import platform
+import subprocess  # nosec
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import (asdict,
+                         dataclass,
+                         field)
+from itertools import product
+from typing import (Any,
+                    Dict,
+                    List,
+                    Optional,
+                    Tuple)
+
+from acouchbase_columnar.cluster import AsyncCluster
+from couchbase_columnar.cluster import Cluster
+from couchbase_columnar.common.deserializer import (DefaultJsonDeserializer,
+                                                    Deserializer,
+                                                    PassthroughDeserializer)
+from couchbase_columnar.credential import Credential
+from couchbase_columnar.options import ClusterOptions, QueryOptions
+from couchbase_columnar.protocol import PYCBCC_VERSION
+from tests.emulator import EmulatorResponse
+from tests.emulator.transport import emulator_transport
+
+RESULTS_FORMAT_VERSION = 1
+EMULATOR_STATEMENT = 'SELECT * FROM benchmark'
+DESERIALIZERS: Dict[str, Deserializer] = {
+    'json': DefaultJsonDeserializer(),
+    'passthrough': PassthroughDeserializer(),
+}
+# (metric, True if higher is better)
+COMPARED_METRICS: List[Tuple[str, bool]] = [
+    ('rows_per_sec', True),
+    ('mb_per_sec', True),
+    ('ttfr_p50_ms', False),
+    ('ttfr_p99_ms', False),
+    ('cpu_us_per_row', False),
+]
+RESULT_SET_FIELDS = ['row_count', 'row_size', 'rows_per_chunk', 'chunk_delay', 'first_row_delay']
+EVENT_LOOPS = ['asyncio', 'uvloop']
+
+
+@dataclass
+class Scenario:
+    api: str
+    deserializer: str
+    concurrency: int
+    result_set: EmulatorResponse
+    queries: int
+
+    @property
+    def name(self) -> str:
+        return (f'{self.api}-{self.deserializer}-c{self.concurrency}'
+                f'-rows{self.result_set.row_count}-size{self.result_set.row_size}')
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    api: str
+    deserializer: str
+    concurrency: int
+    result_set: Dict[str, Any]
+    queries: int
+    rows: int
+    result_bytes: int
+    wall_time_s: float
+    cpu_time_s: float
+    rows_per_sec: float
+    mb_per_sec: float
+    ttfr_p50_ms: float
+    ttfr_p99_ms: float
+    cpu_us_per_row: float
+    errors: int = 0
+    error_messages: List[str] = field(default_factory=list)
+
+
+@dataclass
+class QuerySample:
+    time_to_first_row: Optional[float]
+    rows: int
+    result_bytes: int
+
+
+def build_scenarios(scenario_set: str, queries: int) -> List[Scenario]:
+    if scenario_set == 'quick':
+        concurrency_levels = [1, 8]
+        result_sets = [EmulatorResponse(row_count=1000, row_size=256)]
+    else:
+        concurrency_levels = [1, 4, 16]
+        result_sets = [EmulatorResponse(row_count=1, row_size=256),
+                       EmulatorResponse(row_count=1000, row_size=256),
+                       EmulatorResponse(row_count=10000, row_size=1024, rows_per_chunk=500)]
+    return [Scenario(api, deserializer, concurrency, result_set, queries)
+            for api, deserializer, concurrency, result_set in product(['sync', 'async'],
+                                                                      DESERIALIZERS.keys(),
+                                                                      concurrency_levels,
+                                                                      result_sets)]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[idx]
+
+
+def new_event_loop(name: str) -> asyncio.AbstractEventLoop:
+    if name == 'asyncio':
+        return asyncio.new_event_loop()
+    try:
+        # optional, only required to benchmark the async API on uvloop
+        module = importlib.import_module(name)
+    except ImportError:
+        raise SystemExit(f'--loop {name} requires {name} to be installed.') from None
+    loop: asyncio.AbstractEventLoop = module.new_event_loop()
+    return loop
+
+
+def summarize(scenario: Scenario,
+              samples: List[QuerySample],
+              errors: List[str],
+              wall_time: float,
+              cpu_time: float) -> ScenarioResult:
+    rows = sum(s.rows for s in samples)
+    result_bytes = sum(s.result_bytes for s in samples)
+    ttfr = [s.time_to_first_row * 1e3 for s in samples if s.time_to_first_row is not None]
+    return ScenarioResult(name=scenario.name,
+                          api=scenario.api,
+                          deserializer=scenario.deserializer,
+                          concurrency=scenario.concurrency,
+                          result_set={k: v for k, v in asdict(scenario.result_set).items() if k in RESULT_SET_FIELDS},
+                          queries=len(samples),
+                          rows=rows,
+                          result_bytes=result_bytes,
+                          wall_time_s=wall_time,
+                          cpu_time_s=cpu_time,
+                          rows_per_sec=rows / wall_time if wall_time > 0 else 0.0,
+                          mb_per_sec=result_bytes / (1024 * 1024) / wall_time if wall_time > 0 else 0.0,
+                          ttfr_p50_ms=percentile(ttfr, 50),
+                          ttfr_p99_ms=percentile(ttfr, 99),
+                          cpu_us_per_row=cpu_time * 1e6 / rows if rows > 0 else 0.0,
+                          errors=len(errors),
+                          error_messages=sorted(set(errors))[:5])
+
+
+class BenchmarkRunner:
+    def __init__(self,
+                 connstr: str,
+                 credential: Credential,
+                 statement: Optional[str] = None,
+                 loop: str = 'asyncio') -> None:
+        self._connstr = connstr
+        self._credential = credential
+        self._loop = loop
+        # a statement is only provided when running against a real cluster
+        self._statement = statement or EMULATOR_STATEMENT
+        self._use_emulator = statement is None
+
+    def _query_options(self, scenario: Scenario) -> QueryOptions:
+        if self._use_emulator:
+            return QueryOptions(raw=scenario.result_set.to_raw())
+        return QueryOptions()
+
+    def _run_sync_query(self, cluster: Cluster, opts: QueryOptions) -> QuerySample:
+        start = time.perf_counter()
+        res = cluster.execute_query(self._statement, opts)
+        time_to_first_row = None
+        rows = 0
+        for _ in res.rows():
+            if time_to_first_row is None:
+                time_to_first_row = time.perf_counter() - start
+            rows += 1
+        return QuerySample(time_to_first_row, rows, res.metadata().metrics().result_size())
+
+    def _run_sync_worker(self,
+                         cluster: Cluster,
+                         opts: QueryOptions,
+                         queries: int) -> Tuple[List[QuerySample], List[str]]:
+        samples: List[QuerySample] = []
+        errors: List[str] = []
+        for _ in range(queries):
+            try:
+                samples.append(self._run_sync_query(cluster, opts))
+            except Exception as ex:
+                errors.append(repr(ex))
+        return samples, errors
+
+    def run_sync(self, scenario: Scenario) -> ScenarioResult:
+        cluster = Cluster.create_instance(self._connstr,
+                                          self._credential,
+                                          ClusterOptions(deserializer=DESERIALIZERS[scenario.deserializer]))
+        try:
+            opts = self._query_options(scenario)
+            # warm-up
+            self._run_sync_worker(cluster, opts, 1)
+            per_worker = max(1, scenario.queries // scenario.concurrency)
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            with ThreadPoolExecutor(max_workers=scenario.concurrency) as pool:
+                results = list(pool.map(lambda _: self._run_sync_worker(cluster, opts, per_worker),
+                                        range(scenario.concurrency)))
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+        finally:
+            cluster.shutdown()
+        samples = [s for worker_samples, _ in results for s in worker_samples]
+        errors = [e for _, worker_errors in results for e in worker_errors]
+        return summarize(scenario, samples, errors, wall_time, cpu_time)
+
+    async def _run_async_query(self, cluster: AsyncCluster, opts: QueryOptions) -> QuerySample:
+        start = time.perf_counter()
+        res = await cluster.execute_query(self._statement, opts)
+        time_to_first_row = None
+        rows = 0
+        async for _ in res.rows():
+            if time_to_first_row is None:
+                time_to_first_row = time.perf_counter() - start
+            rows += 1
+        return QuerySample(time_to_first_row, rows, res.metadata().metrics().result_size())
+
+    async def _run_async_worker(self,
+                                cluster: AsyncCluster,
+                                opts: QueryOptions,
+                                queries: int) -> Tuple[List[QuerySample], List[str]]:
+        samples: List[QuerySample] = []
+        errors: List[str] = []
+        for _ in range(queries):
+            try:
+                samples.append(await self._run_async_query(cluster, opts))
+            except Exception as ex:
+                errors.append(repr(ex))
+        return samples, errors
+
+    async def _run_async(self, scenario: Scenario) -> ScenarioResult:
+        cluster = AsyncCluster.create_instance(self._connstr,
+                                               self._credential,
+                                               ClusterOptions(deserializer=DESERIALIZERS[scenario.deserializer]))
+        try:
+            opts = self._query_options(scenario)
+            # warm-up
+            await self._run_async_worker(cluster, opts, 1)
+            per_worker = max(1, scenario.queries // scenario.concurrency)
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            results = await asyncio.gather(*[self._run_async_worker(cluster, opts, per_worker)
+                                             for _ in range(scenario.concurrency)])
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+        finally:
+            cluster.shutdown()
+        samples = [s for worker_samples, _ in results for s in worker_samples]
+        errors = [e for _, worker_errors in results for e in worker_errors]
+        return summarize(scenario, samples, errors, wall_time, cpu_time)
+
+    def run_async(self, scenario: Scenario) -> ScenarioResult:
+        loop = new_event_loop(self._loop)
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(self._run_async(scenario))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def run(self, scenario: Scenario) -> ScenarioResult:
+        if scenario.api == 'sync':
+            return self.run_sync(scenario)
+        return self.run_async(scenario)
+
+
+class EmulatorProcess:
+    """Runs the Columnar query service emulator in a child process."""
+
+    def __init__(self) -> None:
+        self._proc: Optional[subprocess.Popen[str]] = None
+        self.port = 0
+
+    def __enter__(self) -> EmulatorProcess:
+        self._proc = subprocess.Popen([sys.executable, '-m', 'tests.emulator', '--port', '0'],  # nosec
+                                      stdout=subprocess.PIPE,
+                                      text=True)
+        if self._proc.stdout is None:
+            raise RuntimeError('Unable to read the emulator address.')
+        line = self._proc.stdout.readline()
+        if not line:
+            raise RuntimeError('Emulator failed to start.')
+        # e.g. Columnar emulator listening on http://127.0.0.1:40000/api/v1/request
+        self.port = int(line.rsplit(':', 1)[1].split('/')[0])
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.wait()
+            self._proc = None
+
+
+def run_benchmarks(args: argparse.Namespace) -> int:
+    scenarios = build_scenarios(args.scenarios, args.queries)
+    if args.filter:
+        scenarios = [s for s in scenarios if args.filter in s.name]
+
+    results: List[ScenarioResult] = []
+    with ExitStack() as stack:
+        if args.connstr is None:
+            emulator = stack.enter_context(EmulatorProcess())
+            stack.enter_context(emulator_transport())
+            connstr = f'couchbases://127.0.0.1:{emulator.port}'
+        else:
+            if args.statement is None:
+                raise SystemExit('--statement is required when running against a cluster.')
+            connstr = args.connstr
+        runner = BenchmarkRunner(connstr,
+                                 Credential.from_username_and_password(args.username, args.password),
+                                 statement=args.statement if args.connstr is not None else None,
+                                 loop=args.loop)
+        for scenario in scenarios:
+            result = runner.run(scenario)
+            results.append(result)
+            print(f'{result.name:<48} {result.rows_per_sec:>12.0f} rows/s {result.mb_per_sec:>8.2f} MB/s '
+                  f'ttfr p50={result.ttfr_p50_ms:.3f}ms p99={result.ttfr_p99_ms:.3f}ms '
+                  f'cpu={result.cpu_us_per_row:.2f}us/row errors={result.errors}', flush=True)
+
+    output = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'metadata': {
+            'sdk_version': PYCBCC_VERSION,
+            'python_version': platform.python_version(),
+            'python_implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'target': 'emulator' if args.connstr is None else 'cluster',
+            'scenarios': args.scenarios,
+            'queries': args.queries,
+            'loop': args.loop,
+        },
+        'results': [asdict(r) for r in results],
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    return 1 if any(r.errors for r in results) else 0
+
+
+def compare_results(baseline: Dict[str, Any],
+                    current: Dict[str, Any],
+                    threshold: float) -> Tuple[List[Dict[str, Any]], bool]:
+    """Compares two result files, returns the per-metric deltas and whether any metric regressed past ``threshold``."""
+    baseline_results = {r['name']: r for r in baseline['results']}
+    rows: List[Dict[str, Any]] = []
+    regressed = False
+    for result in current['results']:
+        base = baseline_results.get(result['name'], None)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            base_value = base[metric]
+            value = result[metric]
+            change = (value - base_value) / base_value if base_value else 0.0
+            is_regression = (change < -threshold) if higher_is_better else (change > threshold)
+            regressed = regressed or is_regression
+            rows.append({'name': result['name'],
+                         'metric': metric,
+                         'baseline': base_value,
+                         'current': value,
+                         'change': change,
+                         'regression': is_regression})
+    return rows, regressed
+
+
+def run_compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows, regressed = compare_results(baseline, current, args.threshold)
+    print(f'baseline: {baseline["metadata"]["sdk_version"]}  current: {current["metadata"]["sdk_version"]}')
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f'{row["name"]:<48} {row["metric"]:<16} {row["baseline"]:>14.3f} {row["current"]:>14.3f} '
+              f'{row["change"]:>+8.1%}{flag}')
+    return 1 if regressed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Columnar SDK query streaming benchmarks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmark scenarios.')
+    run_parser.add_argument('--scenarios', choices=['quick', 'full'], default='quick')
+    run_parser.add_argument('--queries', type=int, default=50, help='Queries per scenario.')
+    run_parser.add_argument('--filter', help='Only run scenarios whose name contains the provided value.')
+    run_parser.add_argument('--output', help='Path of the JSON results file.')
+    run_parser.add_argument('--connstr', help='Run against a Columnar cluster instead of the emulator.')
+    run_parser.add_argument('--username', default='Administrator')
+    run_parser.add_argument('--password', default='password')
+    run_parser.add_argument('--statement', help='Statement to execute when running against a cluster.')
+    run_parser.add_argument('--loop', choices=EVENT_LOOPS, default='asyncio',
+                            help='Event loop used by the async scenarios (default asyncio).')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two JSON results files.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.05,
+                                help='Relative change treated as a regression (default 0.05).')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run_benchmarks(args)
+    return run_compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
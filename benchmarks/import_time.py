@@ -0,0 +1,149 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Import-time benchmark.
+
+Usage::
+
+    python -m benchmarks.import_time --runs 10 --output import_time.json
+    python -m benchmarks.import_time --module acouchbase_columnar --max-ms 50
+
+Each run imports the module in a fresh interpreter with ``python -X importtime`` and the import time reported for the
+module is recorded.  The command exits with a non-zero status if a module that should only be loaded on first use
+(e.g. the C++ extension) is imported, or if the median import time is above ``--max-ms``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess  # nosec
+import sys
+from dataclasses import asdict, dataclass
+from typing import (Dict,
+                    List,
+                    Optional,
+                    Union)
+
+# modules that should only be loaded when the first cluster is created
+DEFERRED_MODULES = ['couchbase_columnar.protocol.pycbcc_core']
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportTimeResult:
+    module: str
+    runs: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    module_count: int
+    deferred_modules_imported: List[str]
+    slowest_modules: List[Dict[str, Union[str, float]]]
+
+
+def parse_import_times(output: str) -> List[ImportRecord]:
+    records: List[ImportRecord] = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        # nested imports are indented by two spaces per level
+        records.append(ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def run_import(module: str) -> List[ImportRecord]:
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],  # nosec
+                          capture_output=True,
+                          text=True,
+                          check=False)
+    if proc.returncode != 0:
+        raise RuntimeError(f'Unable to import {module}:\n{proc.stderr}')
+    return parse_import_times(proc.stderr)
+
+
+def measure(module: str, runs: int, top: int) -> ImportTimeResult:
+    totals: List[float] = []
+    self_times: Dict[str, List[int]] = {}
+    imported: List[str] = []
+    for _ in range(runs):
+        records = run_import(module)
+        total = next((r.cumulative_us for r in records if r.name == module), 0)
+        totals.append(total / 1000)
+        for record in records:
+            self_times.setdefault(record.name, []).append(record.self_us)
+        imported = [r.name for r in records]
+
+    slowest = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:top]
+    return ImportTimeResult(module=module,
+                            runs=runs,
+                            median_ms=round(statistics.median(totals), 3),
+                            min_ms=round(min(totals), 3),
+                            max_ms=round(max(totals), 3),
+                            module_count=len(imported),
+                            deferred_modules_imported=[m for m in DEFERRED_MODULES if m in imported],
+                            slowest_modules=[{'name': name, 'self_ms': round(statistics.median(times) / 1000, 3)}
+                                             for name, times in slowest])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Columnar SDK import-time benchmark.')
+    parser.add_argument('--module', default='couchbase_columnar', help='Module to import.')
+    parser.add_argument('--runs', type=int, default=10, help='Number of fresh interpreters to import the module in.')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest modules (self time) to report.')
+    parser.add_argument('--max-ms', type=float, help='Fail if the median import time is above this value.')
+    parser.add_argument('--output', help='Path of the JSON results file.')
+    args = parser.parse_args(argv)
+
+    result = measure(args.module, args.runs, args.top)
+    print(f'{result.module}: median={result.median_ms}ms min={result.min_ms}ms max={result.max_ms}ms '
+          f'modules={result.module_count}')
+    for slow in result.slowest_modules:
+        print(f'  {slow["self_ms"]:>8.3f}ms  {slow["name"]}')
+
+    if args.output:
+        output = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'result': asdict(result),
+        }
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+
+    status = 0
+    if result.deferred_modules_imported:
+        print(f'Importing {result.module} loaded: {", ".join(result.deferred_modules_imported)}')
+        status = 1
+    if args.max_ms is not None and result.median_ms > args.max_ms:
+        print(f'Median import time ({result.median_ms}ms) is above the maximum ({args.max_ms}ms)')
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
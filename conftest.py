@@ -24,20 +24,33 @@ pytest_plugins = [
 
 _UNIT_TESTS = [
     'acouchbase_columnar/tests/connection_t.py::ConnectionTests',
+    'acouchbase_columnar/tests/event_loop_t.py::EventLoopTests',
     'acouchbase_columnar/tests/options_t.py::ClusterOptionsTests',
     'acouchbase_columnar/tests/query_options_t.py::ClusterQueryOptionsTests',
     'acouchbase_columnar/tests/query_options_t.py::ScopeQueryOptionsTests',
+    'couchbase_columnar/tests/admission_t.py::AdmissionTests',
     'couchbase_columnar/tests/binding_errors_t.py::BindingErrorTests',
+    'couchbase_columnar/tests/circuit_breaker_t.py::CircuitBreakerTests',
     'couchbase_columnar/tests/connection_t.py::ConnectionTests',
+    'couchbase_columnar/tests/deadline_t.py::DeadlineTests',
+    'couchbase_columnar/tests/deserializer_t.py::DeserializerTests',
+    'couchbase_columnar/tests/import_t.py::ImportTests',
+    'couchbase_columnar/tests/instrumentation_t.py::InstrumentationTests',
+    'couchbase_columnar/tests/metrics_t.py::MetricsTests',
     'couchbase_columnar/tests/options_t.py::ClusterOptionsTests',
     'couchbase_columnar/tests/query_options_t.py::ClusterQueryOptionsTests',
     'couchbase_columnar/tests/query_options_t.py::ScopeQueryOptionsTests',
+    'couchbase_columnar/tests/retry_t.py::RetryTests',
+    'couchbase_columnar/tests/tenancy_t.py::TenancyTests',
+    'couchbase_columnar/tests/watchdog_t.py::WatchdogTests',
 ]
 
 _INTEGRATRION_TESTS = [
+    'acouchbase_columnar/tests/emulator_t.py::EmulatorTests',
     'acouchbase_columnar/tests/error_t.py::ErrorTests',
     'acouchbase_columnar/tests/query_t.py::ClusterQueryTests',
     'acouchbase_columnar/tests/query_t.py::ScopeQueryTests',
+    'couchbase_columnar/tests/emulator_t.py::EmulatorTests',
     'couchbase_columnar/tests/errors_t.py::ErrorTests',
     'couchbase_columnar/tests/query_t.py::ClusterQueryTests',
     'couchbase_columnar/tests/query_t.py::ScopeQueryTests',
@@ -15,3 +15,4 @@
 
 from couchbase_columnar.common import JSONType as JSONType  # noqa: F401
 from couchbase_columnar.protocol import configure_logging as configure_logging  # noqa: F401
+from couchbase_columnar.protocol import get_dropped_log_message_count as get_dropped_log_message_count  # noqa: F401
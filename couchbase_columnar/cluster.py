@@ -24,8 +24,12 @@ from couchbase_columnar.database import Database
 from couchbase_columnar.result import BlockingQueryResult
 
 if TYPE_CHECKING:
+    from datetime import timedelta
+
     from couchbase_columnar.credential import Credential
+    from couchbase_columnar.metrics import MetricsSnapshot
     from couchbase_columnar.options import ClusterOptions
+    from couchbase_columnar.result import WarmUpResult
 
 
 class Cluster:
@@ -142,6 +146,58 @@ class Cluster:
         """  # noqa: E501
         return self._impl.execute_query(statement, *args, **kwargs)
 
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        """Returns a snapshot of the cluster's built-in query metrics.
+
+        Built-in metrics are recorded per statement fingerprint (the statement w/ literals stripped) and outcome.  They
+        are only recorded if enabled via the `enable_metrics` (or `metrics_report_interval`) cluster option, otherwise the
+        returned snapshot is empty.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Returns:
+            :class:`~couchbase_columnar.metrics.MetricsSnapshot`: A snapshot of the query latency, time to first row, rows and bytes
+            histograms.
+
+        Examples:
+            Log the p99 query latency per statement fingerprint::
+
+                snapshot = cluster.metrics_snapshot()
+                for entry in snapshot.entries:
+                    print(f'{entry.fingerprint} ({entry.outcome}): p99={entry.latency.percentiles["p99"]}us')
+
+        """  # noqa: E501
+        return self._impl.metrics_snapshot()
+
+    def warm_up(self, connections: int = 1, timeout: Optional[timedelta] = None) -> WarmUpResult:
+        """Opens (and TLS-handshakes) connections to the query service ahead of the application's first queries.
+
+        Each connection is established by executing a lightweight query, the queries are executed concurrently so that
+        a separate connection is used for each.  Once warmed up, the connections are kept open for subsequent queries.
+        Warm-up can also be done when the cluster is created via the `warmup_connections` cluster option.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Args:
+            connections: The number of connections to open (at most 64). Defaults to 1.
+            timeout: The timeout for each warm-up query. Defaults to `None` (10 seconds).
+
+        Returns:
+            :class:`~couchbase_columnar.result.WarmUpResult`: The number of connections that were successfully opened, any
+            errors raised and how long the warm-up took.
+
+        Raises:
+            ValueError: If ``connections`` is not a positive int or is greater than 64.
+
+        Examples:
+            Warm up 4 connections::
+
+                res = cluster.warm_up(4)
+                print(f'Warmed up {res.succeeded}/{res.connections} connections in {res.elapsed}')
+
+        """  # noqa: E501
+        return self._impl.warm_up(connections, timeout)
+
     def shutdown(self) -> None:
         """Shuts down this cluster instance. Cleaning up all resources associated with it.
 
@@ -15,7 +15,8 @@
 
 import sys
 from concurrent.futures import Future
-from typing import overload
+from datetime import timedelta
+from typing import Optional, overload
 
 if sys.version_info < (3, 11):
     from typing_extensions import Unpack
@@ -25,12 +26,13 @@ else:
 from couchbase_columnar import JSONType
 from couchbase_columnar.credential import Credential
 from couchbase_columnar.database import Database
+from couchbase_columnar.metrics import MetricsSnapshot
 from couchbase_columnar.options import (ClusterOptions,
                                         ClusterOptionsKwargs,
                                         QueryOptions,
                                         QueryOptionsKwargs)
 from couchbase_columnar.query import CancelToken
-from couchbase_columnar.result import BlockingQueryResult
+from couchbase_columnar.result import BlockingQueryResult, WarmUpResult
 
 class Cluster:
     @overload
@@ -176,6 +178,10 @@ class Cluster:
 
     def shutdown(self) -> None: ...
 
+    def metrics_snapshot(self) -> MetricsSnapshot: ...
+
+    def warm_up(self, connections: int = ..., timeout: Optional[timedelta] = ...) -> WarmUpResult: ...
+
     @overload
     @classmethod
     def create_instance(cls, connstr: str, credential: Credential) -> Cluster: ...
@@ -0,0 +1,122 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Optional
+
+
+class CircuitBreakerConfig:
+    """Circuit breaker for a cluster's queries, see the ``circuit_breaker`` cluster option.
+
+    The circuit breaker tracks the outcome of the last `window_size` queries.  Once at least `min_queries` queries have
+    been tracked and the ratio of failed queries reaches `error_threshold`, the circuit opens and queries fail
+    immediately with a :class:`~couchbase_columnar.errors.CircuitOpenError` (instead of waiting for their timeout).
+    After `open_duration`, the circuit is half-open: up to `half_open_probes` queries are executed as probes, the
+    circuit closes if all of them succeed and opens again if any of them fails.
+
+    A query fails if it times out, the Columnar service is overloaded (a temporary failure error) or the SDK cannot
+    reach the service.  Other errors (e.g. a syntax error) are the query's own and do not count.  If `latency_threshold`
+    is set, a query whose dispatch latency (the time until the server has responded) exceeds the threshold counts as a
+    failure as well.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Args:
+        error_threshold (Optional[float]): The ratio (between 0 and 1) of failed queries that opens the circuit.
+            Defaults to `None` (0.5).
+        latency_threshold (Optional[timedelta]): If set, queries with a dispatch latency above the threshold count as
+            failures.  Defaults to `None` (latency is not considered).
+        min_queries (Optional[int]): The minimum number of tracked queries before the circuit can open.  Defaults to
+            `None` (20).
+        window_size (Optional[int]): The number of most recent queries the error ratio is computed from.  Defaults to
+            `None` (100).
+        open_duration (Optional[timedelta]): How long the circuit stays open before allowing probe queries.  Defaults
+            to `None` (5s).
+        half_open_probes (Optional[int]): The number of probe queries that must succeed to close the circuit.  Defaults
+            to `None` (3).
+        per_statement (Optional[bool]): If enabled, each statement (by its fingerprint, i.e. the statement with literal
+            values replaced) has its own circuit breaker in addition to the cluster's, so a failing statement does not
+            open the circuit for other statements.  Defaults to `None` (disabled).
+    """
+
+    def __init__(self,
+                 error_threshold: Optional[float] = None,
+                 latency_threshold: Optional[timedelta] = None,
+                 min_queries: Optional[int] = None,
+                 window_size: Optional[int] = None,
+                 open_duration: Optional[timedelta] = None,
+                 half_open_probes: Optional[int] = None,
+                 per_statement: Optional[bool] = None) -> None:
+        self._error_threshold = float(error_threshold) if error_threshold is not None else 0.5
+        if not 0 < self._error_threshold <= 1:
+            raise ValueError('error_threshold must be greater than 0 and at most 1.')
+        if latency_threshold is not None and (not isinstance(latency_threshold, timedelta)
+                                              or latency_threshold.total_seconds() <= 0):
+            raise ValueError('latency_threshold must be a positive timedelta.')
+        self._latency_threshold = latency_threshold
+        self._min_queries = self._to_positive_int(min_queries, 20, 'min_queries')
+        self._window_size = self._to_positive_int(window_size, 100, 'window_size')
+        if self._min_queries > self._window_size:
+            raise ValueError('min_queries must not exceed the window_size.')
+        if open_duration is not None and (not isinstance(open_duration, timedelta)
+                                          or open_duration.total_seconds() < 0):
+            raise ValueError('open_duration must be a non-negative timedelta.')
+        self._open_duration = open_duration if open_duration is not None else timedelta(seconds=5)
+        self._half_open_probes = self._to_positive_int(half_open_probes, 3, 'half_open_probes')
+        self._per_statement = per_statement is True
+
+    @staticmethod
+    def _to_positive_int(value: Optional[int], default: int, name: str) -> int:
+        if value is None:
+            return default
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f'{name} must be a positive int.')
+        return value
+
+    @property
+    def error_threshold(self) -> float:
+        return self._error_threshold
+
+    @property
+    def latency_threshold(self) -> Optional[timedelta]:
+        return self._latency_threshold
+
+    @property
+    def min_queries(self) -> int:
+        return self._min_queries
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @property
+    def open_duration(self) -> timedelta:
+        return self._open_duration
+
+    @property
+    def half_open_probes(self) -> int:
+        return self._half_open_probes
+
+    @property
+    def per_statement(self) -> bool:
+        return self._per_statement
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(error_threshold={self._error_threshold}, '
+                f'latency_threshold={self._latency_threshold}, min_queries={self._min_queries}, '
+                f'window_size={self._window_size}, open_duration={self._open_duration}, '
+                f'half_open_probes={self._half_open_probes}, per_statement={self._per_statement})')
@@ -19,16 +19,15 @@ import sys
 from abc import ABC, abstractmethod
 from typing import (Any,
                     Coroutine,
-                    List,
                     Optional,
                     Union)
 
 if sys.version_info < (3, 9):
     from typing import AsyncIterator as PyAsyncIterator
-    from typing import Iterator
+    from typing import Iterator, Sequence
 else:
     from collections.abc import AsyncIterator as PyAsyncIterator
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Sequence
 
 from couchbase_columnar.common.query import QueryMetadata
 
@@ -46,7 +45,9 @@ class QueryResult(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_all_rows(self) -> Union[Coroutine[Any, Any, List[Any]], List[Any]]:
+    def get_all_rows(self,
+                     max_memory: Optional[int] = None
+                     ) -> Union[Coroutine[Any, Any, Sequence[Any]], Sequence[Any]]:
         """Convenience method to load all query results into memory."""
         raise NotImplementedError
 
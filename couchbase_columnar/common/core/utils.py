@@ -27,7 +27,11 @@ from typing import (Any,
                     Union)
 from urllib.parse import quote
 
+from couchbase_columnar.common.circuit_breaker import CircuitBreakerConfig
 from couchbase_columnar.common.deserializer import Deserializer
+from couchbase_columnar.common.metrics import Meter
+from couchbase_columnar.common.retry import RetryPolicy
+from couchbase_columnar.common.tracing import RequestTracer
 
 T = TypeVar('T')
 E = TypeVar('E', bound=Enum)
@@ -81,6 +85,63 @@ def validate_raw_dict(value: Dict[str, Any]) -> Dict[str, Any]:
     return value
 
 
+def validate_positive_int(value: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"Expected value to be of type int instead of {type(value)}")
+    if value <= 0:
+        raise ValueError('Value must be greater than 0.')
+    return value
+
+
+def validate_positive_float(value: float) -> float:
+    if isinstance(value, bool) or not isinstance(value, (float, int)):
+        raise ValueError(f"Expected value to be of type float instead of {type(value)}")
+    if value <= 0:
+        raise ValueError('Value must be greater than 0.')
+    return float(value)
+
+
+def validate_ratio(value: float) -> float:
+    """Validates a ratio, i.e. a number in the [0, 1] range."""
+    if isinstance(value, bool) or not isinstance(value, (float, int)):
+        raise ValueError(f"Expected value to be of type float instead of {type(value)}")
+    if value < 0 or value > 1:
+        raise ValueError('Value must be between 0 and 1.')
+    return float(value)
+
+
+def validate_positive_timedelta(value: timedelta) -> int:
+    """Validates a (strictly) positive timedelta and returns the duration in microseconds."""
+    if not isinstance(value, timedelta):
+        raise ValueError(f"Expected value to be of type timedelta instead of {type(value)}")
+    total_us = timedelta_as_microseconds(value)
+    if total_us <= 0:
+        raise ValueError('Duration must be greater than 0.')
+    return total_us
+
+
+def validate_non_negative_timedelta(value: timedelta) -> int:
+    """Validates a non-negative timedelta and returns the duration in microseconds."""
+    if not isinstance(value, timedelta):
+        raise ValueError(f"Expected value to be of type timedelta instead of {type(value)}")
+    total_us = timedelta_as_microseconds(value)
+    if total_us < 0:
+        raise ValueError('Duration must not be negative.')
+    return total_us
+
+
+def validate_projection(value: List[str]) -> List[str]:
+    """Validates a (non-empty) list of dotted field paths, e.g. ['id', 'geo.lat']."""
+    if not isinstance(value, list) or not value:
+        raise ValueError('Expected value to be a non-empty list of field paths.')
+    for field_path in value:
+        if not isinstance(field_path, str):
+            raise ValueError(f'Expected all field paths to be of type str instead of {type(field_path)}.')
+        if not all(field_path.split('.')):
+            raise ValueError(f"Invalid field path '{field_path}'.  Path segments must not be empty.")
+    return list(value)
+
+
 def validate_path(value: str) -> str:
     if not isinstance(value, str):
         raise ValueError("Path option must be str.")
@@ -145,4 +206,8 @@ VALIDATE_INT = ValidateType[int]()
 VALIDATE_FLOAT = ValidateType[float]()
 VALIDATE_STR = ValidateType[str]()
 VALIDATE_DESERIALIZER = ValidateBaseClass[Deserializer]()
+VALIDATE_METER = ValidateBaseClass[Meter]()
+VALIDATE_RETRY_POLICY = ValidateType[RetryPolicy]()
+VALIDATE_CIRCUIT_BREAKER = ValidateType[CircuitBreakerConfig]()
+VALIDATE_TRACER = ValidateBaseClass[RequestTracer]()
 VALIDATE_STR_LIST = ValidateList[str]()
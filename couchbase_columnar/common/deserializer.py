@@ -15,9 +15,40 @@
 
 from __future__ import annotations
 
+import importlib
 import json
+import sys
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import (MISSING,
+                         fields,
+                         is_dataclass)
+from functools import lru_cache
+from inspect import isclass
+from threading import local
+from types import ModuleType
+from typing import (Any,
+                    Callable,
+                    Dict,
+                    FrozenSet,
+                    Generic,
+                    Hashable,
+                    Iterator,
+                    List,
+                    Mapping,
+                    Optional,
+                    Tuple,
+                    Type,
+                    TypeVar,
+                    Union,
+                    cast,
+                    get_type_hints)
+
+if sys.version_info < (3, 10):
+    from typing_extensions import get_args, get_origin
+else:
+    from typing import get_args, get_origin
+
+T = TypeVar('T')
 
 
 class Deserializer(ABC):
@@ -31,6 +62,9 @@ class Deserializer(ABC):
 
     @classmethod
     def __subclasshook__(cls, subclass: type) -> bool:
+        if cls is not Deserializer:
+            # only the interface is structural, isinstance checks against implementations use the class hierarchy
+            return NotImplemented  # type: ignore[no-any-return]
         return (hasattr(subclass, 'deserialize') and
                 callable(subclass.deserialize))
 
@@ -67,3 +101,579 @@ class PassthroughDeserializer(Deserializer):
             The received bytes.
         """
         return value
+
+
+class TypedDeserializer(Deserializer, Generic[T]):
+    """
+    Deserializer that decodes each row directly into an instance of a model class: a `msgspec.Struct`, a `dataclass`
+    or a `NamedTuple`.  The row's fields are validated against (and converted to) the model's type annotations while
+    decoding, unknown fields are ignored.
+
+    If `msgspec <https://jcristharif.com/msgspec/>`_ is installed, rows are decoded by a msgspec decoder in a single
+    pass w/o building intermediate dicts, msgspec is required for `msgspec.Struct` models.  Otherwise rows are decoded
+    using Python's json library and converted to the model (supported annotations: `int`, `float`, `str`, `bool`,
+    `Optional`, `List`, `Dict` and nested models, other annotations are not validated).
+
+    The decoder is compiled once per model and shared by all deserializers of the model.
+
+    Args:
+        model (Type[T]): The class each row is decoded into.
+
+    Raises:
+        ValueError: If the model is not a `msgspec.Struct`, a `dataclass` or a `NamedTuple`, or if the model is a
+            `msgspec.Struct` and msgspec cannot be imported.
+
+    **Example**
+
+    .. code-block:: python
+
+        @dataclass
+        class Airline:
+            id: int
+            name: str
+            country: Optional[str] = None
+
+        q_opts = QueryOptions(deserializer=TypedDeserializer(Airline))
+        result = cluster.execute_query('SELECT a.* FROM airline a LIMIT 10;', q_opts)
+    """
+
+    def __init__(self, model: Type[T]) -> None:
+        if not isclass(model):
+            # e.g. an instance or a typing alias (List[int]), which might not even be hashable
+            raise _invalid_model_error()
+        self._model = model
+        # the model class is the decoder cache's key
+        self._decode = _compile_decoder(cast(Hashable, model))
+
+    @property
+    def model(self) -> Type[T]:
+        """
+        Returns:
+            The class each row is decoded into.
+        """
+        return self._model
+
+    def deserialize(self, value: bytes) -> T:
+        """Decodes the received bytes into an instance of the deserializer's model.
+
+        Args:
+            value: The bytes to deserialize.
+
+        Returns:
+            The decoded model instance.
+
+        Raises:
+            ValueError: If the row does not match the model (`msgspec.ValidationError` is a subclass of ValueError).
+        """
+        return self._decode(value)  # type: ignore[no-any-return]
+
+
+class TupleRowDeserializer(Deserializer):
+    """
+    **INTERNAL**
+
+    Deserializes rows using the query's deserializer and returns each row as a tuple of its values (see the `row_format`
+    query option).  The column names are taken from the first row and shared by every row of the result; a row w/o
+    one of the columns (e.g. a MISSING field) has `None` in its place.
+    """
+
+    def __init__(self, deserializer: Deserializer) -> None:
+        self._deserializer = deserializer
+        self._columns: Optional[Tuple[str, ...]] = None
+        self._column_set: FrozenSet[str] = frozenset()
+
+    @property
+    def deserializer(self) -> Deserializer:
+        return self._deserializer
+
+    @property
+    def columns(self) -> Optional[Tuple[str, ...]]:
+        """The result's column names, `None` until the first row has been deserialized."""
+        return self._columns
+
+    def deserialize(self, value: bytes) -> Tuple[Any, ...]:
+        row = self._deserializer.deserialize(value)
+        columns = self._columns
+        if columns is None:
+            return self._set_columns(row)
+        # rows of the same shape as the first row
+        if type(row) is dict and len(row) == len(columns):
+            try:
+                return tuple([row[column] for column in columns])
+            except KeyError:
+                pass
+        return self._irregular_row(row)
+
+    def _set_columns(self, row: Any) -> Tuple[Any, ...]:
+        if not isinstance(row, Mapping):
+            raise ValueError(f'The tuple row format requires rows to be JSON objects, received {type(row).__name__}.')
+        self._columns = tuple(row)
+        self._column_set = frozenset(self._columns)
+        return tuple(row.values())
+
+    def _irregular_row(self, row: Any) -> Tuple[Any, ...]:
+        if not isinstance(row, Mapping):
+            raise ValueError(f'The tuple row format requires rows to be JSON objects, received {type(row).__name__}.')
+        unknown = [key for key in row if key not in self._column_set]
+        if unknown:
+            raise ValueError((f'Row has fields that are not in the result\'s columns {self._columns}: {unknown}.  The '
+                              'tuple row format requires the first row to have every column.'))
+        return tuple([row.get(column) for column in self._columns or ()])
+
+
+class LazyRow(Mapping[str, Any]):
+    """
+    **VOLATILE** A read-only mapping of a row's fields, the row's fields are decoded on first access (see
+    :class:`.LazyRowDeserializer`).  Decoded fields are cached, accessing a field again does not decode it again.
+    """
+
+    __slots__ = ('_raw', '_parser', '_doc', '_values', '_keys', '_complete')
+
+    def __init__(self, raw: bytes, parser: Optional[_OnDemandParser] = None) -> None:
+        self._raw = raw
+        self._parser = parser
+        # the row's parsed document (w/ an on-demand parser), kept until all of the row's fields have been decoded
+        self._doc: Any = None
+        self._values: Dict[str, Any] = {}
+        self._keys: Optional[Tuple[str, ...]] = None
+        # all of the row's fields have been decoded
+        self._complete = False
+
+    @property
+    def raw(self) -> bytes:
+        """
+        Returns:
+            The row's JSON, as received from the server.
+        """
+        return self._raw
+
+    def materialize(self) -> Dict[str, Any]:
+        """Decodes all of the row's fields.
+
+        Returns:
+            A new dict of the row's fields.
+        """
+        if not self._complete:
+            self._decode_all()
+        return dict(self._values)
+
+    def _get_doc(self, parser: _OnDemandParser) -> Any:
+        if self._doc is None:
+            # the row is parsed once, fields are decoded from the parsed document as they are accessed
+            self._doc = parser.parse(self._raw)
+        return self._doc
+
+    def _decode_all(self) -> None:
+        if self._parser is not None:
+            values = self._parser.to_python(self._get_doc(self._parser))
+        else:
+            values = json.loads(self._raw)
+        if not isinstance(values, dict):
+            raise ValueError(f'A LazyRow requires the row to be a JSON object, received {type(values).__name__}.')
+        self._set_complete(values)
+
+    def _set_complete(self, values: Dict[str, Any]) -> None:
+        self._values = values
+        self._keys = tuple(values)
+        self._complete = True
+        # the parsed document is no longer needed
+        self._doc = None
+
+    def _get_keys(self) -> Tuple[str, ...]:
+        if self._keys is None:
+            if self._parser is None:
+                self._decode_all()
+            else:
+                self._keys = self._parser.keys(self._get_doc(self._parser))
+        return self._keys or ()
+
+    def __getitem__(self, key: str) -> Any:
+        values = self._values
+        if key in values:
+            return values[key]
+        if self._complete:
+            raise KeyError(key)
+        if self._parser is None:
+            # w/o an on-demand parser, the whole row is decoded once
+            self._decode_all()
+            return self._values[key]
+        value = self._parser.field(self._get_doc(self._parser), key)
+        values[key] = value
+        keys = self._get_keys()
+        if len(values) == len(keys):
+            # every field has been accessed, keep the row's field order
+            self._set_complete({k: values[k] for k in keys})
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._get_keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_keys())
+
+    def __len__(self) -> int:
+        return len(self._get_keys())
+
+    def __repr__(self) -> str:
+        return f'LazyRow(size={len(self._raw)}, decoded_fields={list(self._values)})'
+
+
+class LazyRowDeserializer(Deserializer):
+    """
+    **VOLATILE** Deserializer that returns each row as a :class:`.LazyRow`, which keeps the row's JSON and only decodes
+    a field once it is accessed.  Reduces the CPU spent on rows where only a few fields are read, e.g. when filtering
+    rows after fetching them.  Rows that are not JSON objects (e.g. `SELECT VALUE` results) are decoded immediately.
+
+    If `pysimdjson <https://pysimdjson.tkte.ch/>`_ is installed, fields are decoded using an on-demand parser and fields
+    that are never accessed are never decoded.  The row is parsed once, when the first field is accessed, and the parsed
+    document is kept until all of the row's fields have been decoded (or :meth:`.LazyRow.materialize` is called).
+    Otherwise the row is decoded (using Python's json library) once the first field is accessed.
+
+    **Example**
+
+    .. code-block:: python
+
+        q_opts = QueryOptions(deserializer=LazyRowDeserializer())
+        result = cluster.execute_query('SELECT h.* FROM hotel h;', q_opts)
+        # only the country field of most rows is decoded
+        hotels = [row.materialize() for row in result.rows() if row['country'] == 'France']
+    """
+
+    def __init__(self) -> None:
+        self._parser = _get_on_demand_parser()
+
+    @property
+    def on_demand(self) -> bool:
+        """
+        Returns:
+            True if fields are decoded by an on-demand parser (i.e. pysimdjson is installed), False otherwise.
+        """
+        return self._parser is not None
+
+    def deserialize(self, value: bytes) -> Any:
+        """Wraps the received bytes in a :class:`.LazyRow`.
+
+        Args:
+            value: The bytes to deserialize.
+
+        Returns:
+            A :class:`.LazyRow` if the row is a JSON object, the deserialized Python object otherwise.
+        """
+        if value[:1] == b'{' or value.lstrip()[:1] == b'{':
+            return LazyRow(value, self._parser)
+        return json.loads(value)
+
+
+class ProjectingDeserializer(Deserializer):
+    """
+    **INTERNAL**
+
+    Extracts the query's projected field paths (see the `project` query option) from each row, the rest of the row is
+    skipped.  Nested paths keep their nesting (`'geo.lat'` -> `{'geo': {'lat': ...}}`) and paths missing from a row are
+    omitted.  Rows that are not JSON objects are not projected.
+
+    If pysimdjson is installed, only the projected fields are decoded.  The projected row is returned as is for the
+    default deserializer, otherwise it is re-encoded and deserialized by the query's deserializer.
+    """
+
+    def __init__(self, deserializer: Deserializer, paths: List[str]) -> None:
+        self._deserializer = deserializer
+        self._paths = tuple(paths)
+        self._projection = _build_projection(paths)
+        self._parser = _get_on_demand_parser()
+        self._decode_only = type(deserializer) is DefaultJsonDeserializer
+
+    @property
+    def deserializer(self) -> Deserializer:
+        return self._deserializer
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        return self._paths
+
+    def deserialize(self, value: bytes) -> Any:
+        if self._parser is not None:
+            row = self._parser.project(value, self._projection)
+        else:
+            row = json.loads(value)
+            if isinstance(row, dict):
+                row = _project_dict(row, self._projection)
+        if self._decode_only:
+            return row
+        return self._deserializer.deserialize(json.dumps(row, separators=(',', ':')).encode('utf-8'))
+
+
+# a field name maps to None if the whole field is projected, otherwise to the projection of its (nested) fields
+_Projection = Dict[str, Any]
+
+
+def _build_projection(paths: List[str]) -> _Projection:
+    projection: _Projection = {}
+    for field_path in paths:
+        *parents, name = field_path.split('.')
+        node: Optional[_Projection] = projection
+        for parent in parents:
+            if node is None:
+                break
+            if parent not in node:
+                node[parent] = {}
+            node = node[parent]
+        if node is not None:
+            # the whole field covers any of its nested paths
+            node[name] = None
+    return projection
+
+
+def _project_dict(row: Dict[str, Any], projection: _Projection) -> Dict[str, Any]:
+    projected: Dict[str, Any] = {}
+    for name, nested in projection.items():
+        if name not in row:
+            continue
+        value = row[name]
+        if nested is None:
+            projected[name] = value
+        elif isinstance(value, dict):
+            nested_value = _project_dict(value, nested)
+            if nested_value:
+                projected[name] = nested_value
+    return projected
+
+
+class _OnDemandParser:
+    """
+    **INTERNAL**
+
+    Decodes rows, or single fields of a row, using pysimdjson.  A pysimdjson parser cannot parse another document while
+    values of the previous document are referenced: a :class:`.LazyRow`'s document, which is kept until the row's
+    fields have been decoded, is parsed by a parser of its own, other documents are parsed by the thread's parser and
+    converted to Python objects before returning.
+    """
+
+    def __init__(self, module: ModuleType) -> None:
+        self._module = module
+        self._local = local()
+
+    @classmethod
+    def create(cls) -> Optional[_OnDemandParser]:
+        try:
+            # optional, imported once a deserializer is created rather than when the SDK is imported
+            return cls(importlib.import_module('simdjson'))
+        except ImportError:
+            return None
+
+    def _get_parser(self) -> Any:
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = self._local.parser = self._module.Parser()
+        return parser
+
+    def to_python(self, value: Any) -> Any:
+        if isinstance(value, self._module.Object):
+            return value.as_dict()
+        if isinstance(value, self._module.Array):
+            return value.as_list()
+        return value
+
+    def parse(self, raw: bytes) -> Any:
+        """Parses a row's document w/ a parser of its own, the document can be referenced for as long as needed."""
+        doc = self._module.Parser().parse(raw)
+        if not isinstance(doc, self._module.Object):
+            raise ValueError(f'A LazyRow requires the row to be a JSON object, received {type(doc).__name__}.')
+        return doc
+
+    def field(self, doc: Any, key: str) -> Any:
+        if key not in doc:
+            raise KeyError(key)
+        return self.to_python(doc[key])
+
+    def keys(self, doc: Any) -> Tuple[str, ...]:
+        return tuple(doc.keys())
+
+    def project(self, raw: bytes, projection: _Projection) -> Any:
+        doc = self._get_parser().parse(raw)
+        if isinstance(doc, self._module.Object):
+            value = self._project_object(doc, projection)
+        else:
+            value = self.to_python(doc)
+        del doc
+        return value
+
+    def _project_object(self, obj: Any, projection: _Projection) -> Dict[str, Any]:
+        projected: Dict[str, Any] = {}
+        for name, nested in projection.items():
+            if name not in obj:
+                continue
+            value = obj[name]
+            if nested is None:
+                projected[name] = self.to_python(value)
+            elif isinstance(value, self._module.Object):
+                nested_value = self._project_object(value, nested)
+                if nested_value:
+                    projected[name] = nested_value
+        return projected
+
+
+@lru_cache(maxsize=1)
+def _get_on_demand_parser() -> Optional[_OnDemandParser]:
+    """The on-demand parser shared by all deserializers, `None` if pysimdjson is not installed."""
+    return _OnDemandParser.create()
+
+
+"""
+
+TypedDeserializer decoders
+
+"""
+
+# converts a value decoded by the json library, the second argument is the value's path (used in error messages)
+_Converter = Callable[[Any, str], Any]
+
+
+def _is_named_tuple(model: Any) -> bool:
+    return isinstance(model, type) and issubclass(model, tuple) and hasattr(model, '_fields')
+
+
+def _is_msgspec_struct(model: Any) -> bool:
+    # checked w/o importing msgspec, i.e. when msgspec cannot be imported
+    return any(base.__name__ == 'Struct' and base.__module__.split('.')[0] == 'msgspec' for base in model.__mro__)
+
+
+def _is_model(model: Any) -> bool:
+    return (isinstance(model, type) and is_dataclass(model)) or _is_named_tuple(model)
+
+
+@lru_cache(maxsize=128)
+def _compile_decoder(model: Any) -> Callable[[bytes], Any]:
+    msgspec: Optional[ModuleType]
+    try:
+        # optional, imported once a model's decoder is compiled rather than when the SDK is imported
+        msgspec = importlib.import_module('msgspec')
+    except ImportError:
+        msgspec = None
+
+    if msgspec is not None:
+        if issubclass(model, msgspec.Struct) or is_dataclass(model):
+            return msgspec.json.Decoder(model).decode  # type: ignore[no-any-return]
+        if _is_named_tuple(model):
+            # msgspec decodes NamedTuples from arrays, rows are objects so decode into an equivalent Struct
+            struct_fields: List[Union[Tuple[str, Any], Tuple[str, Any, Any]]] = []
+            hints = get_type_hints(model)
+            for name in model._fields:
+                if name in model._field_defaults:
+                    struct_fields.append((name, hints.get(name, Any), model._field_defaults[name]))
+                else:
+                    struct_fields.append((name, hints.get(name, Any)))
+            decode = msgspec.json.Decoder(msgspec.defstruct(model.__name__, struct_fields)).decode
+            astuple = msgspec.structs.astuple
+            return lambda value: model(*astuple(decode(value)))
+    elif _is_msgspec_struct(model):
+        raise ValueError(f'TypedDeserializer requires msgspec to decode the msgspec.Struct model {model.__name__}.')
+    elif _is_model(model):
+        convert = _compile_model_converter(model)
+        return lambda value: convert(json.loads(value), '$')
+
+    raise _invalid_model_error()
+
+
+def _invalid_model_error() -> ValueError:
+    return ValueError('TypedDeserializer model must be a msgspec.Struct, a dataclass or a NamedTuple.')
+
+
+def _compile_model_converter(model: Type[Any]) -> _Converter:
+    hints = get_type_hints(model)
+    if is_dataclass(model):
+        names = [f.name for f in fields(model) if f.init]
+        required = frozenset(f.name for f in fields(model)
+                             if f.init and f.default is MISSING and f.default_factory is MISSING)
+    else:
+        names = list(model._fields)
+        required = frozenset(name for name in names if name not in model._field_defaults)
+    converters = [(name, _compile_converter(hints.get(name, Any))) for name in names]
+
+    def convert(value: Any, path: str) -> Any:
+        if not isinstance(value, dict):
+            raise ValueError(f'Expected `object`, got `{type(value).__name__}` - at `{path}`')
+        missing = required.difference(value)
+        if missing:
+            raise ValueError(f'Object missing required field `{min(missing)}` - at `{path}`')
+        return model(**{name: conv(value[name], f'{path}.{name}') for name, conv in converters if name in value})
+
+    return convert
+
+
+def _compile_converter(annotation: Any) -> _Converter:
+    if _is_model(annotation):
+        return _compile_model_converter(annotation)
+    if annotation in _SCALAR_CONVERTERS:
+        return _SCALAR_CONVERTERS[annotation]
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Union and len(args) == 2 and type(None) in args:
+        return _optional_converter(_compile_converter(args[0] if args[1] is type(None) else args[1]))
+    if origin is list and args:
+        return _list_converter(_compile_converter(args[0]))
+    if origin is dict and len(args) == 2:
+        return _dict_converter(_compile_converter(args[1]))
+    # not validated
+    return _passthrough
+
+
+def _passthrough(value: Any, path: str) -> Any:
+    return value
+
+
+def _type_error(expected: str, value: Any, path: str) -> ValueError:
+    return ValueError(f'Expected `{expected}`, got `{type(value).__name__}` - at `{path}`')
+
+
+def _convert_int(value: Any, path: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise _type_error('int', value, path)
+    return value
+
+
+def _convert_float(value: Any, path: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _type_error('float', value, path)
+    return float(value)
+
+
+def _convert_str(value: Any, path: str) -> str:
+    if not isinstance(value, str):
+        raise _type_error('str', value, path)
+    return value
+
+
+def _convert_bool(value: Any, path: str) -> bool:
+    if not isinstance(value, bool):
+        raise _type_error('bool', value, path)
+    return value
+
+
+_SCALAR_CONVERTERS: Dict[Any, _Converter] = {
+    int: _convert_int,
+    float: _convert_float,
+    str: _convert_str,
+    bool: _convert_bool,
+    Any: _passthrough,
+}
+
+
+def _optional_converter(convert: _Converter) -> _Converter:
+    return lambda value, path: None if value is None else convert(value, path)
+
+
+def _list_converter(convert: _Converter) -> _Converter:
+    def convert_list(value: Any, path: str) -> List[Any]:
+        if not isinstance(value, list):
+            raise _type_error('array', value, path)
+        return [convert(v, f'{path}[{idx}]') for idx, v in enumerate(value)]
+    return convert_list
+
+
+def _dict_converter(convert: _Converter) -> _Converter:
+    def convert_dict(value: Any, path: str) -> Dict[str, Any]:
+        if not isinstance(value, dict):
+            raise _type_error('object', value, path)
+        return {k: convert(v, f'{path}.{k}') for k, v in value.items()}
+    return convert_dict
@@ -39,6 +39,20 @@ QueryScanConsistency.REQUEST_PLUS.__doc__ = ('Indicates that the results to the
                                              'of consistency.')
 
 
+class QueryRowFormat(Enum):
+    """
+    **VOLATILE** Represents the formats query rows can be returned in (see the `row_format` query option).
+    """
+
+    DICT = 'dict'
+    TUPLE = 'tuple'
+
+
+QueryRowFormat.DICT.__doc__ = 'Indicates that rows are returned as deserialized (i.e. dicts for JSON object rows).'
+QueryRowFormat.TUPLE.__doc__ = ('Indicates that rows are returned as tuples of their values, the column names are '
+                                'taken from the first row and shared by every row of the result.')
+
+
 class IpProtocol(Enum):
     """
     Represents the various IP protocol options that are available when resolving hostnames during the bootstrap and HTTP connection process.
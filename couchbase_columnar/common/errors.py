@@ -118,6 +118,77 @@ class QueryError(ColumnarError):
         return self.__repr__()
 
 
+class ResultLimitExceededError(ColumnarError):
+    """
+    Indicates that a query streamed more results than allowed by the `max_rows` or `max_result_bytes` query option.
+    The query is cancelled once the limit is exceeded.
+    """
+
+    def __init__(self,
+                 base: Optional[Exception] = None,
+                 message: Optional[str] = None,
+                 limit_name: Optional[str] = None,
+                 limit: Optional[int] = None) -> None:
+        super().__init__(base, message)
+        self._limit_name = limit_name or ''
+        self._limit = limit or 0
+
+    @property
+    def limit_name(self) -> str:
+        """
+        Returns:
+            Name of the query option that was exceeded (`max_rows` or `max_result_bytes`)
+        """
+        return self._limit_name
+
+    @property
+    def limit(self) -> int:
+        """
+        Returns:
+            The configured value of the limit that was exceeded
+        """
+        return self._limit
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({super().__repr__()})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class CircuitOpenError(ColumnarError):
+    """
+    Indicates that a query was rejected by the SDK, prior to being sent to the Columnar server, because the circuit
+    breaker (see the `circuit_breaker` cluster option) is open, i.e. too many of the recent queries have failed.
+    """
+
+    def __init__(self, base: Optional[Exception] = None, message: Optional[str] = None) -> None:
+        super().__init__(base, message)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({super().__repr__()})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class QueryRejectedError(ColumnarError):
+    """
+    Indicates that a query was rejected by the SDK, prior to being sent to the Columnar server, because the client-side
+    concurrency limit (see the `max_concurrent_queries` cluster option) was reached and an in-flight slot did not become
+    available within the `concurrency_queue_timeout`.
+    """
+
+    def __init__(self, base: Optional[Exception] = None, message: Optional[str] = None) -> None:
+        super().__init__(base, message)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({super().__repr__()})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
 class TimeoutError(ColumnarError):
     """
     Indicates that a request was unable to complete prior to reaching the deadline specified for the reqest.
@@ -133,6 +204,40 @@ class TimeoutError(ColumnarError):
         return self.__repr__()
 
 
+class DeadlineExceededError(TimeoutError):
+    """
+    Indicates that a query did not complete within the `deadline` query option.  The deadline covers the whole
+    operation (waiting to be dispatched, waiting for the server to respond and streaming the results); the query is
+    cancelled once the deadline is exceeded.
+    """
+
+    def __init__(self,
+                 base: Optional[Exception] = None,
+                 message: Optional[str] = None,
+                 phase: Optional[str] = None) -> None:
+        super().__init__(base, message)
+        self._phase = phase or ''
+
+    @property
+    def phase(self) -> str:
+        """
+        Returns:
+            The phase of the query the deadline was exceeded in: `queue` (waiting to be dispatched), `dispatch` (waiting
+            for the server to respond) or `streaming` (iterating the results)
+        """
+        return self._phase
+
+
+class IdleRowTimeoutError(TimeoutError):
+    """
+    Indicates that a query's results stalled: no row was received within the `idle_row_timeout` query option.  The
+    query is cancelled once the timeout is exceeded.
+    """
+
+    def __init__(self, base: Optional[Exception] = None, message: Optional[str] = None) -> None:
+        super().__init__(base, message)
+
+
 class FeatureUnavailableError(Exception):
     """
     Raised when feature that is not available with the current server version is used.
@@ -173,4 +278,5 @@ class QueryOperationCanceledError(Exception):
 ColumnarErrors: TypeAlias = Union[ColumnarError,
                                   InvalidCredentialError,
                                   QueryError,
+                                  ResultLimitExceededError,
                                   TimeoutError]
@@ -0,0 +1,235 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import (asdict,
+                         dataclass,
+                         field)
+from typing import (Any,
+                    Dict,
+                    List,
+                    Optional)
+
+
+class ValueRecorder(ABC):
+    """
+    Interface a custom value recorder (i.e. histogram) must implement
+    """
+
+    @abstractmethod
+    def record_value(self, value: int) -> None:
+        """Records a value.
+
+        Args:
+            value: The value to record.  Durations are recorded in microseconds, sizes in bytes.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def __subclasshook__(cls, subclass: type) -> bool:
+        return (hasattr(subclass, 'record_value') and
+                callable(subclass.record_value))
+
+
+class Meter(ABC):
+    """
+    Interface a custom meter must implement
+    """
+
+    @abstractmethod
+    def value_recorder(self, name: str, tags: Dict[str, str]) -> ValueRecorder:
+        """Returns the :class:`.ValueRecorder` for the provided metric name and tags.
+
+        The SDK may call this method for every query, implementations are encouraged to cache recorders.
+
+        Args:
+            name: The metric name.
+            tags: The metric tags.
+
+        Returns:
+            A :class:`.ValueRecorder`.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def __subclasshook__(cls, subclass: type) -> bool:
+        return (hasattr(subclass, 'value_recorder') and
+                callable(subclass.value_recorder))
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Point-in-time view of one of the SDK's built-in (HDR-style) histograms.
+
+    Recorded values are accurate to within 1%.  Durations are in microseconds, sizes are in bytes.
+
+    **VOLATILE** This API is subject to change at any time.
+    """
+    count: int = 0
+    min: int = 0
+    max: int = 0
+    mean: float = 0.0
+    percentiles: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class QueryMetricsEntry:
+    """Built-in query metrics for a single statement fingerprint and outcome.
+
+    **VOLATILE** This API is subject to change at any time.
+    """
+    fingerprint: str
+    outcome: str
+    latency: HistogramSnapshot
+    time_to_first_row: HistogramSnapshot
+    rows: HistogramSnapshot
+    bytes: HistogramSnapshot
+
+
+@dataclass(frozen=True)
+class HedgingStats:
+    """Counters for hedged queries, see the ``hedge_after`` query option.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Attributes:
+        requests (int): The number of queries executed with the ``hedge_after`` query option.
+        hedges_sent (int): The number of duplicate (hedge) queries dispatched.
+        hedges_won (int): The number of hedge queries that responded before the original query.
+    """
+    requests: int = 0
+    hedges_sent: int = 0
+    hedges_won: int = 0
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """Counters for retried queries, see the ``retry_policy`` cluster and query options.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Attributes:
+        queries (int): The number of queries executed with a retry policy.
+        retries (int): The number of retries.
+        succeeded_after_retry (int): The number of retried queries that eventually succeeded.
+        failed_after_retry (int): The number of retried queries that failed on their last attempt.
+        budget_exhausted (int): The number of retries that were not attempted because the cluster's retry budget (the
+            ``retry_budget`` cluster option) was exhausted.
+    """
+    queries: int = 0
+    retries: int = 0
+    succeeded_after_retry: int = 0
+    failed_after_retry: int = 0
+    budget_exhausted: int = 0
+
+
+@dataclass(frozen=True)
+class CircuitBreakerStats:
+    """State of a circuit breaker, see the ``circuit_breaker`` cluster option.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Attributes:
+        fingerprint (Optional[str]): The statement fingerprint of a per-statement circuit breaker, `None` for the
+            cluster's circuit breaker.
+        state (str): The circuit's state, one of ``closed``, ``open`` or ``half_open``.
+        queries (int): The number of queries in the window the error ratio is computed from.
+        failures (int): The number of failed queries in the window.
+        opened (int): The number of times the circuit has opened.
+        rejected (int): The number of queries that failed with a
+            :class:`~couchbase_columnar.errors.CircuitOpenError`.
+    """
+    fingerprint: Optional[str]
+    state: str
+    queries: int = 0
+    failures: int = 0
+    opened: int = 0
+    rejected: int = 0
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimitStats:
+    """State of the adaptive concurrency limit, see the ``max_concurrent_queries`` cluster option.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Attributes:
+        limit (int): The current limit of in-flight queries.
+        max_limit (int): The configured maximum limit (the ``max_concurrent_queries`` cluster option).
+        in_flight (int): The number of in-flight queries.
+        queued (int): The number of queries waiting for an in-flight slot.
+        queued_priority (int): The number of high priority queries (the ``priority`` query option) waiting for an
+            in-flight slot.
+        reserved_priority_slots (int): The number of slots reserved for high priority queries (the
+            ``reserved_priority_slots`` cluster option).
+        admitted (int): The number of queries that have been admitted.
+        rejected (int): The number of queries rejected because a slot did not become available in time.
+    """
+    limit: int
+    max_limit: int
+    in_flight: int = 0
+    queued: int = 0
+    queued_priority: int = 0
+    reserved_priority_slots: int = 0
+    admitted: int = 0
+    rejected: int = 0
+
+
+@dataclass(frozen=True)
+class TenantStats:
+    """Per-tenant throttling counters, see the ``tenant`` query option.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Attributes:
+        tenant (str): The tenant tag.
+        in_flight (int): The number of the tenant's in-flight queries.
+        queued (int): The number of the tenant's queries waiting for one of the tenant's in-flight slots.
+        admitted (int): The number of the tenant's queries that have been admitted.
+        rejected (int): The number of the tenant's queries rejected because they exceeded the tenant's rate limit or
+            did not get an in-flight slot in time.
+        queue_wait (:class:`.HistogramSnapshot`): The time (in microseconds) the tenant's queries were throttled
+            before being admitted.
+    """
+    tenant: str
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    queue_wait: HistogramSnapshot = field(default_factory=HistogramSnapshot)
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Point-in-time view of a cluster's built-in query metrics.
+
+    **VOLATILE** This API is subject to change at any time.
+    """
+    timestamp: float
+    entries: List[QueryMetricsEntry] = field(default_factory=list)
+    hedging: HedgingStats = field(default_factory=HedgingStats)
+    retries: RetryStats = field(default_factory=RetryStats)
+    concurrency: Optional[ConcurrencyLimitStats] = None
+    tenants: List[TenantStats] = field(default_factory=list)
+    circuit_breakers: List[CircuitBreakerStats] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            The snapshot as a JSON serializable dict.
+        """
+        return asdict(self)
@@ -49,6 +49,8 @@ class ClusterOptions(ClusterOptionsBase):
         Options and methods marked **VOLATILE** are subject to change at any time.
 
     Args:
+        circuit_breaker (Optional[:class:`~couchbase_columnar.options.CircuitBreakerConfig`]): **VOLATILE** If set, queries fail immediately with a :class:`~couchbase_columnar.errors.CircuitOpenError` while too many of the recent queries have failed (e.g. the Columnar service is unavailable), instead of waiting for their timeout.  Circuit breaker state changes are logged and reported in :meth:`~couchbase_columnar.cluster.Cluster.metrics_snapshot`.  Defaults to `None` (disabled).
+        concurrency_queue_timeout (Optional[timedelta]): **VOLATILE** How long a query waits for an in-flight slot when the `max_concurrent_queries` limit (or its tenant's `tenant_max_concurrent_queries` quota or `tenant_rate_limit`) is reached, a query that does not get a slot in time fails with a :class:`~couchbase_columnar.errors.QueryRejectedError`.  Use `timedelta(0)` to reject queries beyond the limit immediately.  Defaults to `None` (wait until a slot is available).
         config_poll_floor (Optional[timedelta]): Set to configure polling floor interval. Defaults to `None` (50ms).
         config_poll_interval (Optional[timedelta]): Set to configure polling floor interval. Defaults to `None` (2.5s).
         deserializer (Optional[Deserializer]): Set to configure global serializer to translate JSON to Python objects. Defaults to `None` (:class:`~couchbase_columnar.deserializer.DefaultJsonDeserializer`).
@@ -56,11 +58,25 @@ class ClusterOptions(ClusterOptionsBase):
         dns_port (Optional[int]): **VOLATILE** This API is subject to change at any time. Set to configure custom DNS port. Defaults to `None`.
         dump_configuration (Optional[bool]): If enabled, dump received server configuration when TRACE level logging. Defaults to `False` (disabled).
         enable_clustermap_notification (Optional[bool]): If enabled, allows server to push configuration updates asynchronously. Defaults to `True` (enabled).
+        enable_metrics (Optional[bool]): **VOLATILE** If enabled, the cluster records built-in query latency, time to first row, rows and bytes histograms, see :meth:`~couchbase_columnar.cluster.Cluster.metrics_snapshot`. Defaults to `None` (disabled).
+        hedging_budget (Optional[float]): **VOLATILE** Limits hedged queries (see the `hedge_after` query option) to this ratio of the hedge-eligible queries.  Must be between 0 and 1.  Defaults to `None` (0.05, i.e. 5%).
         ip_protocol (Optional[Union[:class:`~couchbase_columnar.options.IpProtocol`, str]]): Controls preference of IP protocol for name resolution. Defaults to `None` (any).
+        max_concurrent_queries (Optional[int]): **VOLATILE** If set, the number of in-flight queries is limited by an adaptive limit (at most this value).  The limit is decreased when queries time out, fail due to the service being overloaded or their latency spikes, and it grows back while queries succeed.  The current limit is reported in :meth:`~couchbase_columnar.cluster.Cluster.metrics_snapshot`.  Defaults to `None` (unlimited).
+        meter (Optional[:class:`~couchbase_columnar.metrics.Meter`]): **VOLATILE** Set to record query metrics (request encoding, dispatch, time to first row, deserialization and streaming durations as well as result rows and bytes). Defaults to `None` (disabled).
+        metrics_report_interval (Optional[timedelta]): **VOLATILE** If set, built-in query metrics are enabled and a snapshot is logged (INFO level) to the logger provided to :func:`~couchbase_columnar.configure_logging` at this interval. Defaults to `None` (disabled).
         network (Optional[str]): Set to configure external network. Defaults to `None` (auto).
+        reserved_priority_slots (Optional[int]): **VOLATILE** Requires the `max_concurrent_queries` cluster option.  The number of in-flight slots that only high priority queries (see the `priority` query option) can use, normal queries can always use at least one slot.  Defaults to `None` (no reserved slots).
+        retry_budget (Optional[float]): **VOLATILE** The ratio of retries to queries (between 0 and 1) allowed by the `retry_policy`, retries beyond the budget are not attempted so that retries cannot overload a struggling cluster.  Defaults to `None` (0.1, i.e. 1 retry per 10 queries).
+        retry_policy (Optional[:class:`~couchbase_columnar.options.RetryPolicy`]): **VOLATILE** The default retry policy for queries that fail with a temporary error before returning any rows, see the `retry_policy` query option.  Defaults to `None` (queries are not retried).
         security_options (Optional[:class:`.SecurityOptions`]): Security options for SDK connection.
+        slow_query_threshold (Optional[timedelta]): **VOLATILE** If set, queries whose total duration, time to first row or streaming duration exceeds the threshold are logged (WARNING level), with the statement's fingerprint and server-side execution time, to the logger provided to :func:`~couchbase_columnar.configure_logging`. Defaults to `None` (disabled).
+        tenant_burst (Optional[int]): **VOLATILE** Requires the `tenant_rate_limit` cluster option.  The number of queries a tenant can execute in a burst before being limited to the `tenant_rate_limit`.  Defaults to `None` (a second's worth of queries).
+        tenant_max_concurrent_queries (Optional[int]): **VOLATILE** If set, every tenant (see the `tenant` query option) can have at most this many in-flight queries, further queries of the tenant wait for one of the tenant's queries to complete.  Defaults to `None` (unlimited).
+        tenant_rate_limit (Optional[float]): **VOLATILE** If set, every tenant (see the `tenant` query option) can execute at most this many queries per second, further queries of the tenant are delayed (or rejected with a :class:`~couchbase_columnar.errors.QueryRejectedError` if the delay exceeds the `concurrency_queue_timeout`).  Per-tenant queue wait times are reported in :meth:`~couchbase_columnar.cluster.Cluster.metrics_snapshot`.  Defaults to `None` (unlimited).
         timeout_options (Optional[:class:`.TimeoutOptions`]): Timeout options for various SDK operations. See :class:`.TimeoutOptions` for details.
+        tracer (Optional[:class:`~couchbase_columnar.tracing.RequestTracer`]): **VOLATILE** Set to create a span for each query (with child spans for request encoding and dispatch). Defaults to `None` (disabled).
         user_agent_extra (Optional[str]): Set to add further details to identification fields in server protocols. Defaults to `None` (`{Python SDK version} (python/{Python version})`).
+        warmup_connections (Optional[int]): **VOLATILE** If set, the cluster opens (and TLS-handshakes) this many connections (at most 64) to the query service when it is created, see :meth:`~couchbase_columnar.cluster.Cluster.warm_up`.  Warm-up failures are logged (WARNING level) and do not fail cluster creation. Defaults to `None` (disabled).
     """  # noqa: E501
 
 
@@ -170,15 +186,24 @@ class QueryOptions(QueryOptionsBase):
         Options marked **VOLATILE** are subject to change at any time.
 
     Args:
+        deadline (Optional[timedelta]): **VOLATILE** Bounds the whole query operation: waiting to be dispatched (e.g. for an in-flight slot or a thread of the cluster's thread pool), waiting for the server to respond (including retries) and iterating the results.  The remaining time is sent to the server as the query's `timeout` (if it is less than the `timeout`) every time the query is dispatched.  A query that has not completed by the deadline is cancelled and fails with a :class:`~couchbase_columnar.errors.DeadlineExceededError` that reports the phase the time was spent in.  Defaults to `None` (no deadline).
         deserializer (Optional[Deserializer]): Specifies a :class:`~couchbase_columnar.deserializer.Deserializer` to apply to results.  Defaults to `None` (:class:`~couchbase_columnar.deserializer.DefaultJsonDeserializer`).
+        hedge_after (Optional[timedelta]): **VOLATILE** If the query has not responded once this duration has elapsed, a duplicate of the query is sent (within the cluster's `hedging_budget`), the first query to respond is used and the other query is cancelled.  Only allowed for read-only queries (`read_only=True`).  Defaults to `None` (disabled).
+        idle_row_timeout (Optional[timedelta]): **VOLATILE** If set, the query is cancelled and fails with an :class:`~couchbase_columnar.errors.IdleRowTimeoutError` if the SDK waits longer than this for the next row while the application is iterating the results (e.g. the connection stalled mid-stream), instead of waiting until the query's `timeout`.  Time the application spends processing a row does not count.  Defaults to `None` (disabled).
         lazy_execute (Optional[bool]): **VOLATILE** If enabled, the query will not execute until the application begins to iterate over results.  Defaulst to `None` (disabled).
+        max_result_bytes (Optional[int]): **VOLATILE** If set, the maximum number of (raw) row bytes the SDK will stream for the query. Once exceeded, the query is cancelled and a :class:`~couchbase_columnar.errors.ResultLimitExceededError` is raised.  Defaults to `None` (no limit).
+        max_rows (Optional[int]): **VOLATILE** If set, the maximum number of rows the SDK will stream for the query. Once exceeded, the query is cancelled and a :class:`~couchbase_columnar.errors.ResultLimitExceededError` is raised.  Defaults to `None` (no limit).
         named_parameters (Optional[Dict[str, :py:type:`~couchbase_columnar.JSONType`]]): Values to use for positional placeholders in query.
         positional_parameters (Optional[List[:py:type:`~couchbase_columnar.JSONType`]]):, optional): Values to use for named placeholders in query.
-        priority (Optional[bool]): Indicates whether this query should be executed with a specific priority level.
+        priority (Optional[bool]): Indicates whether this query should be executed with a specific priority level.  If the `max_concurrent_queries` cluster option is set, high priority queries are also prioritized by the SDK when waiting for an in-flight slot and can use the `reserved_priority_slots`.
+        project (Optional[List[str]]): **VOLATILE** Field paths (nested fields separated by dots, e.g. `['id', 'geo.lat']`) to extract from each row, the rest of the row is skipped by the SDK instead of being deserialized.  Rows keep their nesting (`'geo.lat'` is returned as `{'geo': {'lat': ...}}`) and paths missing from a row are omitted.  The statement is not modified, the server still returns the full rows.  If pysimdjson is installed, only the projected fields are decoded.  The projected fields are passed to a custom `deserializer` as JSON.  Field names that contain a dot cannot be projected.  Defaults to `None` (the full rows).
         query_context (Optional[str]): Specifies the context within which this query should be executed.
         raw (Optional[Dict[str, Any]]): Specifies any additional parameters which should be passed to the Columnar engine when executing the query.
         read_only (Optional[bool]): Specifies that this query should be executed in read-only mode, disabling the ability for the query to make any changes to the data.
+        retry_policy (Optional[:class:`~couchbase_columnar.options.RetryPolicy`]): **VOLATILE** Overrides the cluster's `retry_policy` for this query.  Queries are only retried before returning any rows, and only read-only queries (`read_only=True`) are retried after a timeout.  Use `RetryPolicy(max_attempts=1)` to disable retries.  Defaults to `None` (the cluster's retry policy).
+        row_format (Optional[Union[:class:`~couchbase_columnar.query.QueryRowFormat`, str]]): **VOLATILE** If set to `tuple`, each row is returned as a tuple of its values instead of a dict, the column names are taken from the first row and are available from the result's `columns()` method.  Every row of the result must have the first row's fields (a missing field's value is `None`).  Reduces the memory used by large results of identical rows.  Defaults to `None` (`dict`).
         scan_consistency (Optional[QueryScanConsistency]): Specifies the consistency requirements when executing the query.
+        tenant (Optional[str]): **VOLATILE** Tags the query with a tenant, queries of each tenant are throttled separately according to the `tenant_rate_limit` and `tenant_max_concurrent_queries` cluster options.  Defaults to `None` (not throttled).
         timeout (Optional[timedelta]): Set to configure allowed time for operation to complete. Defaults to `None` (75s).
     """  # noqa: E501
 
@@ -34,11 +34,19 @@ else:
     from typing import TypeAlias
 
 from couchbase_columnar.common import JSONType
+from couchbase_columnar.common.circuit_breaker import CircuitBreakerConfig
 from couchbase_columnar.common.deserializer import Deserializer
-from couchbase_columnar.common.enums import IpProtocol, QueryScanConsistency
+from couchbase_columnar.common.enums import (IpProtocol,
+                                             QueryRowFormat,
+                                             QueryScanConsistency)
+from couchbase_columnar.common.metrics import Meter
+from couchbase_columnar.common.retry import RetryPolicy
+from couchbase_columnar.common.tracing import RequestTracer
 
 # need to populate the TypedDict to help the static type checker
 class ClusterOptionsKwargs(TypedDict, total=False):
+    circuit_breaker: Optional[CircuitBreakerConfig]
+    concurrency_queue_timeout: Optional[timedelta]
     config_poll_floor: Optional[timedelta]
     config_poll_interval: Optional[timedelta]
     deserializer: Optional[Deserializer]
@@ -46,13 +54,29 @@ class ClusterOptionsKwargs(TypedDict, total=False):
     dns_port: Optional[int]
     dump_configuration: Optional[bool]
     enable_clustermap_notification: Optional[bool]
+    enable_metrics: Optional[bool]
+    hedging_budget: Optional[float]
     ip_protocol: Optional[Union[IpProtocol, str]]
+    max_concurrent_queries: Optional[int]
+    meter: Optional[Meter]
+    metrics_report_interval: Optional[timedelta]
     network: Optional[str]
+    reserved_priority_slots: Optional[int]
+    retry_budget: Optional[float]
+    retry_policy: Optional[RetryPolicy]
     security_options: Optional[SecurityOptionsBase]
+    slow_query_threshold: Optional[timedelta]
+    tenant_burst: Optional[int]
+    tenant_max_concurrent_queries: Optional[int]
+    tenant_rate_limit: Optional[float]
     timeout_options: Optional[TimeoutOptionsBase]
+    tracer: Optional[RequestTracer]
     user_agent_extra: Optional[str]
+    warmup_connections: Optional[int]
 
 ClusterOptionsValidKeys: TypeAlias = Literal[
+    'circuit_breaker',
+    'concurrency_queue_timeout',
     'config_poll_floor',
     'config_poll_interval',
     'deserializer',
@@ -60,11 +84,25 @@ ClusterOptionsValidKeys: TypeAlias = Literal[
     'dns_port',
     'dump_configuration',
     'enable_clustermap_notification',
+    'enable_metrics',
+    'hedging_budget',
     'ip_protocol',
+    'max_concurrent_queries',
+    'meter',
+    'metrics_report_interval',
     'network',
+    'reserved_priority_slots',
+    'retry_budget',
+    'retry_policy',
     'security_options',
+    'slow_query_threshold',
+    'tenant_burst',
+    'tenant_max_concurrent_queries',
+    'tenant_rate_limit',
     'timeout_options',
+    'tracer',
     'user_agent_extra',
+    'warmup_connections',
 ]
 
 class ClusterOptionsBase(Dict[str, Any]):
@@ -73,6 +111,8 @@ class ClusterOptionsBase(Dict[str, Any]):
     """
 
     VALID_OPTION_KEYS: List[ClusterOptionsValidKeys] = [
+        'circuit_breaker',
+        'concurrency_queue_timeout',
         'config_poll_floor',
         'config_poll_interval',
         'deserializer',
@@ -80,11 +120,25 @@ class ClusterOptionsBase(Dict[str, Any]):
         'dns_port',
         'dump_configuration',
         'enable_clustermap_notification',
+        'enable_metrics',
+        'hedging_budget',
         'ip_protocol',
+        'max_concurrent_queries',
+        'meter',
+        'metrics_report_interval',
         'network',
+        'reserved_priority_slots',
+        'retry_budget',
+        'retry_policy',
         'security_options',
+        'slow_query_threshold',
+        'tenant_burst',
+        'tenant_max_concurrent_queries',
+        'tenant_rate_limit',
         'timeout_options',
+        'tracer',
         'user_agent_extra',
+        'warmup_connections',
     ]
 
     @overload
@@ -94,6 +148,8 @@ class ClusterOptionsBase(Dict[str, Any]):
     @overload
     def __init__(self,
                  *,
+                 circuit_breaker: Optional[CircuitBreakerConfig] = None,
+                 concurrency_queue_timeout: Optional[timedelta] = None,
                  config_poll_floor: Optional[timedelta] = None,
                  config_poll_interval: Optional[timedelta] = None,
                  deserializer: Optional[Deserializer] = None,
@@ -101,11 +157,25 @@ class ClusterOptionsBase(Dict[str, Any]):
                  dns_port: Optional[int] = None,
                  dump_configuration: Optional[bool] = None,
                  enable_clustermap_notification: Optional[bool] = None,
+                 enable_metrics: Optional[bool] = None,
+                 hedging_budget: Optional[float] = None,
                  ip_protocol: Optional[Union[IpProtocol, str]] = None,
+                 max_concurrent_queries: Optional[int] = None,
+                 meter: Optional[Meter] = None,
+                 metrics_report_interval: Optional[timedelta] = None,
                  network: Optional[str] = None,
+                 reserved_priority_slots: Optional[int] = None,
+                 retry_budget: Optional[float] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
                  security_options: Optional[SecurityOptionsBase] = None,
+                 slow_query_threshold: Optional[timedelta] = None,
+                 tenant_burst: Optional[int] = None,
+                 tenant_max_concurrent_queries: Optional[int] = None,
+                 tenant_rate_limit: Optional[float] = None,
                  timeout_options: Optional[TimeoutOptionsBase] = None,
+                 tracer: Optional[RequestTracer] = None,
                  user_agent_extra: Optional[str] = None,
+                 warmup_connections: Optional[int] = None,
                  ) -> None:
         ...
 
@@ -211,28 +281,46 @@ class TimeoutOptionsBase(Dict[str, object]):
 
 # need to populate the TypedDict to help the static type checker
 class QueryOptionsKwargs(TypedDict, total=False):
+    deadline: Optional[timedelta]
     deserializer: Optional[Deserializer]
+    hedge_after: Optional[timedelta]
+    idle_row_timeout: Optional[timedelta]
     lazy_execute: Optional[bool]
+    max_result_bytes: Optional[int]
+    max_rows: Optional[int]
     named_parameters: Optional[Dict[str, JSONType]]
     positional_parameters: Optional[List[JSONType]]
     priority: Optional[bool]
+    project: Optional[List[str]]
     query_context: Optional[str]
     raw: Optional[Dict[str, Any]]
     read_only: Optional[bool]
+    retry_policy: Optional[RetryPolicy]
+    row_format: Optional[Union[QueryRowFormat, str]]
     scan_consistency: Optional[QueryScanConsistency]
+    tenant: Optional[str]
     timeout: Optional[timedelta]
 
 
 QueryOptionsValidKeys: TypeAlias = Literal[
+    'deadline',
     'deserializer',
+    'hedge_after',
+    'idle_row_timeout',
     'lazy_execute',
+    'max_result_bytes',
+    'max_rows',
     'named_parameters',
     'positional_parameters',
     'priority',
+    'project',
     'query_context',
     'raw',
     'read_only',
+    'retry_policy',
+    'row_format',
     'scan_consistency',
+    'tenant',
     'timeout',
 ]
 
@@ -243,15 +331,24 @@ class QueryOptionsBase(Dict[str, object]):
     """
 
     VALID_OPTION_KEYS: List[QueryOptionsValidKeys] = [
+        'deadline',
         'deserializer',
+        'hedge_after',
+        'idle_row_timeout',
         'lazy_execute',
+        'max_result_bytes',
+        'max_rows',
         'named_parameters',
         'positional_parameters',
         'priority',
+        'project',
         'query_context',
         'raw',
         'read_only',
+        'retry_policy',
+        'row_format',
         'scan_consistency',
+        'tenant',
         'timeout',
     ]
 
@@ -262,15 +359,24 @@ class QueryOptionsBase(Dict[str, object]):
     @overload
     def __init__(self,
                  *,
+                 deadline: Optional[timedelta] = None,
                  deserializer: Optional[Deserializer] = None,
+                 hedge_after: Optional[timedelta] = None,
+                 idle_row_timeout: Optional[timedelta] = None,
                  lazy_execute: Optional[bool] = None,
+                 max_result_bytes: Optional[int] = None,
+                 max_rows: Optional[int] = None,
                  named_parameters: Optional[Dict[str, JSONType]] = None,
                  positional_parameters: Optional[Iterable[JSONType]] = None,
                  priority: Optional[bool] = None,
+                 project: Optional[List[str]] = None,
                  query_context: Optional[str] = None,
                  raw: Optional[Dict[str, Any]] = None,
                  read_only: Optional[bool] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 row_format: Optional[Union[QueryRowFormat, str]] = None,
                  scan_consistency: Optional[QueryScanConsistency] = None,
+                 tenant: Optional[str] = None,
                  timeout: Optional[timedelta] = None,
                  ) -> None:
         ...
@@ -15,15 +15,24 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from datetime import timedelta
+from types import TracebackType
 from typing import (Any,
                     List,
-                    Optional)
+                    Optional,
+                    Tuple,
+                    Type,
+                    Union)
 
 from couchbase_columnar.common.core.result import QueryResult as QueryResult
+from couchbase_columnar.common.deserializer import TupleRowDeserializer
 from couchbase_columnar.common.query import QueryMetadata
 from couchbase_columnar.common.streaming import (AsyncIterator,
                                                  BlockingIterator,
-                                                 StreamingExecutor)
+                                                 SpillableRowSequence,
+                                                 StreamingExecutor,
+                                                 cancel_if_streaming)
 
 
 class BlockingQueryResult(QueryResult):
@@ -38,20 +47,50 @@ class BlockingQueryResult(QueryResult):
         """
         self._executor.cancel()
 
-    def get_all_rows(self) -> List[Any]:
+    def get_all_rows(self, max_memory: Optional[int] = None) -> Union[List[Any], SpillableRowSequence]:
         """Convenience method to load all query results into memory.
 
+        Args:
+            max_memory (Optional[int]): **VOLATILE** If set, the maximum number of (raw) row bytes to retain in memory.
+                Rows received after the limit has been reached are written to a temporary file.  Rows are deserialized on
+                access.
+                Defaults to `None` (all rows are retained in memory).
+
         Returns:
-            A list of query results.
+            A list of query results.  If ``max_memory`` is set, a :class:`~couchbase_columnar.result.SpillableRowSequence`
+            is returned instead.
+
+        Raises:
+            ValueError: If ``max_memory`` is not a positive int.
 
         Example:
             Read all rows from simple query::
 
                 q_str = 'SELECT * FROM `travel-sample`.inventory WHERE country LIKE 'United%' LIMIT 2;'
-                q_rows = cluster.execute_query(q_str).all_rows()
+                q_rows = cluster.execute_query(q_str).get_all_rows()
+
+            Read all rows, keeping at most 64MiB of rows in memory::
+
+                q_str = 'SELECT * FROM `travel-sample`.inventory.airline;'
+                with cluster.execute_query(q_str).get_all_rows(max_memory=64 * 1024 * 1024) as q_rows:
+                    print(f'Found {len(q_rows)} rows, last row: {q_rows[-1]}')
+
+        """  # noqa: E501
+        return BlockingIterator(self._executor).get_all_rows(max_memory=max_memory)
+
+    def columns(self) -> Optional[Tuple[str, ...]]:
+        """Get the column names of the result's rows, if rows are returned as tuples (see the `row_format` option).
+
+        **VOLATILE** This API is subject to change at any time.
 
+        Returns:
+            The column names, in the order of each row's values.  `None` if rows are not returned as tuples or if no
+            row has been read yet (the column names are taken from the first row).
         """
-        return BlockingIterator(self._executor).get_all_rows()
+        deserializer = self._executor.deserializer
+        if isinstance(deserializer, TupleRowDeserializer):
+            return deserializer.columns
+        return None
 
     def metadata(self) -> QueryMetadata:
         """Get the query metadata.
@@ -90,21 +129,53 @@ class AsyncQueryResult(QueryResult):
         """
         self._executor.cancel()
 
-    async def get_all_rows(self) -> List[Any]:
+    async def get_all_rows(self, max_memory: Optional[int] = None) -> Union[List[Any], SpillableRowSequence]:
         """Convenience method to load all query results into memory.
 
+        Args:
+            max_memory (Optional[int]): **VOLATILE** If set, the maximum number of (raw) row bytes to retain in memory.
+                Rows received after the limit has been reached are written to a temporary file.  Rows are deserialized on
+                access.
+                Defaults to `None` (all rows are retained in memory).
+
         Returns:
-            A list of query results.
+            A list of query results.  If ``max_memory`` is set, a :class:`~couchbase_columnar.result.SpillableRowSequence`
+            is returned instead.
+
+        Raises:
+            ValueError: If ``max_memory`` is not a positive int.
 
         Example:
 
             Read all rows from simple query::
 
                 q_str = 'SELECT * FROM `travel-sample`.inventory WHERE country LIKE 'United%' LIMIT 2;'
-                q_rows = await cluster.execute_query(q_str).all_rows()
+                q_res = await cluster.execute_query(q_str)
+                q_rows = await q_res.get_all_rows()
+
+            Read all rows, keeping at most 64MiB of rows in memory::
+
+                q_str = 'SELECT * FROM `travel-sample`.inventory.airline;'
+                q_res = await cluster.execute_query(q_str)
+                with await q_res.get_all_rows(max_memory=64 * 1024 * 1024) as q_rows:
+                    print(f'Found {len(q_rows)} rows, last row: {q_rows[-1]}')
+
+        """  # noqa: E501
+        return await AsyncIterator(self._executor).get_all_rows(max_memory=max_memory)
+
+    def columns(self) -> Optional[Tuple[str, ...]]:
+        """Get the column names of the result's rows, if rows are returned as tuples (see the `row_format` option).
 
+        **VOLATILE** This API is subject to change at any time.
+
+        Returns:
+            The column names, in the order of each row's values.  `None` if rows are not returned as tuples or if no
+            row has been read yet (the column names are taken from the first row).
         """
-        return await AsyncIterator(self._executor).get_all_rows()
+        deserializer = self._executor.deserializer
+        if isinstance(deserializer, TupleRowDeserializer):
+            return deserializer.columns
+        return None
 
     def metadata(self) -> QueryMetadata:
         """The meta-data which has been returned by the query.
@@ -131,5 +202,51 @@ class AsyncQueryResult(QueryResult):
     def __aiter__(self) -> AsyncIterator:
         return AsyncIterator(self._executor).__aiter__()
 
+    async def __aenter__(self) -> AsyncQueryResult:
+        """Use the query result as an async context manager.
+
+        If the query results are still being streamed when the ``async with`` block exits (e.g. iteration stopped with
+        ``break``, an exception was raised or the task was cancelled), streaming is cancelled so that the SDK stops
+        receiving (and buffering) the remaining rows.
+
+        **VOLATILE** This API is subject to change at any time.
+
+        Example:
+
+            Stop streaming after the first matching row::
+
+                q_str = 'SELECT * FROM `travel-sample`.inventory.airline;'
+                async with await cluster.execute_query(q_str) as q_res:
+                    async for row in q_res.rows():
+                        if row['airline']['country'] == 'France':
+                            break
+
+        """
+        return self
+
+    async def __aexit__(self,
+                        exc_type: Optional[Type[BaseException]],
+                        exc_val: Optional[BaseException],
+                        exc_tb: Optional[TracebackType]) -> None:
+        cancel_if_streaming(self._executor)
+
     def __repr__(self) -> str:
         return "AsyncQueryResult()"
+
+
+@dataclass(frozen=True)
+class WarmUpResult:
+    """Outcome of warming up a cluster's connections to the query service.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Attributes:
+        connections (int): The number of connections requested.
+        succeeded (int): The number of connections that were successfully established (and used to execute a query).
+        elapsed (timedelta): How long the warm-up took.
+        errors (List[Exception]): The errors raised by the failed connections (if any).
+    """
+    connections: int
+    succeeded: int
+    elapsed: timedelta
+    errors: List[Exception] = field(default_factory=list)
@@ -0,0 +1,136 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from typing import (FrozenSet,
+                    Iterable,
+                    Optional,
+                    Tuple)
+
+from couchbase_columnar.common.errors import QueryError, TimeoutError
+
+# Columnar error codes for temporary failures (the request was not executed)
+DEFAULT_RETRIABLE_ERROR_CODES = frozenset([23000, 23003, 23007])
+
+
+class RetryPolicy:
+    """Retry policy for queries that fail before returning any rows, see the ``retry_policy`` cluster and query
+    options.
+
+    A query is retried (up to `max_attempts` attempts) if it fails, before any rows have been returned, with one of the
+    `retriable_errors` or a :class:`~couchbase_columnar.errors.QueryError` with one of the `retriable_error_codes`.  A
+    query that is not read-only is not retried after a :class:`~couchbase_columnar.errors.TimeoutError` as the server
+    might have executed it.  The backoff before each retry grows exponentially and, with `jitter` enabled, a random
+    duration between 0 and the computed backoff is used so that clients do not retry in lockstep.  The query timeout
+    applies to each attempt.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Args:
+        max_attempts (Optional[int]): The maximum number of attempts, including the initial attempt.  Use `1` to
+            disable retries.  Defaults to `None` (3).
+        initial_backoff (Optional[timedelta]): The backoff before the first retry.  Defaults to `None` (100ms).
+        max_backoff (Optional[timedelta]): The maximum backoff.  Defaults to `None` (2s).
+        backoff_multiplier (Optional[float]): The factor the backoff grows by after each retry.  Defaults to `None`
+            (2.0).
+        jitter (Optional[bool]): If enabled, a random backoff between 0 and the computed backoff is used.  Defaults to
+            `None` (enabled).
+        retriable_errors (Optional[Iterable[type[Exception]]]): The error classes that qualify for a retry.  Defaults to
+            `None` (:class:`~couchbase_columnar.errors.TimeoutError`).
+        retriable_error_codes (Optional[Iterable[int]]): The Columnar server error codes that qualify for a retry.
+            Defaults to `None` (23000, 23003 and 23007, i.e. temporary failures).
+    """
+
+    def __init__(self,
+                 max_attempts: Optional[int] = None,
+                 initial_backoff: Optional[timedelta] = None,
+                 max_backoff: Optional[timedelta] = None,
+                 backoff_multiplier: Optional[float] = None,
+                 jitter: Optional[bool] = None,
+                 retriable_errors: Optional[Iterable[type[Exception]]] = None,
+                 retriable_error_codes: Optional[Iterable[int]] = None) -> None:
+        self._max_attempts = max_attempts if max_attempts is not None else 3
+        if isinstance(self._max_attempts, bool) or not isinstance(self._max_attempts, int) or self._max_attempts < 1:
+            raise ValueError('max_attempts must be a positive int.')
+        self._initial_backoff = self._to_seconds(initial_backoff, 0.1, 'initial_backoff')
+        self._max_backoff = self._to_seconds(max_backoff, 2.0, 'max_backoff')
+        self._backoff_multiplier = float(backoff_multiplier) if backoff_multiplier is not None else 2.0
+        if self._backoff_multiplier < 1:
+            raise ValueError('backoff_multiplier must be at least 1.')
+        self._jitter = jitter is not False
+        self._retriable_errors: Tuple[type[Exception], ...] = (
+            tuple(retriable_errors) if retriable_errors is not None else (TimeoutError,))
+        if not all(isinstance(e, type) and issubclass(e, Exception) for e in self._retriable_errors):
+            raise ValueError('retriable_errors must be Exception classes.')
+        self._retriable_error_codes: FrozenSet[int] = (frozenset(retriable_error_codes)
+                                                       if retriable_error_codes is not None
+                                                       else DEFAULT_RETRIABLE_ERROR_CODES)
+
+    @staticmethod
+    def _to_seconds(value: Optional[timedelta], default: float, name: str) -> float:
+        if value is None:
+            return default
+        if not isinstance(value, timedelta) or value.total_seconds() < 0:
+            raise ValueError(f'{name} must be a non-negative timedelta.')
+        return value.total_seconds()
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts
+
+    @property
+    def initial_backoff(self) -> timedelta:
+        return timedelta(seconds=self._initial_backoff)
+
+    @property
+    def max_backoff(self) -> timedelta:
+        return timedelta(seconds=self._max_backoff)
+
+    @property
+    def backoff_multiplier(self) -> float:
+        return self._backoff_multiplier
+
+    @property
+    def jitter(self) -> bool:
+        return self._jitter
+
+    def is_retriable(self, error: BaseException, read_only: bool) -> bool:
+        """Returns `True` if a query that failed with the provided error (before returning any rows) can be retried.
+
+        Args:
+            error: The query's error.
+            read_only: Whether the query is read-only (the ``read_only`` query option).
+        """
+        if isinstance(error, TimeoutError) and not read_only:
+            return False
+        if isinstance(error, QueryError) and error.code in self._retriable_error_codes:
+            return True
+        return isinstance(error, self._retriable_errors)
+
+    def backoff(self, retry: int) -> float:
+        """Returns the backoff (in seconds) before the provided retry (starting at 1)."""
+        backoff = min(self._max_backoff, self._initial_backoff * self._backoff_multiplier ** (retry - 1))
+        if self._jitter:
+            # full jitter, only spreads retries out so a non-cryptographic generator is fine (bandit B311)
+            return random.uniform(0, backoff)  # nosec B311
+        return backoff
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(max_attempts={self._max_attempts}, initial_backoff={self._initial_backoff}s, '
+                f'max_backoff={self._max_backoff}s, backoff_multiplier={self._backoff_multiplier}, '
+                f'jitter={self._jitter})')
@@ -16,24 +16,33 @@
 from __future__ import annotations
 
 import sys
+import tempfile
 from abc import ABC, abstractmethod
+from array import array
 from asyncio import Future
 from enum import IntEnum
 from threading import Event
-from typing import (Any,
+from typing import (IO,
+                    Any,
                     Coroutine,
                     List,
+                    Mapping,
                     Optional,
-                    Union)
+                    Union,
+                    overload)
 
 if sys.version_info < (3, 9):
     from typing import AsyncIterator as PyAsyncIterator
-    from typing import Iterator
+    from typing import Iterator, Sequence
 else:
     from collections.abc import AsyncIterator as PyAsyncIterator
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Sequence
 
-from couchbase_columnar.common.errors import ColumnarError, InternalSDKError
+from couchbase_columnar.common.core.utils import validate_positive_int
+from couchbase_columnar.common.deserializer import Deserializer
+from couchbase_columnar.common.errors import (ColumnarError,
+                                              InternalSDKError,
+                                              ResultLimitExceededError)
 from couchbase_columnar.common.query import QueryMetadata
 
 
@@ -71,6 +80,11 @@ class StreamingExecutor(ABC):
     def cancel_token(self) -> Optional[Event]:
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def deserializer(self) -> Deserializer:
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def cancel_poll_interval(self) -> Optional[float]:
@@ -106,6 +120,198 @@ class StreamingExecutor(ABC):
     def get_next_row(self) -> Union[Coroutine[Any, Any, Any], Any]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_next_raw_row(self) -> Union[Coroutine[Any, Any, bytes], bytes]:
+        raise NotImplementedError
+
+
+def cancel_if_streaming(executor: StreamingExecutor) -> None:
+    """
+    **INTERNAL
+
+    Cancels the query if its results are still being streamed, a completed (or cancelled) query is left as is.
+    """
+    if executor.streaming_state == StreamingState.Started:
+        executor.cancel()
+
+
+class ResultLimits:
+    """
+    **INTERNAL**
+
+    Tracks the rows and (raw) row bytes streamed for a query against the max_rows and max_result_bytes query options.
+    """
+
+    def __init__(self, max_rows: Optional[int] = None, max_result_bytes: Optional[int] = None) -> None:
+        self._max_rows = max_rows
+        self._max_result_bytes = max_result_bytes
+        self._row_count = 0
+        self._byte_count = 0
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    @property
+    def byte_count(self) -> int:
+        return self._byte_count
+
+    def add_row(self, row: bytes) -> Optional[ResultLimitExceededError]:
+        """
+        **INTERNAL**
+
+        Accounts for the provided row.  Returns the error the executor should raise (after cancelling the query) if a
+        limit has been exceeded, otherwise `None`.
+        """
+        self._row_count += 1
+        self._byte_count += len(row)
+        if self._max_rows is not None and self._row_count > self._max_rows:
+            return ResultLimitExceededError(message=f'Query returned more than max_rows={self._max_rows} rows.',
+                                            limit_name='max_rows',
+                                            limit=self._max_rows)
+        if self._max_result_bytes is not None and self._byte_count > self._max_result_bytes:
+            return ResultLimitExceededError(message=('Query returned more than '
+                                                     f'max_result_bytes={self._max_result_bytes} bytes.'),
+                                            limit_name='max_result_bytes',
+                                            limit=self._max_result_bytes)
+        return None
+
+    @classmethod
+    def from_query_options(cls, options: Optional[Mapping[str, Any]]) -> Optional[ResultLimits]:
+        """
+        **INTERNAL**
+
+        Returns `None` if neither limit is set so that executors can skip accounting altogether.
+        """
+        if not options:
+            return None
+        max_rows = options.get('max_rows', None)
+        max_result_bytes = options.get('max_result_bytes', None)
+        if max_rows is None and max_result_bytes is None:
+            return None
+        return cls(max_rows=max_rows, max_result_bytes=max_result_bytes)
+
+
+class SpillableRowSequence(Sequence[Any]):
+    """A read-only sequence of query rows that spills to disk once a memory limit has been reached.
+
+    Rows are kept in memory, as the raw bytes received from the server, until the size of the retained rows would
+    exceed ``max_memory``.  Every row after that point is written to a temporary file.  Rows are only deserialized
+    when they are accessed (each time they are accessed), so ``max_memory`` bounds the memory used by the retained rows
+    rather than by the rows' (usually several times larger) deserialized objects.  The temporary file is removed when
+    the sequence is closed or garbage collected.
+
+    **VOLATILE** This API is subject to change at any time.
+    """
+
+    def __init__(self, deserializer: Deserializer, max_memory: int) -> None:
+        self._deserializer = deserializer
+        self._max_memory = max_memory
+        self._memory_used = 0
+        self._rows: List[bytes] = []
+        self._spill_file: Optional[IO[bytes]] = None
+        # end offset of each spilled row; the start offset is the end offset of the previous row
+        self._spill_ends = array('Q')
+        self._spill_size = 0
+
+    @property
+    def memory_used(self) -> int:
+        """
+            int: The number of raw row bytes retained in memory.
+        """
+        return self._memory_used
+
+    @property
+    def spilled(self) -> bool:
+        """
+            bool: Indicator on if any rows have been written to disk.
+        """
+        return self._spill_file is not None
+
+    @property
+    def spilled_count(self) -> int:
+        """
+            int: The number of rows that have been written to disk.
+        """
+        return len(self._spill_ends)
+
+    def append_raw_row(self, row: bytes) -> None:
+        """
+        **INTERNAL
+        """
+        if not self._rows and not self._spill_ends:
+            # the deserializer's state (e.g. the columns of tuple rows) is taken from the first row, not the first row
+            # that is accessed
+            self._deserializer.deserialize(row)
+        row_size = len(row)
+        if self._spill_file is None and self._memory_used + row_size <= self._max_memory:
+            self._rows.append(row)
+            self._memory_used += row_size
+            return
+
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix='pycbcc-rows-')
+        self._spill_file.seek(self._spill_size)
+        self._spill_file.write(row)
+        self._spill_size += row_size
+        self._spill_ends.append(self._spill_size)
+
+    def close(self) -> None:
+        """Removes the temporary file used to store the spilled rows.
+
+        Spilled rows are no longer accessible once the sequence has been closed.
+        """
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+    def _read_spilled_row(self, spill_idx: int) -> Any:
+        if self._spill_file is None or self._spill_file.closed:
+            raise ValueError('Cannot read spilled rows, the sequence has been closed.')
+        start = self._spill_ends[spill_idx - 1] if spill_idx > 0 else 0
+        self._spill_file.seek(start)
+        return self._deserializer.deserialize(self._spill_file.read(self._spill_ends[spill_idx] - start))
+
+    @overload
+    def __getitem__(self, idx: int) -> Any:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Any]:
+        ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Any:
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError('Row index out of range.')
+        if idx < len(self._rows):
+            return self._deserializer.deserialize(self._rows[idx])
+        return self._read_spilled_row(idx - len(self._rows))
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in self._rows:
+            yield self._deserializer.deserialize(row)
+        for spill_idx in range(len(self._spill_ends)):
+            yield self._read_spilled_row(spill_idx)
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._spill_ends)
+
+    def __enter__(self) -> SpillableRowSequence:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f'SpillableRowSequence(len={len(self)}, in_memory={len(self._rows)}, '
+                f'spilled={len(self._spill_ends)})')
+
 
 class BlockingIterator(Iterator[Any]):
     """
@@ -115,11 +321,38 @@ class BlockingIterator(Iterator[Any]):
     def __init__(self, executor: StreamingExecutor) -> None:
         self._executor = executor
 
-    def get_all_rows(self) -> List[Any]:
+    def get_all_rows(self, max_memory: Optional[int] = None) -> Union[List[Any], SpillableRowSequence]:
         """
         **INTERNAL
         """
-        return [r for r in list(self)]
+        if max_memory is None:
+            return list(self)
+
+        rows = SpillableRowSequence(self._executor.deserializer, validate_positive_int(max_memory))
+        # make sure lazily executed queries are submitted prior to reading rows
+        iter(self)
+        while True:
+            try:
+                rows.append_raw_row(self._next_raw_row())
+            except StopIteration:
+                break
+            except BaseException:
+                rows.close()
+                raise
+        return rows
+
+    def _next_raw_row(self) -> bytes:
+        """
+        **INTERNAL
+        """
+        try:
+            return self._executor.get_next_raw_row()  # type: ignore[return-value]
+        except StopIteration:
+            raise
+        except ColumnarError as err:
+            raise err
+        except Exception as ex:
+            raise InternalSDKError(str(ex))
 
     def __iter__(self) -> BlockingIterator:
         """
@@ -154,11 +387,36 @@ class AsyncIterator(PyAsyncIterator[Any]):
     def __init__(self, executor: StreamingExecutor) -> None:
         self._executor = executor
 
-    async def get_all_rows(self) -> List[Any]:
+    async def get_all_rows(self, max_memory: Optional[int] = None) -> Union[List[Any], SpillableRowSequence]:
         """
         **INTERNAL
         """
-        return [r async for r in self]
+        if max_memory is None:
+            return [r async for r in self]
+
+        rows = SpillableRowSequence(self._executor.deserializer, validate_positive_int(max_memory))
+        while True:
+            try:
+                rows.append_raw_row(await self._next_raw_row())
+            except StopAsyncIteration:
+                break
+            except BaseException:
+                rows.close()
+                raise
+        return rows
+
+    async def _next_raw_row(self) -> bytes:
+        """
+        **INTERNAL
+        """
+        try:
+            return await self._executor.get_next_raw_row()  # type: ignore[no-any-return, misc]
+        except StopAsyncIteration:
+            raise
+        except ColumnarError as err:
+            raise err
+        except Exception as ex:
+            raise InternalSDKError(str(ex))
 
     def __aiter__(self) -> AsyncIterator:
         """
@@ -166,6 +424,15 @@ class AsyncIterator(PyAsyncIterator[Any]):
         """
         return self
 
+    async def aclose(self) -> None:
+        """
+        **INTERNAL
+
+        Same as an async generator's ``aclose()``, allows :func:`contextlib.aclosing` to stop streaming the query
+        results when iteration is abandoned.
+        """
+        cancel_if_streaming(self._executor)
+
     async def __anext__(self) -> Any:
         """
         **INTERNAL
@@ -0,0 +1,71 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+SpanAttributeValue = Union[str, int, float, bool]
+
+
+class RequestSpan(ABC):
+    """
+    Interface a custom request span must implement
+    """
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: SpanAttributeValue) -> None:
+        """Sets an attribute on the span.
+
+        Args:
+            key: The attribute name.
+            value: The attribute value.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def end(self) -> None:
+        """Completes the span."""
+        raise NotImplementedError
+
+    @classmethod
+    def __subclasshook__(cls, subclass: type) -> bool:
+        return (hasattr(subclass, 'set_attribute') and callable(subclass.set_attribute) and
+                hasattr(subclass, 'end') and callable(subclass.end))
+
+
+class RequestTracer(ABC):
+    """
+    Interface a custom request tracer must implement
+    """
+
+    @abstractmethod
+    def request_span(self, name: str, parent: Optional[RequestSpan] = None) -> RequestSpan:
+        """Creates (and starts) a new span.
+
+        Args:
+            name: The span name.
+            parent: The parent span, if this span is a child span.
+
+        Returns:
+            The started :class:`.RequestSpan`.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def __subclasshook__(cls, subclass: type) -> bool:
+        return (hasattr(subclass, 'request_span') and
+                callable(subclass.request_span))
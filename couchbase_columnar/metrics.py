@@ -0,0 +1,25 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from couchbase_columnar.common.metrics import CircuitBreakerStats as CircuitBreakerStats  # noqa: F401
+from couchbase_columnar.common.metrics import ConcurrencyLimitStats as ConcurrencyLimitStats  # noqa: F401
+from couchbase_columnar.common.metrics import HedgingStats as HedgingStats  # noqa: F401
+from couchbase_columnar.common.metrics import HistogramSnapshot as HistogramSnapshot  # noqa: F401
+from couchbase_columnar.common.metrics import Meter as Meter  # noqa: F401
+from couchbase_columnar.common.metrics import MetricsSnapshot as MetricsSnapshot  # noqa: F401
+from couchbase_columnar.common.metrics import QueryMetricsEntry as QueryMetricsEntry  # noqa: F401
+from couchbase_columnar.common.metrics import RetryStats as RetryStats  # noqa: F401
+from couchbase_columnar.common.metrics import TenantStats as TenantStats  # noqa: F401
+from couchbase_columnar.common.metrics import ValueRecorder as ValueRecorder  # noqa: F401
@@ -13,35 +13,21 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from __future__ import annotations
+
 import os
 import sys
 from functools import partial, partialmethod
-from typing import (Dict,
+from threading import Lock
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Dict,
+                    Literal,
                     Optional,
                     Union)
 
-try:
-    # Importing the ssl package allows us to utilize some Python voodoo to find OpenSSL.
-    # This is particularly helpful on M1 macs (PYCBC-1386).
-    import ssl  # noqa: F401 # nopep8 # isort:skip # noqa: E402
-    import couchbase_columnar.protocol.pycbcc_core  # noqa: F401 # nopep8 # isort:skip # noqa: E402
-except ImportError:
-    # should only need to do this on Windows w/ Python >= 3.8 due to the changes made for how DLLs are resolved
-    if sys.platform.startswith('win32') and (3, 8) <= sys.version_info:
-        open_ssl_dir = os.getenv('PYCBCC_OPENSSL_DIR')
-        # if not set by environment, try to use libcrypto and libssl that comes w/ Windows Python install
-        if not open_ssl_dir:
-            for p in sys.path:
-                if os.path.split(p)[-1] == 'DLLs':
-                    open_ssl_dir = p
-                    break
-
-        if open_ssl_dir:
-            os.add_dll_directory(open_ssl_dir)
-        else:
-            print(('PYCBCC: Caught import error. '
-                   'Most likely due to not finding OpenSSL libraries. '
-                   'Set PYCBCC_OPENSSL_DIR to location where OpenSSL libraries can be found.'))
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.pycbcc_core import pycbcc_logger
 
 try:
     from couchbase_columnar._version import __version__
@@ -57,18 +43,84 @@ try:
 except Exception:  # nosec
     pass
 
-""" Add support for logging, adding a TRACE level to logging """
 import json  # nopep8 # isort:skip # noqa: E402
 import logging  # nopep8 # isort:skip # noqa: E402
 
-from couchbase_columnar.protocol.pycbcc_core import CXXCBC_METADATA, pycbcc_logger  # nopep8 # isort:skip # noqa: E402
+"""
+
+Native extension loading
+
+The C++ extension (and everything that depends on it: the core logger, the C++ metadata, the TRACE logging level)
+is loaded on first use rather than when couchbase_columnar is imported.  Importing the SDK, e.g. in a CLI or a
+serverless handler that might never connect, stays cheap.
+
+"""
+
+_CORE_LOAD_LOCK = Lock()
+_CORE_LOADED = False
+_PYCBCC_LOGGER: Optional[pycbcc_logger] = None
+_CXXCBC_METADATA_JSON: Optional[Dict[str, Any]] = None
+_LOGGING_CONFIG: Optional[Dict[str, Any]] = None
+
+
+def _import_core() -> None:
+    """**INTERNAL**"""
+    try:
+        # Importing the ssl package allows us to utilize some Python voodoo to find OpenSSL.
+        # This is particularly helpful on M1 macs (PYCBC-1386).
+        import ssl  # noqa: F401
+
+        import couchbase_columnar.protocol.pycbcc_core  # noqa: F401
+    except ImportError:
+        # should only need to do this on Windows w/ Python >= 3.8 due to the changes made for how DLLs are resolved
+        if sys.platform.startswith('win32') and (3, 8) <= sys.version_info:
+            open_ssl_dir = os.getenv('PYCBCC_OPENSSL_DIR')
+            # if not set by environment, try to use libcrypto and libssl that comes w/ Windows Python install
+            if not open_ssl_dir:
+                for p in sys.path:
+                    if os.path.split(p)[-1] == 'DLLs':
+                        open_ssl_dir = p
+                        break
+
+            if open_ssl_dir:
+                os.add_dll_directory(open_ssl_dir)
+            else:
+                print(('PYCBCC: Caught import error. '
+                       'Most likely due to not finding OpenSSL libraries. '
+                       'Set PYCBCC_OPENSSL_DIR to location where OpenSSL libraries can be found.'))
+
+
+def _add_trace_level() -> None:
+    """**INTERNAL**"""
+    logging.TRACE = 5  # type: ignore
+    logging.addLevelName(logging.TRACE, 'TRACE')  # type: ignore
+    logging.Logger.trace = partialmethod(logging.Logger.log, logging.TRACE)  # type: ignore
+    logging.trace = partial(logging.log, logging.TRACE)  # type: ignore
+
+
+def load_core() -> None:
+    """**INTERNAL**
+
+    Loads the C++ extension and sets up the core logger.  Called when the first cluster is created; safe to call
+    multiple times and from multiple threads.
+    """
+    global _CORE_LOADED
+    global _PYCBCC_LOGGER
+    if _CORE_LOADED:
+        return
+    with _CORE_LOAD_LOCK:
+        if _CORE_LOADED:
+            return
+        _import_core()
+        from couchbase_columnar.protocol.pycbcc_core import pycbcc_logger
+        _PYCBCC_LOGGER = pycbcc_logger()
+        _add_trace_level()
+        atexit.register(_pycbcc_teardown)
+        _CORE_LOADED = True
+        configure_console_logger()
+        if _LOGGING_CONFIG is not None:
+            _configure_logging_sink(**_LOGGING_CONFIG)
 
-_PYCBCC_LOGGER = pycbcc_logger()
-_CXXCBC_METADATA_JSON = json.loads(CXXCBC_METADATA)
-logging.TRACE = 5  # type: ignore
-logging.addLevelName(logging.TRACE, 'TRACE')  # type: ignore
-logging.Logger.trace = partialmethod(logging.Logger.log, logging.TRACE)  # type: ignore
-logging.trace = partial(logging.log, logging.TRACE)  # type: ignore
 
 """
 
@@ -82,11 +134,10 @@ def _pycbcc_teardown(**kwargs: object) -> None:
     """**INTERNAL**"""
     global _PYCBCC_LOGGER
     if _PYCBCC_LOGGER:
-        # TODO:  see about synchronizing the logger's shutdown here
-        _PYCBCC_LOGGER = None  # type: ignore
-
+        # hand any queued log messages to the Python logger prior to the interpreter shutting down
+        _PYCBCC_LOGGER.shutdown_logging_sink()
+        _PYCBCC_LOGGER = None
 
-atexit.register(_pycbcc_teardown)
 
 """
 
@@ -100,9 +151,20 @@ _METADATA_KEYS = ['openssl_default_cert_dir',
                   'version']
 
 
+def _get_cxxcbc_metadata() -> Dict[str, Any]:
+    """**INTERNAL**"""
+    global _CXXCBC_METADATA_JSON
+    if _CXXCBC_METADATA_JSON is None:
+        load_core()
+        from couchbase_columnar.protocol.pycbcc_core import CXXCBC_METADATA
+        _CXXCBC_METADATA_JSON = json.loads(CXXCBC_METADATA)
+    return _CXXCBC_METADATA_JSON
+
+
 def get_metadata(as_str: Optional[bool] = False, detailed: Optional[bool] = False) -> Union[Dict[str, str], str]:
-    metadata = _CXXCBC_METADATA_JSON if detailed is True else {
-        k: v for k, v in _CXXCBC_METADATA_JSON.items() if k in _METADATA_KEYS}
+    cxxcbc_metadata = _get_cxxcbc_metadata()
+    metadata = cxxcbc_metadata if detailed is True else {
+        k: v for k, v in cxxcbc_metadata.items() if k in _METADATA_KEYS}
     return json.dumps(metadata) if as_str is True else metadata
 
 
@@ -116,24 +178,98 @@ Logging methods
 def configure_console_logger() -> None:
     import os
     log_level = os.getenv('PYCBCC_LOG_LEVEL', None)
-    if log_level:
+    if log_level and _PYCBCC_LOGGER is not None:
         _PYCBCC_LOGGER.create_console_logger(log_level.lower())
         logger = logging.getLogger()
         logger.info(f'Python Couchbase Columnar Client ({PYCBCC_VERSION})')
         logging.getLogger().debug(get_metadata(as_str=True))
 
 
+_SDK_LOGGER_NAME = 'couchbase_columnar'
+
+
 def configure_logging(name: str,
                       level: Optional[int] = logging.INFO,
-                      parent_logger: Optional[logging.Logger] = None) -> None:
+                      parent_logger: Optional[logging.Logger] = None,
+                      queue_size: Optional[int] = None,
+                      overflow_policy: Optional[Literal['drop', 'block']] = None) -> None:
+    """Configures the SDK to send its log messages to the provided Python logger.
+
+    Log messages from the C++ core are placed onto a bounded queue and a single background thread hands them, in
+    batches, to the Python logger.  This keeps the SDK's IO threads from waiting on the GIL when verbose logging is
+    enabled.
+
+    The C++ core is loaded when the first cluster is created; if this is called prior, the configuration is applied at
+    that point.
+
+    Args:
+        name (str): The name of the logger.
+        level (Optional[int]): The logging level. Defaults to `logging.INFO`.
+        parent_logger (Optional[`logging.Logger`]): If provided, the logger is created as a child of the parent logger.
+        queue_size (Optional[int]): **VOLATILE** Maximum number of log messages waiting to be handed to the Python
+            logger. Defaults to `None` (8192).
+        overflow_policy (Optional[str]): **VOLATILE** What to do with a log message when the queue is full.  `drop`
+            discards the message (see :func:`.get_dropped_log_message_count`), `block` waits for room on the queue,
+            which can stall the SDK's IO threads (a thread holding the GIL does not wait, the message is handed to the
+            Python logger directly). Defaults to `None` (`drop`).
+
+    Raises:
+        `ValueError`: If the queue_size or overflow_policy is invalid.
+    """
+    global _SDK_LOGGER_NAME
+    global _LOGGING_CONFIG
+    if queue_size is not None and (isinstance(queue_size, bool)
+                                   or not isinstance(queue_size, int)
+                                   or queue_size <= 0):
+        raise ValueError('queue_size must be an int greater than 0.')
+    if overflow_policy is not None and overflow_policy not in ('drop', 'block'):
+        raise ValueError("overflow_policy must be either 'drop' or 'block'.")
     if parent_logger:
         name = f'{parent_logger.name}.{name}'
+    _SDK_LOGGER_NAME = name
+    sink_kwargs: Dict[str, Union[int, str]] = {}
+    if queue_size is not None:
+        sink_kwargs['queue_size'] = queue_size
+    if overflow_policy is not None:
+        sink_kwargs['overflow_policy'] = overflow_policy
+    # if the C++ core has not been loaded yet, load_core() applies the configuration
+    _LOGGING_CONFIG = {'name': name, 'level': level, 'sink_kwargs': sink_kwargs}
+    if _CORE_LOADED:
+        _configure_logging_sink(**_LOGGING_CONFIG)
+
+
+def _configure_logging_sink(name: str, level: Optional[int], sink_kwargs: Dict[str, Union[int, str]]) -> None:
+    """**INTERNAL**"""
+    if _PYCBCC_LOGGER is None:
+        return
     logger = logging.getLogger(name)
-    _PYCBCC_LOGGER.configure_logging_sink(logger, level)
+    _PYCBCC_LOGGER.configure_logging_sink(logger, level, **sink_kwargs)
     logger.info(f'Python Couchbase Columnar Client ({PYCBCC_VERSION})')
     logger.debug(get_metadata(as_str=True))
 
 
+def get_dropped_log_message_count() -> int:
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    Returns:
+        int: The number of log messages dropped, since :func:`.configure_logging` was called, because the logging
+        queue was full.
+    """
+    if _PYCBCC_LOGGER is None:
+        return 0
+    return _PYCBCC_LOGGER.dropped_log_messages()
+
+
+def get_sdk_logger() -> logging.Logger:
+    """**INTERNAL**
+
+    Returns the logger provided to :func:`configure_logging` (defaults to the `couchbase_columnar` logger) so that
+    SDK-side (i.e. not C++ core) log messages end up in the same sink.
+    """
+    return logging.getLogger(_SDK_LOGGER_NAME)
+
+
 def enable_protocol_logger_to_save_network_traffic_to_file(filename: str) -> None:
     """
     **VOLATILE** This API is subject to change at any time.
@@ -147,7 +283,6 @@ def enable_protocol_logger_to_save_network_traffic_to_file(filename: str) -> Non
     Raises:
         `ValueError`: If a filename is not provided.
     """
-    _PYCBCC_LOGGER.enable_protocol_logger(filename)
-
-
-configure_console_logger()
+    load_core()
+    if _PYCBCC_LOGGER is not None:
+        _PYCBCC_LOGGER.enable_protocol_logger(filename)
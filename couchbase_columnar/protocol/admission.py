@@ -0,0 +1,353 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from threading import Event, Lock
+from time import perf_counter_ns
+from typing import (TYPE_CHECKING,
+                    Callable,
+                    Deque,
+                    Dict,
+                    List,
+                    Optional)
+
+from couchbase_columnar.common.errors import (QueryError,
+                                              QueryRejectedError,
+                                              TimeoutError)
+from couchbase_columnar.common.metrics import ConcurrencyLimitStats
+
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.deadline import Deadline
+
+# Columnar error codes for a service that is (temporarily) unable to take on more work
+OVERLOAD_ERROR_CODES = frozenset([23000, 23003, 23007])
+# the limit is halved on a timeout or overload error and reduced by 10% on a latency spike
+ERROR_BACKOFF_RATIO = 0.5
+LATENCY_BACKOFF_RATIO = 0.9
+# a query whose dispatch latency exceeds its statement's baseline by this factor is a latency spike
+LATENCY_TOLERANCE = 2.0
+# the per-statement baseline is a slow moving average, a sustained slowdown eventually becomes the new baseline
+BASELINE_SMOOTHING = 0.05
+MAX_BASELINES = 1000
+# priority classes (the priority query option) and their share of the slots granted to waiting queries
+PRIORITY_HIGH = 'high'
+PRIORITY_NORMAL = 'normal'
+PRIORITY_WEIGHTS = {PRIORITY_HIGH: 4, PRIORITY_NORMAL: 1}
+
+
+def is_overload_error(error: Optional[BaseException]) -> bool:
+    """**INTERNAL**
+
+    Returns `True` if the error indicates the Columnar service is overloaded (i.e. timeouts and the server's
+    temporary failure/too many requests errors).
+    """
+    if isinstance(error, TimeoutError):
+        return True
+    return isinstance(error, QueryError) and error.code in OVERLOAD_ERROR_CODES
+
+
+def get_priority_class(priority: Optional[bool]) -> str:
+    """**INTERNAL**"""
+    return PRIORITY_HIGH if priority is True else PRIORITY_NORMAL
+
+
+class AdmissionPermit:
+    """**INTERNAL**
+
+    An in-flight slot held by a single query.  The permit is released once the query has completed, failed or was
+    cancelled, releasing a permit more than once is a no-op.
+    """
+
+    __slots__ = ('_limiter', '_fingerprint', '_acquired_ns', '_utilized', '_latency_ns', '_released')
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter, fingerprint: str, utilized: bool) -> None:
+        self._limiter = limiter
+        self._fingerprint = fingerprint
+        self._acquired_ns = perf_counter_ns()
+        # whether the limit was (mostly) in use when the permit was acquired, only then can the limit grow
+        self._utilized = utilized
+        self._latency_ns: Optional[int] = None
+        self._released = False
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    @property
+    def acquired_ns(self) -> int:
+        return self._acquired_ns
+
+    @property
+    def utilized(self) -> bool:
+        return self._utilized
+
+    @property
+    def latency_ns(self) -> Optional[int]:
+        return self._latency_ns
+
+    def dispatch_completed(self) -> None:
+        """Records the query's dispatch latency (i.e. the time until the server has responded)."""
+        if self._latency_ns is None:
+            self._latency_ns = perf_counter_ns() - self._acquired_ns
+
+    def release(self, error: Optional[BaseException] = None, sample: bool = True) -> None:
+        """Releases the slot.  If `sample` is `False` (e.g. the query was cancelled), the outcome does not adjust the
+        limit.
+        """
+        # permits are released from the C++ core's callbacks (the async API) as well as the event loop
+        self._limiter.release(self, error, sample)
+
+
+class _Waiter:
+    """**INTERNAL**"""
+
+    __slots__ = ('callback', 'fingerprint', 'priority_class')
+
+    def __init__(self, callback: Callable[[AdmissionPermit], None], fingerprint: str, priority_class: str) -> None:
+        self.callback = callback
+        self.fingerprint = fingerprint
+        self.priority_class = priority_class
+
+
+class AdaptiveConcurrencyLimiter:
+    """**INTERNAL**
+
+    Limits the number of in-flight queries, the limit adapts to the observed query outcomes (AIMD):
+
+    * A timeout or overload error halves the limit.
+    * A query whose dispatch latency exceeds twice its statement's baseline reduces the limit by 10%.
+    * Any other successful query grows the limit by ``1 / limit`` (i.e. one slot per limit's worth of queries) if the
+      limit was in use.
+
+    Only queries dispatched after the previous decrease can decrease the limit again, so a burst of failures caused by
+    the same overload only decreases the limit once.  Queries beyond the limit wait for a slot to be released, for at
+    most `queue_timeout` seconds.
+
+    Waiting queries are queued (FIFO) per priority class.  Released slots are granted to the classes by smooth weighted
+    round-robin (see `PRIORITY_WEIGHTS`), so high priority queries get most slots without starving normal queries.
+    `reserved_priority_slots` slots can only be used by high priority queries (normal queries can always use at least
+    one slot), so a burst of normal queries cannot take up every slot.
+    """
+
+    def __init__(self,
+                 max_limit: int,
+                 queue_timeout: Optional[float] = None,
+                 min_limit: int = 1,
+                 reserved_priority_slots: int = 0) -> None:
+        self._max_limit = max_limit
+        self._min_limit = min(min_limit, max_limit)
+        self._queue_timeout = queue_timeout
+        self._reserved_priority_slots = reserved_priority_slots
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._waiters: Dict[str, Deque[_Waiter]] = {priority_class: deque() for priority_class in PRIORITY_WEIGHTS}
+        self._wrr_weights = {priority_class: 0 for priority_class in PRIORITY_WEIGHTS}
+        self._baselines: OrderedDict[str, float] = OrderedDict()
+        self._last_decrease_ns = 0
+        self._lock = Lock()
+        self._admitted = 0
+        self._rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def max_limit(self) -> int:
+        return self._max_limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_timeout(self) -> Optional[float]:
+        return self._queue_timeout
+
+    @property
+    def reserved_priority_slots(self) -> int:
+        return self._reserved_priority_slots
+
+    def _capacity(self, priority_class: str) -> int:
+        # NOTE: must be called w/ the lock held
+        limit = int(self._limit)
+        if priority_class == PRIORITY_HIGH:
+            return limit
+        return max(1, limit - self._reserved_priority_slots)
+
+    def _can_admit(self, priority_class: str) -> bool:
+        # NOTE: must be called w/ the lock held
+        return not self._waiters[priority_class] and self._in_flight < self._capacity(priority_class)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        # NOTE: must be called w/ the lock held
+        candidates = [priority_class for priority_class, waiters in self._waiters.items()
+                      if waiters and self._in_flight < self._capacity(priority_class)]
+        if not candidates:
+            return None
+        # smooth weighted round-robin amongst the classes that have waiting queries and can use a slot
+        total = 0
+        for priority_class in candidates:
+            self._wrr_weights[priority_class] += PRIORITY_WEIGHTS[priority_class]
+            total += PRIORITY_WEIGHTS[priority_class]
+        selected = max(candidates, key=lambda c: self._wrr_weights[c])
+        self._wrr_weights[selected] -= total
+        return self._waiters[selected].popleft()
+
+    def _new_permit(self, fingerprint: str) -> AdmissionPermit:
+        # NOTE: must be called w/ the lock held
+        self._in_flight += 1
+        self._admitted += 1
+        return AdmissionPermit(self, fingerprint, utilized=self._in_flight * 2 >= self._limit)
+
+    def try_acquire(self, fingerprint: str, priority: bool = False) -> Optional[AdmissionPermit]:
+        """Returns a permit if a slot is available (and no other query of the same priority class is waiting for one),
+        otherwise `None`.
+        """
+        with self._lock:
+            if not self._can_admit(get_priority_class(priority)):
+                return None
+            return self._new_permit(fingerprint)
+
+    def enqueue(self,
+                fingerprint: str,
+                callback: Callable[[AdmissionPermit], None],
+                priority: bool = False) -> Optional[_Waiter]:
+        """Waits for a slot.  If a slot is available, `callback` is called immediately and `None` is returned,
+        otherwise `callback` is called (from the thread releasing a slot) once the waiter is granted a slot.
+        """
+        priority_class = get_priority_class(priority)
+        with self._lock:
+            if self._can_admit(priority_class):
+                permit = self._new_permit(fingerprint)
+                waiter = None
+            else:
+                waiter = _Waiter(callback, fingerprint, priority_class)
+                self._waiters[priority_class].append(waiter)
+        if waiter is None:
+            callback(permit)
+        return waiter
+
+    def cancel_waiter(self, waiter: _Waiter, rejected: bool = True) -> bool:
+        """Removes the waiter from the queue.  Returns `False` if the waiter has already been granted a slot."""
+        with self._lock:
+            try:
+                self._waiters[waiter.priority_class].remove(waiter)
+            except ValueError:
+                return False
+            if rejected:
+                self._rejected += 1
+            return True
+
+    def acquire(self,
+                fingerprint: str,
+                priority: bool = False,
+                deadline: Optional[Deadline] = None) -> AdmissionPermit:
+        """Blocks until a slot is available.
+
+        Raises:
+            :class:`~couchbase_columnar.errors.QueryRejectedError`: If a slot did not become available within the
+                queue timeout.
+            :class:`~couchbase_columnar.errors.DeadlineExceededError`: If a slot did not become available before the
+                query's deadline (and the deadline is before the queue timeout).
+        """
+        granted = Event()
+        permits: List[AdmissionPermit] = []
+
+        def grant(p: AdmissionPermit) -> None:
+            permits.append(p)
+            granted.set()
+
+        waiter = self.enqueue(fingerprint, grant, priority=priority)
+        timeout = self._queue_timeout
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+        else:
+            deadline = None
+        if waiter is not None and not granted.wait(timeout):
+            # only the queue timeout rejects the query, a query that runs out of time is not counted as rejected
+            if self.cancel_waiter(waiter, rejected=deadline is None):
+                if deadline is not None:
+                    raise deadline.exceeded_error()
+                raise self.rejected_error()
+            # the slot was granted while timing out
+            granted.wait()
+        return permits[0]
+
+    def rejected_error(self) -> QueryRejectedError:
+        return QueryRejectedError(message=(f'Query rejected, {self._in_flight} queries are in-flight (limit='
+                                           f'{int(self._limit)}) and a slot did not become available within the '
+                                           'concurrency queue timeout.'))
+
+    def release(self, permit: AdmissionPermit, error: Optional[BaseException] = None, sample: bool = True) -> None:
+        """Releases the permit's slot, adjusts the limit and grants slots to waiting queries."""
+        granted = []
+        with self._lock:
+            if permit._released:
+                return
+            permit._released = True
+            self._in_flight -= 1
+            if sample:
+                self._adjust_limit(permit, error)
+            waiter = self._next_waiter()
+            while waiter is not None:
+                granted.append((waiter, self._new_permit(waiter.fingerprint)))
+                waiter = self._next_waiter()
+        for waiter, new_permit in granted:
+            waiter.callback(new_permit)
+
+    def _adjust_limit(self, permit: AdmissionPermit, error: Optional[BaseException]) -> None:
+        # NOTE: must be called w/ the lock held
+        if is_overload_error(error):
+            self._decrease(permit, ERROR_BACKOFF_RATIO)
+            return
+        latency = permit.latency_ns
+        if error is not None or latency is None:
+            # other errors say nothing about the service's load
+            return
+        baseline = self._baselines.get(permit.fingerprint, None)
+        if baseline is None:
+            if len(self._baselines) >= MAX_BASELINES:
+                self._baselines.popitem(last=False)
+            self._baselines[permit.fingerprint] = float(latency)
+        else:
+            self._baselines[permit.fingerprint] = baseline + BASELINE_SMOOTHING * (latency - baseline)
+            self._baselines.move_to_end(permit.fingerprint)
+        if baseline is not None and latency > baseline * LATENCY_TOLERANCE:
+            self._decrease(permit, LATENCY_BACKOFF_RATIO)
+        elif permit.utilized:
+            self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+
+    def _decrease(self, permit: AdmissionPermit, ratio: float) -> None:
+        # NOTE: must be called w/ the lock held
+        if permit.acquired_ns < self._last_decrease_ns:
+            # the query was dispatched before the previous decrease took effect
+            return
+        self._limit = max(float(self._min_limit), self._limit * ratio)
+        self._last_decrease_ns = perf_counter_ns()
+
+    def stats(self) -> ConcurrencyLimitStats:
+        with self._lock:
+            return ConcurrencyLimitStats(limit=int(self._limit),
+                                         max_limit=self._max_limit,
+                                         in_flight=self._in_flight,
+                                         queued=sum(len(waiters) for waiters in self._waiters.values()),
+                                         queued_priority=len(self._waiters[PRIORITY_HIGH]),
+                                         reserved_priority_slots=self._reserved_priority_slots,
+                                         admitted=self._admitted,
+                                         rejected=self._rejected)
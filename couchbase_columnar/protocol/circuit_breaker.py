@@ -0,0 +1,261 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from threading import Lock
+from time import perf_counter_ns
+from typing import (Deque,
+                    List,
+                    Optional,
+                    Tuple)
+
+from couchbase_columnar.common.circuit_breaker import CircuitBreakerConfig
+from couchbase_columnar.common.errors import CircuitOpenError, ColumnarError
+from couchbase_columnar.common.metrics import CircuitBreakerStats
+from couchbase_columnar.protocol import get_sdk_logger
+from couchbase_columnar.protocol.admission import is_overload_error
+from couchbase_columnar.protocol.instrumentation import fingerprint_statement
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+# closed per-statement circuit breakers beyond this many are forgotten (oldest first)
+MAX_STATEMENTS = 1000
+
+
+def is_failure(error: Optional[BaseException]) -> bool:
+    """**INTERNAL**
+
+    Returns `True` if the error indicates the Columnar service is unhealthy: timeouts, overload errors and errors that
+    are not specific to the query (e.g. the service cannot be reached).
+    """
+    if is_overload_error(error):
+        return True
+    return type(error) is ColumnarError
+
+
+class CircuitBreaker:
+    """**INTERNAL**
+
+    A single circuit (the cluster's or a statement's).  Every state change starts a new generation, outcomes of
+    queries admitted in a previous generation are ignored (e.g. a query that was in-flight when the circuit opened).
+    """
+
+    def __init__(self, config: CircuitBreakerConfig, fingerprint: Optional[str] = None) -> None:
+        self._config = config
+        self._fingerprint = fingerprint
+        self._open_duration_ns = int(config.open_duration.total_seconds() * 1e9)
+        self._state = STATE_CLOSED
+        self._generation = 0
+        # True for a failed query
+        self._outcomes: Deque[bool] = deque(maxlen=config.window_size)
+        self._failures = 0
+        self._opened_ns = 0
+        self._probes = 0
+        self._probe_successes = 0
+        self._opened = 0
+        self._rejected = 0
+        self._lock = Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        return self._fingerprint
+
+    def try_acquire(self) -> Optional[int]:
+        """Returns the generation the query is admitted in, or `None` if the circuit is open."""
+        with self._lock:
+            if self._state == STATE_OPEN:
+                if perf_counter_ns() - self._opened_ns < self._open_duration_ns:
+                    self._rejected += 1
+                    return None
+                self._transition(STATE_HALF_OPEN)
+            if self._state == STATE_HALF_OPEN:
+                if self._probes >= self._config.half_open_probes:
+                    self._rejected += 1
+                    return None
+                self._probes += 1
+            return self._generation
+
+    def record(self, generation: int, failure: Optional[bool]) -> None:
+        """Records the outcome of a query admitted in `generation`, `failure` is `None` if the query was cancelled."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            if self._state == STATE_HALF_OPEN:
+                if failure is None:
+                    # the probe was abandoned, another query can take its place
+                    self._probes -= 1
+                elif failure:
+                    self._transition(STATE_OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self._config.half_open_probes:
+                        self._transition(STATE_CLOSED)
+                return
+            if self._state != STATE_CLOSED or failure is None:
+                return
+            if len(self._outcomes) == self._outcomes.maxlen and self._outcomes[0]:
+                self._failures -= 1
+            self._outcomes.append(failure)
+            if failure:
+                self._failures += 1
+            if (len(self._outcomes) >= self._config.min_queries
+                    and self._failures / len(self._outcomes) >= self._config.error_threshold):
+                self._transition(STATE_OPEN)
+
+    def _transition(self, state: str) -> None:
+        # NOTE: must be called w/ the lock held
+        name = 'Circuit breaker' if self._fingerprint is None else f'Circuit breaker for {self._fingerprint!r}'
+        if state == STATE_OPEN:
+            if self._state == STATE_CLOSED:
+                get_sdk_logger().warning(f'{name} opened, {self._failures} of the last {len(self._outcomes)} '
+                                         'queries failed.')
+            else:
+                get_sdk_logger().warning(f'{name} opened again, a probe query failed.')
+            self._opened_ns = perf_counter_ns()
+            self._opened += 1
+        elif state == STATE_HALF_OPEN:
+            get_sdk_logger().info(f'{name} is half-open, probing with up to {self._config.half_open_probes} queries.')
+        else:
+            get_sdk_logger().info(f'{name} closed.')
+        self._state = state
+        self._generation += 1
+        self._outcomes.clear()
+        self._failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+
+    def stats(self) -> CircuitBreakerStats:
+        with self._lock:
+            return CircuitBreakerStats(fingerprint=self._fingerprint,
+                                       state=self._state,
+                                       queries=len(self._outcomes),
+                                       failures=self._failures,
+                                       opened=self._opened,
+                                       rejected=self._rejected)
+
+
+class CircuitBreakerPermit:
+    """**INTERNAL**
+
+    Admission of a single query by the cluster's (and its statement's) circuit breaker.  The query's outcome is
+    recorded once the permit is released, releasing a permit more than once is a no-op.
+    """
+
+    __slots__ = ('_grants', '_latency_threshold_ns', '_dispatch_start_ns', '_latency_ns', '_released', '_lock')
+
+    def __init__(self,
+                 grants: List[Tuple[CircuitBreaker, int]],
+                 latency_threshold_ns: Optional[int],
+                 lock: Lock) -> None:
+        self._grants = grants
+        self._latency_threshold_ns = latency_threshold_ns
+        self._dispatch_start_ns: Optional[int] = None
+        self._latency_ns: Optional[int] = None
+        self._released = False
+        # the breakers' lock, permits are released from the C++ core's callbacks (the async API) as well as the event
+        # loop
+        self._lock = lock
+
+    def dispatch_started(self) -> None:
+        # a retried query's latency includes all of its attempts
+        if self._dispatch_start_ns is None:
+            self._dispatch_start_ns = perf_counter_ns()
+
+    def dispatch_completed(self) -> None:
+        """Records the query's dispatch latency (i.e. the time until the server has responded)."""
+        if self._latency_ns is None and self._dispatch_start_ns is not None:
+            self._latency_ns = perf_counter_ns() - self._dispatch_start_ns
+
+    def release(self, error: Optional[BaseException] = None, sample: bool = True) -> None:
+        """Records the query's outcome.  If `sample` is `False` (e.g. the query was cancelled) or the query was never
+        dispatched (e.g. it was rejected by the concurrency limit), the outcome is not recorded.
+        """
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        failure: Optional[bool] = None
+        if sample and self._dispatch_start_ns is not None:
+            failure = is_failure(error) or (self._latency_threshold_ns is not None
+                                            and self._latency_ns is not None
+                                            and self._latency_ns > self._latency_threshold_ns)
+        for breaker, generation in self._grants:
+            breaker.record(generation, failure)
+
+
+class CircuitBreakers:
+    """**INTERNAL**
+
+    The cluster's circuit breaker and, if the ``per_statement`` setting is enabled, a circuit breaker per statement
+    fingerprint.  A query must be admitted by both.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig) -> None:
+        self._config = config
+        self._latency_threshold_ns = (int(config.latency_threshold.total_seconds() * 1e9)
+                                      if config.latency_threshold is not None else None)
+        self._cluster_breaker = CircuitBreaker(config)
+        self._statement_breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def config(self) -> CircuitBreakerConfig:
+        return self._config
+
+    def _get_statement_breaker(self, fingerprint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._statement_breakers.get(fingerprint, None)
+            if breaker is not None:
+                self._statement_breakers.move_to_end(fingerprint)
+                return breaker
+            if len(self._statement_breakers) >= MAX_STATEMENTS:
+                closed = next((f for f, b in self._statement_breakers.items() if b.state == STATE_CLOSED), None)
+                if closed is not None:
+                    del self._statement_breakers[closed]
+            breaker = self._statement_breakers[fingerprint] = CircuitBreaker(self._config, fingerprint)
+            return breaker
+
+    def acquire(self, statement: str) -> CircuitBreakerPermit:
+        """Admits the query.
+
+        Raises:
+            :class:`~couchbase_columnar.errors.CircuitOpenError`: If the cluster's or the statement's circuit is open.
+        """
+        generation = self._cluster_breaker.try_acquire()
+        if generation is None:
+            raise CircuitOpenError(message='Query rejected, the circuit breaker is open.')
+        grants = [(self._cluster_breaker, generation)]
+        if self._config.per_statement:
+            fingerprint = fingerprint_statement(statement)
+            breaker = self._get_statement_breaker(fingerprint)
+            statement_generation = breaker.try_acquire()
+            if statement_generation is None:
+                # the query is not executed, so it is not an outcome for the cluster's circuit breaker
+                self._cluster_breaker.record(generation, None)
+                raise CircuitOpenError(message=f'Query rejected, the circuit breaker for {fingerprint!r} is open.')
+            grants.append((breaker, statement_generation))
+        return CircuitBreakerPermit(grants, self._latency_threshold_ns, self._lock)
+
+    def stats(self) -> List[CircuitBreakerStats]:
+        with self._lock:
+            statement_breakers = list(self._statement_breakers.values())
+        return [self._cluster_breaker.stats()] + [b.stats() for b in statement_breakers]
@@ -16,18 +16,28 @@
 from __future__ import annotations
 
 import atexit
+import time
 from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
 from typing import (TYPE_CHECKING,
+                    Dict,
                     Optional,
                     Union)
 
-from couchbase_columnar.common.result import BlockingQueryResult
+from couchbase_columnar.common.result import BlockingQueryResult, WarmUpResult
 from couchbase_columnar.protocol.core.client_adapter import _ClientAdapter
 from couchbase_columnar.protocol.core.request import ClusterRequestBuilder
 from couchbase_columnar.protocol.query import _QueryStreamingExecutor
+from couchbase_columnar.protocol.warm_up import (WARM_UP_STATEMENT,
+                                                 build_warm_up_query_options,
+                                                 build_warm_up_result,
+                                                 log_warm_up_result)
 
 if TYPE_CHECKING:
+    from datetime import timedelta
+
     from couchbase_columnar.common.credential import Credential
+    from couchbase_columnar.common.metrics import MetricsSnapshot
     from couchbase_columnar.options import ClusterOptions
 
 
@@ -46,6 +56,9 @@ class Cluster:
         self._tp_executor = ThreadPoolExecutor()
         self._tp_executor_shutdown_called = False
         atexit.register(self._shutdown_executor)
+        warmup_connections = self._client_adapter.connection_details.warmup_connections
+        if warmup_connections is not None:
+            log_warm_up_result(self.warm_up(warmup_connections))
 
     @property
     def client_adapter(self) -> _ClientAdapter:
@@ -75,6 +88,7 @@ class Cluster:
         req = self._request_builder.build_close_connection_request()
         self._client_adapter.close_connection(req)
         self._client_adapter.reset_client()
+        self._client_adapter.query_instrumentation.close()
         if self._tp_executor_shutdown_called is False:
             self._tp_executor.shutdown()
 
@@ -105,6 +119,42 @@ class Cluster:
             # TODO: log warning and/or exception?
             print('Cluster does not have a connection.  Ignoring')
 
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        """
+            **INTERNAL**
+        """
+        snapshot = self._client_adapter.query_instrumentation.metrics_snapshot()
+        limiter = self._client_adapter.concurrency_limiter
+        tenant_throttle = self._client_adapter.tenant_throttle
+        circuit_breakers = self._client_adapter.circuit_breakers
+        return replace(snapshot,
+                       hedging=self._client_adapter.hedging_budget.stats(),
+                       concurrency=limiter.stats() if limiter is not None else None,
+                       retries=self._client_adapter.retry_engine.stats(),
+                       tenants=tenant_throttle.stats() if tenant_throttle is not None else [],
+                       circuit_breakers=circuit_breakers.stats() if circuit_breakers is not None else [])
+
+    def _warm_up_connection(self, query_opts: Dict[str, object]) -> Optional[Exception]:
+        """
+            **INTERNAL**
+        """
+        try:
+            req, _ = self._request_builder.build_query_request(WARM_UP_STATEMENT, **query_opts)
+            # not recorded by the query instrumentation, warm-up queries are not the application's queries
+            executor = _QueryStreamingExecutor(self.client_adapter.client, req)
+            executor.submit_query()
+            BlockingQueryResult(executor).get_all_rows()
+        except Exception as ex:
+            return ex
+        return None
+
+    def warm_up(self, connections: int = 1, timeout: Optional[timedelta] = None) -> WarmUpResult:
+        query_opts = build_warm_up_query_options(connections, timeout)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix='pycbcc-warmup') as tp_executor:
+            fts = [tp_executor.submit(self._warm_up_connection, query_opts) for _ in range(connections)]
+        return build_warm_up_result(connections, start, [ft.result() for ft in fts])
+
     def _execute_query_in_background(self, executor: _QueryStreamingExecutor) -> BlockingQueryResult:
         """
             **INTERNAL**
@@ -116,12 +166,19 @@ class Cluster:
                       statement: str,
                       *args: object,
                       **kwargs: object) -> Union[BlockingQueryResult, Future[BlockingQueryResult]]:
+        tracker = self.client_adapter.query_instrumentation.start_query(statement)
         req, cancel_token = self._request_builder.build_query_request(statement, *args, **kwargs)
         lazy_execute = req.options.pop('lazy_execute', None)
         executor = _QueryStreamingExecutor(self.client_adapter.client,
                                            req,
                                            cancel_token=cancel_token,
-                                           lazy_execute=lazy_execute)
+                                           lazy_execute=lazy_execute,
+                                           tracker=tracker,
+                                           hedging_budget=self.client_adapter.hedging_budget,
+                                           concurrency_limiter=self.client_adapter.concurrency_limiter,
+                                           tenant_throttle=self.client_adapter.tenant_throttle,
+                                           retry_engine=self.client_adapter.retry_engine,
+                                           circuit_breakers=self.client_adapter.circuit_breakers)
         if executor.cancel_token is not None:
             executor.set_threadpool_executor(self.threadpool_executor)
             if lazy_execute is True:
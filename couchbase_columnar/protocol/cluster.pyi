@@ -24,6 +24,7 @@ else:
 
 from couchbase_columnar import JSONType
 from couchbase_columnar.common.credential import Credential
+from couchbase_columnar.common.metrics import MetricsSnapshot
 from couchbase_columnar.common.query import CancelToken
 from couchbase_columnar.common.result import BlockingQueryResult
 from couchbase_columnar.options import (ClusterOptions,
@@ -66,6 +67,8 @@ class Cluster:
 
     def shutdown(self) -> None: ...
 
+    def metrics_snapshot(self) -> MetricsSnapshot: ...
+
     @overload
     def execute_query(self, statement: str) -> BlockingQueryResult: ...
 
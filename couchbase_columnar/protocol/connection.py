@@ -24,10 +24,14 @@ from typing import (TYPE_CHECKING,
                     TypedDict)
 from urllib.parse import parse_qs, urlparse
 
+from couchbase_columnar.common.circuit_breaker import CircuitBreakerConfig
 from couchbase_columnar.common.core.utils import to_query_str
 from couchbase_columnar.common.credential import Credential
 from couchbase_columnar.common.deserializer import DefaultJsonDeserializer, Deserializer
+from couchbase_columnar.common.metrics import Meter
 from couchbase_columnar.common.options import ClusterOptions
+from couchbase_columnar.common.retry import RetryPolicy
+from couchbase_columnar.common.tracing import RequestTracer
 from couchbase_columnar.protocol import PYCBCC_VERSION
 from couchbase_columnar.protocol.options import (ClusterOptionsTransformedKwargs,
                                                  QueryStrVal,
@@ -137,6 +141,22 @@ class _ConnectionDetails:
     options_in_connstr: Dict[str, List[str]]
     enable_dns_srv: Optional[bool] = None
     dns_srv_timeout: Optional[str] = None
+    tracer: Optional[RequestTracer] = None
+    meter: Optional[Meter] = None
+    enable_metrics: Optional[bool] = None
+    metrics_report_interval: Optional[int] = None
+    slow_query_threshold: Optional[int] = None
+    warmup_connections: Optional[int] = None
+    hedging_budget: Optional[float] = None
+    max_concurrent_queries: Optional[int] = None
+    concurrency_queue_timeout: Optional[int] = None
+    reserved_priority_slots: Optional[int] = None
+    tenant_rate_limit: Optional[float] = None
+    tenant_burst: Optional[int] = None
+    tenant_max_concurrent_queries: Optional[int] = None
+    retry_policy: Optional[RetryPolicy] = None
+    retry_budget: Optional[float] = None
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
 
     def validate_security_options(self) -> None:
         security_opts: Optional[SecurityOptionsTransformedKwargs] = self.cluster_options.get('security_options')
@@ -230,6 +250,28 @@ class _ConnectionDetails:
         if default_deserializer is None:
             default_deserializer = DefaultJsonDeserializer()
 
+        # the tracer, meter and built-in metrics are handled by the SDK, not the C++ core
+        tracer = cluster_opts.pop('tracer', None)
+        meter = cluster_opts.pop('meter', None)
+        enable_metrics = cluster_opts.pop('enable_metrics', None)
+        metrics_report_interval = cluster_opts.pop('metrics_report_interval', None)
+        slow_query_threshold = cluster_opts.pop('slow_query_threshold', None)
+        # connection warm-up is done by the SDK (via queries) once connected
+        warmup_connections = cluster_opts.pop('warmup_connections', None)
+        # hedged queries are dispatched by the SDK
+        hedging_budget = cluster_opts.pop('hedging_budget', None)
+        # admission control is done by the SDK, before queries reach the C++ core
+        max_concurrent_queries = cluster_opts.pop('max_concurrent_queries', None)
+        concurrency_queue_timeout = cluster_opts.pop('concurrency_queue_timeout', None)
+        reserved_priority_slots = cluster_opts.pop('reserved_priority_slots', None)
+        tenant_rate_limit = cluster_opts.pop('tenant_rate_limit', None)
+        tenant_burst = cluster_opts.pop('tenant_burst', None)
+        tenant_max_concurrent_queries = cluster_opts.pop('tenant_max_concurrent_queries', None)
+        # retries are done by the SDK, before a query has returned any rows
+        retry_policy = cluster_opts.pop('retry_policy', None)
+        retry_budget = cluster_opts.pop('retry_budget', None)
+        circuit_breaker = cluster_opts.pop('circuit_breaker', None)
+
         if 'user_agent_extra' in cluster_opts:
             cluster_opts['user_agent_extra'] = f'{PYCBCC_VERSION};{cluster_opts["user_agent_extra"]}'
         else:
@@ -241,6 +283,22 @@ class _ConnectionDetails:
                         default_deserializer,
                         options_in_connstr=options_in_connstr,
                         enable_dns_srv=enable_dns_srv,
-                        dns_srv_timeout=dns_srv_timeout)
+                        dns_srv_timeout=dns_srv_timeout,
+                        tracer=tracer,
+                        meter=meter,
+                        enable_metrics=enable_metrics,
+                        metrics_report_interval=metrics_report_interval,
+                        slow_query_threshold=slow_query_threshold,
+                        warmup_connections=warmup_connections,
+                        hedging_budget=hedging_budget,
+                        max_concurrent_queries=max_concurrent_queries,
+                        concurrency_queue_timeout=concurrency_queue_timeout,
+                        reserved_priority_slots=reserved_priority_slots,
+                        tenant_rate_limit=tenant_rate_limit,
+                        tenant_burst=tenant_burst,
+                        tenant_max_concurrent_queries=tenant_max_concurrent_queries,
+                        retry_policy=retry_policy,
+                        retry_budget=retry_budget,
+                        circuit_breaker=circuit_breaker)
         conn_dtls.validate_security_options()
         return conn_dtls
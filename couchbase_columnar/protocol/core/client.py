@@ -21,12 +21,9 @@ from typing import (TYPE_CHECKING,
                     Dict,
                     Optional)
 
+from couchbase_columnar.protocol import load_core
 from couchbase_columnar.protocol.core import PyCapsuleType
 from couchbase_columnar.protocol.core.result import CoreQueryIterator
-from couchbase_columnar.protocol.pycbcc_core import (_test_create_connection,
-                                                     close_connection,
-                                                     columnar_query,
-                                                     create_connection)
 
 if TYPE_CHECKING:
     from couchbase_columnar.protocol.core.request import (CloseConnectionRequest,
@@ -40,6 +37,7 @@ class _CoreClient:
     """
 
     def __init__(self) -> None:
+        load_core()
         self._connection: Optional[PyCapsuleType] = None
 
     @property
@@ -67,6 +65,7 @@ class _CoreClient:
         """
         **INTERNAL**
         """
+        from couchbase_columnar.protocol.pycbcc_core import close_connection
         return close_connection(self.connection, **req.to_req_dict())
 
     def connect(self, req: ConnectRequest) -> PyCapsuleType:
@@ -75,8 +74,23 @@ class _CoreClient:
         """
         final_kwargs = req.to_req_dict()
         conn_str = final_kwargs.pop('connection_str')
+        from couchbase_columnar.protocol.pycbcc_core import create_connection
         return create_connection(conn_str, **final_kwargs)
 
+    def connect_in_background(self,
+                              req: ConnectRequest,
+                              callback: Callable[[PyCapsuleType], None],
+                              errback: Callable[[Any], None]) -> None:
+        """
+        **INTERNAL**
+
+        Opens the connection w/o blocking, the callback (or errback) is called from the C++ core's IO thread.
+        """
+        final_kwargs = req.to_req_dict()
+        conn_str = final_kwargs.pop('connection_str')
+        from couchbase_columnar.protocol.pycbcc_core import create_connection
+        create_connection(conn_str, callback=callback, errback=errback, **final_kwargs)
+
     def columnar_query_op(self,
                           req: QueryRequest,
                           callback: Optional[Callable[..., None]] = None,
@@ -93,6 +107,7 @@ class _CoreClient:
             final_kwargs['row_callback'] = row_callback
         if run_in_background is not None:
             final_kwargs['run_in_background'] = run_in_background
+        from couchbase_columnar.protocol.pycbcc_core import columnar_query
         return columnar_query(**final_kwargs)
 
     def _test_connect(self, req: ConnectRequest) -> Dict[str, Any]:
@@ -101,4 +116,5 @@ class _CoreClient:
         """
         final_kwargs = req.to_req_dict()
         conn_str = final_kwargs.pop('connection_str')
+        from couchbase_columnar.protocol.pycbcc_core import _test_create_connection
         return _test_create_connection(conn_str, **final_kwargs)
@@ -33,12 +33,18 @@ else:
 from couchbase_columnar.common.credential import Credential
 from couchbase_columnar.common.deserializer import Deserializer
 from couchbase_columnar.common.errors import ColumnarError, InternalSDKError
+from couchbase_columnar.protocol.admission import AdaptiveConcurrencyLimiter
+from couchbase_columnar.protocol.circuit_breaker import CircuitBreakers
 from couchbase_columnar.protocol.connection import _ConnectionDetails
 from couchbase_columnar.protocol.core.client import _CoreClient
 from couchbase_columnar.protocol.core.request import CloseConnectionRequest, ConnectRequest
 from couchbase_columnar.protocol.core.result import CoreResult
 from couchbase_columnar.protocol.errors import CoreColumnarError, ErrorMapper
+from couchbase_columnar.protocol.hedging import HedgingBudget
+from couchbase_columnar.protocol.instrumentation import QueryInstrumentation
 from couchbase_columnar.protocol.options import OptionsBuilder
+from couchbase_columnar.protocol.retry import RetryEngine
+from couchbase_columnar.protocol.tenancy import TenantThrottle
 
 ReqT = TypeVar('ReqT', ConnectRequest, CloseConnectionRequest)
 
@@ -101,6 +107,34 @@ class _ClientAdapter:
                                                        credential,
                                                        options,
                                                        **kwargs)
+        self._query_instrumentation = QueryInstrumentation(
+            tracer=self._conn_details.tracer,
+            meter=self._conn_details.meter,
+            enable_metrics=self._conn_details.enable_metrics,
+            metrics_report_interval=self._conn_details.metrics_report_interval,
+            slow_query_threshold=self._conn_details.slow_query_threshold)
+        self._hedging_budget = HedgingBudget(self._conn_details.hedging_budget)
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if self._conn_details.max_concurrent_queries is not None:
+            queue_timeout = self._conn_details.concurrency_queue_timeout
+            # the queue timeout option is transformed to microseconds
+            self._concurrency_limiter = AdaptiveConcurrencyLimiter(
+                self._conn_details.max_concurrent_queries,
+                queue_timeout=queue_timeout / 1e6 if queue_timeout is not None else None,
+                reserved_priority_slots=self._conn_details.reserved_priority_slots or 0)
+        self._tenant_throttle: Optional[TenantThrottle] = None
+        if (self._conn_details.tenant_rate_limit is not None
+                or self._conn_details.tenant_max_concurrent_queries is not None):
+            queue_timeout = self._conn_details.concurrency_queue_timeout
+            self._tenant_throttle = TenantThrottle(
+                rate=self._conn_details.tenant_rate_limit,
+                burst=self._conn_details.tenant_burst,
+                max_concurrent=self._conn_details.tenant_max_concurrent_queries,
+                queue_timeout=queue_timeout / 1e6 if queue_timeout is not None else None)
+        self._retry_engine = RetryEngine(self._conn_details.retry_policy, self._conn_details.retry_budget)
+        self._circuit_breakers: Optional[CircuitBreakers] = None
+        if self._conn_details.circuit_breaker is not None:
+            self._circuit_breakers = CircuitBreakers(self._conn_details.circuit_breaker)
 
     @property
     def client(self) -> _CoreClient:
@@ -132,6 +166,48 @@ class _ClientAdapter:
         """
         return self._conn_details.default_deserializer
 
+    @property
+    def query_instrumentation(self) -> QueryInstrumentation:
+        """
+            **INTERNAL**
+        """
+        return self._query_instrumentation
+
+    @property
+    def hedging_budget(self) -> HedgingBudget:
+        """
+            **INTERNAL**
+        """
+        return self._hedging_budget
+
+    @property
+    def concurrency_limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        """
+            **INTERNAL**
+        """
+        return self._concurrency_limiter
+
+    @property
+    def tenant_throttle(self) -> Optional[TenantThrottle]:
+        """
+            **INTERNAL**
+        """
+        return self._tenant_throttle
+
+    @property
+    def retry_engine(self) -> RetryEngine:
+        """
+            **INTERNAL**
+        """
+        return self._retry_engine
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakers]:
+        """
+            **INTERNAL**
+        """
+        return self._circuit_breakers
+
     @property
     def options_builder(self) -> OptionsBuilder:
         """
@@ -33,7 +33,10 @@ if sys.version_info < (3, 10):
 else:
     from typing import TypeAlias
 
-from couchbase_columnar.common.deserializer import Deserializer
+from couchbase_columnar.common.deserializer import (Deserializer,
+                                                    ProjectingDeserializer,
+                                                    TupleRowDeserializer)
+from couchbase_columnar.common.enums import QueryRowFormat
 from couchbase_columnar.common.options import QueryOptions
 from couchbase_columnar.common.query import CancelToken
 from couchbase_columnar.protocol.options import ClusterOptionsTransformedKwargs, QueryOptionsTransformedKwargs
@@ -43,6 +46,22 @@ if TYPE_CHECKING:
     from couchbase_columnar.protocol.core.client_adapter import _ClientAdapter as BlockingClientAdapter
 
 
+def build_row_deserializer(deserializer: Deserializer, options: QueryOptionsTransformedKwargs) -> Deserializer:
+    """**INTERNAL**
+
+    Returns the deserializer applied to the query's rows, i.e. the query's deserializer wrapped according to the
+    query's projection and row format.
+    """
+    project = options.get('project', None)
+    if project:
+        # the projection is applied first, the row format applies to the projected rows
+        deserializer = ProjectingDeserializer(deserializer, project)
+    if options.get('row_format', None) == QueryRowFormat.TUPLE.value:
+        # a new deserializer per query, the column names are specific to the query's result
+        return TupleRowDeserializer(deserializer)
+    return deserializer
+
+
 @dataclass
 class CloseConnectionRequest:
     callback: Optional[Callable[..., None]] = None
@@ -118,7 +137,11 @@ class QueryRequest:
         req_options = req_dict.pop('options', None)
         # core C++ wants all args JSONified,
         for opt_key, opt_val in req_options.items():
-            if opt_key == 'serializer':
+            if opt_key in ('serializer', 'max_rows', 'max_result_bytes', 'hedge_after', 'tenant', 'retry_policy',
+                           'deadline', 'idle_row_timeout', 'row_format', 'project'):
+                # result limits, hedging, tenant throttling, retries, deadlines, the idle row timeout, the row format
+                # and the projection are handled by the SDK, the C++ core does not need them (the remaining deadline is
+                # sent as the query's timeout)
                 continue
             elif opt_key == 'raw':
                 req_dict[opt_key] = {f'{k}': json.dumps(v).encode('utf-8')
@@ -197,6 +220,7 @@ class ClusterRequestBuilder:
             q_opts['named_parameters'] = named_params
         # add the default serializer if one does not exist
         deserializer = q_opts.pop('deserializer', None) or self._conn_details.default_deserializer
+        deserializer = build_row_deserializer(deserializer, q_opts)
 
         final_opts = {}
         for k, v in q_opts.items():
@@ -271,6 +295,7 @@ class ScopeRequestBuilder:
             q_opts['named_parameters'] = named_params
         # add the default serializer if one does not exist
         deserializer = q_opts.pop('deserializer', None) or self._conn_details.default_deserializer
+        deserializer = build_row_deserializer(deserializer, q_opts)
 
         final_opts = {}
         for k, v in q_opts.items():
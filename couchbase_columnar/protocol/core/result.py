@@ -16,15 +16,18 @@
 from __future__ import annotations
 
 import sys
+from typing import TYPE_CHECKING
 
 if sys.version_info < (3, 10):
     from typing_extensions import TypeAlias
 else:
     from typing import TypeAlias
 
-from couchbase_columnar.protocol.pycbcc_core import columnar_query_iterator, result
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.pycbcc_core import columnar_query_iterator, result
 
-CoreQueryIterator: TypeAlias = columnar_query_iterator
-CoreResult: TypeAlias = result
+# forward references so that importing this module does not load the C++ extension
+CoreQueryIterator: TypeAlias = 'columnar_query_iterator'
+CoreResult: TypeAlias = 'result'
 
 ResultType: TypeAlias = CoreResult
@@ -0,0 +1,128 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import (TYPE_CHECKING,
+                    Dict,
+                    Optional,
+                    TypeVar,
+                    Union)
+
+from couchbase_columnar.common.errors import DeadlineExceededError, TimeoutError
+
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.core.request import QueryRequest
+    from couchbase_columnar.protocol.options import QueryOptionsTransformedKwargs
+
+# waiting to be dispatched (the cluster's thread pool, lazy execution, tenant throttling and the concurrency limit)
+PHASE_QUEUE = 'queue'
+# waiting for the server to respond, including retries and their backoff
+PHASE_DISPATCH = 'dispatch'
+# iterating the query's rows
+PHASE_STREAMING = 'streaming'
+PHASES = (PHASE_QUEUE, PHASE_DISPATCH, PHASE_STREAMING)
+
+ErrT = TypeVar('ErrT', bound=Exception)
+
+
+class Deadline:
+    """**INTERNAL**
+
+    The deadline of a single query (see the ``deadline`` query option), started when the query is executed.  The
+    executor moves the deadline through the query's phases, so that the error raised once the deadline is exceeded
+    reports where the time was spent.
+    """
+
+    __slots__ = ('_timeout', '_timeout_option', '_end_ns', '_phase', '_phase_start_ns', '_phase_ns')
+
+    def __init__(self, timeout: float, timeout_option: Optional[int] = None, start_ns: Optional[int] = None) -> None:
+        self._timeout = timeout
+        # the query's timeout option (in microseconds), the server is sent the lesser of the option and the deadline
+        self._timeout_option = timeout_option
+        if start_ns is None:
+            start_ns = perf_counter_ns()
+        self._end_ns = start_ns + int(timeout * 1e9)
+        self._phase = PHASE_QUEUE
+        self._phase_start_ns = start_ns
+        self._phase_ns: Dict[str, int] = {}
+
+    @classmethod
+    def from_query_options(cls, options: Optional[QueryOptionsTransformedKwargs]) -> Optional[Deadline]:
+        """Returns `None` if the query does not have a deadline."""
+        if not options:
+            return None
+        # the deadline and timeout options are transformed to microseconds
+        deadline = options.get('deadline', None)
+        if deadline is None:
+            return None
+        return cls(deadline / 1e6, options.get('timeout', None))
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def phase(self) -> str:
+        return self._phase
+
+    def remaining(self) -> float:
+        """Returns the time (in seconds) until the deadline."""
+        return max(0.0, (self._end_ns - perf_counter_ns()) / 1e9)
+
+    def expired(self) -> bool:
+        return perf_counter_ns() >= self._end_ns
+
+    def enter(self, phase: str) -> None:
+        if phase == self._phase:
+            return
+        now_ns = perf_counter_ns()
+        self._phase_ns[self._phase] = self._phase_ns.get(self._phase, 0) + now_ns - self._phase_start_ns
+        self._phase = phase
+        self._phase_start_ns = now_ns
+
+    def apply(self, request: QueryRequest) -> None:
+        """Sets the timeout the query is dispatched with to the time remaining until the deadline (unless the query's
+        timeout option is less).
+
+        Raises:
+            :class:`~couchbase_columnar.errors.DeadlineExceededError`: If the deadline has been exceeded.
+        """
+        remaining_us = (self._end_ns - perf_counter_ns()) // 1000
+        if remaining_us <= 0:
+            raise self.exceeded_error()
+        if request.options is None:
+            return
+        if self._timeout_option is not None and self._timeout_option <= remaining_us:
+            request.options['timeout'] = self._timeout_option
+        else:
+            request.options['timeout'] = remaining_us
+
+    def check_error(self, error: ErrT) -> Union[ErrT, DeadlineExceededError]:
+        """Returns the deadline's error in place of a timeout caused by the deadline (i.e. the server timed out the
+        query after the time remaining until the deadline).
+        """
+        if isinstance(error, TimeoutError) and not isinstance(error, DeadlineExceededError) and self.expired():
+            return self.exceeded_error()
+        return error
+
+    def exceeded_error(self) -> DeadlineExceededError:
+        phase_ns = dict(self._phase_ns)
+        phase_ns[self._phase] = phase_ns.get(self._phase, 0) + perf_counter_ns() - self._phase_start_ns
+        spent = ', '.join(f'{phase}: {phase_ns[phase] / 1e9:.3f}s' for phase in PHASES if phase in phase_ns)
+        return DeadlineExceededError(message=(f'Query exceeded its deadline of {self._timeout:.3f}s in the '
+                                              f'{self._phase} phase ({spent}).'),
+                                     phase=self._phase)
@@ -17,7 +17,8 @@ from __future__ import annotations
 
 import sys
 from enum import Enum
-from typing import (Any,
+from typing import (TYPE_CHECKING,
+                    Any,
                     Dict,
                     Optional,
                     Union,
@@ -33,9 +34,11 @@ from couchbase_columnar.common.errors import (ColumnarError,
                                               ColumnarErrors,
                                               InternalSDKError,
                                               QueryOperationCanceledError)
-from couchbase_columnar.protocol.pycbcc_core import core_error
 
-CoreError: TypeAlias = core_error
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.pycbcc_core import core_error
+
+CoreError: TypeAlias = 'core_error'
 ClientError: TypeAlias = Union[InternalSDKError,
                                QueryOperationCanceledError,
                                RuntimeError,
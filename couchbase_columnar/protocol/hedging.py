@@ -0,0 +1,368 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from heapq import heappop, heappush
+from itertools import count
+from threading import (Condition,
+                       Event,
+                       Lock,
+                       Thread)
+from time import perf_counter_ns
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    List,
+                    Optional,
+                    Tuple,
+                    Union)
+
+from couchbase_columnar.common.metrics import HedgingStats
+from couchbase_columnar.protocol import get_sdk_logger
+from couchbase_columnar.protocol.errors import CoreColumnarError
+
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.core.client import _CoreClient
+    from couchbase_columnar.protocol.core.request import QueryRequest
+    from couchbase_columnar.protocol.core.result import CoreQueryIterator
+    from couchbase_columnar.protocol.options import QueryOptionsTransformedKwargs
+
+DEFAULT_HEDGING_BUDGET = 0.05
+# the budget accrues at most this many requests worth of hedges, a quiet period does not allow a burst of hedges
+BUDGET_WINDOW = 100
+# threads waiting for the results of blocking queries' hedges, shared by all clusters
+HEDGE_MAX_WORKERS = 4
+
+
+def get_hedge_after(options: Optional[QueryOptionsTransformedKwargs]) -> Optional[float]:
+    """**INTERNAL**
+
+    Returns the hedge delay (in seconds) if the query should be hedged.  Only read-only queries can be hedged, a
+    duplicate of a query that modifies data could apply the modification twice.
+    """
+    if options is None:
+        return None
+    # the hedge_after option is transformed to microseconds
+    hedge_after = options.get('hedge_after', None)
+    if hedge_after is None:
+        return None
+    if options.get('readonly', None) is not True:
+        raise ValueError('The hedge_after query option is only allowed for read-only queries (read_only=True).')
+    return hedge_after / 1e6
+
+
+class HedgingBudget:
+    """**INTERNAL**
+
+    Limits hedged requests to a ratio of the hedge-eligible requests.  Each eligible request deposits `ratio` tokens
+    (up to `ratio * BUDGET_WINDOW` tokens), a hedge costs a token.
+    """
+
+    def __init__(self, ratio: Optional[float] = None) -> None:
+        self._ratio = ratio if ratio is not None else DEFAULT_HEDGING_BUDGET
+        self._max_tokens = max(1.0, self._ratio * BUDGET_WINDOW)
+        self._tokens = 0.0
+        self._lock = Lock()
+        self._requests = 0
+        self._hedges_sent = 0
+        self._hedges_won = 0
+
+    @property
+    def ratio(self) -> float:
+        return self._ratio
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._requests += 1
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self._hedges_sent += 1
+            return True
+
+    def hedge_won(self) -> None:
+        with self._lock:
+            self._hedges_won += 1
+
+    def stats(self) -> HedgingStats:
+        with self._lock:
+            return HedgingStats(requests=self._requests,
+                                hedges_sent=self._hedges_sent,
+                                hedges_won=self._hedges_won)
+
+
+class HedgeTimer:
+    """**INTERNAL**
+
+    A callback scheduled by :meth:`HedgeScheduler.call_later`.  Cancelling the timer drops the callback (and what it
+    references) right away, the timer itself is discarded once it is due.
+    """
+
+    __slots__ = ('callback',)
+
+    def __init__(self, callback: Callable[[], None]) -> None:
+        self.callback: Optional[Callable[[], None]] = callback
+
+    def cancel(self) -> None:
+        self.callback = None
+
+
+class HedgeScheduler:
+    """**INTERNAL**
+
+    Dispatches the hedges of blocking queries.  A single daemon thread (started once the first hedge is scheduled) calls
+    each query's :meth:`HedgedQueryIterator.hedge` once its `hedge_after` has elapsed and a small shared pool waits for
+    the hedges' results.  The original query is waited for by the calling thread, so hedging does not start a thread
+    per query.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self._max_workers = max_workers or HEDGE_MAX_WORKERS
+        self._timers: List[Tuple[int, int, HedgeTimer]] = []
+        self._sequence = count()
+        self._cond = Condition(Lock())
+        self._thread: Optional[Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> HedgeTimer:
+        due_ns = perf_counter_ns() + int(delay * 1e9)
+        timer = HedgeTimer(callback)
+        with self._cond:
+            heappush(self._timers, (due_ns, next(self._sequence), timer))
+            # the thread does not survive a fork
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name='pycbcc-hedge-timer', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return timer
+
+    def submit(self, fn: Callable[..., None], *args: Any) -> None:
+        with self._cond:
+            # nor do the pool's threads
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='pycbcc-hedge')
+                self._pool_pid = os.getpid()
+            pool = self._pool
+        pool.submit(fn, *args)
+
+    def _due(self, now_ns: int) -> Tuple[List[Callable[[], None]], Optional[int]]:
+        """Removes the callbacks that are due and returns them, along w/ the time the next callback is due."""
+        # NOTE: must be called w/ the lock held
+        due: List[Callable[[], None]] = []
+        while self._timers and self._timers[0][0] <= now_ns:
+            callback = heappop(self._timers)[2].callback
+            # None if the timer was cancelled
+            if callback is not None:
+                due.append(callback)
+        return due, self._timers[0][0] if self._timers else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                now_ns = perf_counter_ns()
+                due, next_due_ns = self._due(now_ns)
+                if not due:
+                    self._cond.wait((next_due_ns - now_ns) / 1e9 if next_due_ns is not None else None)
+            for callback in due:
+                try:
+                    callback()
+                except Exception as ex:
+                    get_sdk_logger().debug(f'Unable to dispatch hedged query: {ex!r}')
+
+
+_HEDGE_SCHEDULER: Optional[HedgeScheduler] = None
+_HEDGE_SCHEDULER_LOCK = Lock()
+
+
+def get_hedge_scheduler() -> HedgeScheduler:
+    """**INTERNAL**"""
+    global _HEDGE_SCHEDULER
+    with _HEDGE_SCHEDULER_LOCK:
+        if _HEDGE_SCHEDULER is None:
+            _HEDGE_SCHEDULER = HedgeScheduler()
+        return _HEDGE_SCHEDULER
+
+
+class _HedgeCandidate:
+    """**INTERNAL**"""
+
+    __slots__ = ('is_hedge', 'query_iter', 'done', 'result')
+
+    def __init__(self, is_hedge: bool) -> None:
+        self.is_hedge = is_hedge
+        self.query_iter: Optional[CoreQueryIterator] = None
+        self.done = False
+        self.result: Union[bool, Exception, None] = None
+
+
+class HedgedQueryIterator:
+    """**INTERNAL**
+
+    Implements the bindings' ``columnar_query_iterator`` interface on top of a query and (at most) one duplicate of
+    it.  The duplicate (hedge) is dispatched if the query has not responded once `hedge_after` has elapsed and the
+    hedging budget allows it.  The first query to respond successfully (i.e. its results have started to stream) wins
+    and the other query is cancelled.  An error only decides the outcome once no other query is pending, so a hedge can
+    succeed where the original query failed.
+
+    NOTE: the winner is decided by the core's query result, i.e. once the query's response has started to stream, not
+    by the time to the first row.  A query that responds quickly but then stalls before its first row still wins.
+
+    With callbacks (the async API), the winner's query result is handed to `callback`, the caller is responsible for
+    calling :meth:`hedge` once `hedge_after` has elapsed (e.g. via ``loop.call_later()``).  Without callbacks (the
+    blocking API), the hedge is dispatched by the :class:`.HedgeScheduler` and :meth:`wait_for_core_query_result` waits
+    for the original query in the calling thread.
+    """
+
+    def __init__(self,
+                 client: _CoreClient,
+                 request: QueryRequest,
+                 hedge_after: float,
+                 budget: HedgingBudget,
+                 callback: Optional[Callable[..., None]] = None,
+                 row_callback: Optional[Callable[..., None]] = None,
+                 retry: bool = False) -> None:
+        self._client = client
+        self._request = request
+        self._hedge_after = hedge_after
+        self._budget = budget
+        self._callback = callback
+        self._row_callback = row_callback
+        self._lock = Lock()
+        self._decided = Event()
+        self._candidates: List[_HedgeCandidate] = []
+        self._winner: Optional[_HedgeCandidate] = None
+        self._hedge_dispatched = False
+        self._cancelled = False
+        self._hedge_timer: Optional[HedgeTimer] = None
+        if not retry:
+            # a retried query (i.e. dispatched again by the executor) is only counted once against the hedging budget
+            self._budget.request_started()
+        self._start_candidate(is_hedge=False)
+        if self._callback is None:
+            self._hedge_timer = get_hedge_scheduler().call_later(self._hedge_after, self.hedge)
+
+    @property
+    def hedge_after(self) -> float:
+        return self._hedge_after
+
+    def _start_candidate(self, is_hedge: bool) -> None:
+        candidate = _HedgeCandidate(is_hedge)
+        with self._lock:
+            self._candidates.append(candidate)
+        if self._callback is not None:
+            candidate.query_iter = self._client.columnar_query_op(self._request,
+                                                                  callback=partial(self._candidate_done, candidate),
+                                                                  row_callback=self._row_callback)
+        else:
+            candidate.query_iter = self._client.columnar_query_op(self._request)
+            if is_hedge:
+                # the original query is waited for by wait_for_core_query_result()
+                get_hedge_scheduler().submit(self._wait_for_candidate, candidate)
+        with self._lock:
+            # the outcome might have been decided before the query iterator was available to cancel
+            lost = self._cancelled or (self._winner is not None and self._winner is not candidate)
+        if lost:
+            candidate.query_iter.cancel()
+
+    def _wait_for_candidate(self, candidate: _HedgeCandidate) -> None:
+        if candidate.query_iter is not None:
+            self._candidate_done(candidate, candidate.query_iter.wait_for_core_query_result())
+
+    def _candidate_done(self, candidate: _HedgeCandidate, res: Union[bool, Exception]) -> None:
+        with self._lock:
+            candidate.done = True
+            candidate.result = res
+            if self._winner is not None:
+                return
+            failed = isinstance(res, Exception)
+            if failed and not all(c.done for c in self._candidates):
+                # another query might still succeed
+                return
+            # if all queries failed, the original query's error is reported
+            winner = self._candidates[0] if failed else candidate
+            self._winner = winner
+            losers = [c for c in self._candidates if c is not winner]
+
+        self._cancel_hedge_timer()
+        for loser in losers:
+            if loser.query_iter is not None:
+                loser.query_iter.cancel()
+        if winner.is_hedge:
+            self._budget.hedge_won()
+        self._decided.set()
+        if self._callback is not None:
+            self._callback(winner.result)
+
+    def _cancel_hedge_timer(self) -> None:
+        # the scheduler would otherwise reference the iterator until hedge_after has elapsed
+        if self._hedge_timer is not None:
+            self._hedge_timer.cancel()
+
+    def hedge(self) -> None:
+        """Dispatches the hedge if the query has not responded (and the hedging budget allows it)."""
+        with self._lock:
+            if self._winner is not None or self._hedge_dispatched or self._cancelled:
+                return
+            self._hedge_dispatched = True
+        if not self._budget.try_acquire():
+            return
+        try:
+            self._start_candidate(is_hedge=True)
+        except Exception as ex:
+            get_sdk_logger().debug(f'Unable to dispatch hedged query: {ex!r}')
+            # the hedge is the last candidate, mark it failed so the outcome can be decided
+            self._candidate_done(self._candidates[-1], ex)
+
+    def wait_for_core_query_result(self) -> Union[bool, CoreColumnarError]:
+        original = self._candidates[0]
+        if not original.done:
+            # a winning hedge cancels the original query, which completes the wait
+            self._wait_for_candidate(original)
+        # the original query failed, the hedge (if dispatched) might still succeed
+        self._decided.wait()
+        # an error is always the original query's (i.e. the core's) error
+        return self._winner.result if self._winner is not None else False  # type: ignore[return-value]
+
+    def _winner_iter(self) -> CoreQueryIterator:
+        if self._winner is None or self._winner.query_iter is None:
+            raise RuntimeError('Query rows are only available once the query has responded.')
+        return self._winner.query_iter
+
+    def metadata(self) -> Any:
+        return self._winner_iter().metadata()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            candidates = list(self._candidates)
+        self._cancel_hedge_timer()
+        for candidate in candidates:
+            if candidate.query_iter is not None:
+                candidate.query_iter.cancel()
+
+    def __iter__(self) -> HedgedQueryIterator:
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._winner_iter())
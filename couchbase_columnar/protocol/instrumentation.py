@@ -0,0 +1,426 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+from datetime import timedelta
+from functools import lru_cache
+from threading import Lock
+from time import perf_counter_ns
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    Dict,
+                    List,
+                    Match,
+                    Optional)
+
+from couchbase_columnar.common.errors import QueryOperationCanceledError
+from couchbase_columnar.common.metrics import MetricsSnapshot
+from couchbase_columnar.protocol import get_sdk_logger
+from couchbase_columnar.protocol.metrics_registry import MetricsRegistry, MetricsReporter
+
+if TYPE_CHECKING:
+    from couchbase_columnar.common.metrics import Meter, ValueRecorder
+    from couchbase_columnar.common.query import QueryMetadata
+    from couchbase_columnar.common.tracing import RequestSpan, RequestTracer
+    from couchbase_columnar.protocol.core.request import QueryRequest
+
+QUERY_SPAN_NAME = 'query'
+REQUEST_ENCODING_SPAN_NAME = 'request_encoding'
+DISPATCH_SPAN_NAME = 'dispatch_to_server'
+
+# durations are recorded in microseconds, sizes in bytes
+REQUEST_ENCODING_METRIC = 'columnar.query.request_encoding_duration'
+DISPATCH_METRIC = 'columnar.query.dispatch_duration'
+TIME_TO_FIRST_ROW_METRIC = 'columnar.query.time_to_first_row'
+ROW_DESERIALIZATION_METRIC = 'columnar.query.row_deserialization_duration'
+DESERIALIZATION_METRIC = 'columnar.query.deserialization_duration'
+STREAMING_METRIC = 'columnar.query.streaming_duration'
+DURATION_METRIC = 'columnar.query.duration'
+RESULT_ROWS_METRIC = 'columnar.query.result_rows'
+RESULT_BYTES_METRIC = 'columnar.query.result_bytes'
+
+OUTCOME_SUCCESS = 'Success'
+OUTCOME_CANCELED = 'Canceled'
+
+# client-side durations checked against the slow_query_threshold cluster option
+SLOW_QUERY_DURATIONS = ['total', 'time_to_first_row', 'streaming']
+
+
+def _ns_to_us(value: int) -> int:
+    return value // 1000
+
+
+def _timedelta_to_us(value: timedelta) -> int:
+    return value // timedelta(microseconds=1)
+
+
+# backtick quoted identifiers are kept as-is, string and numeric literals are replaced w/ '?'
+_STATEMENT_TOKEN_PATTERN = re.compile(r"""(?P<identifier>`(?:[^`]|``)*`)"""
+                                      r"""|(?P<string>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")"""
+                                      r"""|(?P<number>(?<![\w$])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)""")
+_LITERAL_LIST_PATTERN = re.compile(r'\[\s*\?(?:\s*,\s*\?)*\s*\]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _replace_literal(match: Match[str]) -> str:
+    if match.group('identifier') is not None:
+        return match.group('identifier')
+    return '?'
+
+
+@lru_cache(maxsize=1024)
+def fingerprint_statement(statement: str) -> str:
+    """
+    **INTERNAL**
+
+    Normalizes a statement so that statements only differing by literal values share a fingerprint.
+    """
+    fingerprint = _STATEMENT_TOKEN_PATTERN.sub(_replace_literal, statement)
+    fingerprint = _LITERAL_LIST_PATTERN.sub('[?]', fingerprint)
+    return _WHITESPACE_PATTERN.sub(' ', fingerprint).strip().rstrip(';').rstrip()
+
+
+def _get_outcome(error: Optional[BaseException]) -> str:
+    if error is None:
+        return OUTCOME_SUCCESS
+    if (isinstance(error, QueryOperationCanceledError)
+            or isinstance(getattr(error, '_base', None), QueryOperationCanceledError)):
+        return OUTCOME_CANCELED
+    return type(error).__name__
+
+
+class QueryTracker:
+    """
+    **INTERNAL**
+
+    Collects the timings of a single query.  Only created when a tracer, meter, built-in metrics and/or the slow query
+    log is configured, executors skip all bookkeeping when they do not have a tracker.
+    """
+
+    def __init__(self,
+                 statement: str,
+                 tracer: Optional[RequestTracer] = None,
+                 meter: Optional[Meter] = None,
+                 registry: Optional[MetricsRegistry] = None,
+                 slow_query_threshold: Optional[int] = None) -> None:
+        self._statement = statement
+        self._tracer = tracer
+        self._meter = meter
+        self._registry = registry
+        self._slow_query_threshold = slow_query_threshold
+        self._parameter_count = 0
+        self._start_ns = perf_counter_ns()
+        self._encoded_ns: Optional[int] = None
+        self._dispatch_start_ns: Optional[int] = None
+        self._dispatch_end_ns: Optional[int] = None
+        self._first_row_ns: Optional[int] = None
+        self._attempts = 1
+        self._end_ns: Optional[int] = None
+        # for the async API, the query can be finished from the C++ core's callback and cancelled on the event loop
+        self._finish_lock = Lock()
+        self._row_count = 0
+        self._byte_count = 0
+        self._deserialization_ns = 0
+        self._outcome: Optional[str] = None
+        self._row_deserialization_recorder: Optional[ValueRecorder] = None
+        self._span: Optional[RequestSpan] = None
+        self._encoding_span: Optional[RequestSpan] = None
+        self._dispatch_span: Optional[RequestSpan] = None
+        if self._tracer is not None:
+            self._span = self._tracer.request_span(QUERY_SPAN_NAME)
+            self._span.set_attribute('db.system', 'couchbase')
+            self._span.set_attribute('db.couchbase.service', 'analytics')
+            self._span.set_attribute('db.operation', 'query')
+            self._span.set_attribute('db.statement', statement)
+            self._encoding_span = self._tracer.request_span(REQUEST_ENCODING_SPAN_NAME, parent=self._span)
+
+    @property
+    def finished(self) -> bool:
+        return self._end_ns is not None
+
+    @property
+    def outcome(self) -> Optional[str]:
+        return self._outcome
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    @property
+    def byte_count(self) -> int:
+        return self._byte_count
+
+    @property
+    def span(self) -> Optional[RequestSpan]:
+        return self._span
+
+    def request_encoded(self, request: QueryRequest) -> None:
+        self._encoded_ns = perf_counter_ns()
+        if request.options is not None:
+            self._parameter_count = (len(request.options.get('positional_parameters', None) or [])
+                                     + len(request.options.get('named_parameters', None) or {}))
+        if self._encoding_span is not None:
+            self._encoding_span.end()
+        if self._span is not None:
+            if request.database_name is not None:
+                self._span.set_attribute('db.name', request.database_name)
+            if request.scope_name is not None:
+                self._span.set_attribute('db.couchbase.scope', request.scope_name)
+
+    def dispatch_started(self) -> None:
+        # a retried query's dispatch duration includes all of its attempts
+        if self._dispatch_start_ns is None:
+            self._dispatch_start_ns = perf_counter_ns()
+        if self._tracer is not None:
+            self._dispatch_span = self._tracer.request_span(DISPATCH_SPAN_NAME, parent=self._span)
+
+    def dispatch_retried(self, attempt: int) -> None:
+        """
+        **INTERNAL**
+
+        Called when the query failed before returning any rows and will be dispatched again, each attempt has its own
+        dispatch span.  For the async API this is called from the C++ core's callback.
+        """
+        self._attempts = attempt
+        if self._dispatch_span is not None:
+            self._dispatch_span.set_attribute('outcome', 'retried')
+            self._dispatch_span.end()
+            self._dispatch_span = None
+
+    def dispatch_completed(self) -> None:
+        """
+        **INTERNAL**
+
+        Called once the core has a response from the server (i.e. the query result is ready to be streamed).  For the
+        async API this is called from the C++ core's callback, and therefore not on the event loop thread.
+        """
+        if self._dispatch_end_ns is not None:
+            return
+        self._dispatch_end_ns = perf_counter_ns()
+        if self._dispatch_span is not None:
+            self._dispatch_span.end()
+
+    def row_received(self, row: bytes) -> None:
+        if self._first_row_ns is None:
+            self._first_row_ns = perf_counter_ns()
+        self._row_count += 1
+        self._byte_count += len(row)
+
+    def row_deserialized(self, elapsed_ns: int) -> None:
+        self._deserialization_ns += elapsed_ns
+        if self._meter is not None:
+            if self._row_deserialization_recorder is None:
+                self._row_deserialization_recorder = self._meter.value_recorder(ROW_DESERIALIZATION_METRIC,
+                                                                                self._tags())
+            self._row_deserialization_recorder.record_value(_ns_to_us(elapsed_ns))
+
+    def finish(self,
+               error: Optional[BaseException] = None,
+               get_metadata: Optional[Callable[[], QueryMetadata]] = None) -> None:
+        """
+        **INTERNAL**
+
+        Records the query's outcome.  `get_metadata` is only called if the query needs to be written to the slow query
+        log, so a successful query's metadata is not fetched unless needed.
+        """
+        with self._finish_lock:
+            if self._end_ns is not None:
+                return
+            self._end_ns = perf_counter_ns()
+        self._outcome = _get_outcome(error)
+        durations = self.durations()
+        if self._meter is not None:
+            self._record_metrics(self._meter, self._outcome, durations)
+        if self._registry is not None:
+            self._registry.record_query(fingerprint_statement(self._statement),
+                                        self._outcome,
+                                        durations['total'] or 0,
+                                        durations['time_to_first_row'],
+                                        self._row_count,
+                                        self._byte_count)
+        if self._span is not None:
+            self._end_span(self._span, self._outcome, durations)
+        if self._slow_query_threshold is not None:
+            self._log_if_slow(self._slow_query_threshold, self._outcome, durations, get_metadata)
+
+    def cancel(self) -> None:
+        self.finish(QueryOperationCanceledError())
+
+    def durations(self) -> Dict[str, Optional[int]]:
+        """
+        **INTERNAL**
+
+        Returns the query's durations, in microseconds.  A duration is `None` if the query did not reach that stage.
+        """
+        end_ns = self._end_ns if self._end_ns is not None else perf_counter_ns()
+        durations: Dict[str, Optional[int]] = {
+            'request_encoding': None,
+            'dispatch': None,
+            'time_to_first_row': None,
+            'streaming': None,
+            'deserialization': _ns_to_us(self._deserialization_ns),
+            'total': _ns_to_us(end_ns - self._start_ns),
+        }
+        if self._encoded_ns is not None:
+            durations['request_encoding'] = _ns_to_us(self._encoded_ns - self._start_ns)
+        if self._dispatch_start_ns is not None:
+            if self._dispatch_end_ns is not None:
+                durations['dispatch'] = _ns_to_us(self._dispatch_end_ns - self._dispatch_start_ns)
+            if self._first_row_ns is not None:
+                durations['time_to_first_row'] = _ns_to_us(self._first_row_ns - self._dispatch_start_ns)
+            streaming_start_ns = self._dispatch_end_ns or self._first_row_ns
+            if streaming_start_ns is not None:
+                durations['streaming'] = _ns_to_us(end_ns - streaming_start_ns)
+        return durations
+
+    def _record_metrics(self, meter: Meter, outcome: str, durations: Dict[str, Optional[int]]) -> None:
+        tags = self._tags(outcome)
+        for name, value in [(REQUEST_ENCODING_METRIC, durations['request_encoding']),
+                            (DISPATCH_METRIC, durations['dispatch']),
+                            (TIME_TO_FIRST_ROW_METRIC, durations['time_to_first_row']),
+                            (STREAMING_METRIC, durations['streaming']),
+                            (DESERIALIZATION_METRIC, durations['deserialization']),
+                            (DURATION_METRIC, durations['total']),
+                            (RESULT_ROWS_METRIC, self._row_count),
+                            (RESULT_BYTES_METRIC, self._byte_count)]:
+            if value is not None:
+                meter.value_recorder(name, tags).record_value(value)
+
+    def _end_span(self, span: RequestSpan, outcome: str, durations: Dict[str, Optional[int]]) -> None:
+        if self._dispatch_span is not None and self._dispatch_end_ns is None:
+            self._dispatch_span.end()
+        span.set_attribute('outcome', outcome)
+        span.set_attribute('db.couchbase.result_rows', self._row_count)
+        span.set_attribute('db.couchbase.result_bytes', self._byte_count)
+        if self._attempts > 1:
+            span.set_attribute('db.couchbase.retries', self._attempts - 1)
+        for key, value in durations.items():
+            if value is not None:
+                span.set_attribute(f'db.couchbase.{key}_us', value)
+        span.end()
+
+    def _log_if_slow(self,
+                     threshold: int,
+                     outcome: str,
+                     durations: Dict[str, Optional[int]],
+                     get_metadata: Optional[Callable[[], QueryMetadata]]) -> None:
+        exceeded: List[str] = []
+        for key in SLOW_QUERY_DURATIONS:
+            value = durations[key]
+            if value is not None and value > threshold:
+                exceeded.append(key)
+        if not exceeded:
+            return
+        logger = get_sdk_logger()
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+
+        entry: Dict[str, Any] = {
+            'fingerprint': fingerprint_statement(self._statement),
+            'outcome': outcome,
+            'parameter_count': self._parameter_count,
+            'rows': self._row_count,
+            'result_bytes': self._byte_count,
+            'threshold_us': threshold,
+            'exceeded': exceeded,
+            'client': {f'{key}_us': value for key, value in durations.items()},
+        }
+        if get_metadata is not None:
+            try:
+                metadata = get_metadata()
+                metrics = metadata.metrics()
+                entry['request_id'] = metadata.request_id()
+                entry['server'] = {'elapsed_time_us': _timedelta_to_us(metrics.elapsed_time()),
+                                   'execution_time_us': _timedelta_to_us(metrics.execution_time())}
+            except Exception:  # nosec
+                # metadata is best effort, the query has completed so we do not want to raise here
+                pass
+        logger.warning(f'Slow query: {json.dumps(entry)}')
+
+    def _tags(self, outcome: Optional[str] = None) -> Dict[str, str]:
+        tags = {'db.couchbase.service': 'analytics', 'db.operation': 'query'}
+        if outcome is not None:
+            tags['outcome'] = outcome
+        return tags
+
+
+class QueryInstrumentation:
+    """
+    **INTERNAL**
+
+    Per-cluster factory for :class:`.QueryTracker` instances.  Also owns the cluster's built-in metrics registry (and
+    reporter), if enabled.
+    """
+
+    def __init__(self,
+                 tracer: Optional[RequestTracer] = None,
+                 meter: Optional[Meter] = None,
+                 enable_metrics: Optional[bool] = None,
+                 metrics_report_interval: Optional[int] = None,
+                 slow_query_threshold: Optional[int] = None) -> None:
+        self._tracer = tracer
+        self._meter = meter
+        # the threshold option is transformed to microseconds
+        self._slow_query_threshold = slow_query_threshold
+        self._registry: Optional[MetricsRegistry] = None
+        self._reporter: Optional[MetricsReporter] = None
+        if enable_metrics is True or metrics_report_interval is not None:
+            self._registry = MetricsRegistry()
+        if self._registry is not None and metrics_report_interval is not None:
+            # the interval option is transformed to microseconds
+            self._reporter = MetricsReporter(self._registry, metrics_report_interval / 1e6)
+            self._reporter.start()
+
+    @property
+    def enabled(self) -> bool:
+        return (self._tracer is not None
+                or self._meter is not None
+                or self._registry is not None
+                or self._slow_query_threshold is not None)
+
+    @property
+    def metrics_registry(self) -> Optional[MetricsRegistry]:
+        return self._registry
+
+    def close(self) -> None:
+        if self._reporter is not None:
+            self._reporter.stop()
+            self._reporter = None
+
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        if self._registry is None:
+            return MetricsSnapshot(timestamp=time.time())
+        return self._registry.snapshot()
+
+    def start_query(self, statement: str) -> Optional[QueryTracker]:
+        """
+        **INTERNAL**
+
+        Returns `None` when no tracer or meter is configured (and built-in metrics and the slow query log are disabled),
+        so the no-op default adds no per-query/per-row overhead.
+        """
+        if not self.enabled:
+            return None
+        return QueryTracker(statement,
+                            tracer=self._tracer,
+                            meter=self._meter,
+                            registry=self._registry,
+                            slow_query_threshold=self._slow_query_threshold)
@@ -0,0 +1,297 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+import weakref
+from threading import (Event,
+                       Lock,
+                       Thread,
+                       local)
+from typing import (Callable,
+                    Dict,
+                    List,
+                    Optional,
+                    Tuple)
+
+from couchbase_columnar.common.metrics import (HistogramSnapshot,
+                                               MetricsSnapshot,
+                                               QueryMetricsEntry)
+from couchbase_columnar.protocol import get_sdk_logger
+
+# 2^7 sub-buckets per power of 2 keeps the relative error of a recorded value below 1%
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SNAPSHOT_PERCENTILES = [50.0, 90.0, 99.0, 99.9]
+MAX_FINGERPRINTS = 1000
+OTHER_FINGERPRINT = '<other>'
+
+
+def _bucket_index(value: int) -> int:
+    if value < 2 * SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - (SUB_BUCKET_BITS + 1)
+    return shift * SUB_BUCKET_COUNT + (value >> shift)
+
+
+def _bucket_highest_value(index: int) -> int:
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index
+    shift = index // SUB_BUCKET_COUNT - 1
+    top = index - shift * SUB_BUCKET_COUNT
+    return ((top + 1) << shift) - 1
+
+
+class HdrHistogram:
+    """
+    **INTERNAL**
+
+    Log-linear (HDR-style) histogram of non-negative integer values.  Buckets are stored sparsely.
+
+    Not thread-safe, each thread records into its own histograms (see :class:`.MetricsRegistry`).
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[int, int] = {}
+        self._total = 0
+        self._min: Optional[int] = None
+        self._max = 0
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        idx = _bucket_index(value)
+        self._counts[idx] = self._counts.get(idx, 0) + 1
+        self._total += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other: HdrHistogram) -> None:
+        # NOTE: the other histogram's shard must be locked (see :class:`.MetricsRegistry`)
+        for idx, count in other._counts.items():
+            self._counts[idx] = self._counts.get(idx, 0) + count
+        self._total += other._total
+        other_min = other._min
+        if other_min is not None and (self._min is None or other_min < self._min):
+            self._min = other_min
+        if other._max > self._max:
+            self._max = other._max
+
+    def snapshot(self, percentiles: Optional[List[float]] = None) -> HistogramSnapshot:
+        count = sum(self._counts.values())
+        if count == 0:
+            return HistogramSnapshot()
+        if percentiles is None:
+            percentiles = SNAPSHOT_PERCENTILES
+        sorted_buckets = sorted(self._counts.items())
+        values: Dict[str, int] = {}
+        for p in percentiles:
+            target = max(1, math.ceil(p / 100 * count))
+            seen = 0
+            for idx, bucket_count in sorted_buckets:
+                seen += bucket_count
+                if seen >= target:
+                    values[f'p{p:g}'] = min(_bucket_highest_value(idx), self._max)
+                    break
+        return HistogramSnapshot(count=count,
+                                 min=self._min or 0,
+                                 max=self._max,
+                                 mean=self._total / count,
+                                 percentiles=values)
+
+
+class _QueryHistograms:
+    def __init__(self) -> None:
+        self.latency = HdrHistogram()
+        self.time_to_first_row = HdrHistogram()
+        self.rows = HdrHistogram()
+        self.bytes = HdrHistogram()
+
+    def merge(self, other: _QueryHistograms) -> None:
+        self.latency.merge(other.latency)
+        self.time_to_first_row.merge(other.time_to_first_row)
+        self.rows.merge(other.rows)
+        self.bytes.merge(other.bytes)
+
+
+class _Shard:
+    """A single thread's histograms, the lock is only contended while a snapshot is merging the shard."""
+
+    __slots__ = ('histograms', 'lock')
+
+    def __init__(self) -> None:
+        self.histograms: Dict[Tuple[str, str], _QueryHistograms] = {}
+        self.lock = Lock()
+
+
+class _ShardHolder:
+    """Only referenced by its thread's thread-local storage, i.e. released once the thread exits."""
+
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self) -> None:
+        self.shard = _Shard()
+
+
+def _merge_histograms(merged: Dict[Tuple[str, str], _QueryHistograms],
+                      histograms: Dict[Tuple[str, str], _QueryHistograms]) -> None:
+    for key, query_histograms in histograms.items():
+        if key not in merged:
+            merged[key] = _QueryHistograms()
+        merged[key].merge(query_histograms)
+
+
+def _retire_shard(get_registry: Callable[[], Optional[MetricsRegistry]], shard: _Shard) -> None:
+    registry = get_registry()
+    if registry is not None:
+        registry._retire_shard(shard)
+
+
+class MetricsRegistry:
+    """
+    **INTERNAL**
+
+    In-process registry of query histograms, keyed by statement fingerprint and outcome.
+
+    Each thread records into its own shard so recording never waits on other threads; shards are merged when a snapshot
+    is taken.  Once a thread exits, its shard is folded into the registry's retired histograms so the number of shards
+    is bounded by the number of live threads.
+    """
+
+    def __init__(self) -> None:
+        self._local = local()
+        self._shards: List[_Shard] = []
+        self._retired: Dict[Tuple[str, str], _QueryHistograms] = {}
+        self._shards_lock = Lock()
+
+    def _get_shard(self) -> _Shard:
+        holder: Optional[_ShardHolder] = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _ShardHolder()
+            self._local.holder = holder
+            with self._shards_lock:
+                self._shards.append(holder.shard)
+            # the finalizer must not keep the registry alive
+            weakref.finalize(holder, _retire_shard, weakref.ref(self), holder.shard)
+        return holder.shard
+
+    def _retire_shard(self, shard: _Shard) -> None:
+        with self._shards_lock:
+            self._shards.remove(shard)
+            with shard.lock:
+                for key, histograms in shard.histograms.items():
+                    if key not in self._retired and len(self._retired) >= MAX_FINGERPRINTS:
+                        key = (OTHER_FINGERPRINT, key[1])
+                    if key not in self._retired:
+                        self._retired[key] = _QueryHistograms()
+                    self._retired[key].merge(histograms)
+
+    def record_query(self,
+                     fingerprint: str,
+                     outcome: str,
+                     latency: int,
+                     time_to_first_row: Optional[int],
+                     rows: int,
+                     result_bytes: int) -> None:
+        shard = self._get_shard()
+        with shard.lock:
+            histograms = shard.histograms.get((fingerprint, outcome), None)
+            if histograms is None:
+                key = (fingerprint, outcome)
+                if len(shard.histograms) >= MAX_FINGERPRINTS:
+                    # keep the registry's memory bounded if statements are not parameterized
+                    key = (OTHER_FINGERPRINT, outcome)
+                    histograms = shard.histograms.get(key, None)
+                if histograms is None:
+                    histograms = _QueryHistograms()
+                    shard.histograms[key] = histograms
+            histograms.latency.record(latency)
+            if time_to_first_row is not None:
+                histograms.time_to_first_row.record(time_to_first_row)
+            histograms.rows.record(rows)
+            histograms.bytes.record(result_bytes)
+
+    def snapshot(self) -> MetricsSnapshot:
+        merged: Dict[Tuple[str, str], _QueryHistograms] = {}
+        with self._shards_lock:
+            # a shard is either live or retired, never both
+            shards = list(self._shards)
+            _merge_histograms(merged, self._retired)
+        for shard in shards:
+            with shard.lock:
+                _merge_histograms(merged, shard.histograms)
+
+        entries = [QueryMetricsEntry(fingerprint=fingerprint,
+                                     outcome=outcome,
+                                     latency=histograms.latency.snapshot(),
+                                     time_to_first_row=histograms.time_to_first_row.snapshot(),
+                                     rows=histograms.rows.snapshot(),
+                                     bytes=histograms.bytes.snapshot())
+                   for (fingerprint, outcome), histograms in sorted(merged.items())]
+        return MetricsSnapshot(timestamp=time.time(), entries=entries)
+
+
+class MetricsReporter:
+    """
+    **INTERNAL**
+
+    Periodically logs a :class:`.MetricsRegistry` snapshot, at INFO level, to the logger provided to
+    :func:`~couchbase_columnar.configure_logging`.
+    """
+
+    def __init__(self, registry: MetricsRegistry, interval: float) -> None:
+        self._registry = registry
+        self._interval = interval
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name='pycbcc-metrics-reporter', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def report(self) -> None:
+        snapshot = self._registry.snapshot()
+        if not snapshot.entries:
+            return
+        logger = get_sdk_logger()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f'Query metrics: {json.dumps(snapshot.as_dict())}')
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.report()
+            except Exception:  # nosec
+                # the reporter should never take down the application
+                pass
@@ -33,18 +33,32 @@ if sys.version_info < (3, 10):
 else:
     from typing import TypeAlias
 
+from couchbase_columnar.common.circuit_breaker import CircuitBreakerConfig
 from couchbase_columnar.common.core.utils import (VALIDATE_BOOL,
+                                                  VALIDATE_CIRCUIT_BREAKER,
                                                   VALIDATE_DESERIALIZER,
                                                   VALIDATE_INT,
+                                                  VALIDATE_METER,
+                                                  VALIDATE_RETRY_POLICY,
                                                   VALIDATE_STR,
                                                   VALIDATE_STR_LIST,
+                                                  VALIDATE_TRACER,
                                                   EnumToStr,
                                                   timedelta_as_microseconds,
                                                   to_microseconds,
+                                                  validate_non_negative_timedelta,
                                                   validate_path,
+                                                  validate_positive_float,
+                                                  validate_positive_int,
+                                                  validate_positive_timedelta,
+                                                  validate_projection,
+                                                  validate_ratio,
                                                   validate_raw_dict)
 from couchbase_columnar.common.deserializer import Deserializer
-from couchbase_columnar.common.enums import IpProtocol, QueryScanConsistency
+from couchbase_columnar.common.enums import (IpProtocol,
+                                             QueryRowFormat,
+                                             QueryScanConsistency)
+from couchbase_columnar.common.metrics import Meter
 from couchbase_columnar.common.options import (ClusterOptions,
                                                OptionsClass,
                                                QueryOptions,
@@ -53,6 +67,9 @@ from couchbase_columnar.common.options import (ClusterOptions,
 from couchbase_columnar.common.options_base import (ClusterOptionsValidKeys,
                                                     SecurityOptionsValidKeys,
                                                     TimeoutOptionsValidKeys)
+from couchbase_columnar.common.retry import RetryPolicy
+from couchbase_columnar.common.tracing import RequestTracer
+from couchbase_columnar.protocol.warm_up import validate_warm_up_connections
 
 QUERY_CONSISTENCY_TO_STR = EnumToStr[QueryScanConsistency]()
 
@@ -60,6 +77,8 @@ QueryStrVal = Union[List[str], str, bool, int]
 
 
 class ClusterOptionsTransforms(TypedDict):
+    circuit_breaker: Dict[Literal['circuit_breaker'], Callable[[Any], CircuitBreakerConfig]]
+    concurrency_queue_timeout: Dict[Literal['concurrency_queue_timeout'], Callable[[Any], int]]
     config_poll_floor: Dict[Literal['config_poll_floor'], Callable[[Any], int]]
     config_poll_interval: Dict[Literal['config_poll_interval'], Callable[[Any], int]]
     deserializer: Dict[Literal['deserializer'], Callable[[Any], Deserializer]]
@@ -67,14 +86,30 @@ class ClusterOptionsTransforms(TypedDict):
     dns_port: Dict[Literal['dns_port'], Callable[[Any], int]]
     dump_configuration: Dict[Literal['dump_configuration'], Callable[[Any], bool]]
     enable_clustermap_notification: Dict[Literal['enable_clustermap_notification'], Callable[[Any], bool]]
+    enable_metrics: Dict[Literal['enable_metrics'], Callable[[Any], bool]]
+    hedging_budget: Dict[Literal['hedging_budget'], Callable[[Any], float]]
     ip_protocol: Dict[Literal['use_ip_protocol'], Callable[[Any], str]]
+    max_concurrent_queries: Dict[Literal['max_concurrent_queries'], Callable[[Any], int]]
+    meter: Dict[Literal['meter'], Callable[[Any], Meter]]
+    metrics_report_interval: Dict[Literal['metrics_report_interval'], Callable[[Any], int]]
     network: Dict[Literal['network'], Callable[[Any], str]]
+    reserved_priority_slots: Dict[Literal['reserved_priority_slots'], Callable[[Any], int]]
+    retry_budget: Dict[Literal['retry_budget'], Callable[[Any], float]]
+    retry_policy: Dict[Literal['retry_policy'], Callable[[Any], RetryPolicy]]
     security_options: Dict[Literal['security_options'], Callable[[Any], Any]]
+    slow_query_threshold: Dict[Literal['slow_query_threshold'], Callable[[Any], int]]
+    tenant_burst: Dict[Literal['tenant_burst'], Callable[[Any], int]]
+    tenant_max_concurrent_queries: Dict[Literal['tenant_max_concurrent_queries'], Callable[[Any], int]]
+    tenant_rate_limit: Dict[Literal['tenant_rate_limit'], Callable[[Any], float]]
     timeout_options: Dict[Literal['timeout_options'], Callable[[Any], Any]]
+    tracer: Dict[Literal['tracer'], Callable[[Any], RequestTracer]]
     user_agent_extra: Dict[Literal['user_agent_extra'], Callable[[Any], str]]
+    warmup_connections: Dict[Literal['warmup_connections'], Callable[[Any], int]]
 
 
 CLUSTER_OPTIONS_TRANSFORMS: ClusterOptionsTransforms = {
+    'circuit_breaker': {'circuit_breaker': VALIDATE_CIRCUIT_BREAKER},
+    'concurrency_queue_timeout': {'concurrency_queue_timeout': validate_non_negative_timedelta},
     'config_poll_floor': {'config_poll_floor': timedelta_as_microseconds},
     'config_poll_interval': {'config_poll_interval': timedelta_as_microseconds},
     'deserializer': {'deserializer': VALIDATE_DESERIALIZER},
@@ -82,15 +117,31 @@ CLUSTER_OPTIONS_TRANSFORMS: ClusterOptionsTransforms = {
     'dns_port': {'dns_port': VALIDATE_INT},
     'dump_configuration': {'dump_configuration': VALIDATE_BOOL},
     'enable_clustermap_notification': {'enable_clustermap_notification': VALIDATE_BOOL},
+    'enable_metrics': {'enable_metrics': VALIDATE_BOOL},
+    'hedging_budget': {'hedging_budget': validate_ratio},
     'ip_protocol': {'use_ip_protocol': EnumToStr[IpProtocol]()},
+    'max_concurrent_queries': {'max_concurrent_queries': validate_positive_int},
+    'meter': {'meter': VALIDATE_METER},
+    'metrics_report_interval': {'metrics_report_interval': validate_positive_timedelta},
     'network': {'network': VALIDATE_STR},
+    'reserved_priority_slots': {'reserved_priority_slots': validate_positive_int},
+    'retry_budget': {'retry_budget': validate_ratio},
+    'retry_policy': {'retry_policy': VALIDATE_RETRY_POLICY},
     'security_options': {'security_options': lambda x: x},
+    'slow_query_threshold': {'slow_query_threshold': validate_positive_timedelta},
+    'tenant_burst': {'tenant_burst': validate_positive_int},
+    'tenant_max_concurrent_queries': {'tenant_max_concurrent_queries': validate_positive_int},
+    'tenant_rate_limit': {'tenant_rate_limit': validate_positive_float},
     'timeout_options': {'timeout_options': lambda x: x},
+    'tracer': {'tracer': VALIDATE_TRACER},
     'user_agent_extra': {'user_agent_extra': VALIDATE_STR},
+    'warmup_connections': {'warmup_connections': validate_warm_up_connections},
 }
 
 
 class ClusterOptionsTransformedKwargs(TypedDict, total=False):
+    circuit_breaker: Optional[CircuitBreakerConfig]
+    concurrency_queue_timeout: Optional[int]
     config_poll_floor: Optional[int]
     config_poll_interval: Optional[int]
     deserializer: Optional[Deserializer]
@@ -98,11 +149,25 @@ class ClusterOptionsTransformedKwargs(TypedDict, total=False):
     dns_port: Optional[int]
     dump_configuration: Optional[bool]
     enable_clustermap_notification: Optional[bool]
+    enable_metrics: Optional[bool]
+    hedging_budget: Optional[float]
+    max_concurrent_queries: Optional[int]
+    meter: Optional[Meter]
+    metrics_report_interval: Optional[int]
     network: Optional[str]
+    reserved_priority_slots: Optional[int]
+    retry_budget: Optional[float]
+    retry_policy: Optional[RetryPolicy]
     security_options: Optional[SecurityOptionsTransformedKwargs]
+    slow_query_threshold: Optional[int]
+    tenant_burst: Optional[int]
+    tenant_max_concurrent_queries: Optional[int]
+    tenant_rate_limit: Optional[float]
     timeout_options: Optional[TimeoutOptionsTransformedKwargs]
+    tracer: Optional[RequestTracer]
     user_agent_extra: Optional[str]
     use_ip_protocol: Optional[str]
+    warmup_connections: Optional[int]
 
 
 class SecurityOptionsTransforms(TypedDict):
@@ -166,56 +231,92 @@ class TimeoutOptionsTransformedKwargs(TypedDict, total=False):
 
 
 QueryOptionsValidKeys: TypeAlias = Literal[
+    'deadline',
     'deserializer',
+    'hedge_after',
+    'idle_row_timeout',
     'lazy_execute',
+    'max_result_bytes',
+    'max_rows',
     'named_parameters',
     'positional_parameters',
     'priority',
+    'project',
     'query_context',
     'raw',
     'read_only',
+    'retry_policy',
+    'row_format',
     'scan_consistency',
+    'tenant',
     'timeout',
 ]
 
 
 class QueryOptionsTransforms(TypedDict):
+    deadline: Dict[Literal['deadline'], Callable[[Any], int]]
     deserializer: Dict[Literal['deserializer'], Callable[[Any], Deserializer]]
+    hedge_after: Dict[Literal['hedge_after'], Callable[[Any], int]]
+    idle_row_timeout: Dict[Literal['idle_row_timeout'], Callable[[Any], int]]
     lazy_execute: Dict[Literal['lazy_execute'], Callable[[Any], bool]]
+    max_result_bytes: Dict[Literal['max_result_bytes'], Callable[[Any], int]]
+    max_rows: Dict[Literal['max_rows'], Callable[[Any], int]]
     named_parameters: Dict[Literal['named_parameters'], Callable[[Any], Any]]
     positional_parameters: Dict[Literal['positional_parameters'], Callable[[Any], Any]]
     priority: Dict[Literal['priority'], Callable[[Any], bool]]
+    project: Dict[Literal['project'], Callable[[Any], List[str]]]
     query_context: Dict[Literal['query_context'], Callable[[Any], str]]
     raw: Dict[Literal['raw'], Callable[[Any], Dict[str, Any]]]
     read_only: Dict[Literal['readonly'], Callable[[Any], bool]]
+    retry_policy: Dict[Literal['retry_policy'], Callable[[Any], RetryPolicy]]
+    row_format: Dict[Literal['row_format'], Callable[[Any], str]]
     scan_consistency: Dict[Literal['scan_consistency'], Callable[[Any], str]]
+    tenant: Dict[Literal['tenant'], Callable[[Any], str]]
     timeout: Dict[Literal['timeout'], Callable[[Any], int]]
 
 
 QUERY_OPTIONS_TRANSFORMS: QueryOptionsTransforms = {
+    'deadline': {'deadline': validate_positive_timedelta},
     'deserializer': {'deserializer': VALIDATE_DESERIALIZER},
+    'hedge_after': {'hedge_after': validate_positive_timedelta},
+    'idle_row_timeout': {'idle_row_timeout': validate_positive_timedelta},
     'lazy_execute': {'lazy_execute': VALIDATE_BOOL},
+    'max_result_bytes': {'max_result_bytes': validate_positive_int},
+    'max_rows': {'max_rows': validate_positive_int},
     'named_parameters':  {'named_parameters': lambda x: x},
     'positional_parameters':  {'positional_parameters': lambda x: x},
     'priority': {'priority': VALIDATE_BOOL},
+    'project': {'project': validate_projection},
     'query_context': {'query_context': VALIDATE_STR},
     'raw': {'raw': validate_raw_dict},
     'read_only': {'readonly': VALIDATE_BOOL},
+    'retry_policy': {'retry_policy': VALIDATE_RETRY_POLICY},
+    'row_format': {'row_format': EnumToStr[QueryRowFormat]()},
     'scan_consistency': {'scan_consistency': QUERY_CONSISTENCY_TO_STR},
+    'tenant': {'tenant': VALIDATE_STR},
     'timeout': {'timeout': to_microseconds}
 }
 
 
 class QueryOptionsTransformedKwargs(TypedDict, total=False):
+    deadline: Optional[int]
     deserializer: Optional[Deserializer]
+    hedge_after: Optional[int]
+    idle_row_timeout: Optional[int]
     lazy_execute: Optional[bool]
+    max_result_bytes: Optional[int]
+    max_rows: Optional[int]
     named_parameters: Optional[Any]
     positional_parameters: Optional[Any]
     priority: Optional[bool]
+    project: Optional[List[str]]
     query_context: Optional[str]
     raw: Optional[Dict[str, Any]]
     readonly: Optional[bool]
+    retry_policy: Optional[RetryPolicy]
+    row_format: Optional[str]
     scan_consistency: Optional[str]
+    tenant: Optional[str]
     timeout: Optional[int]
 
 
@@ -42,6 +42,8 @@ class pycbcc_logger:
     def configure_logging_sink(self, *args: object, **kwargs: object) -> None: ...
     def create_console_logger(self, *args: object, **kwargs: object) -> None: ...
     def enable_protocol_logger(self, *args: object, **kwargs: object) -> None: ...
+    def dropped_log_messages(self) -> int: ...
+    def shutdown_logging_sink(self) -> None: ...
 
 class result:
     raw_result: Dict[str, Any]
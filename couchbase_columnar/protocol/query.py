@@ -15,26 +15,54 @@
 
 from __future__ import annotations
 
+import weakref
 from concurrent.futures import Future, ThreadPoolExecutor
 from threading import Event
+from time import perf_counter_ns
 from typing import (TYPE_CHECKING,
                     Any,
                     Optional,
+                    TypeVar,
                     Union)
 
-from couchbase_columnar.common.errors import (ColumnarError,
+from couchbase_columnar.common.deserializer import Deserializer
+from couchbase_columnar.common.errors import (CircuitOpenError,
+                                              ColumnarError,
+                                              DeadlineExceededError,
                                               InternalSDKError,
-                                              QueryOperationCanceledError)
+                                              QueryOperationCanceledError,
+                                              QueryRejectedError)
 from couchbase_columnar.common.query import CancelToken, QueryMetadata
-from couchbase_columnar.common.streaming import StreamingExecutor, StreamingState
+from couchbase_columnar.common.streaming import (ResultLimits,
+                                                 StreamingExecutor,
+                                                 StreamingState)
 from couchbase_columnar.protocol.core.result import CoreQueryIterator
+from couchbase_columnar.protocol.deadline import (PHASE_DISPATCH,
+                                                  PHASE_STREAMING,
+                                                  Deadline)
 from couchbase_columnar.protocol.errors import (ClientError,
                                                 CoreColumnarError,
                                                 ErrorMapper)
+from couchbase_columnar.protocol.hedging import (HedgedQueryIterator,
+                                                 HedgingBudget,
+                                                 get_hedge_after)
+from couchbase_columnar.protocol.instrumentation import fingerprint_statement
+from couchbase_columnar.protocol.tenancy import get_tenant
+from couchbase_columnar.protocol.watchdog import (get_idle_row_timeout,
+                                                  get_stream_watchdog,
+                                                  idle_row_timeout_error)
 
 if TYPE_CHECKING:
+    from couchbase_columnar.protocol.admission import AdaptiveConcurrencyLimiter, AdmissionPermit
+    from couchbase_columnar.protocol.circuit_breaker import CircuitBreakerPermit, CircuitBreakers
     from couchbase_columnar.protocol.core.client import _CoreClient
     from couchbase_columnar.protocol.core.request import QueryRequest
+    from couchbase_columnar.protocol.instrumentation import QueryTracker
+    from couchbase_columnar.protocol.retry import RetryEngine
+    from couchbase_columnar.protocol.tenancy import TenantPermit, TenantThrottle
+    from couchbase_columnar.protocol.watchdog import IdleWatch
+
+ErrT = TypeVar('ErrT', bound=Exception)
 
 
 class _QueryStreamingExecutor(StreamingExecutor):
@@ -46,7 +74,13 @@ class _QueryStreamingExecutor(StreamingExecutor):
                  client: _CoreClient,
                  request: QueryRequest,
                  cancel_token: Optional[CancelToken] = None,
-                 lazy_execute: Optional[bool] = None) -> None:
+                 lazy_execute: Optional[bool] = None,
+                 tracker: Optional[QueryTracker] = None,
+                 hedging_budget: Optional[HedgingBudget] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 tenant_throttle: Optional[TenantThrottle] = None,
+                 retry_engine: Optional[RetryEngine] = None,
+                 circuit_breakers: Optional[CircuitBreakers] = None) -> None:
         self._client = client
         self._request = request
         self._deserializer = request.deserializer
@@ -57,7 +91,31 @@ class _QueryStreamingExecutor(StreamingExecutor):
         self._streaming_state = StreamingState.NotStarted
         self._metadata: Optional[QueryMetadata] = None
         self._cancel_token: Optional[CancelToken] = cancel_token
-        self._query_iter: CoreQueryIterator
+        # set once the query is cancelled, interrupts the backoff before a retry
+        self._cancelled = Event()
+        self._result_limits = ResultLimits.from_query_options(request.options)
+        self._tracker = tracker
+        if self._tracker is not None:
+            self._tracker.request_encoded(request)
+        self._hedging_budget = hedging_budget
+        self._hedge_after = get_hedge_after(request.options)
+        self._concurrency_limiter = concurrency_limiter
+        self._permit: Optional[AdmissionPermit] = None
+        # high priority queries are granted most of the slots released while queries wait for a slot
+        self._priority = request.options is not None and request.options.get('priority', None) is True
+        self._tenant_throttle = tenant_throttle
+        self._tenant = get_tenant(request.options)
+        self._tenant_permit: Optional[TenantPermit] = None
+        self._retries = retry_engine.start_query(request.options) if retry_engine is not None else None
+        self._circuit_breakers = circuit_breakers
+        self._breaker_permit: Optional[CircuitBreakerPermit] = None
+        # started once the query is executed, time spent waiting for the cluster's thread pool counts against it
+        self._deadline = Deadline.from_query_options(request.options)
+        self._idle_row_timeout = get_idle_row_timeout(request.options)
+        self._idle_watch: Optional[IdleWatch] = None
+        # cancels the stream once the deadline has passed, a stalled row would otherwise overrun the deadline
+        self._deadline_watch: Optional[IdleWatch] = None
+        self._query_iter: Union[CoreQueryIterator, HedgedQueryIterator]
         self._tp_executor: ThreadPoolExecutor
         self._query_res_ft: Future[Union[bool, Union[ColumnarError, ClientError]]]
 
@@ -70,6 +128,13 @@ class _QueryStreamingExecutor(StreamingExecutor):
             return self._cancel_token.token
         return None
 
+    @property
+    def deserializer(self) -> Deserializer:
+        """
+            **INTERNAL**
+        """
+        return self._deserializer
+
     @property
     def cancel_poll_interval(self) -> Optional[float]:
         """
@@ -97,6 +162,7 @@ class _QueryStreamingExecutor(StreamingExecutor):
         """
             **INTERNAL**
         """
+        self._cancelled.set()
         if self._query_iter is None:
             return
         self._query_iter.cancel()
@@ -104,6 +170,9 @@ class _QueryStreamingExecutor(StreamingExecutor):
         if self._cancel_token is not None and not self._cancel_token.token.is_set():
             self._cancel_token.token.set()
         self._streaming_state = StreamingState.Cancelled
+        if self._tracker is not None:
+            self._tracker.cancel()
+        self._release_permits(sample=False)
 
     def get_metadata(self) -> QueryMetadata:
         """
@@ -146,30 +215,207 @@ class _QueryStreamingExecutor(StreamingExecutor):
         """
             **INTERNAL**
         """
-        res = self._query_iter.wait_for_core_query_result()
-        if isinstance(res, CoreColumnarError):
-            return ErrorMapper.build_error(res)
+        while True:
+            res = self._query_iter.wait_for_core_query_result()
+            if not isinstance(res, CoreColumnarError):
+                break
+            err = self._build_error(res)
+            delay = self._retry_delay(err)
+            if delay is None:
+                return err
+            # the backoff is interrupted if the query is cancelled
+            if self._cancel_token is not None and self._cancel_token.token.wait(delay):
+                return ColumnarError(base=QueryOperationCanceledError())
+            try:
+                self._query_iter = self._dispatch()
+            except ColumnarError as ex:
+                return ex
+            if self._streaming_state == StreamingState.Cancelled:
+                self._query_iter.cancel()
+                return ColumnarError(base=QueryOperationCanceledError())
+        self._dispatch_succeeded()
         return res
 
-    def submit_query(self) -> None:
+    def _start_query(self) -> Union[CoreQueryIterator, HedgedQueryIterator]:
         """
             **INTERNAL**
         """
-        if not StreamingState.okay_to_stream(self._streaming_state):
-            raise RuntimeError('Query has been canceled or previously executed.')
+        if self._hedging_budget is not None and self._hedge_after is not None:
+            return HedgedQueryIterator(self._client,
+                                       self._request,
+                                       self._hedge_after,
+                                       self._hedging_budget,
+                                       retry=self._retries is not None and self._retries.attempts > 1)
+        return self._client.columnar_query_op(self._request)
 
-        self._streaming_state = StreamingState.Started
+    def _dispatch(self) -> Union[CoreQueryIterator, HedgedQueryIterator]:
+        """
+            **INTERNAL**
+        """
+        self._apply_deadline()
+        if self._tracker is not None:
+            self._tracker.dispatch_started()
+        if self._breaker_permit is not None:
+            self._breaker_permit.dispatch_started()
         try:
-            self._query_iter = self._client.columnar_query_op(self._request)
+            return self._start_query()
         except Exception as ex:
             # suppress context, we know we have raised an error from the bindings
             if isinstance(ex, CoreColumnarError):
-                raise ErrorMapper.build_error(ex) from None
-            raise InternalSDKError(str(ex)) from None
+                raise self._query_failed(self._build_error(ex)) from None
+            raise self._query_failed(InternalSDKError(str(ex))) from None
 
-        res = self._query_iter.wait_for_core_query_result()
-        if isinstance(res, CoreColumnarError):
-            raise ErrorMapper.build_error(res)
+    def _apply_deadline(self) -> None:
+        """
+            **INTERNAL**
+        """
+        if self._deadline is None:
+            return
+        # the server times out the query once the time remaining until the deadline has elapsed
+        try:
+            self._deadline.apply(self._request)
+        except DeadlineExceededError as err:
+            raise self._query_failed(err) from None
+        self._deadline.enter(PHASE_DISPATCH)
+
+    def _build_error(self, core_error: CoreColumnarError) -> Union[ColumnarError, ClientError]:
+        """
+            **INTERNAL**
+        """
+        err = ErrorMapper.build_error(core_error)
+        if self._deadline is not None:
+            return self._deadline.check_error(err)
+        return err
+
+    def _retry_delay(self, err: Exception) -> Optional[float]:
+        """
+            **INTERNAL**
+
+        Returns the backoff (in seconds) before the query is dispatched again, or `None` if the query fails with the
+        provided error.
+        """
+        if self._retries is None:
+            return None
+        # a retry must be dispatched before the deadline
+        max_delay = self._deadline.remaining() if self._deadline is not None else None
+        delay = self._retries.next_delay(err, max_delay)
+        if delay is not None and self._tracker is not None:
+            self._tracker.dispatch_retried(self._retries.attempts)
+        return delay
+
+    def _dispatch_succeeded(self) -> None:
+        """
+            **INTERNAL**
+        """
+        if self._tracker is not None:
+            self._tracker.dispatch_completed()
+        if self._permit is not None:
+            self._permit.dispatch_completed()
+        if self._breaker_permit is not None:
+            self._breaker_permit.dispatch_completed()
+        if self._retries is not None:
+            self._retries.dispatch_succeeded()
+        if self._deadline is not None:
+            self._deadline.enter(PHASE_STREAMING)
+            if self._deadline_watch is None:
+                self._deadline_watch = get_stream_watchdog().watch_deadline(self._deadline.remaining(),
+                                                                            self._query_iter.cancel)
+                weakref.finalize(self, self._deadline_watch.close)
+        if self._idle_row_timeout is not None and self._idle_watch is None:
+            # the watchdog cancels the stream if the executor waits too long for a row
+            self._idle_watch = get_stream_watchdog().watch(self._idle_row_timeout, self._query_iter.cancel)
+            weakref.finalize(self, self._idle_watch.close)
+
+    def _acquire_breaker_permit(self) -> None:
+        """
+            **INTERNAL**
+        """
+        if self._circuit_breakers is None:
+            return
+        # fail fast, w/o waiting for an in-flight slot, while the circuit is open
+        try:
+            self._breaker_permit = self._circuit_breakers.acquire(self._request.statement)
+        except CircuitOpenError as err:
+            raise self._query_failed(err) from None
+        weakref.finalize(self, self._breaker_permit.release, None, False)
+
+    def _acquire_permit(self) -> None:
+        """
+            **INTERNAL**
+        """
+        if self._deadline is not None and self._deadline.expired():
+            # e.g. the query waited for one of the cluster's threads (or to be iterated, if executed lazily)
+            raise self._query_failed(self._deadline.exceeded_error())
+        self._acquire_breaker_permit()
+        if self._tenant_throttle is not None and self._tenant is not None:
+            # the tenant's queries are throttled before they take up one of the cluster's in-flight slots
+            try:
+                self._tenant_permit = self._tenant_throttle.acquire(self._tenant, self._deadline)
+            except (QueryRejectedError, DeadlineExceededError) as err:
+                raise self._query_failed(err) from None
+            weakref.finalize(self, self._tenant_permit.release)
+        if self._concurrency_limiter is None:
+            return
+        try:
+            fingerprint = fingerprint_statement(self._request.statement)
+            self._permit = self._concurrency_limiter.acquire(fingerprint,
+                                                             priority=self._priority,
+                                                             deadline=self._deadline)
+        except (QueryRejectedError, DeadlineExceededError) as err:
+            raise self._query_failed(err) from None
+        # a result that is never iterated to the end must not hold on to its slot
+        weakref.finalize(self, self._permit.release, None, False)
+
+    def _query_failed(self, err: ErrT) -> ErrT:
+        """
+            **INTERNAL**
+        """
+        if self._tracker is not None:
+            self._tracker.finish(err)
+        self._release_permits(err)
+        return err
+
+    def _release_permits(self, error: Optional[BaseException] = None, sample: bool = True) -> None:
+        """
+            **INTERNAL**
+        """
+        if self._permit is not None:
+            self._permit.release(error, sample)
+        if self._tenant_permit is not None:
+            self._tenant_permit.release()
+        if self._breaker_permit is not None:
+            self._breaker_permit.release(error, sample)
+        if self._idle_watch is not None:
+            self._idle_watch.close()
+        if self._deadline_watch is not None:
+            self._deadline_watch.close()
+
+    def submit_query(self) -> None:
+        """
+            **INTERNAL**
+        """
+        if not StreamingState.okay_to_stream(self._streaming_state):
+            raise RuntimeError('Query has been canceled or previously executed.')
+
+        self._streaming_state = StreamingState.Started
+        self._acquire_permit()
+        while True:
+            self._query_iter = self._dispatch()
+            if self._cancelled.is_set():
+                # cancelled while the retry was dispatched
+                self._query_iter.cancel()
+                return
+            res = self._query_iter.wait_for_core_query_result()
+            if not isinstance(res, CoreColumnarError):
+                break
+            err = self._build_error(res)
+            delay = self._retry_delay(err)
+            if delay is None:
+                raise self._query_failed(err)
+            # the backoff is interrupted if the query is cancelled (e.g. from another thread)
+            if self._cancelled.wait(delay):
+                return
+        self._dispatch_succeeded()
 
     def _wait_for_result(self) -> None:
         """
@@ -187,7 +433,7 @@ class _QueryStreamingExecutor(StreamingExecutor):
         if isinstance(res, ColumnarError) and isinstance(res._base, QueryOperationCanceledError):
             pass
         elif isinstance(res, Exception):
-            raise res
+            raise self._query_failed(res)
 
     def submit_query_in_background(self) -> None:
         """
@@ -197,18 +443,24 @@ class _QueryStreamingExecutor(StreamingExecutor):
             raise RuntimeError('Query has been canceled or previously executed.')
 
         self._streaming_state = StreamingState.Started
-        try:
-            self._query_iter = self._client.columnar_query_op(self._request)
-        except Exception as ex:
-            # suppress context, we know we have raised an error from the bindings
-            if isinstance(ex, CoreColumnarError):
-                raise ErrorMapper.build_error(ex) from None
-            raise InternalSDKError(str(ex)) from None
-
+        self._acquire_permit()
+        self._query_iter = self._dispatch()
         self._query_res_ft = self._tp_executor.submit(self._get_core_query_result)
         self._wait_for_result()
 
     def get_next_row(self) -> Any:
+        """
+            **INTERNAL**
+        """
+        row = self.get_next_raw_row()
+        if self._tracker is None:
+            return self._deserializer.deserialize(row)
+        start_ns = perf_counter_ns()
+        deserialized_row = self._deserializer.deserialize(row)
+        self._tracker.row_deserialized(perf_counter_ns() - start_ns)
+        return deserialized_row
+
+    def get_next_raw_row(self) -> bytes:
         """
             **INTERNAL**
         """
@@ -219,12 +471,57 @@ class _QueryStreamingExecutor(StreamingExecutor):
             self.cancel()
             raise StopIteration
 
-        row = next(self._query_iter)
+        if self._deadline is not None and self._deadline.expired():
+            # the application is still iterating the rows, record the deadline error as the outcome
+            deadline_err = self._query_failed(self._deadline.exceeded_error())
+            self.cancel()
+            raise deadline_err
+
+        row = self._next_core_row()
         if isinstance(row, CoreColumnarError):
-            raise ErrorMapper.build_error(row)
+            raise self._query_failed(self._build_error(row))
         # should only be None once query request is complete and _no_ errors found
         if row is None:
             self._streaming_state = StreamingState.Completed
+            if self._tracker is not None:
+                self._tracker.finish(get_metadata=self.get_metadata)
+            self._release_permits()
             raise StopIteration
 
-        return self._deserializer.deserialize(row)
+        if self._tracker is not None:
+            self._tracker.row_received(row)
+
+        if self._result_limits is not None:
+            limit_err = self._result_limits.add_row(row)
+            if limit_err is not None:
+                # record the limit error as the outcome, cancelling would otherwise record a cancellation
+                self._query_failed(limit_err)
+                self.cancel()
+                raise limit_err
+
+        return row  # type: ignore[no-any-return]
+
+    def _next_core_row(self) -> Any:
+        """
+            **INTERNAL**
+        """
+        if self._idle_watch is None:
+            row = next(self._query_iter)
+        else:
+            # only time spent waiting for the row counts as idle, not time the application spends processing rows
+            self._idle_watch.waiting()
+            try:
+                row = next(self._query_iter)
+            finally:
+                self._idle_watch.received()
+            if self._idle_watch.expired:
+                # the watchdog cancelled the stream, record the idle row timeout as the outcome
+                idle_err = self._query_failed(idle_row_timeout_error(self._idle_watch.timeout))
+                self.cancel()
+                raise idle_err
+        if self._deadline_watch is not None and self._deadline_watch.expired and self._deadline is not None:
+            # the watchdog cancelled the stream once the deadline passed, record the deadline error as the outcome
+            deadline_err = self._query_failed(self._deadline.exceeded_error())
+            self.cancel()
+            raise deadline_err
+        return row
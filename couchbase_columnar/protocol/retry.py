@@ -0,0 +1,148 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from couchbase_columnar.common.metrics import RetryStats
+from couchbase_columnar.common.retry import RetryPolicy
+from couchbase_columnar.protocol import get_sdk_logger
+
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.options import QueryOptionsTransformedKwargs
+
+DEFAULT_RETRY_BUDGET = 0.1
+# the budget accrues at most this many queries worth of retries, a quiet period does not allow a burst of retries
+BUDGET_WINDOW = 100
+
+
+class RetryEngine:
+    """**INTERNAL**
+
+    Resolves the retry policy of each query (the ``retry_policy`` query option, otherwise the cluster's) and limits
+    retries to a ratio of the queries (the retry budget), so that retries cannot amplify an outage.  Each query with a
+    retry policy deposits `budget` tokens (up to `budget * BUDGET_WINDOW` tokens), a retry costs a token.  The budget
+    starts full, so that the first queries of a new cluster can be retried.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, budget: Optional[float] = None) -> None:
+        self._policy = policy
+        self._budget = budget if budget is not None else DEFAULT_RETRY_BUDGET
+        self._max_tokens = max(1.0, self._budget * BUDGET_WINDOW)
+        self._tokens = self._max_tokens
+        self._lock = Lock()
+        self._queries = 0
+        self._retries = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._budget_exhausted = 0
+
+    @property
+    def policy(self) -> Optional[RetryPolicy]:
+        return self._policy
+
+    @property
+    def budget(self) -> float:
+        return self._budget
+
+    def start_query(self, options: Optional[QueryOptionsTransformedKwargs]) -> Optional[QueryRetries]:
+        """Returns the query's retry state, or `None` if the query is not retried."""
+        policy = options.get('retry_policy', None) if options is not None else None
+        if policy is None:
+            policy = self._policy
+        if policy is None or policy.max_attempts <= 1:
+            return None
+        with self._lock:
+            self._queries += 1
+            self._tokens = min(self._max_tokens, self._tokens + self._budget)
+        read_only = options is not None and options.get('readonly', None) is True
+        return QueryRetries(self, policy, read_only)
+
+    def _try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                self._budget_exhausted += 1
+                return False
+            self._tokens -= 1.0
+            self._retries += 1
+            return True
+
+    def _query_finished(self, succeeded: bool) -> None:
+        with self._lock:
+            if succeeded:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return RetryStats(queries=self._queries,
+                              retries=self._retries,
+                              succeeded_after_retry=self._succeeded,
+                              failed_after_retry=self._failed,
+                              budget_exhausted=self._budget_exhausted)
+
+
+class QueryRetries:
+    """**INTERNAL**
+
+    Retry state of a single query.  Retries only happen before the query has returned any rows.
+    """
+
+    __slots__ = ('_engine', '_policy', '_read_only', '_attempts', '_done')
+
+    def __init__(self, engine: RetryEngine, policy: RetryPolicy, read_only: bool) -> None:
+        self._engine = engine
+        self._policy = policy
+        self._read_only = read_only
+        self._attempts = 1
+        self._done = False
+
+    @property
+    def attempts(self) -> int:
+        return self._attempts
+
+    def next_delay(self, error: BaseException, max_delay: Optional[float] = None) -> Optional[float]:
+        """Returns the backoff (in seconds) before the query should be retried, or `None` if the query should fail
+        with the provided error.  The query is not retried if the backoff is not less than `max_delay` (e.g. the time
+        remaining until the query's deadline).
+        """
+        if (self._done
+                or self._attempts >= self._policy.max_attempts
+                or not self._policy.is_retriable(error, self._read_only)):
+            self._finish(succeeded=False)
+            return None
+        delay = self._policy.backoff(self._attempts)
+        if (max_delay is not None and delay >= max_delay) or not self._engine._try_acquire():
+            self._finish(succeeded=False)
+            return None
+        self._attempts += 1
+        get_sdk_logger().debug(f'Retrying query (attempt {self._attempts} of {self._policy.max_attempts}) in '
+                               f'{delay:.3f}s after {error!r}.')
+        return delay
+
+    def dispatch_succeeded(self) -> None:
+        """Called once the query has responded, the query is not retried after this point."""
+        self._finish(succeeded=True)
+
+    def _finish(self, succeeded: bool) -> None:
+        if self._done:
+            return
+        self._done = True
+        # only queries that were retried count towards the outcome counters
+        if self._attempts > 1:
+            self._engine._query_finished(succeeded)
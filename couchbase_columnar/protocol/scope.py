@@ -66,12 +66,19 @@ class Scope:
                       statement: str,
                       *args: object,
                       **kwargs: object) -> Union[BlockingQueryResult, Future[BlockingQueryResult]]:
+        tracker = self.client_adapter.query_instrumentation.start_query(statement)
         req, cancel_token = self._request_builder.build_query_request(statement, *args, **kwargs)
         lazy_execute = req.options.pop('lazy_execute', None)
         executor = _QueryStreamingExecutor(self.client_adapter.client,
                                            req,
                                            cancel_token=cancel_token,
-                                           lazy_execute=lazy_execute)
+                                           lazy_execute=lazy_execute,
+                                           tracker=tracker,
+                                           hedging_budget=self.client_adapter.hedging_budget,
+                                           concurrency_limiter=self.client_adapter.concurrency_limiter,
+                                           tenant_throttle=self.client_adapter.tenant_throttle,
+                                           retry_engine=self.client_adapter.retry_engine,
+                                           circuit_breakers=self.client_adapter.circuit_breakers)
         if executor.cancel_token is not None:
             executor.set_threadpool_executor(self.threadpool_executor)
             if lazy_execute is True:
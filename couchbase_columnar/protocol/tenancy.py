@@ -0,0 +1,336 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from threading import Event, Lock
+from typing import (TYPE_CHECKING,
+                    Callable,
+                    Deque,
+                    List,
+                    Optional)
+
+from couchbase_columnar.common.errors import QueryRejectedError
+from couchbase_columnar.common.metrics import TenantStats
+from couchbase_columnar.protocol.metrics_registry import HdrHistogram
+
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.deadline import Deadline
+    from couchbase_columnar.protocol.options import QueryOptionsTransformedKwargs
+
+# idle tenants beyond this many are forgotten (oldest first), tenant tags are provided by the application.  If none of
+# the tenants is idle, queries of new tenants are rejected.
+MAX_TENANTS = 1000
+
+
+def get_tenant(options: Optional[QueryOptionsTransformedKwargs]) -> Optional[str]:
+    """**INTERNAL**"""
+    if options is None:
+        return None
+    return options.get('tenant', None)
+
+
+class TenantPermit:
+    """**INTERNAL**
+
+    A tenant's in-flight slot held by a single query.  Releasing a permit more than once is a no-op.
+    """
+
+    __slots__ = ('_throttle', '_tenant', '_queue_wait_ns', '_released')
+
+    def __init__(self, throttle: TenantThrottle, tenant: str, queue_wait_ns: int) -> None:
+        self._throttle = throttle
+        self._tenant = tenant
+        self._queue_wait_ns = queue_wait_ns
+        self._released = False
+
+    @property
+    def tenant(self) -> str:
+        return self._tenant
+
+    @property
+    def queue_wait_ns(self) -> int:
+        return self._queue_wait_ns
+
+    def release(self) -> None:
+        # permits are released from the C++ core's callbacks (the async API) as well as the event loop
+        self._throttle.release(self)
+
+
+class _TenantWaiter:
+    """**INTERNAL**"""
+
+    __slots__ = ('callback', 'enqueued_ns')
+
+    def __init__(self, callback: Callable[[TenantPermit], None], enqueued_ns: int) -> None:
+        self.callback = callback
+        self.enqueued_ns = enqueued_ns
+
+
+class _TenantState:
+    """**INTERNAL**"""
+
+    __slots__ = ('tokens', 'refilled_ns', 'in_flight', 'waiters', 'admitted', 'rejected', 'queue_wait')
+
+    def __init__(self, tokens: float, now_ns: int) -> None:
+        self.tokens = tokens
+        self.refilled_ns = now_ns
+        self.in_flight = 0
+        self.waiters: Deque[_TenantWaiter] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_wait = HdrHistogram()
+
+
+class TenantThrottle:
+    """**INTERNAL**
+
+    Gives every tenant (the ``tenant`` query option) the same share of the cluster: each tenant has its own token
+    bucket (`rate` queries per second, bursts of up to `burst` queries) and in-flight quota (`max_concurrent`).  A
+    query is first delayed until its tenant's bucket has a token (see :meth:`reserve`), then waits (FIFO, per tenant)
+    for one of its tenant's in-flight slots.  Queries that would wait longer than `queue_timeout` seconds are rejected,
+    so a noisy tenant is throttled before its queries reach the core and other tenants are not affected.
+
+    At most `MAX_TENANTS` tenants are tracked, idle tenants are forgotten to make room for new tenants.  Once every
+    tracked tenant has queries in-flight (or waiting), the queries of new tenants are rejected.
+    """
+
+    def __init__(self,
+                 rate: Optional[float] = None,
+                 burst: Optional[int] = None,
+                 max_concurrent: Optional[int] = None,
+                 queue_timeout: Optional[float] = None) -> None:
+        self._rate = rate
+        # by default, a tenant can burst up to a second's worth of queries
+        self._burst = float(burst if burst is not None else max(1, int(rate or 1)))
+        self._max_concurrent = max_concurrent
+        self._queue_timeout = queue_timeout
+        self._tenants: OrderedDict[str, _TenantState] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return int(self._burst)
+
+    @property
+    def max_concurrent(self) -> Optional[int]:
+        return self._max_concurrent
+
+    @property
+    def queue_timeout(self) -> Optional[float]:
+        return self._queue_timeout
+
+    def _get_state(self, tenant: str, now_ns: int) -> _TenantState:
+        # NOTE: must be called w/ the lock held
+        state = self._tenants.get(tenant, None)
+        if state is not None:
+            self._tenants.move_to_end(tenant)
+            return state
+        if len(self._tenants) >= MAX_TENANTS:
+            idle = next((t for t, s in self._tenants.items() if self._is_idle(s, now_ns)), None)
+            if idle is None:
+                # tracking the tenant anyway would let the tenants grow w/o bound w/ the tenant tags' churn
+                raise QueryRejectedError(message=(f'Query rejected, tenant {tenant!r} cannot be throttled: the '
+                                                  f'maximum of {MAX_TENANTS} tenants have queries in-flight or '
+                                                  'queued.'))
+            del self._tenants[idle]
+        state = self._tenants[tenant] = _TenantState(self._burst, now_ns)
+        return state
+
+    def _is_idle(self, state: _TenantState, now_ns: int) -> bool:
+        # NOTE: must be called w/ the lock held
+        if state.in_flight > 0 or state.waiters:
+            return False
+        # forgetting the tenant must not reset a bucket that has not been refilled yet
+        return self._rate is None or state.tokens + (now_ns - state.refilled_ns) / 1e9 * self._rate >= self._burst
+
+    def reserve(self, tenant: str, deadline: Optional[Deadline] = None) -> float:
+        """Takes a token from the tenant's bucket.  Returns the delay (in seconds) until the token is available, the
+        query must not be dispatched before the delay has elapsed.
+
+        Raises:
+            :class:`~couchbase_columnar.errors.QueryRejectedError`: If the delay exceeds the queue timeout, or if the
+                tenant is new and the maximum number of tenants have queries in-flight or queued.
+            :class:`~couchbase_columnar.errors.DeadlineExceededError`: If the delay exceeds the time remaining until
+                the query's deadline.
+        """
+        if self._rate is None:
+            return 0.0
+        now_ns = time.perf_counter_ns()
+        with self._lock:
+            state = self._get_state(tenant, now_ns)
+            elapsed = (now_ns - state.refilled_ns) / 1e9
+            state.tokens = min(self._burst, state.tokens + elapsed * self._rate)
+            state.refilled_ns = now_ns
+            # tokens can be reserved ahead of time, queries are then spaced out at the tenant's rate
+            state.tokens -= 1
+            delay = max(0.0, -state.tokens / self._rate)
+            if self._queue_timeout is not None and delay > self._queue_timeout:
+                state.tokens += 1
+                state.rejected += 1
+                raise QueryRejectedError(message=(f'Query rejected, tenant {tenant!r} exceeded its rate limit of '
+                                                  f'{self._rate:g} queries per second.'))
+            if deadline is not None and delay > deadline.remaining():
+                # the query would not be dispatched in time, the token is left for the tenant's other queries
+                state.tokens += 1
+                raise deadline.exceeded_error()
+        return delay
+
+    def _new_permit(self, tenant: str, state: _TenantState, enqueued_ns: int) -> TenantPermit:
+        # NOTE: must be called w/ the lock held
+        state.in_flight += 1
+        state.admitted += 1
+        queue_wait_ns = time.perf_counter_ns() - enqueued_ns
+        # durations are recorded in microseconds
+        state.queue_wait.record(queue_wait_ns // 1000)
+        return TenantPermit(self, tenant, queue_wait_ns)
+
+    def _can_admit(self, state: _TenantState) -> bool:
+        # NOTE: must be called w/ the lock held
+        return self._max_concurrent is None or state.in_flight < self._max_concurrent
+
+    def try_acquire(self, tenant: str, enqueued_ns: int) -> Optional[TenantPermit]:
+        """Returns a permit if one of the tenant's slots is available (and none of the tenant's queries is waiting for
+        one), otherwise `None`.  `enqueued_ns` is when the query started waiting (``time.perf_counter_ns()``).
+
+        Raises:
+            :class:`~couchbase_columnar.errors.QueryRejectedError`: If the tenant is new and the maximum number of
+                tenants have queries in-flight or queued.
+        """
+        with self._lock:
+            state = self._get_state(tenant, time.perf_counter_ns())
+            if state.waiters or not self._can_admit(state):
+                return None
+            return self._new_permit(tenant, state, enqueued_ns)
+
+    def enqueue(self,
+                tenant: str,
+                callback: Callable[[TenantPermit], None],
+                enqueued_ns: int) -> Optional[_TenantWaiter]:
+        """Waits for one of the tenant's slots.  If a slot is available, `callback` is called immediately and `None` is
+        returned, otherwise `callback` is called (from the thread releasing a slot) once the waiter is granted a slot.
+
+        Raises:
+            :class:`~couchbase_columnar.errors.QueryRejectedError`: If the tenant is new and the maximum number of
+                tenants have queries in-flight or queued.
+        """
+        with self._lock:
+            state = self._get_state(tenant, time.perf_counter_ns())
+            if not state.waiters and self._can_admit(state):
+                permit = self._new_permit(tenant, state, enqueued_ns)
+                waiter = None
+            else:
+                waiter = _TenantWaiter(callback, enqueued_ns)
+                state.waiters.append(waiter)
+        if waiter is None:
+            callback(permit)
+        return waiter
+
+    def cancel_waiter(self, tenant: str, waiter: _TenantWaiter, rejected: bool = True) -> bool:
+        """Removes the waiter from the tenant's queue.  Returns `False` if the waiter has already been granted a
+        slot.
+        """
+        with self._lock:
+            state = self._tenants.get(tenant, None)
+            if state is None:
+                return False
+            try:
+                state.waiters.remove(waiter)
+            except ValueError:
+                return False
+            if rejected:
+                state.rejected += 1
+            return True
+
+    def acquire(self, tenant: str, deadline: Optional[Deadline] = None) -> TenantPermit:
+        """Blocks until the tenant's rate allows the query and one of the tenant's slots is available.
+
+        Raises:
+            :class:`~couchbase_columnar.errors.QueryRejectedError`: If the query would wait longer than the queue
+                timeout, or if the tenant is new and the maximum number of tenants have queries in-flight or queued.
+            :class:`~couchbase_columnar.errors.DeadlineExceededError`: If the query would wait past its deadline (and
+                the deadline is before the queue timeout).
+        """
+        enqueued_ns = time.perf_counter_ns()
+        delay = self.reserve(tenant, deadline)
+        if delay > 0:
+            time.sleep(delay)
+        granted = Event()
+        permits: List[TenantPermit] = []
+
+        def grant(p: TenantPermit) -> None:
+            permits.append(p)
+            granted.set()
+
+        waiter = self.enqueue(tenant, grant, enqueued_ns)
+        timeout = self.remaining_queue_timeout(enqueued_ns)
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+        else:
+            deadline = None
+        if waiter is not None and not granted.wait(timeout):
+            # only the queue timeout rejects the query, a query that runs out of time is not counted as rejected
+            if self.cancel_waiter(tenant, waiter, rejected=deadline is None):
+                if deadline is not None:
+                    raise deadline.exceeded_error()
+                raise self.rejected_error(tenant)
+            # the slot was granted while timing out
+            granted.wait()
+        return permits[0]
+
+    def remaining_queue_timeout(self, enqueued_ns: int) -> Optional[float]:
+        """Returns how long (in seconds) a query that started waiting at `enqueued_ns` can still wait for a slot."""
+        if self._queue_timeout is None:
+            return None
+        return max(0.0, self._queue_timeout - (time.perf_counter_ns() - enqueued_ns) / 1e9)
+
+    def rejected_error(self, tenant: str) -> QueryRejectedError:
+        return QueryRejectedError(message=(f'Query rejected, tenant {tenant!r} has {self._max_concurrent} queries '
+                                           'in-flight and a slot did not become available within the concurrency '
+                                           'queue timeout.'))
+
+    def release(self, permit: TenantPermit) -> None:
+        """Releases the permit's slot and grants it to the tenant's next waiting query."""
+        waiter = None
+        with self._lock:
+            if permit._released:
+                return
+            permit._released = True
+            state = self._tenants.get(permit.tenant, None)
+            if state is None:
+                return
+            state.in_flight -= 1
+            if state.waiters and self._can_admit(state):
+                waiter = state.waiters.popleft()
+                new_permit = self._new_permit(permit.tenant, state, waiter.enqueued_ns)
+        if waiter is not None:
+            waiter.callback(new_permit)
+
+    def stats(self) -> List[TenantStats]:
+        with self._lock:
+            return [TenantStats(tenant=tenant,
+                                in_flight=state.in_flight,
+                                queued=len(state.waiters),
+                                admitted=state.admitted,
+                                rejected=state.rejected,
+                                queue_wait=state.queue_wait.snapshot())
+                    for tenant, state in self._tenants.items()]
@@ -0,0 +1,71 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import (Dict,
+                    List,
+                    Optional)
+
+from couchbase_columnar.common.core.utils import validate_positive_int
+from couchbase_columnar.common.result import WarmUpResult
+from couchbase_columnar.protocol import get_sdk_logger
+
+# The C++ core does not expose its HTTP session pool, a connection to the query service is established (DNS SRV
+# resolution, TLS handshake and config fetch included) by executing a query on it.  Executing the warm-up queries
+# concurrently forces the core to open a connection per query, each is returned to the pool once the query completes.
+WARM_UP_STATEMENT = 'SELECT 1;'
+DEFAULT_WARM_UP_TIMEOUT = timedelta(seconds=10)
+# the blocking API executes each warm-up query on a thread of its own
+MAX_WARM_UP_CONNECTIONS = 64
+
+
+def validate_warm_up_connections(value: int) -> int:
+    """**INTERNAL**"""
+    validate_positive_int(value)
+    if value > MAX_WARM_UP_CONNECTIONS:
+        raise ValueError(f'Cannot warm up more than {MAX_WARM_UP_CONNECTIONS} connections.')
+    return value
+
+
+def build_warm_up_query_options(connections: int, timeout: Optional[timedelta] = None) -> Dict[str, object]:
+    """**INTERNAL**"""
+    validate_warm_up_connections(connections)
+    if timeout is None:
+        timeout = DEFAULT_WARM_UP_TIMEOUT
+    return {'timeout': timeout, 'read_only': True}
+
+
+def build_warm_up_result(connections: int,
+                         start: float,
+                         results: List[Optional[Exception]]) -> WarmUpResult:
+    """**INTERNAL**"""
+    errors = [err for err in results if err is not None]
+    return WarmUpResult(connections=connections,
+                        succeeded=connections - len(errors),
+                        elapsed=timedelta(seconds=time.perf_counter() - start),
+                        errors=errors)
+
+
+def log_warm_up_result(result: WarmUpResult) -> None:
+    """**INTERNAL**"""
+    elapsed_ms = result.elapsed.total_seconds() * 1000
+    if result.errors:
+        get_sdk_logger().warning(f'Warmed up {result.succeeded}/{result.connections} connections in '
+                                 f'{elapsed_ms:.1f}ms, first error: {result.errors[0]!r}')
+    else:
+        get_sdk_logger().info(f'Warmed up {result.connections} connections in {elapsed_ms:.1f}ms')
@@ -0,0 +1,205 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from heapq import (heapify,
+                   heappop,
+                   heappush)
+from itertools import count
+from threading import (Condition,
+                       Lock,
+                       Thread)
+from time import perf_counter_ns
+from typing import (TYPE_CHECKING,
+                    Callable,
+                    List,
+                    Optional,
+                    Tuple)
+
+from couchbase_columnar.common.errors import IdleRowTimeoutError
+from couchbase_columnar.protocol import get_sdk_logger
+
+if TYPE_CHECKING:
+    from couchbase_columnar.protocol.options import QueryOptionsTransformedKwargs
+
+
+def get_idle_row_timeout(options: Optional[QueryOptionsTransformedKwargs]) -> Optional[float]:
+    """**INTERNAL**
+
+    Returns the query's idle row timeout (in seconds), or `None` if the query's row stream is not watched.
+    """
+    if options is None:
+        return None
+    # the idle_row_timeout option is transformed to microseconds
+    idle_row_timeout = options.get('idle_row_timeout', None)
+    if idle_row_timeout is None:
+        return None
+    return idle_row_timeout / 1e6
+
+
+def idle_row_timeout_error(idle_row_timeout: float) -> IdleRowTimeoutError:
+    """**INTERNAL**"""
+    return IdleRowTimeoutError(message=(f'No row was received within the idle_row_timeout of {idle_row_timeout:.3f}s, '
+                                        'the query was cancelled.'))
+
+
+class IdleWatch:
+    """**INTERNAL**
+
+    Watches a single query's row stream.  The executor marks when it starts waiting for a row and when the row has
+    been received, which is all the work done per row: the watchdog only checks the stream once the timeout could have
+    elapsed.
+    """
+
+    __slots__ = ('_watchdog', '_timeout', '_timeout_ns', '_on_idle', 'waiting_since_ns', 'expired', 'watched')
+
+    def __init__(self, watchdog: StreamWatchdog, timeout: float, on_idle: Callable[[], None]) -> None:
+        self._watchdog = watchdog
+        self._timeout = timeout
+        self._timeout_ns = int(timeout * 1e9)
+        self._on_idle = on_idle
+        # NOTE: read by the watchdog's thread w/o a lock, a stale read only delays the check
+        self.waiting_since_ns: Optional[int] = None
+        self.expired = False
+        # NOTE: only read/written w/ the watchdog's lock held
+        self.watched = True
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def timeout_ns(self) -> int:
+        return self._timeout_ns
+
+    def waiting(self) -> None:
+        self.waiting_since_ns = perf_counter_ns()
+
+    def received(self) -> None:
+        self.waiting_since_ns = None
+
+    def close(self) -> None:
+        """Stops watching the stream, closing a watch more than once is a no-op."""
+        self._watchdog.unwatch(self)
+
+    def _fire(self) -> None:
+        self.expired = True
+        try:
+            self._on_idle()
+        except Exception as ex:
+            get_sdk_logger().warning(f'Failed to cancel an idle query: {ex!r}')
+
+
+class StreamWatchdog:
+    """**INTERNAL**
+
+    Cancels the row streams of blocking queries that have not received a row within their idle row timeout.  A single
+    daemon thread (started once the first stream is watched) checks every watched stream no earlier than the time it
+    could become idle, so watching a stream does not add a timer per row.  The watches are kept in a heap ordered by
+    their next check, each time the thread wakes up it only checks the watches that are due.
+    """
+
+    def __init__(self) -> None:
+        # (next check (ns), tie breaker, watch), closed watches are removed once due (or when the heap is compacted)
+        self._heap: List[Tuple[int, int, IdleWatch]] = []
+        self._closed = 0
+        self._counter = count()
+        self._cond = Condition(Lock())
+        self._thread: Optional[Thread] = None
+
+    def watch(self, timeout: float, on_idle: Callable[[], None]) -> IdleWatch:
+        """Starts watching a stream, `on_idle` is called (from the watchdog's thread) once the stream is idle."""
+        return self._watch(IdleWatch(self, timeout, on_idle))
+
+    def watch_deadline(self, remaining: float, on_expired: Callable[[], None]) -> IdleWatch:
+        """Starts watching a stream's deadline, `on_expired` is called (from the watchdog's thread) once `remaining`
+        seconds have elapsed, whether or not the executor is waiting for a row.
+        """
+        watch = IdleWatch(self, remaining, on_expired)
+        # always waiting, the watch must not be marked as waiting/received
+        watch.waiting()
+        return self._watch(watch)
+
+    def _watch(self, watch: IdleWatch) -> IdleWatch:
+        with self._cond:
+            # a stream cannot become idle before a full timeout has elapsed
+            heappush(self._heap, (perf_counter_ns() + watch.timeout_ns, next(self._counter), watch))
+            # the thread does not survive a fork
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name='pycbcc-stream-watchdog', daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is watch:
+                # the new stream's check is earlier than the watchdog's current wait
+                self._cond.notify()
+        return watch
+
+    def unwatch(self, watch: IdleWatch) -> None:
+        with self._cond:
+            if not watch.watched:
+                return
+            watch.watched = False
+            self._closed += 1
+            # w/ long timeouts, closed watches would stay in the heap for long, drop them once they are the majority
+            if self._closed > len(self._heap) // 2:
+                self._heap = [entry for entry in self._heap if entry[2].watched]
+                heapify(self._heap)
+                self._closed = 0
+
+    def _check(self, now_ns: int) -> Tuple[List[IdleWatch], Optional[int]]:
+        """Removes the watches of idle streams and returns them, along w/ the time of the next check."""
+        # NOTE: must be called w/ the lock held
+        idle: List[IdleWatch] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ns:
+            _, _, watch = heappop(heap)
+            if not watch.watched:
+                self._closed -= 1
+                continue
+            waiting_since_ns = watch.waiting_since_ns
+            if waiting_since_ns is None:
+                # a stream that starts waiting from now on cannot become idle before now + timeout
+                check_ns = now_ns + watch.timeout_ns
+            elif now_ns - waiting_since_ns >= watch.timeout_ns:
+                watch.watched = False
+                idle.append(watch)
+                continue
+            else:
+                check_ns = waiting_since_ns + watch.timeout_ns
+            heappush(heap, (check_ns, next(self._counter), watch))
+        return idle, heap[0][0] if heap else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                now_ns = perf_counter_ns()
+                idle, next_check_ns = self._check(now_ns)
+                if not idle:
+                    self._cond.wait((next_check_ns - now_ns) / 1e9 if next_check_ns is not None else None)
+            for watch in idle:
+                watch._fire()
+
+
+_WATCHDOG: Optional[StreamWatchdog] = None
+_WATCHDOG_LOCK = Lock()
+
+
+def get_stream_watchdog() -> StreamWatchdog:
+    """**INTERNAL**"""
+    global _WATCHDOG
+    with _WATCHDOG_LOCK:
+        if _WATCHDOG is None:
+            _WATCHDOG = StreamWatchdog()
+        return _WATCHDOG
@@ -16,3 +16,5 @@
 from couchbase_columnar.common.result import AsyncQueryResult as AsyncQueryResult  # noqa: F401
 from couchbase_columnar.common.result import BlockingQueryResult as BlockingQueryResult  # noqa: F401
 from couchbase_columnar.common.result import QueryResult as QueryResult  # noqa: F401
+from couchbase_columnar.common.result import WarmUpResult as WarmUpResult  # noqa: F401
+from couchbase_columnar.common.streaming import SpillableRowSequence as SpillableRowSequence  # noqa: F401
@@ -0,0 +1,238 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from threading import Barrier, Thread
+from typing import List
+
+import pytest
+
+from couchbase_columnar.common.errors import QueryError, TimeoutError
+from couchbase_columnar.errors import QueryRejectedError
+from couchbase_columnar.metrics import ConcurrencyLimitStats
+from couchbase_columnar.protocol.admission import (AdaptiveConcurrencyLimiter,
+                                                   AdmissionPermit,
+                                                   is_overload_error)
+
+
+class OverloadError(Exception):
+    error_properties = {'code': 23007, 'server_message': 'Job queue is full'}
+
+
+def complete(permit: AdmissionPermit, latency_ns: int = 1000) -> None:
+    # a fixed dispatch latency, so that scheduling jitter is not mistaken for a latency spike
+    permit._latency_ns = latency_ns
+    permit.release()
+
+
+class AdmissionTestSuite:
+    TEST_MANIFEST = [
+        'test_acquire_waits_for_slot',
+        'test_decrease_once_per_window',
+        'test_increase_when_utilized',
+        'test_is_overload_error',
+        'test_latency_spike_decreases_limit',
+        'test_limit_bounds',
+        'test_permit_release_concurrently',
+        'test_permit_release_idempotent',
+        'test_priority_weighted_round_robin',
+        'test_queue_timeout',
+        'test_reserved_priority_slots',
+        'test_stats',
+        'test_try_acquire',
+    ]
+
+    def test_acquire_waits_for_slot(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(1, queue_timeout=5)
+        permit = limiter.acquire('SELECT ?')
+        permits: List[AdmissionPermit] = []
+        t = Thread(target=lambda: permits.append(limiter.acquire('SELECT ?')))
+        t.start()
+        t.join(0.1)
+        # the second query is queued until the first releases its slot
+        assert permits == []
+        assert limiter.stats().queued == 1
+        permit.release(sample=False)
+        t.join(5)
+        assert len(permits) == 1
+        assert limiter.in_flight == 1
+
+    def test_decrease_once_per_window(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(16)
+        permits = [limiter.acquire('SELECT ?') for _ in range(4)]
+        # the queries were dispatched before the limit decreased, only the first timeout counts
+        for permit in permits:
+            permit.release(TimeoutError())
+        assert limiter.limit == 8
+        limiter.acquire('SELECT ?').release(TimeoutError())
+        assert limiter.limit == 4
+
+    def test_increase_when_utilized(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(8)
+        limiter.acquire('SELECT ?').release(TimeoutError())
+        assert limiter.limit == 4
+        # a single in-flight query does not use enough of the limit to grow it
+        complete(limiter.acquire('SELECT ?'))
+        assert limiter.limit == 4
+        for _ in range(10):
+            permits = [limiter.acquire('SELECT ?') for _ in range(limiter.limit)]
+            for p in permits:
+                complete(p)
+        assert limiter.limit == 8
+
+    def test_is_overload_error(self) -> None:
+        assert is_overload_error(TimeoutError()) is True
+        assert is_overload_error(QueryError(base=OverloadError())) is True
+        assert is_overload_error(QueryError()) is False
+        assert is_overload_error(ValueError()) is False
+        assert is_overload_error(None) is False
+
+    def test_latency_spike_decreases_limit(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(10)
+        permit = limiter.acquire('SELECT ?')
+        permit.dispatch_completed()
+        assert permit.latency_ns is not None
+        # the first sample sets the statement's baseline
+        complete(permit)
+        assert limiter.limit == 10
+        complete(limiter.acquire('SELECT ?'), latency_ns=3000)
+        assert limiter.limit == 9
+        # other statements have their own baseline
+        complete(limiter.acquire('SELECT * FROM t'), latency_ns=10**6)
+        assert limiter.limit == 9
+
+    def test_limit_bounds(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(4)
+        for _ in range(10):
+            limiter.acquire('SELECT ?').release(TimeoutError())
+        assert limiter.limit == 1
+        assert limiter.max_limit == 4
+
+    def test_permit_release_concurrently(self) -> None:
+        for _ in range(20):
+            limiter = AdaptiveConcurrencyLimiter(4)
+            permit = limiter.acquire('SELECT ?')
+            limiter.acquire('SELECT ?')
+            # e.g. the async API's core callback and a cancel on the event loop
+            barrier = Barrier(4)
+
+            def release() -> None:
+                barrier.wait()
+                permit.release(TimeoutError())
+            threads = [Thread(target=release) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert limiter.in_flight == 1
+            assert limiter.limit == 2
+
+    def test_permit_release_idempotent(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(2)
+        permit = limiter.acquire('SELECT ?')
+        permit.release(TimeoutError())
+        permit.release(TimeoutError())
+        assert limiter.in_flight == 0
+        assert limiter.limit == 1
+
+    def test_priority_weighted_round_robin(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(1)
+        permit = limiter.acquire('SELECT ?')
+        granted: List[str] = []
+        for idx in range(10):
+            limiter.enqueue(f'normal-{idx}', lambda p: granted.append(p.fingerprint))
+            limiter.enqueue(f'high-{idx}', lambda p: granted.append(p.fingerprint), priority=True)
+        assert limiter.stats().queued == 20
+        assert limiter.stats().queued_priority == 10
+        permit.release(sample=False)
+        # each released slot is granted to the next waiting query, 4 high priority queries per normal query
+        while len(granted) < 20:
+            limiter.release(AdmissionPermit(limiter, granted[-1], utilized=False), sample=False)
+        assert granted[:10] == ['high-0', 'high-1', 'normal-0', 'high-2', 'high-3',
+                                'high-4', 'high-5', 'normal-1', 'high-6', 'high-7']
+        # FIFO within a priority class
+        assert [g for g in granted if g.startswith('normal')] == [f'normal-{idx}' for idx in range(10)]
+        assert [g for g in granted if g.startswith('high')] == [f'high-{idx}' for idx in range(10)]
+
+    def test_queue_timeout(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(1, queue_timeout=0)
+        permit = limiter.acquire('SELECT ?')
+        with pytest.raises(QueryRejectedError):
+            limiter.acquire('SELECT ?')
+        assert limiter.stats().rejected == 1
+        assert limiter.stats().queued == 0
+        permit.release()
+        limiter.acquire('SELECT ?')
+
+    def test_reserved_priority_slots(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(4, reserved_priority_slots=2)
+        permits = [limiter.acquire('SELECT ?') for _ in range(2)]
+        # the remaining slots are reserved for high priority queries
+        assert limiter.try_acquire('SELECT ?') is None
+        high_permits = [limiter.try_acquire('SELECT ?', priority=True) for _ in range(2)]
+        assert all(p is not None for p in high_permits)
+        assert limiter.try_acquire('SELECT ?', priority=True) is None
+        assert limiter.stats().reserved_priority_slots == 2
+        for permit in permits:
+            permit.release(TimeoutError())
+        assert limiter.limit == 2
+        # normal queries can always use at least one slot
+        assert limiter.in_flight == 2
+        for p in high_permits:
+            assert p is not None
+            p.release(sample=False)
+        assert limiter.try_acquire('SELECT ?') is not None
+        assert limiter.try_acquire('SELECT ?') is None
+
+    def test_stats(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(3)
+        permits = [limiter.acquire('SELECT ?') for _ in range(2)]
+        stats = limiter.stats()
+        assert isinstance(stats, ConcurrencyLimitStats)
+        assert stats.limit == 3
+        assert stats.max_limit == 3
+        assert stats.in_flight == 2
+        assert stats.admitted == 2
+        for permit in permits:
+            permit.release(sample=False)
+        assert limiter.stats().in_flight == 0
+
+    def test_try_acquire(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(1)
+        permit = limiter.try_acquire('SELECT ?')
+        assert permit is not None
+        assert limiter.try_acquire('SELECT ?') is None
+        granted: List[AdmissionPermit] = []
+        waiter = limiter.enqueue('SELECT ?', granted.append)
+        assert waiter is not None
+        permit.release()
+        # the slot is handed to the waiting query
+        assert len(granted) == 1
+        assert limiter.cancel_waiter(waiter) is False
+        assert limiter.in_flight == 1
+
+
+class AdmissionTests(AdmissionTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(AdmissionTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(AdmissionTests) if valid_test_method(meth)]
+        test_list = set(AdmissionTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -0,0 +1,219 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from threading import Barrier, Thread
+from typing import (Any,
+                    Dict,
+                    List,
+                    Optional)
+
+import pytest
+
+from couchbase_columnar.common.errors import (ColumnarError,
+                                              QueryError,
+                                              TimeoutError)
+from couchbase_columnar.errors import CircuitOpenError
+from couchbase_columnar.metrics import CircuitBreakerStats
+from couchbase_columnar.options import CircuitBreakerConfig
+from couchbase_columnar.protocol.circuit_breaker import (STATE_CLOSED,
+                                                         STATE_HALF_OPEN,
+                                                         STATE_OPEN,
+                                                         CircuitBreakers,
+                                                         is_failure)
+
+
+def execute(breakers: CircuitBreakers,
+            statement: str = 'SELECT 1',
+            error: Optional[BaseException] = None,
+            latency: float = 0) -> None:
+    permit = breakers.acquire(statement)
+    permit.dispatch_started()
+    if latency > 0:
+        time.sleep(latency)
+    permit.dispatch_completed()
+    permit.release(error)
+
+
+class CircuitBreakerTestSuite:
+    TEST_MANIFEST = [
+        'test_config_invalid',
+        'test_half_open_probe_fails',
+        'test_half_open_probes',
+        'test_is_failure',
+        'test_latency_threshold',
+        'test_min_queries',
+        'test_opens_on_error_threshold',
+        'test_outcome_of_earlier_generation_ignored',
+        'test_per_statement',
+        'test_permit_release_concurrently',
+        'test_stats',
+    ]
+
+    def test_config_invalid(self) -> None:
+        invalid_opts: List[Dict[str, Any]] = [{'error_threshold': 0},
+                                              {'error_threshold': 1.5},
+                                              {'latency_threshold': 1},
+                                              {'min_queries': 0},
+                                              {'min_queries': 20, 'window_size': 10},
+                                              {'open_duration': timedelta(seconds=-1)},
+                                              {'half_open_probes': True}]
+        for invalid in invalid_opts:
+            with pytest.raises(ValueError):
+                CircuitBreakerConfig(**invalid)
+
+    def test_half_open_probe_fails(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=1, open_duration=timedelta(0)))
+        execute(breakers, error=TimeoutError())
+        probe = breakers.acquire('SELECT 1')
+        probe.dispatch_started()
+        probe.release(TimeoutError())
+        assert breakers.stats()[0].state == STATE_OPEN
+        assert breakers.stats()[0].opened == 2
+
+    def test_half_open_probes(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=1,
+                                                        open_duration=timedelta(milliseconds=100),
+                                                        half_open_probes=2))
+        execute(breakers, error=TimeoutError())
+        with pytest.raises(CircuitOpenError):
+            breakers.acquire('SELECT 1')
+        time.sleep(0.1)
+        probes = [breakers.acquire('SELECT 1') for _ in range(2)]
+        assert breakers.stats()[0].state == STATE_HALF_OPEN
+        # only the probes are executed while the circuit is half-open
+        with pytest.raises(CircuitOpenError):
+            breakers.acquire('SELECT 1')
+        # an abandoned probe makes room for another probe
+        probes[1].release(sample=False)
+        probes[1] = breakers.acquire('SELECT 1')
+        for probe in probes:
+            probe.dispatch_started()
+            probe.release()
+        assert breakers.stats()[0].state == STATE_CLOSED
+
+    def test_is_failure(self) -> None:
+        assert is_failure(TimeoutError()) is True
+        assert is_failure(ColumnarError()) is True
+        assert is_failure(None) is False
+        # errors caused by the query itself do not indicate an unhealthy service
+        assert is_failure(QueryError()) is False
+        assert is_failure(ValueError()) is False
+
+    def test_latency_threshold(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=2,
+                                                        latency_threshold=timedelta(milliseconds=20)))
+        execute(breakers)
+        execute(breakers, latency=0.03)
+        assert breakers.stats()[0].state == STATE_OPEN
+
+    def test_min_queries(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=5))
+        for _ in range(4):
+            execute(breakers, error=TimeoutError())
+        assert breakers.stats()[0].state == STATE_CLOSED
+        execute(breakers, error=TimeoutError())
+        assert breakers.stats()[0].state == STATE_OPEN
+
+    def test_opens_on_error_threshold(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(error_threshold=0.5, min_queries=4, window_size=4))
+        for _ in range(6):
+            execute(breakers)
+        execute(breakers, error=TimeoutError())
+        assert breakers.stats()[0].state == STATE_CLOSED
+        execute(breakers, error=ColumnarError())
+        # the window holds the last 4 queries, 2 of which failed
+        assert breakers.stats()[0].state == STATE_OPEN
+        with pytest.raises(CircuitOpenError):
+            breakers.acquire('SELECT 1')
+
+    def test_outcome_of_earlier_generation_ignored(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=1, open_duration=timedelta(0)))
+        in_flight = breakers.acquire('SELECT 1')
+        in_flight.dispatch_started()
+        execute(breakers, error=TimeoutError())
+        probe = breakers.acquire('SELECT 1')
+        # the query admitted before the circuit opened is not a probe
+        in_flight.release()
+        assert breakers.stats()[0].state == STATE_HALF_OPEN
+        probe.dispatch_started()
+        probe.release()
+        probe = breakers.acquire('SELECT 1')
+        assert breakers.stats()[0].state == STATE_HALF_OPEN
+
+    def test_per_statement(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=2, per_statement=True))
+        for _ in range(3):
+            execute(breakers, 'SELECT 1')
+        for _ in range(2):
+            execute(breakers, 'SELECT * FROM t WHERE id = 1', error=TimeoutError())
+        # the failing statement (by fingerprint) is rejected, other statements are not affected
+        with pytest.raises(CircuitOpenError):
+            breakers.acquire('SELECT * FROM t WHERE id = 2')
+        execute(breakers, 'SELECT 1')
+        stats = breakers.stats()
+        assert stats[0].fingerprint is None
+        assert stats[0].state == STATE_CLOSED
+        statement_stats = {s.fingerprint: s for s in stats[1:]}
+        assert set(statement_stats) == {'SELECT ?', 'SELECT * FROM t WHERE id = ?'}
+        assert statement_stats['SELECT * FROM t WHERE id = ?'].state == STATE_OPEN
+        assert statement_stats['SELECT * FROM t WHERE id = ?'].rejected == 1
+
+    def test_permit_release_concurrently(self) -> None:
+        for _ in range(20):
+            breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=3))
+            permit = breakers.acquire('SELECT 1')
+            permit.dispatch_started()
+            permit.dispatch_completed()
+            # e.g. the async API's core callback and a cancel on the event loop
+            barrier = Barrier(4)
+
+            def release() -> None:
+                barrier.wait()
+                permit.release(TimeoutError())
+            threads = [Thread(target=release) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert breakers.stats()[0].queries == 1
+            assert breakers.stats()[0].failures == 1
+
+    def test_stats(self) -> None:
+        breakers = CircuitBreakers(CircuitBreakerConfig(min_queries=3))
+        execute(breakers)
+        execute(breakers, error=TimeoutError())
+        # queries that were not dispatched (e.g. rejected by the concurrency limit) are not recorded
+        breakers.acquire('SELECT 1').release(TimeoutError())
+        stats = breakers.stats()
+        assert len(stats) == 1
+        assert isinstance(stats[0], CircuitBreakerStats)
+        assert stats[0] == CircuitBreakerStats(fingerprint=None, state=STATE_CLOSED, queries=2, failures=1)
+
+
+class CircuitBreakerTests(CircuitBreakerTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(CircuitBreakerTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(CircuitBreakerTests) if valid_test_method(meth)]
+        test_list = set(CircuitBreakerTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
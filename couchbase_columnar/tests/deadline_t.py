@@ -0,0 +1,157 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from couchbase_columnar.common.errors import (QueryError,
+                                              QueryRejectedError,
+                                              TimeoutError)
+from couchbase_columnar.deserializer import DefaultJsonDeserializer
+from couchbase_columnar.errors import DeadlineExceededError
+from couchbase_columnar.options import RetryPolicy
+from couchbase_columnar.protocol.admission import AdaptiveConcurrencyLimiter
+from couchbase_columnar.protocol.core.request import QueryRequest
+from couchbase_columnar.protocol.deadline import (PHASE_DISPATCH,
+                                                  PHASE_QUEUE,
+                                                  PHASE_STREAMING,
+                                                  Deadline)
+from couchbase_columnar.protocol.retry import RetryEngine
+from couchbase_columnar.protocol.tenancy import TenantThrottle
+
+
+class DeadlineTestSuite:
+    TEST_MANIFEST = [
+        'test_apply',
+        'test_check_error',
+        'test_exceeded_error',
+        'test_from_query_options',
+        'test_limiter_wait',
+        'test_retry_backoff_exceeds_deadline',
+        'test_tenant_rate_limit_delay',
+        'test_tenant_wait',
+    ]
+
+    def test_apply(self) -> None:
+        req = QueryRequest('SELECT 1', DefaultJsonDeserializer(), {})
+        Deadline(2).apply(req)
+        assert req.options is not None
+        timeout = req.options['timeout']
+        assert timeout is not None and 1900000 < timeout <= 2000000
+        # the query's timeout option is kept if it is less than the time remaining until the deadline
+        Deadline(2, timeout_option=500000).apply(req)
+        assert req.options['timeout'] == 500000
+        with pytest.raises(DeadlineExceededError):
+            Deadline(0).apply(req)
+
+    def test_check_error(self) -> None:
+        timeout_err = TimeoutError()
+        assert Deadline(10).check_error(timeout_err) is timeout_err
+        deadline = Deadline(0)
+        deadline.enter(PHASE_DISPATCH)
+        err = deadline.check_error(timeout_err)
+        assert isinstance(err, DeadlineExceededError)
+        assert err.phase == PHASE_DISPATCH
+        # only timeouts can be caused by the deadline
+        query_err = QueryError()
+        assert deadline.check_error(query_err) is query_err
+
+    def test_exceeded_error(self) -> None:
+        deadline = Deadline(0.05)
+        time.sleep(0.01)
+        deadline.enter(PHASE_DISPATCH)
+        time.sleep(0.02)
+        deadline.enter(PHASE_STREAMING)
+        time.sleep(0.03)
+        assert deadline.expired() is True
+        assert deadline.remaining() == 0
+        err = deadline.exceeded_error()
+        assert isinstance(err, TimeoutError)
+        assert err.phase == PHASE_STREAMING
+        assert 'deadline of 0.050s in the streaming phase (queue: 0.01' in repr(err)
+        assert 'dispatch: 0.02' in repr(err)
+
+    def test_from_query_options(self) -> None:
+        assert Deadline.from_query_options(None) is None
+        assert Deadline.from_query_options({'timeout': 1000000}) is None
+        deadline = Deadline.from_query_options({'deadline': 1500000})
+        assert deadline is not None
+        assert deadline.timeout == 1.5
+        assert deadline.phase == PHASE_QUEUE
+        assert 1.4 < deadline.remaining() <= 1.5
+
+    def test_limiter_wait(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(1, queue_timeout=5)
+        permit = limiter.acquire('SELECT ?')
+        with pytest.raises(DeadlineExceededError) as ex_info:
+            limiter.acquire('SELECT ?', deadline=Deadline(0.05))
+        assert ex_info.value.phase == PHASE_QUEUE
+        # the query ran out of time, the limiter did not reject it
+        assert limiter.stats().rejected == 0
+        assert limiter.stats().queued == 0
+        permit.release()
+        # the queue timeout is before the deadline
+        limiter = AdaptiveConcurrencyLimiter(1, queue_timeout=0.01)
+        permit = limiter.acquire('SELECT ?')
+        with pytest.raises(QueryRejectedError):
+            limiter.acquire('SELECT ?', deadline=Deadline(5))
+        assert limiter.stats().rejected == 1
+
+    def test_retry_backoff_exceeds_deadline(self) -> None:
+        engine = RetryEngine(RetryPolicy(max_attempts=3, jitter=False), budget=1)
+        retries = engine.start_query({'readonly': True})
+        assert retries is not None
+        # the default initial backoff (100ms) would not be over before the deadline
+        assert retries.next_delay(TimeoutError(), max_delay=0.05) is None
+        assert engine.stats().retries == 0
+        retries = engine.start_query({'readonly': True})
+        assert retries is not None
+        assert retries.next_delay(TimeoutError(), max_delay=1) is not None
+
+    def test_tenant_rate_limit_delay(self) -> None:
+        throttle = TenantThrottle(rate=10, burst=1)
+        throttle.acquire('tenant-a').release()
+        # the next token is available in 100ms
+        with pytest.raises(DeadlineExceededError) as ex_info:
+            throttle.reserve('tenant-a', Deadline(0.05))
+        assert ex_info.value.phase == PHASE_QUEUE
+        # the token is not used up by the query that ran out of time
+        assert throttle.reserve('tenant-a') <= 0.1
+
+    def test_tenant_wait(self) -> None:
+        throttle = TenantThrottle(max_concurrent=1, queue_timeout=5)
+        permit = throttle.acquire('tenant-a')
+        with pytest.raises(DeadlineExceededError):
+            throttle.acquire('tenant-a', Deadline(0.05))
+        stats = throttle.stats()[0]
+        assert stats.rejected == 0
+        assert stats.queued == 0
+        permit.release()
+
+
+class DeadlineTests(DeadlineTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(DeadlineTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(DeadlineTests) if valid_test_method(meth)]
+        test_list = set(DeadlineTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -0,0 +1,280 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from typing import (Any,
+                    Dict,
+                    List,
+                    NamedTuple,
+                    Optional)
+
+import pytest
+
+from couchbase_columnar.common.deserializer import ProjectingDeserializer, TupleRowDeserializer
+from couchbase_columnar.deserializer import (DefaultJsonDeserializer,
+                                             Deserializer,
+                                             LazyRow,
+                                             LazyRowDeserializer,
+                                             TypedDeserializer)
+from couchbase_columnar.options import QueryOptions
+
+
+@dataclass
+class Geo:
+    lat: float
+    lon: float
+
+
+@dataclass
+class Airport:
+    id: int
+    name: str
+    geo: Optional[Geo] = None
+    tags: List[str] = field(default_factory=list)
+
+
+class Route(NamedTuple):
+    source: str
+    destination: str
+    stops: int = 0
+
+
+@dataclass
+class Document:
+    id: str
+    extra: Dict[str, Any]
+
+
+class DeserializerTestSuite:
+    TEST_MANIFEST = [
+        'test_lazy_row',
+        'test_lazy_row_not_an_object',
+        'test_lazy_row_on_demand',
+        'test_projecting_deserializer',
+        'test_projecting_deserializer_custom_deserializer',
+        'test_projecting_deserializer_on_demand',
+        'test_tuple_row_deserializer',
+        'test_tuple_row_deserializer_irregular_rows',
+        'test_typed_deserializer_compiled_once',
+        'test_typed_deserializer_dataclass',
+        'test_typed_deserializer_invalid_model',
+        'test_typed_deserializer_invalid_row',
+        'test_typed_deserializer_msgspec_missing',
+        'test_typed_deserializer_msgspec_struct',
+        'test_typed_deserializer_named_tuple',
+        'test_typed_deserializer_query_option',
+    ]
+
+    def test_lazy_row(self) -> None:
+        raw = b'{"id": 1, "name": "SFO", "geo": {"lat": 37.6, "lon": -122.4}, "tags": ["hub"]}'
+        row = LazyRowDeserializer().deserialize(raw)
+        assert isinstance(row, LazyRow)
+        assert row.raw == raw
+        assert row['name'] == 'SFO'
+        assert row['geo'] == {'lat': 37.6, 'lon': -122.4}
+        assert row.get('country') is None
+        with pytest.raises(KeyError):
+            row['country']
+        assert 'tags' in row
+        assert list(row) == ['id', 'name', 'geo', 'tags']
+        assert len(row) == 4
+        materialized = row.materialize()
+        assert materialized == {'id': 1, 'name': 'SFO', 'geo': {'lat': 37.6, 'lon': -122.4}, 'tags': ['hub']}
+        assert row == materialized
+        # the row is read-only, the materialized dict is a copy
+        materialized['id'] = 2
+        assert row['id'] == 1
+        with pytest.raises(TypeError):
+            row['id'] = 2  # type: ignore[index]
+
+    def test_lazy_row_not_an_object(self) -> None:
+        deserializer = LazyRowDeserializer()
+        assert deserializer.deserialize(b'1') == 1
+        assert deserializer.deserialize(b'[1, {"a": 2}]') == [1, {'a': 2}]
+        assert isinstance(deserializer.deserialize(b' {"a": 1}'), LazyRow)
+
+    def test_lazy_row_on_demand(self) -> None:
+        pytest.importorskip('simdjson')
+        deserializer = LazyRowDeserializer()
+        assert deserializer.on_demand is True
+        rows = [deserializer.deserialize(b'{"id": %d, "doc": {"body": "%s"}}' % (idx, b'x' * 100)) for idx in range(3)]
+        # rows are accessed in any order, untouched fields are not decoded
+        assert [rows[idx]['id'] for idx in (2, 0, 1)] == [2, 0, 1]
+        assert all(list(row._values) == ['id'] for row in rows)
+        # the row is parsed once, its fields are decoded from the same document
+        doc = rows[0]._doc
+        assert doc is not None
+        assert len(rows[0]) == 2 and list(rows[0]) == ['id', 'doc']
+        assert rows[0]._doc is doc
+        assert rows[0].materialize() == {'id': 0, 'doc': {'body': 'x' * 100}}
+        # the document is released once all of the row's fields are decoded
+        assert rows[0]._doc is None
+        assert rows[1]['doc'] == {'body': 'x' * 100}
+        assert rows[1]._doc is None
+        assert list(rows[1].materialize()) == ['id', 'doc']
+
+    def test_projecting_deserializer(self) -> None:
+        deserializer = ProjectingDeserializer(DefaultJsonDeserializer(), ['name', 'geo.lat', 'id', 'geo.alt.m'])
+        # force the json library
+        deserializer._parser = None
+        raw = b'{"id": 1, "name": "SFO", "geo": {"lat": 37.6, "lon": -122.4, "alt": {"m": 4}}, "doc": {"body": "x"}}'
+        row = deserializer.deserialize(raw)
+        assert row == {'name': 'SFO', 'geo': {'lat': 37.6, 'alt': {'m': 4}}, 'id': 1}
+        # the fields are in the order of the paths
+        assert list(row) == ['name', 'geo', 'id']
+        # missing paths are omitted
+        assert deserializer.deserialize(b'{"id": 2, "geo": {"lon": -118.4}}') == {'id': 2}
+        assert deserializer.deserialize(b'{"id": 3, "name": null, "geo": 1}') == {'id': 3, 'name': None}
+        # rows that are not objects are not projected
+        assert deserializer.deserialize(b'[1, 2]') == [1, 2]
+        # a whole field covers its nested paths
+        deserializer = ProjectingDeserializer(DefaultJsonDeserializer(), ['geo.lat', 'geo', 'geo.lon'])
+        deserializer._parser = None
+        assert deserializer.deserialize(raw) == {'geo': {'lat': 37.6, 'lon': -122.4, 'alt': {'m': 4}}}
+
+    def test_projecting_deserializer_custom_deserializer(self) -> None:
+        raw = b'{"id": 1, "name": "SFO", "geo": {"lat": 37.6, "lon": -122.4}, "tags": ["hub"]}'
+        deserializer = ProjectingDeserializer(TypedDeserializer(Airport), ['id', 'name', 'geo'])
+        assert deserializer.deserialize(raw) == Airport(1, 'SFO', Geo(37.6, -122.4))
+        deserializer = ProjectingDeserializer(LazyRowDeserializer(), ['tags'])
+        row = deserializer.deserialize(raw)
+        assert isinstance(row, LazyRow)
+        assert row.materialize() == {'tags': ['hub']}
+
+    def test_projecting_deserializer_on_demand(self) -> None:
+        pytest.importorskip('simdjson')
+        paths = ['id', 'geo.lat', 'geo.alt', 'tags', 'missing.field']
+        deserializer = ProjectingDeserializer(DefaultJsonDeserializer(), paths)
+        assert deserializer._parser is not None
+        fallback = ProjectingDeserializer(DefaultJsonDeserializer(), paths)
+        fallback._parser = None
+        rows = [b'{"id": 1, "geo": {"lat": 37.6, "lon": -122.4}, "tags": ["hub", {"a": null}], "doc": "x"}',
+                b'{"id": 2, "geo": {"alt": {"m": [4]}}, "missing": 1}',
+                b'{"geo": null}',
+                b'"SFO"',
+                b'[{"id": 1}]']
+        for raw in rows:
+            assert deserializer.deserialize(raw) == fallback.deserialize(raw)
+        assert deserializer.deserialize(rows[0]) == {'id': 1, 'geo': {'lat': 37.6}, 'tags': ['hub', {'a': None}]}
+
+    def test_tuple_row_deserializer(self) -> None:
+        deserializer = TupleRowDeserializer(DefaultJsonDeserializer())
+        assert deserializer.columns is None
+        assert deserializer.deserialize(b'{"id": 1, "name": "SFO", "geo": {"lat": 37}}') == (1, 'SFO', {'lat': 37})
+        assert deserializer.columns == ('id', 'name', 'geo')
+        assert deserializer.deserialize(b'{"id": 2, "name": "LAX", "geo": null}') == (2, 'LAX', None)
+        # the values are in the order of the columns, not the order of the row's fields
+        assert deserializer.deserialize(b'{"name": "JFK", "geo": null, "id": 3}') == (3, 'JFK', None)
+        assert deserializer.columns == ('id', 'name', 'geo')
+
+    def test_tuple_row_deserializer_irregular_rows(self) -> None:
+        deserializer = TupleRowDeserializer(DefaultJsonDeserializer())
+        deserializer.deserialize(b'{"id": 1, "name": "SFO"}')
+        # MISSING fields
+        assert deserializer.deserialize(b'{"id": 2}') == (2, None)
+        with pytest.raises(ValueError, match='country'):
+            deserializer.deserialize(b'{"id": 3, "name": "LAX", "country": "US"}')
+        with pytest.raises(ValueError):
+            deserializer.deserialize(b'{"id": 4, "country": "US"}')
+        with pytest.raises(ValueError):
+            deserializer.deserialize(b'5')
+        with pytest.raises(ValueError):
+            TupleRowDeserializer(DefaultJsonDeserializer()).deserialize(b'[1, "SFO"]')
+
+    def test_typed_deserializer_compiled_once(self) -> None:
+        assert TypedDeserializer(Airport)._decode is TypedDeserializer(Airport)._decode
+        assert TypedDeserializer(Airport)._decode is not TypedDeserializer(Route)._decode
+
+    def test_typed_deserializer_dataclass(self) -> None:
+        deserializer = TypedDeserializer(Airport)
+        assert deserializer.model is Airport
+        row = deserializer.deserialize(b'{"id": 1, "name": "SFO", "geo": {"lat": 37, "lon": -122.4}, "city": "SF"}')
+        assert row == Airport(1, 'SFO', Geo(37.0, -122.4))
+        assert isinstance(row.geo, Geo)
+        assert isinstance(row.geo.lat, float)
+        assert deserializer.deserialize(b'{"id": 2, "name": "LAX", "geo": null, "tags": ["hub"]}') == Airport(
+            2, 'LAX', tags=['hub'])
+        # values of fields annotated w/ Any are not converted
+        doc = TypedDeserializer(Document).deserialize(b'{"id": "doc-1", "extra": {"a": [1, {"b": null}]}}')
+        assert doc == Document('doc-1', {'a': [1, {'b': None}]})
+
+    def test_typed_deserializer_invalid_model(self) -> None:
+        with pytest.raises(ValueError):
+            TypedDeserializer(dict)
+        # not a class
+        for model in (Airport(1, 'SFO'), List[Airport], Optional[Route], {'id': int}):
+            with pytest.raises(ValueError):
+                TypedDeserializer(model)  # type: ignore[arg-type]
+
+    def test_typed_deserializer_msgspec_missing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # a msgspec.Struct model, w/o importing msgspec
+        struct = type('Struct', (), {'__module__': 'msgspec'})
+        model = type('Airline', (struct,), {})
+        monkeypatch.setitem(sys.modules, 'msgspec', None)
+        with pytest.raises(ValueError, match='requires msgspec'):
+            TypedDeserializer(model)
+
+    def test_typed_deserializer_invalid_row(self) -> None:
+        deserializer = TypedDeserializer(Airport)
+        with pytest.raises(ValueError, match='`id`'):
+            deserializer.deserialize(b'{"name": "SFO"}')
+        with pytest.raises(ValueError, match=r'geo\.lat'):
+            deserializer.deserialize(b'{"id": 1, "name": "SFO", "geo": {"lat": "37", "lon": -122.4}}')
+        with pytest.raises(ValueError, match=r'tags\[1\]'):
+            deserializer.deserialize(b'{"id": 1, "name": "SFO", "tags": ["hub", 1]}')
+        with pytest.raises(ValueError):
+            deserializer.deserialize(b'[1, "SFO"]')
+        # bool is not an int
+        with pytest.raises(ValueError):
+            deserializer.deserialize(b'{"id": true, "name": "SFO"}')
+
+    def test_typed_deserializer_msgspec_struct(self) -> None:
+        msgspec = pytest.importorskip('msgspec')
+        airline = msgspec.defstruct('Airline', [('id', int), ('name', str), ('country', Optional[str], None)])
+        deserializer = TypedDeserializer(airline)
+        row = deserializer.deserialize(b'{"id": 10, "name": "40-Mile Air", "iata": "Q5"}')
+        assert row == airline(10, '40-Mile Air')
+        with pytest.raises(ValueError):
+            deserializer.deserialize(b'{"id": "10", "name": "40-Mile Air"}')
+
+    def test_typed_deserializer_named_tuple(self) -> None:
+        deserializer = TypedDeserializer(Route)
+        route = deserializer.deserialize(b'{"destination": "LAX", "source": "SFO", "airline": "AA"}')
+        assert route == Route('SFO', 'LAX', 0)
+        assert isinstance(route, Route)
+        with pytest.raises(ValueError):
+            deserializer.deserialize(b'{"source": "SFO", "destination": "LAX", "stops": 1.5}')
+
+    def test_typed_deserializer_query_option(self) -> None:
+        deserializer = TypedDeserializer(Route)
+        assert isinstance(deserializer, Deserializer)
+        q_opts = QueryOptions(deserializer=deserializer)
+        assert q_opts['deserializer'] is deserializer
+
+
+class DeserializerTests(DeserializerTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(DeserializerTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(DeserializerTests) if valid_test_method(meth)]
+        test_list = set(DeserializerTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -0,0 +1,621 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from threading import Event, Thread
+from threading import enumerate as enumerate_threads
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    Iterator,
+                    List,
+                    Optional)
+
+import pytest
+
+from couchbase_columnar.cluster import Cluster
+from couchbase_columnar.common.streaming import StreamingState
+from couchbase_columnar.credential import Credential
+from couchbase_columnar.errors import (CircuitOpenError,
+                                       ColumnarError,
+                                       DeadlineExceededError,
+                                       IdleRowTimeoutError,
+                                       QueryError,
+                                       QueryRejectedError,
+                                       TimeoutError)
+from couchbase_columnar.options import (CircuitBreakerConfig,
+                                        ClusterOptions,
+                                        QueryOptions,
+                                        RetryPolicy)
+from couchbase_columnar.protocol.hedging import HEDGE_MAX_WORKERS, get_hedge_scheduler
+from couchbase_columnar.protocol.warm_up import MAX_WARM_UP_CONNECTIONS
+from couchbase_columnar.query import CancelToken
+from couchbase_columnar.result import (BlockingQueryResult,
+                                       SpillableRowSequence,
+                                       WarmUpResult)
+from tests import YieldFixture
+from tests.emulator import (ColumnarEmulator,
+                            EmulatorResponse,
+                            QueryContext)
+from tests.environments.base_environment import cluster_transport, get_security_options
+
+if TYPE_CHECKING:
+    from tests.environments.base_environment import BlockingTestEnvironment
+
+
+class EmulatorTestSuite:
+    TEST_MANIFEST = [
+        'test_cancel_while_streaming',
+        'test_circuit_breaker',
+        'test_concurrency_limit',
+        'test_deadline',
+        'test_deadline_while_queued',
+        'test_error_after_rows',
+        'test_hedged_query',
+        'test_hedged_query_not_read_only',
+        'test_hedged_query_primary_wins',
+        'test_hedged_query_retried',
+        'test_idle_row_timeout',
+        'test_mid_stream_disconnect',
+        'test_project',
+        'test_retry',
+        'test_retry_backoff_cancelled',
+        'test_row_format_tuple',
+        'test_slow_consumer',
+        'test_slow_response',
+        'test_statement_handler',
+        'test_streamed_results',
+        'test_tenant_throttle',
+        'test_timeout_while_streaming',
+        'test_warm_up',
+        'test_warm_up_errors',
+        'test_warnings',
+    ]
+
+    @pytest.fixture(scope='class')
+    def emulator(self, test_env: BlockingTestEnvironment) -> YieldFixture[ColumnarEmulator]:
+        if test_env.emulator is None:
+            pytest.skip('Test requires the Columnar emulator (PYCBCC_EMULATOR=ON).')
+        yield test_env.emulator
+        test_env.emulator.clear_handlers()
+
+    @staticmethod
+    def create_cluster(test_env: BlockingTestEnvironment, emulator: ColumnarEmulator, **kwargs: Any) -> Cluster:
+        username, pw = test_env.config.get_username_and_pw()
+        cred = Credential.from_username_and_password(username, pw)
+        opts = ClusterOptions(security_options=get_security_options(test_env.config, emulator))
+        with cluster_transport(emulator):
+            return Cluster.create_instance(emulator.connection_string, cred, opts, **kwargs)
+
+    @pytest.fixture()
+    def hedging_cluster(self,
+                        test_env: BlockingTestEnvironment,
+                        emulator: ColumnarEmulator) -> YieldFixture[Cluster]:
+        # every query can be hedged
+        cluster = self.create_cluster(test_env, emulator, hedging_budget=1.0)
+        yield cluster
+        cluster.shutdown()
+
+    @staticmethod
+    def slow_then_fast_handler() -> Callable[[QueryContext], Optional[EmulatorResponse]]:
+        responses: Iterator[EmulatorResponse] = iter([EmulatorResponse(rows=[{'hedge': False}], first_row_delay=2),
+                                                      EmulatorResponse(rows=[{'hedge': True}])])
+
+        def handler(ctx: QueryContext) -> Optional[EmulatorResponse]:
+            return next(responses, None)
+        return handler
+
+    @staticmethod
+    def fail_then_succeed_handler(failures: int) -> Callable[[QueryContext], Optional[EmulatorResponse]]:
+        responses: Iterator[EmulatorResponse] = iter([EmulatorResponse(errors=[{'code': 23007,
+                                                                                'msg': 'Job queue is full'}])]
+                                                     * failures)
+
+        def handler(ctx: QueryContext) -> Optional[EmulatorResponse]:
+            return next(responses, None)
+        return handler
+
+    def test_cancel_while_streaming(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cancelled_count = emulator.cancelled_count
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.05)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        for row in result.rows():
+            rows.append(row)
+            if len(rows) == 5:
+                result.cancel()
+        assert len(rows) == 5
+        assert result._executor.streaming_state == StreamingState.Cancelled
+        # the emulator notices the client going away the next time it writes (or waits)
+        deadline = time.monotonic() + 5
+        while emulator.cancelled_count == cancelled_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert emulator.cancelled_count == cancelled_count + 1
+
+    def test_circuit_breaker(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        config = CircuitBreakerConfig(min_queries=2, open_duration=timedelta(milliseconds=200), half_open_probes=1)
+        cluster = self.create_cluster(test_env, emulator, circuit_breaker=config)
+        try:
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(2))
+            for _ in range(2):
+                with pytest.raises(QueryError):
+                    cluster.execute_query('SELECT 1;')
+            request_count = emulator.request_count
+            # the circuit is open, queries fail w/o being sent to the server
+            with pytest.raises(CircuitOpenError):
+                cluster.execute_query('SELECT 1;')
+            assert emulator.request_count == request_count
+            time.sleep(0.2)
+            # the probe query succeeds and closes the circuit
+            assert cluster.execute_query('SELECT 1;').get_all_rows() == [{'$1': 1}]
+            assert cluster.execute_query('SELECT 1;').get_all_rows() == [{'$1': 1}]
+            stats = cluster.metrics_snapshot().circuit_breakers
+            assert len(stats) == 1
+            assert stats[0].state == 'closed'
+            assert stats[0].opened == 1
+            assert stats[0].rejected == 1
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+        assert test_env.cluster.metrics_snapshot().circuit_breakers == []
+
+    def test_concurrency_limit(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = self.create_cluster(test_env,
+                                      emulator,
+                                      max_concurrent_queries=1,
+                                      concurrency_queue_timeout=timedelta(0))
+        try:
+            request_count = emulator.request_count
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.05)
+            result = cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+            # the first query holds the only in-flight slot until its rows have been streamed
+            with pytest.raises(QueryRejectedError):
+                cluster.execute_query('SELECT 1;')
+            assert emulator.request_count == request_count + 1
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.in_flight == 1
+            assert stats.rejected == 1
+            assert len(result.get_all_rows()) == 20
+            assert cluster.execute_query('SELECT 1;').get_all_rows() == [{'$1': 1}]
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.limit == 1
+            assert stats.in_flight == 0
+            assert stats.admitted == 2
+        finally:
+            cluster.shutdown()
+        assert test_env.cluster.metrics_snapshot().concurrency is None
+
+    def test_deadline(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        # the server is sent the time remaining until the deadline as the query's timeout
+        assert test_env.cluster.execute_query('SELECT 1;', deadline=timedelta(seconds=2)).get_all_rows() == [{'$1': 1}]
+        timeout = emulator.requests[-1]['timeout']
+        assert timeout.endswith('us') and 0 < int(timeout[:-2]) <= 2000000
+        # the server does not respond in time
+        response = EmulatorResponse(row_count=10, first_row_delay=2)
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceededError) as ex:
+            test_env.cluster.execute_query('SELECT * FROM emulator',
+                                           QueryOptions(raw=response.to_raw(), deadline=timedelta(milliseconds=300)))
+        assert ex.value.phase == 'dispatch'
+        assert time.perf_counter() - start < 1.5
+        # the server streams the rows too slowly
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.2)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(), deadline=timedelta(seconds=1)))
+        rows = []
+        with pytest.raises(DeadlineExceededError) as ex:
+            for row in result.rows():
+                rows.append(row)
+        assert ex.value.phase == 'streaming'
+        assert 0 < len(rows) < 100
+        # the application iterates the rows too slowly
+        response = EmulatorResponse(row_count=10)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(),
+                                                             deadline=timedelta(milliseconds=200)))
+        rows = []
+        with pytest.raises(DeadlineExceededError) as ex:
+            for row in result.rows():
+                rows.append(row)
+                time.sleep(0.3)
+        assert ex.value.phase == 'streaming'
+        assert len(rows) == 1
+        assert result._executor.streaming_state == StreamingState.Cancelled
+        # the server stalls mid-stream, the deadline cancels the executor's wait for the next row
+        response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=3)
+        start = time.perf_counter()
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(),
+                                                             deadline=timedelta(milliseconds=500)))
+        rows = []
+        with pytest.raises(DeadlineExceededError) as ex:
+            for row in result.rows():
+                rows.append(row)
+        assert ex.value.phase == 'streaming'
+        assert len(rows) == 10
+        # i.e. before the transport's socket timeout (the query's timeout + 1s)
+        assert time.perf_counter() - start < 1.2
+
+    def test_deadline_while_queued(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = self.create_cluster(test_env, emulator, max_concurrent_queries=1)
+        try:
+            request_count = emulator.request_count
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.05)
+            result = cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+            # the first query holds the only in-flight slot until its rows have been streamed
+            with pytest.raises(DeadlineExceededError) as ex:
+                cluster.execute_query('SELECT 1;', deadline=timedelta(milliseconds=100))
+            assert ex.value.phase == 'queue'
+            assert emulator.request_count == request_count + 1
+            # time spent waiting for one of the cluster's threads counts against the deadline as well
+            ft = cluster.execute_query('SELECT 1;',
+                                       cancel_token=CancelToken(Event()),
+                                       deadline=timedelta(milliseconds=100))
+            assert isinstance(ft, Future)
+            with pytest.raises(DeadlineExceededError) as ex:
+                ft.result()
+            assert ex.value.phase == 'queue'
+            assert len(result.get_all_rows()) == 20
+            stats = cluster.metrics_snapshot().concurrency
+            assert stats is not None
+            assert stats.in_flight == 0
+            assert stats.rejected == 0
+        finally:
+            cluster.shutdown()
+
+    def test_idle_row_timeout(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cancelled_count = emulator.cancelled_count
+        # the stream stalls after the first chunk of rows
+        response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=5)
+        start = time.perf_counter()
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(),
+                                                             idle_row_timeout=timedelta(milliseconds=200)))
+        rows = []
+        with pytest.raises(IdleRowTimeoutError):
+            for row in result.rows():
+                rows.append(row)
+        assert len(rows) == 10
+        assert time.perf_counter() - start < 2
+        assert result._executor.streaming_state == StreamingState.Cancelled
+        deadline = time.monotonic() + 5
+        while emulator.cancelled_count == cancelled_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert emulator.cancelled_count == cancelled_count + 1
+        # time the application spends processing a row does not count
+        response = EmulatorResponse(row_count=5)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(),
+                                                             idle_row_timeout=timedelta(milliseconds=100)))
+        rows = []
+        for row in result.rows():
+            rows.append(row)
+            time.sleep(0.2)
+        assert len(rows) == 5
+        assert result._executor.streaming_state == StreamingState.Completed
+
+    def test_tenant_throttle(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = self.create_cluster(test_env,
+                                      emulator,
+                                      tenant_max_concurrent_queries=1,
+                                      concurrency_queue_timeout=timedelta(0))
+        try:
+            request_count = emulator.request_count
+            response = EmulatorResponse(row_count=20, rows_per_chunk=10, chunk_delay=0.05)
+            result = cluster.execute_query('SELECT * FROM emulator',
+                                           QueryOptions(raw=response.to_raw(), tenant='tenant-a'))
+            # the tenant's first query holds its only in-flight slot until its rows have been streamed
+            with pytest.raises(QueryRejectedError):
+                cluster.execute_query('SELECT 1;', tenant='tenant-a')
+            assert emulator.request_count == request_count + 1
+            # other tenants (and queries w/o a tenant) are not affected
+            assert cluster.execute_query('SELECT 1;', tenant='tenant-b').get_all_rows() == [{'$1': 1}]
+            assert cluster.execute_query('SELECT 1;').get_all_rows() == [{'$1': 1}]
+            assert len(result.get_all_rows()) == 20
+            assert cluster.execute_query('SELECT 1;', tenant='tenant-a').get_all_rows() == [{'$1': 1}]
+            stats = {s.tenant: s for s in cluster.metrics_snapshot().tenants}
+            assert set(stats) == {'tenant-a', 'tenant-b'}
+            assert stats['tenant-a'].in_flight == 0
+            assert stats['tenant-a'].admitted == 2
+            assert stats['tenant-a'].rejected == 1
+            assert stats['tenant-a'].queue_wait.count == 2
+            assert stats['tenant-b'].admitted == 1
+        finally:
+            cluster.shutdown()
+        assert test_env.cluster.metrics_snapshot().tenants == []
+
+    def test_error_after_rows(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=10, errors=[{'code': 25000, 'msg': 'Internal error'}])
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        with pytest.raises(QueryError) as ex:
+            for row in result.rows():
+                rows.append(row)
+        assert len(rows) == 10
+        assert ex.value.code == 25000
+        assert ex.value.server_message == 'Internal error'
+
+    def test_hedged_query(self, hedging_cluster: Cluster, emulator: ColumnarEmulator) -> None:
+        cancelled_count = emulator.cancelled_count
+        emulator.add_handler(r'^SELECT \* FROM hedged$', self.slow_then_fast_handler())
+        try:
+            start = time.perf_counter()
+            result = hedging_cluster.execute_query('SELECT * FROM hedged',
+                                                   QueryOptions(hedge_after=timedelta(milliseconds=100),
+                                                                read_only=True))
+            rows = result.get_all_rows()
+        finally:
+            emulator.clear_handlers()
+        # the hedge responded first
+        assert rows == [{'hedge': True}]
+        assert time.perf_counter() - start < 2
+        stats = hedging_cluster.metrics_snapshot().hedging
+        assert stats.requests == 1
+        assert stats.hedges_sent == 1
+        assert stats.hedges_won == 1
+        # the original query is cancelled
+        deadline = time.monotonic() + 5
+        while emulator.cancelled_count == cancelled_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert emulator.cancelled_count == cancelled_count + 1
+        # hedges share the scheduler's threads, the original query is waited for by the calling thread
+        hedge_threads = [t for t in enumerate_threads() if t.name.startswith('pycbcc-hedge')]
+        assert len(hedge_threads) <= HEDGE_MAX_WORKERS + 1
+
+    def test_hedged_query_not_read_only(self, hedging_cluster: Cluster) -> None:
+        with pytest.raises(ValueError):
+            hedging_cluster.execute_query('SELECT * FROM hedged', QueryOptions(hedge_after=timedelta(milliseconds=100)))
+        assert hedging_cluster.metrics_snapshot().hedging.requests == 0
+
+    def test_hedged_query_primary_wins(self, hedging_cluster: Cluster, emulator: ColumnarEmulator) -> None:
+        request_count = emulator.request_count
+        result = hedging_cluster.execute_query('SELECT 1;',
+                                               QueryOptions(hedge_after=timedelta(seconds=1), read_only=True))
+        assert result.get_all_rows() == [{'$1': 1}]
+        stats = hedging_cluster.metrics_snapshot().hedging
+        assert stats.requests == 1
+        assert stats.hedges_sent == 0
+        assert stats.hedges_won == 0
+        assert emulator.request_count == request_count + 1
+        # the hedge's timer is cancelled once the original query wins, it does not keep the query alive
+        assert all(timer.callback is None for _, _, timer in get_hedge_scheduler()._timers)
+
+    def test_hedged_query_retried(self, hedging_cluster: Cluster, emulator: ColumnarEmulator) -> None:
+        emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(1))
+        try:
+            request_count = emulator.request_count
+            result = hedging_cluster.execute_query('SELECT 1;',
+                                                   QueryOptions(hedge_after=timedelta(seconds=1), read_only=True),
+                                                   retry_policy=RetryPolicy(initial_backoff=timedelta(milliseconds=10)))
+            assert result.get_all_rows() == [{'$1': 1}]
+        finally:
+            emulator.clear_handlers()
+        assert emulator.request_count == request_count + 2
+        # the retry does not count as another hedge-eligible request
+        stats = hedging_cluster.metrics_snapshot().hedging
+        assert stats.requests == 1
+        assert stats.hedges_sent == 0
+
+    def test_mid_stream_disconnect(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, disconnect_after_rows=20)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = []
+        with pytest.raises(ColumnarError):
+            for row in result.rows():
+                rows.append(row)
+        assert len(rows) == 20
+
+    def test_project(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=100, row_size=256, rows_per_chunk=7)
+        # the payload is not an object, its nested paths are omitted
+        q_opts = QueryOptions(raw=response.to_raw(), project=['name', 'id', 'payload.size'])
+        rows = test_env.cluster.execute_query('SELECT * FROM emulator', q_opts).get_all_rows()
+        assert rows[1] == {'name': 'row-1', 'id': 1}
+        assert [r['id'] for r in rows] == list(range(100))
+        q_opts = QueryOptions(raw=response.to_raw(), project=['name', 'id'], row_format='tuple')
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', q_opts)
+        rows = result.get_all_rows()
+        assert result.columns() == ('name', 'id')
+        assert rows[1] == ('row-1', 1)
+
+    def test_retry(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = self.create_cluster(test_env,
+                                      emulator,
+                                      retry_policy=RetryPolicy(initial_backoff=timedelta(milliseconds=10)))
+        try:
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(2))
+            request_count = emulator.request_count
+            assert cluster.execute_query('SELECT 1;').get_all_rows() == [{'$1': 1}]
+            assert emulator.request_count == request_count + 3
+            # queries executed in the background (w/ a cancel token) are retried as well
+            emulator.clear_handlers()
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(1))
+            ft = cluster.execute_query('SELECT 1;', cancel_token=CancelToken(Event()))
+            assert isinstance(ft, Future)
+            assert ft.result().get_all_rows() == [{'$1': 1}]
+            # the query fails once its attempts are used up
+            emulator.clear_handlers()
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(2))
+            with pytest.raises(QueryError) as ex:
+                cluster.execute_query('SELECT 1;', retry_policy=RetryPolicy(max_attempts=2))
+            assert ex.value.code == 23007
+            stats = cluster.metrics_snapshot().retries
+            assert stats.queries == 3
+            assert stats.retries == 4
+            assert stats.succeeded_after_retry == 2
+            assert stats.failed_after_retry == 1
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+
+    def test_retry_backoff_cancelled(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        cluster = self.create_cluster(test_env,
+                                      emulator,
+                                      retry_policy=RetryPolicy(initial_backoff=timedelta(seconds=30),
+                                                               max_backoff=timedelta(seconds=30),
+                                                               jitter=False))
+        try:
+            emulator.add_handler(r'^SELECT 1;$', self.fail_then_succeed_handler(1))
+            request_count = emulator.request_count
+            result = cluster.execute_query('SELECT 1;', QueryOptions(lazy_execute=True))
+            rows: List[Any] = []
+            consumer = Thread(target=lambda: rows.extend(result.rows()), daemon=True)
+            consumer.start()
+            # wait for the first attempt to fail, the executor then backs off before the retry
+            while emulator.request_count == request_count:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            start = time.perf_counter()
+            result.cancel()
+            consumer.join(5)
+            assert consumer.is_alive() is False
+            assert time.perf_counter() - start < 5
+            assert rows == []
+            # the query is not dispatched again
+            assert emulator.request_count == request_count + 1
+        finally:
+            emulator.clear_handlers()
+            cluster.shutdown()
+
+    def test_slow_consumer(self, test_env: BlockingTestEnvironment) -> None:
+        # large rows fill the socket buffers while the consumer sleeps, the emulator's writes block until rows are read
+        response = EmulatorResponse(row_count=200, row_size=64 * 1024, rows_per_chunk=1)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        count = 0
+        for _ in result.rows():
+            if count == 0:
+                time.sleep(0.5)
+            count += 1
+        assert count == 200
+        assert result.metadata().metrics().result_count() == 200
+
+    def test_slow_response(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=10, first_row_delay=0.5)
+        start = time.perf_counter()
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        rows = result.get_all_rows()
+        assert time.perf_counter() - start >= 0.5
+        assert len(rows) == 10
+        assert result.metadata().metrics().elapsed_time() >= timedelta(milliseconds=500)
+
+    def test_statement_handler(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        emulator.add_handler(r'^SELECT 1 AS one$', EmulatorResponse(rows=[{'one': 1}]))
+        result = test_env.cluster.execute_query('SELECT 1 AS one')
+        assert result.get_all_rows() == [{'one': 1}]
+        assert emulator.requests[-1]['statement'] == 'SELECT 1 AS one'
+
+    def test_streamed_results(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=1000, row_size=128, rows_per_chunk=7)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        assert isinstance(result, BlockingQueryResult)
+        rows = result.get_all_rows()
+        assert [r['id'] for r in rows] == list(range(1000))
+        metrics = result.metadata().metrics()
+        assert metrics.result_count() == 1000
+        assert metrics.result_size() > 1000 * 100
+
+    def test_row_format_tuple(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=100, row_size=64, rows_per_chunk=7)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(), row_format='tuple'))
+        assert result.columns() is None
+        rows = result.get_all_rows()
+        assert result.columns() == ('id', 'name', 'active', 'score', 'payload')
+        assert all(isinstance(r, tuple) for r in rows)
+        assert [r[0] for r in rows] == list(range(100))
+        assert rows[1][:4] == (1, 'row-1', False, 1.5)
+        # rows spilled to disk are returned as tuples as well
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(), row_format='tuple'))
+        spilled_rows = result.get_all_rows(max_memory=1024)
+        assert isinstance(spilled_rows, SpillableRowSequence)
+        with spilled_rows:
+            # the columns are taken from the first row, even though the rows are deserialized on access
+            assert result.columns() == ('id', 'name', 'active', 'score', 'payload')
+            assert spilled_rows.spilled is True
+            assert spilled_rows[-1] == rows[-1]
+            assert list(spilled_rows) == rows
+        assert test_env.cluster.execute_query('SELECT 1;').columns() is None
+
+    def test_timeout_while_streaming(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=100, rows_per_chunk=10, chunk_delay=0.2)
+        result = test_env.cluster.execute_query('SELECT * FROM emulator',
+                                                QueryOptions(raw=response.to_raw(), timeout=timedelta(seconds=1)))
+        rows = []
+        with pytest.raises(TimeoutError):
+            for row in result.rows():
+                rows.append(row)
+        assert 0 < len(rows) < 100
+
+    def test_warm_up(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        request_count = emulator.request_count
+        result = test_env.cluster.warm_up(4)
+        assert isinstance(result, WarmUpResult)
+        assert result.connections == 4
+        assert result.succeeded == 4
+        assert result.errors == []
+        assert result.elapsed > timedelta(0)
+        assert emulator.request_count == request_count + 4
+        assert all(r['statement'] == 'SELECT 1;' for r in list(emulator.requests)[-4:])
+
+        with pytest.raises(ValueError):
+            test_env.cluster.warm_up(0)
+        # each warm-up query is executed on a thread of its own, the number of connections is bounded
+        with pytest.raises(ValueError):
+            test_env.cluster.warm_up(MAX_WARM_UP_CONNECTIONS + 1)
+
+    def test_warm_up_errors(self, test_env: BlockingTestEnvironment, emulator: ColumnarEmulator) -> None:
+        emulator.add_handler(r'^SELECT 1;$', EmulatorResponse(errors=[{'code': 25000, 'msg': 'Internal error'}]))
+        try:
+            result = test_env.cluster.warm_up(2)
+        finally:
+            emulator.clear_handlers()
+        assert result.connections == 2
+        assert result.succeeded == 0
+        assert len(result.errors) == 2
+        assert all(isinstance(err, QueryError) for err in result.errors)
+
+    def test_warnings(self, test_env: BlockingTestEnvironment) -> None:
+        response = EmulatorResponse(row_count=1, warnings=[{'code': 1, 'msg': 'Emulated warning'}])
+        result = test_env.cluster.execute_query('SELECT * FROM emulator', QueryOptions(raw=response.to_raw()))
+        assert len(result.get_all_rows()) == 1
+        warnings = result.metadata().warnings()
+        assert len(warnings) == 1
+        assert warnings[0].code() == 1
+        assert warnings[0].message() == 'Emulated warning'
+
+
+class EmulatorTests(EmulatorTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(EmulatorTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(EmulatorTests) if valid_test_method(meth)]
+        test_list = set(EmulatorTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
+
+    @pytest.fixture(scope='class', name='test_env')
+    def couchbase_test_environment(self,
+                                   sync_test_env: BlockingTestEnvironment) -> YieldFixture[BlockingTestEnvironment]:
+        yield sync_test_env
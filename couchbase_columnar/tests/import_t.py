@@ -0,0 +1,66 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import subprocess  # nosec
+import sys
+
+import pytest
+
+CORE_MODULE = 'couchbase_columnar.protocol.pycbcc_core'
+
+
+def run_python(code: str) -> str:
+    # a fresh interpreter, the test session has (most likely) already loaded the C++ extension
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=False)  # nosec
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.strip()
+
+
+class ImportTestSuite:
+    TEST_MANIFEST = [
+        'test_configure_logging_prior_to_loading_core',
+        'test_import_does_not_load_core',
+    ]
+
+    def test_configure_logging_prior_to_loading_core(self) -> None:
+        code = ('import sys, logging\n'
+                'from couchbase_columnar import configure_logging\n'
+                'from couchbase_columnar.protocol import get_sdk_logger, get_dropped_log_message_count\n'
+                "configure_logging('my_logger', level=logging.DEBUG, queue_size=10)\n"
+                f"print(get_sdk_logger().name, get_dropped_log_message_count(), '{CORE_MODULE}' in sys.modules)")
+        assert run_python(code) == 'my_logger 0 False'
+
+    @pytest.mark.parametrize('module', ['couchbase_columnar',
+                                        'couchbase_columnar.cluster',
+                                        'acouchbase_columnar',
+                                        'acouchbase_columnar.cluster'])
+    def test_import_does_not_load_core(self, module: str) -> None:
+        code = f"import sys, {module}; print('{CORE_MODULE}' in sys.modules)"
+        assert run_python(code) == 'False'
+
+
+class ImportTests(ImportTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(ImportTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(ImportTests) if valid_test_method(meth)]
+        test_list = set(ImportTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
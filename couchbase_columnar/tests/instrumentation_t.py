@@ -0,0 +1,248 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import json
+import logging
+from threading import Barrier, Thread
+from typing import (Dict,
+                    List,
+                    Optional,
+                    Tuple)
+
+import pytest
+
+from couchbase_columnar.deserializer import DefaultJsonDeserializer
+from couchbase_columnar.errors import QueryError, ResultLimitExceededError
+from couchbase_columnar.metrics import Meter, ValueRecorder
+from couchbase_columnar.protocol.core.request import QueryRequest
+from couchbase_columnar.protocol.instrumentation import (DURATION_METRIC,
+                                                         RESULT_BYTES_METRIC,
+                                                         RESULT_ROWS_METRIC,
+                                                         ROW_DESERIALIZATION_METRIC,
+                                                         TIME_TO_FIRST_ROW_METRIC,
+                                                         QueryInstrumentation,
+                                                         QueryTracker)
+from couchbase_columnar.query import QueryMetadata
+from couchbase_columnar.tracing import RequestSpan, RequestTracer
+
+
+class RecordingSpan(RequestSpan):
+    def __init__(self, name: str, parent: Optional[RecordingSpan]) -> None:
+        self.name = name
+        self.parent = parent
+        self.attributes: Dict[str, object] = {}
+        self.ended = False
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.ended = True
+
+
+class RecordingTracer(RequestTracer):
+    def __init__(self) -> None:
+        self.spans: List[RecordingSpan] = []
+
+    def request_span(self, name: str, parent: Optional[RequestSpan] = None) -> RequestSpan:
+        assert parent is None or isinstance(parent, RecordingSpan)
+        span = RecordingSpan(name, parent)
+        self.spans.append(span)
+        return span
+
+
+class RecordingValueRecorder(ValueRecorder):
+    def __init__(self) -> None:
+        self.values: List[int] = []
+
+    def record_value(self, value: int) -> None:
+        self.values.append(value)
+
+
+class RecordingMeter(Meter):
+    def __init__(self) -> None:
+        self.recorders: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], RecordingValueRecorder] = {}
+
+    def value_recorder(self, name: str, tags: Dict[str, str]) -> ValueRecorder:
+        key = (name, tuple(sorted(tags.items())))
+        if key not in self.recorders:
+            self.recorders[key] = RecordingValueRecorder()
+        return self.recorders[key]
+
+    def values(self, name: str, outcome: Optional[str] = None) -> List[int]:
+        values: List[int] = []
+        for (recorder_name, tags), recorder in self.recorders.items():
+            if recorder_name == name and (outcome is None or ('outcome', outcome) in tags):
+                values.extend(recorder.values)
+        return values
+
+
+class InstrumentationTestSuite:
+    TEST_MANIFEST = [
+        'test_instrumentation_disabled',
+        'test_slow_query_log',
+        'test_slow_query_log_below_threshold',
+        'test_tracker_finish_concurrently',
+        'test_tracker_finish_only_once',
+        'test_tracker_metrics',
+        'test_tracker_outcome',
+        'test_tracker_spans',
+    ]
+
+    @pytest.fixture(scope='class')
+    def query_request(self) -> QueryRequest:
+        return QueryRequest('SELECT 1=1', DefaultJsonDeserializer(), {}, 'test-database', 'test-scope')
+
+    def _run_query(self, tracker: QueryTracker, request: QueryRequest, rows: List[bytes]) -> None:
+        tracker.request_encoded(request)
+        tracker.dispatch_started()
+        tracker.dispatch_completed()
+        for row in rows:
+            tracker.row_received(row)
+            tracker.row_deserialized(1000)
+
+    def test_instrumentation_disabled(self) -> None:
+        instrumentation = QueryInstrumentation()
+        assert instrumentation.enabled is False
+        assert instrumentation.start_query('SELECT 1=1') is None
+
+    def test_slow_query_log(self, caplog: pytest.LogCaptureFixture) -> None:
+        request = QueryRequest("SELECT * FROM t WHERE a = $1 AND b = 'x'",
+                               DefaultJsonDeserializer(),
+                               {'positional_parameters': [1]})
+        metadata = QueryMetadata({'request_id': 'test-request-id',
+                                  'metrics': {'elapsed_time': 2000000, 'execution_time': 1000000}})
+        # the threshold is in microseconds, so any query will exceed it
+        tracker = QueryInstrumentation(slow_query_threshold=0).start_query(request.statement)
+        assert tracker is not None
+        with caplog.at_level(logging.WARNING):
+            self._run_query(tracker, request, [b'{"a":1}', b'{"a":2}'])
+            tracker.finish(get_metadata=lambda: metadata)
+        assert len(caplog.records) == 1
+        message = caplog.records[0].getMessage()
+        assert message.startswith('Slow query: ')
+        entry = json.loads(message[len('Slow query: '):])
+        assert entry['fingerprint'] == 'SELECT * FROM t WHERE a = $1 AND b = ?'
+        assert entry['outcome'] == 'Success'
+        assert entry['parameter_count'] == 1
+        assert entry['rows'] == 2
+        assert entry['result_bytes'] == 14
+        assert entry['request_id'] == 'test-request-id'
+        assert entry['server'] == {'elapsed_time_us': 2000, 'execution_time_us': 1000}
+        assert 'total' in entry['exceeded']
+        assert entry['client']['deserialization_us'] == 2
+
+    def test_slow_query_log_below_threshold(self,
+                                            query_request: QueryRequest,
+                                            caplog: pytest.LogCaptureFixture) -> None:
+        def get_metadata() -> QueryMetadata:
+            pytest.fail('Metadata should only be fetched for slow queries.')
+
+        tracker = QueryInstrumentation(slow_query_threshold=60000000).start_query(query_request.statement)
+        assert tracker is not None
+        with caplog.at_level(logging.WARNING):
+            self._run_query(tracker, query_request, [b'{"a":1}'])
+            tracker.finish(get_metadata=get_metadata)
+        assert caplog.records == []
+
+    def test_tracker_finish_concurrently(self, query_request: QueryRequest) -> None:
+        for _ in range(20):
+            meter = RecordingMeter()
+            tracker = QueryTracker(query_request.statement, meter=meter)
+            self._run_query(tracker, query_request, [b'{"a":1}'])
+            # e.g. the async API's core callback and a cancel on the event loop
+            barrier = Barrier(4)
+
+            def finish() -> None:
+                barrier.wait()
+                tracker.finish()
+            threads = [Thread(target=finish) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(meter.values(DURATION_METRIC)) == 1
+
+    def test_tracker_finish_only_once(self, query_request: QueryRequest) -> None:
+        meter = RecordingMeter()
+        tracker = QueryTracker(query_request.statement, meter=meter)
+        self._run_query(tracker, query_request, [b'{"a":1}'])
+        tracker.finish(ResultLimitExceededError(limit_name='max_rows', limit=1))
+        tracker.cancel()
+        tracker.finish()
+        assert tracker.outcome == 'ResultLimitExceededError'
+        assert len(meter.values(DURATION_METRIC)) == 1
+
+    def test_tracker_metrics(self, query_request: QueryRequest) -> None:
+        meter = RecordingMeter()
+        tracker = QueryInstrumentation(meter=meter).start_query(query_request.statement)
+        assert tracker is not None
+        self._run_query(tracker, query_request, [b'{"a":1}', b'{"a":2}', b'{"a":3}'])
+        tracker.finish()
+        assert meter.values(RESULT_ROWS_METRIC, 'Success') == [3]
+        assert meter.values(RESULT_BYTES_METRIC, 'Success') == [21]
+        assert meter.values(ROW_DESERIALIZATION_METRIC) == [1, 1, 1]
+        assert len(meter.values(TIME_TO_FIRST_ROW_METRIC, 'Success')) == 1
+        assert len(meter.values(DURATION_METRIC, 'Success')) == 1
+
+    @pytest.mark.parametrize('error, expected_outcome',
+                             [(None, 'Success'),
+                              (QueryError(), 'QueryError'),
+                              (ResultLimitExceededError(), 'ResultLimitExceededError')])
+    def test_tracker_outcome(self,
+                             query_request: QueryRequest,
+                             error: Optional[Exception],
+                             expected_outcome: str) -> None:
+        tracker = QueryTracker(query_request.statement, meter=RecordingMeter())
+        self._run_query(tracker, query_request, [])
+        tracker.finish(error)
+        assert tracker.finished is True
+        assert tracker.outcome == expected_outcome
+
+        tracker = QueryTracker(query_request.statement, meter=RecordingMeter())
+        self._run_query(tracker, query_request, [])
+        tracker.cancel()
+        assert tracker.outcome == 'Canceled'
+
+    def test_tracker_spans(self, query_request: QueryRequest) -> None:
+        tracer = RecordingTracer()
+        tracker = QueryTracker(query_request.statement, tracer=tracer)
+        self._run_query(tracker, query_request, [b'{"a":1}'])
+        tracker.finish()
+        assert [span.name for span in tracer.spans] == ['query', 'request_encoding', 'dispatch_to_server']
+        assert all(span.ended for span in tracer.spans)
+        query_span = tracer.spans[0]
+        assert all(span.parent is query_span for span in tracer.spans[1:])
+        assert query_span.attributes['db.statement'] == query_request.statement
+        assert query_span.attributes['db.name'] == 'test-database'
+        assert query_span.attributes['db.couchbase.scope'] == 'test-scope'
+        assert query_span.attributes['db.couchbase.result_rows'] == 1
+        assert query_span.attributes['outcome'] == 'Success'
+        assert 'db.couchbase.time_to_first_row_us' in query_span.attributes
+
+
+class InstrumentationTests(InstrumentationTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(InstrumentationTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(InstrumentationTests) if valid_test_method(meth)]
+        test_list = set(InstrumentationTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
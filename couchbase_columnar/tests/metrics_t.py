@@ -0,0 +1,175 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+
+import pytest
+
+from couchbase_columnar.metrics import MetricsSnapshot
+from couchbase_columnar.protocol.instrumentation import QueryInstrumentation, fingerprint_statement
+from couchbase_columnar.protocol.metrics_registry import (MAX_FINGERPRINTS,
+                                                          OTHER_FINGERPRINT,
+                                                          HdrHistogram,
+                                                          MetricsRegistry,
+                                                          MetricsReporter)
+
+
+class MetricsTestSuite:
+    TEST_MANIFEST = [
+        'test_fingerprint_statement',
+        'test_histogram_empty',
+        'test_histogram_percentiles',
+        'test_metrics_disabled',
+        'test_metrics_enabled',
+        'test_registry_bounds_fingerprints',
+        'test_registry_merges_thread_shards',
+        'test_registry_retires_thread_shards',
+        'test_reporter_logs_snapshot',
+    ]
+
+    @pytest.mark.parametrize('statement, expected',
+                             [('SELECT * FROM t WHERE a = 1;', 'SELECT * FROM t WHERE a = ?'),
+                              ("SELECT * FROM t WHERE a = 'x' AND b = \"y\"", 'SELECT * FROM t WHERE a = ? AND b = ?'),
+                              ('SELECT * FROM t WHERE a IN [1, 2, 3]', 'SELECT * FROM t WHERE a IN [?]'),
+                              ('SELECT * FROM `db-2`.s.t1 WHERE a = $1 AND b = $b LIMIT 10',
+                               'SELECT * FROM `db-2`.s.t1 WHERE a = $1 AND b = $b LIMIT ?'),
+                              ('SELECT  *\n  FROM t\tWHERE a=-1.5e3', 'SELECT * FROM t WHERE a=?')])
+    def test_fingerprint_statement(self, statement: str, expected: str) -> None:
+        assert fingerprint_statement(statement) == expected
+
+    def test_histogram_empty(self) -> None:
+        snapshot = HdrHistogram().snapshot()
+        assert snapshot.count == 0
+        assert snapshot.percentiles == {}
+
+    def test_histogram_percentiles(self) -> None:
+        histogram = HdrHistogram()
+        for value in range(1, 100001):
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+        assert snapshot.count == 100000
+        assert snapshot.min == 1
+        assert snapshot.max == 100000
+        assert snapshot.mean == pytest.approx(50000.5)
+        for key, expected in [('p50', 50000), ('p90', 90000), ('p99', 99000), ('p99.9', 99900)]:
+            # values are accurate to within 1%
+            assert snapshot.percentiles[key] == pytest.approx(expected, rel=0.01)
+
+    def test_metrics_disabled(self) -> None:
+        instrumentation = QueryInstrumentation()
+        assert instrumentation.metrics_registry is None
+        assert instrumentation.start_query('SELECT 1=1') is None
+        snapshot = instrumentation.metrics_snapshot()
+        assert isinstance(snapshot, MetricsSnapshot)
+        assert snapshot.entries == []
+
+    def test_metrics_enabled(self) -> None:
+        instrumentation = QueryInstrumentation(enable_metrics=True)
+        for idx in range(3):
+            tracker = instrumentation.start_query(f'SELECT * FROM t WHERE a = {idx}')
+            assert tracker is not None
+            tracker.dispatch_started()
+            tracker.dispatch_completed()
+            tracker.row_received(b'{"a":1}')
+            tracker.finish()
+        snapshot = instrumentation.metrics_snapshot()
+        assert len(snapshot.entries) == 1
+        entry = snapshot.entries[0]
+        assert entry.fingerprint == 'SELECT * FROM t WHERE a = ?'
+        assert entry.outcome == 'Success'
+        assert entry.latency.count == 3
+        assert entry.time_to_first_row.count == 3
+        assert entry.rows.max == 1
+        assert entry.bytes.max == 7
+        # snapshots must be JSON serializable for the reporter
+        json.dumps(snapshot.as_dict())
+
+    def test_registry_bounds_fingerprints(self) -> None:
+        registry = MetricsRegistry()
+        for idx in range(MAX_FINGERPRINTS + 10):
+            registry.record_query(f'statement-{idx}', 'Success', 100, 10, 1, 10)
+        snapshot = registry.snapshot()
+        assert len(snapshot.entries) == MAX_FINGERPRINTS + 1
+        other = [e for e in snapshot.entries if e.fingerprint == OTHER_FINGERPRINT]
+        assert len(other) == 1
+        assert other[0].latency.count == 10
+
+    def test_registry_merges_thread_shards(self) -> None:
+        registry = MetricsRegistry()
+
+        def record(count: int) -> None:
+            for _ in range(count):
+                registry.record_query('SELECT ?', 'Success', 100, 10, 1, 10)
+
+        with ThreadPoolExecutor(max_workers=4) as tp:
+            list(tp.map(record, [250] * 4))
+        registry.record_query('SELECT ?', 'QueryError', 100, None, 0, 0)
+
+        entries = {(e.fingerprint, e.outcome): e for e in registry.snapshot().entries}
+        assert entries[('SELECT ?', 'Success')].latency.count == 1000
+        assert entries[('SELECT ?', 'QueryError')].latency.count == 1
+        assert entries[('SELECT ?', 'QueryError')].time_to_first_row.count == 0
+
+    def test_registry_retires_thread_shards(self) -> None:
+        registry = MetricsRegistry()
+
+        def record() -> None:
+            registry.record_query('SELECT ?', 'Success', 100, 10, 1, 10)
+
+        for _ in range(50):
+            t = Thread(target=record)
+            t.start()
+            t.join()
+        # the shards of exited threads are folded into the retired histograms
+        assert registry._shards == []
+        record()
+        assert len(registry._shards) == 1
+        entries = registry.snapshot().entries
+        assert len(entries) == 1
+        assert entries[0].latency.count == 51
+
+    def test_reporter_logs_snapshot(self, caplog: pytest.LogCaptureFixture) -> None:
+        registry = MetricsRegistry()
+        reporter = MetricsReporter(registry, 60)
+        with caplog.at_level(logging.INFO):
+            # nothing to report yet
+            reporter.report()
+            assert caplog.records == []
+            registry.record_query('SELECT ?', 'Success', 100, 10, 1, 10)
+            reporter.report()
+        assert len(caplog.records) == 1
+        assert 'SELECT ?' in caplog.records[0].getMessage()
+        reporter.start()
+        assert reporter.running is True
+        reporter.stop()
+        assert reporter.running is False
+
+
+class MetricsTests(MetricsTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(MetricsTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(MetricsTests) if valid_test_method(meth)]
+        test_list = set(MetricsTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
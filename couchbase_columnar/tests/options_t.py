@@ -16,27 +16,69 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Dict
+from typing import (Any,
+                    Dict,
+                    List,
+                    Optional)
 
 import pytest
 
 from couchbase_columnar.credential import Credential
 from couchbase_columnar.deserializer import DefaultJsonDeserializer
-from couchbase_columnar.options import (ClusterOptions,
+from couchbase_columnar.metrics import Meter, ValueRecorder
+from couchbase_columnar.options import (CircuitBreakerConfig,
+                                        ClusterOptions,
                                         IpProtocol,
+                                        RetryPolicy,
                                         SecurityOptions,
                                         TimeoutOptions)
 from couchbase_columnar.protocol.core.client_adapter import _ClientAdapter
+from couchbase_columnar.tracing import RequestSpan, RequestTracer
 from tests.columnar_config import CONFIG_FILE
 
 
+class NoOpSpan(RequestSpan):
+    def set_attribute(self, key: str, value: object) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+class NoOpTracer(RequestTracer):
+    def request_span(self, name: str, parent: Optional[RequestSpan] = None) -> RequestSpan:
+        return NoOpSpan()
+
+
+class NoOpValueRecorder(ValueRecorder):
+    def record_value(self, value: int) -> None:
+        pass
+
+
+class NoOpMeter(Meter):
+    def value_recorder(self, name: str, tags: Dict[str, str]) -> ValueRecorder:
+        return NoOpValueRecorder()
+
+
 class ClusterOptionsTestSuite:
 
     TEST_MANIFEST = [
         'test_options',
         'test_options_kwargs',
+        'test_options_circuit_breaker',
+        'test_options_concurrency_limit',
         'test_options_deserializer',
         'test_options_deserializer_kwargs',
+        'test_options_hedging_budget',
+        'test_options_metrics',
+        'test_options_metrics_report_interval_invalid',
+        'test_options_retry_policy',
+        'test_options_slow_query_threshold',
+        'test_options_tenant_throttle',
+        'test_options_tracer_and_meter',
+        'test_options_tracer_and_meter_invalid',
+        'test_options_tracer_and_meter_kwargs',
+        'test_options_warmup_connections',
         'test_security_options',
         'test_security_options_classmethods',
         'test_security_options_kwargs',
@@ -124,6 +166,80 @@ class ClusterOptionsTestSuite:
         client.connection_details.cluster_options.pop('user_agent_extra', None)
         assert expected_opts == client.connection_details.cluster_options
 
+    def test_options_circuit_breaker(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.circuit_breakers is None
+
+        config = CircuitBreakerConfig(error_threshold=0.25, per_statement=True)
+        client = _ClientAdapter('couchbases://localhost', cred, ClusterOptions(circuit_breaker=config))
+        assert client.circuit_breakers is not None
+        assert client.circuit_breakers.config is config
+        # the circuit breaker is handled by the SDK, not the C++ core
+        assert 'circuit_breaker' not in client.connection_details.cluster_options
+
+        with pytest.raises(ValueError):
+            _ClientAdapter('couchbases://localhost', cred, circuit_breaker={'error_threshold': 0.25})
+
+    def test_options_retry_policy(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.retry_engine.policy is None
+        assert client.retry_engine.budget == 0.1
+
+        policy = RetryPolicy(max_attempts=4, initial_backoff=timedelta(milliseconds=10))
+        client = _ClientAdapter('couchbases://localhost',
+                                cred,
+                                ClusterOptions(retry_policy=policy, retry_budget=0.25))
+        assert client.retry_engine.policy is policy
+        assert client.retry_engine.budget == 0.25
+        # retries are handled by the SDK, not the C++ core
+        for opt in ['retry_policy', 'retry_budget']:
+            assert opt not in client.connection_details.cluster_options
+
+        invalid_opts: List[Dict[str, Any]] = [{'retry_policy': {'max_attempts': 3}},
+                                              {'retry_budget': -0.1},
+                                              {'retry_budget': 1.5}]
+        for invalid in invalid_opts:
+            with pytest.raises(ValueError):
+                _ClientAdapter('couchbases://localhost', cred, **invalid)
+
+    def test_options_tenant_throttle(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.tenant_throttle is None
+
+        client = _ClientAdapter('couchbases://localhost',
+                                cred,
+                                ClusterOptions(tenant_rate_limit=2.5,
+                                               tenant_burst=5,
+                                               tenant_max_concurrent_queries=4,
+                                               concurrency_queue_timeout=timedelta(seconds=2)))
+        assert client.tenant_throttle is not None
+        assert client.tenant_throttle.rate == 2.5
+        assert client.tenant_throttle.burst == 5
+        assert client.tenant_throttle.max_concurrent == 4
+        assert client.tenant_throttle.queue_timeout == 2
+        # the cluster-wide concurrency limit is independent of the tenant quotas
+        assert client.concurrency_limiter is None
+        # tenant throttling is handled by the SDK, not the C++ core
+        for opt in ['tenant_rate_limit', 'tenant_burst', 'tenant_max_concurrent_queries']:
+            assert opt not in client.connection_details.cluster_options
+
+        client = _ClientAdapter('couchbases://localhost', cred, tenant_max_concurrent_queries=1)
+        assert client.tenant_throttle is not None
+        assert client.tenant_throttle.rate is None
+        assert client.tenant_throttle.queue_timeout is None
+
+        invalid_opts: List[Dict[str, Any]] = [{'tenant_rate_limit': 0},
+                                              {'tenant_rate_limit': -1.5},
+                                              {'tenant_rate_limit': '10'},
+                                              {'tenant_max_concurrent_queries': 0},
+                                              {'tenant_rate_limit': 10, 'tenant_burst': 0}]
+        for invalid in invalid_opts:
+            with pytest.raises(ValueError):
+                _ClientAdapter('couchbases://localhost', cred, **invalid)
+
     def test_options_deserializer(self) -> None:
         cred = Credential.from_username_and_password('Administrator', 'password')
         default_deserializer = DefaultJsonDeserializer()
@@ -136,6 +252,149 @@ class ClusterOptionsTestSuite:
         client = _ClientAdapter('couchbases://localhost', cred, **{'deserializer': default_deserializer})
         assert default_deserializer == client.connection_details.default_deserializer
 
+    def test_options_metrics(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.query_instrumentation.metrics_registry is None
+
+        client = _ClientAdapter('couchbases://localhost', cred, ClusterOptions(enable_metrics=True))
+        assert 'enable_metrics' not in client.connection_details.cluster_options
+        assert client.query_instrumentation.metrics_registry is not None
+
+        client = _ClientAdapter('couchbases://localhost',
+                                cred,
+                                ClusterOptions(metrics_report_interval=timedelta(minutes=1)))
+        assert client.connection_details.metrics_report_interval == 60000000
+        assert 'metrics_report_interval' not in client.connection_details.cluster_options
+        assert client.query_instrumentation.metrics_registry is not None
+        client.query_instrumentation.close()
+
+    @pytest.mark.parametrize('interval', [timedelta(seconds=0), timedelta(seconds=-1), 60])
+    def test_options_metrics_report_interval_invalid(self, interval: object) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        with pytest.raises(ValueError):
+            _ClientAdapter('couchbases://localhost', cred, **{'metrics_report_interval': interval})
+
+    def test_options_slow_query_threshold(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost',
+                                cred,
+                                ClusterOptions(slow_query_threshold=timedelta(milliseconds=500)))
+        assert client.connection_details.slow_query_threshold == 500000
+        assert 'slow_query_threshold' not in client.connection_details.cluster_options
+        assert client.query_instrumentation.enabled is True
+        # built-in metrics are independent of the slow query log
+        assert client.query_instrumentation.metrics_registry is None
+
+        with pytest.raises(ValueError):
+            _ClientAdapter('couchbases://localhost', cred, slow_query_threshold=timedelta(seconds=0))
+
+    def test_options_tracer_and_meter(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.connection_details.tracer is None
+        assert client.connection_details.meter is None
+        assert client.query_instrumentation.enabled is False
+        assert client.query_instrumentation.start_query('SELECT 1=1') is None
+
+        tracer = NoOpTracer()
+        meter = NoOpMeter()
+        client = _ClientAdapter('couchbases://localhost', cred, ClusterOptions(tracer=tracer, meter=meter))
+        assert tracer == client.connection_details.tracer
+        assert meter == client.connection_details.meter
+        # the tracer and meter are not passed to the C++ core
+        assert 'tracer' not in client.connection_details.cluster_options
+        assert 'meter' not in client.connection_details.cluster_options
+        assert client.query_instrumentation.enabled is True
+        assert client.query_instrumentation.start_query('SELECT 1=1') is not None
+
+    @pytest.mark.parametrize('opts', [{'tracer': NoOpMeter()}, {'meter': NoOpTracer()}, {'tracer': 'tracer'}])
+    def test_options_tracer_and_meter_invalid(self, opts: Dict[str, object]) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        with pytest.raises(ValueError):
+            _ClientAdapter('couchbases://localhost', cred, **opts)
+
+    def test_options_tracer_and_meter_kwargs(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        tracer = NoOpTracer()
+        meter = NoOpMeter()
+        client = _ClientAdapter('couchbases://localhost', cred, **{'tracer': tracer, 'meter': meter})
+        assert tracer == client.connection_details.tracer
+        assert meter == client.connection_details.meter
+        assert client.query_instrumentation.enabled is True
+
+    def test_options_concurrency_limit(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.concurrency_limiter is None
+
+        client = _ClientAdapter('couchbases://localhost',
+                                cred,
+                                ClusterOptions(max_concurrent_queries=16,
+                                               concurrency_queue_timeout=timedelta(milliseconds=500)))
+        assert client.connection_details.max_concurrent_queries == 16
+        assert client.connection_details.concurrency_queue_timeout == 500000
+        assert client.concurrency_limiter is not None
+        assert client.concurrency_limiter.limit == 16
+        assert client.concurrency_limiter.queue_timeout == 0.5
+        # admission control is handled by the SDK, not the C++ core
+        assert 'max_concurrent_queries' not in client.connection_details.cluster_options
+        assert 'concurrency_queue_timeout' not in client.connection_details.cluster_options
+
+        client = _ClientAdapter('couchbases://localhost',
+                                cred,
+                                max_concurrent_queries=1,
+                                concurrency_queue_timeout=timedelta(0))
+        assert client.concurrency_limiter is not None
+        assert client.concurrency_limiter.queue_timeout == 0
+        assert client.concurrency_limiter.reserved_priority_slots == 0
+
+        client = _ClientAdapter('couchbases://localhost', cred, max_concurrent_queries=8, reserved_priority_slots=2)
+        assert client.concurrency_limiter is not None
+        assert client.concurrency_limiter.reserved_priority_slots == 2
+        assert 'reserved_priority_slots' not in client.connection_details.cluster_options
+
+        for invalid in [0, -1, True, '4']:
+            with pytest.raises(ValueError):
+                _ClientAdapter('couchbases://localhost', cred, max_concurrent_queries=invalid)
+        with pytest.raises(ValueError):
+            _ClientAdapter('couchbases://localhost',
+                           cred,
+                           max_concurrent_queries=1,
+                           concurrency_queue_timeout=timedelta(seconds=-1))
+        with pytest.raises(ValueError):
+            _ClientAdapter('couchbases://localhost', cred, max_concurrent_queries=8, reserved_priority_slots=0)
+
+    def test_options_hedging_budget(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.connection_details.hedging_budget is None
+        assert client.hedging_budget.ratio == 0.05
+
+        client = _ClientAdapter('couchbases://localhost', cred, ClusterOptions(hedging_budget=0.1))
+        assert client.connection_details.hedging_budget == 0.1
+        assert client.hedging_budget.ratio == 0.1
+        # hedging is handled by the SDK, not the C++ core
+        assert 'hedging_budget' not in client.connection_details.cluster_options
+
+        for invalid in [-0.1, 1.5, True, '0.1']:
+            with pytest.raises(ValueError):
+                _ClientAdapter('couchbases://localhost', cred, hedging_budget=invalid)
+
+    def test_options_warmup_connections(self) -> None:
+        cred = Credential.from_username_and_password('Administrator', 'password')
+        client = _ClientAdapter('couchbases://localhost', cred)
+        assert client.connection_details.warmup_connections is None
+
+        client = _ClientAdapter('couchbases://localhost', cred, ClusterOptions(warmup_connections=4))
+        assert client.connection_details.warmup_connections == 4
+        # warm-up is handled by the SDK, not the C++ core
+        assert 'warmup_connections' not in client.connection_details.cluster_options
+
+        for invalid in [0, -1, True, '4', 65]:
+            with pytest.raises(ValueError):
+                _ClientAdapter('couchbases://localhost', cred, warmup_connections=invalid)
+
     @pytest.mark.parametrize('opts, expected_opts',
                              [({}, None),
                               ({'trust_only_capella': True},
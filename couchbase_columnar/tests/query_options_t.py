@@ -25,10 +25,17 @@ from typing import (Dict,
 import pytest
 
 from couchbase_columnar import JSONType
+from couchbase_columnar.common.deserializer import ProjectingDeserializer, TupleRowDeserializer
 from couchbase_columnar.credential import Credential
-from couchbase_columnar.options import QueryOptions
+from couchbase_columnar.deserializer import DefaultJsonDeserializer
+from couchbase_columnar.options import QueryOptions, RetryPolicy
 from couchbase_columnar.protocol.core.client_adapter import _ClientAdapter
 from couchbase_columnar.protocol.core.request import ClusterRequestBuilder, ScopeRequestBuilder
+from couchbase_columnar.protocol.deadline import Deadline
+from couchbase_columnar.protocol.hedging import get_hedge_after
+from couchbase_columnar.protocol.tenancy import get_tenant
+from couchbase_columnar.protocol.watchdog import get_idle_row_timeout
+from couchbase_columnar.query import QueryRowFormat
 
 
 @dataclass
@@ -39,20 +46,34 @@ class QueryContext:
 
 class QueryOptionsTestSuite:
     TEST_MANIFEST = [
+        'test_options_deadline',
         'test_options_deserializer',
         'test_options_deserializer_kwargs',
+        'test_options_hedge_after',
+        'test_options_hedge_after_invalid',
+        'test_options_idle_row_timeout',
+        'test_options_max_result_bytes',
+        'test_options_max_result_bytes_kwargs',
+        'test_options_max_rows',
+        'test_options_max_rows_kwargs',
+        'test_options_max_rows_not_sent_to_core',
+        'test_options_result_limits_must_be_positive',
         'test_options_named_parameters',
         'test_options_named_parameters_kwargs',
         'test_options_positional_parameters',
         'test_options_positional_parameters_kwargs',
         'test_options_priority',
         'test_options_priority_kwargs',
+        'test_options_project',
         'test_options_raw',
         'test_options_raw_kwargs',
         'test_options_readonly',
         'test_options_readonly_kwargs',
+        'test_options_retry_policy',
+        'test_options_row_format',
         'test_options_scan_consistency',
         'test_options_scan_consistency_kwargs',
+        'test_options_tenant',
         'test_options_timeout',
         'test_options_timeout_kwargs',
         'test_options_timeout_must_be_positive',
@@ -93,6 +114,164 @@ class QueryOptionsTestSuite:
         assert req.database_name == query_ctx.database_name
         assert req.scope_name == query_ctx.scope_name
 
+    def test_options_deadline(self,
+                              query_statment: str,
+                              request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                              query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(deadline=timedelta(seconds=2), timeout=timedelta(seconds=5))
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'deadline': 2000000, 'timeout': 5000000}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        # the C++ core is sent the time remaining until the deadline as the query's timeout
+        assert 'deadline' not in req.to_req_dict()['query_args']
+        deadline = Deadline.from_query_options(req.options)
+        assert deadline is not None
+        deadline.apply(req)
+        assert 0 < req.to_req_dict()['query_args']['timeout'] <= 2000000
+        with pytest.raises(ValueError):
+            request_builder.build_query_request(query_statment, deadline=timedelta(0))
+
+    def test_options_idle_row_timeout(self,
+                                      query_statment: str,
+                                      request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                      query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(idle_row_timeout=timedelta(milliseconds=500))
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'idle_row_timeout': 500000}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        # the stream is watched by the SDK, the C++ core does not need the option
+        assert 'idle_row_timeout' not in req.to_req_dict()['query_args']
+        assert get_idle_row_timeout(req.options) == 0.5
+        with pytest.raises(ValueError):
+            request_builder.build_query_request(query_statment, idle_row_timeout=timedelta(0))
+
+    def test_options_row_format(self,
+                                query_statment: str,
+                                request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(row_format='tuple')
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'row_format': 'tuple'}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        assert 'row_format' not in req.to_req_dict()['query_args']
+        # rows are converted to tuples by a per query deserializer wrapping the query's deserializer
+        assert isinstance(req.deserializer, TupleRowDeserializer)
+        assert isinstance(req.deserializer.deserializer, DefaultJsonDeserializer)
+        other_req, _ = request_builder.build_query_request(query_statment, row_format=QueryRowFormat.TUPLE)
+        assert other_req.options == exp_opts
+        assert other_req.deserializer is not req.deserializer
+        req, _ = request_builder.build_query_request(query_statment, row_format=QueryRowFormat.DICT)
+        assert isinstance(req.deserializer, DefaultJsonDeserializer)
+        with pytest.raises(ValueError):
+            request_builder.build_query_request(query_statment, row_format='list')
+
+    def test_options_hedge_after(self,
+                                 query_statment: str,
+                                 request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                 query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(hedge_after=timedelta(milliseconds=50), read_only=True)
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'hedge_after': 50000, 'readonly': True}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        assert get_hedge_after(req.options) == 0.05
+        # hedging is handled by the SDK, not the C++ core
+        assert 'hedge_after' not in req.to_req_dict()['query_args']
+
+    @pytest.mark.parametrize('opts', [{'hedge_after': timedelta(0), 'read_only': True},
+                                      {'hedge_after': 0.05, 'read_only': True},
+                                      {'hedge_after': timedelta(milliseconds=50)},
+                                      {'hedge_after': timedelta(milliseconds=50), 'read_only': False}])
+    def test_options_hedge_after_invalid(self,
+                                         query_statment: str,
+                                         request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                         opts: Dict[str, object]) -> None:
+        with pytest.raises(ValueError):
+            req, _ = request_builder.build_query_request(query_statment, **opts)
+            # only read-only queries can be hedged
+            get_hedge_after(req.options)
+
+    def test_options_max_result_bytes(self,
+                                      query_statment: str,
+                                      request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                      query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(max_result_bytes=1024)
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'max_result_bytes': 1024}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+
+    def test_options_max_result_bytes_kwargs(self,
+                                             query_statment: str,
+                                             request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                             query_ctx: QueryContext) -> None:
+        kwargs = {'max_result_bytes': 1024}
+        req, cancel_token = request_builder.build_query_request(query_statment, **kwargs)
+        exp_opts = {'max_result_bytes': 1024}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+
+    def test_options_max_rows(self,
+                              query_statment: str,
+                              request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                              query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(max_rows=10)
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'max_rows': 10}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+
+    def test_options_max_rows_kwargs(self,
+                                     query_statment: str,
+                                     request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                     query_ctx: QueryContext) -> None:
+        kwargs = {'max_rows': 10}
+        req, cancel_token = request_builder.build_query_request(query_statment, **kwargs)
+        exp_opts = {'max_rows': 10}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+
+    def test_options_max_rows_not_sent_to_core(self,
+                                               query_statment: str,
+                                               request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder]
+                                               ) -> None:
+        q_opts = QueryOptions(max_rows=10, max_result_bytes=1024, read_only=True)
+        req, _ = request_builder.build_query_request(query_statment, q_opts)
+        query_args = req.to_req_dict()['query_args']
+        assert 'max_rows' not in query_args
+        assert 'max_result_bytes' not in query_args
+        assert query_args['readonly'] is True
+
+    @pytest.mark.parametrize('opt_key', ['max_rows', 'max_result_bytes'])
+    @pytest.mark.parametrize('opt_val', [0, -1, 1.5, '10', True])
+    def test_options_result_limits_must_be_positive(self,
+                                                    query_statment: str,
+                                                    request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                                    opt_key: str,
+                                                    opt_val: object) -> None:
+        kwargs = {opt_key: opt_val}
+        with pytest.raises(ValueError):
+            request_builder.build_query_request(query_statment, **kwargs)
+
     def test_options_named_parameters(self,
                                       query_statment: str,
                                       request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
@@ -169,6 +348,29 @@ class QueryOptionsTestSuite:
         assert req.database_name == query_ctx.database_name
         assert req.scope_name == query_ctx.scope_name
 
+    def test_options_project(self,
+                             query_statment: str,
+                             request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                             query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(project=['id', 'geo.lat'])
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'project': ['id', 'geo.lat']}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        assert 'project' not in req.to_req_dict()['query_args']
+        assert isinstance(req.deserializer, ProjectingDeserializer)
+        assert req.deserializer.paths == ('id', 'geo.lat')
+        assert isinstance(req.deserializer.deserializer, DefaultJsonDeserializer)
+        # the row format applies to the projected rows
+        req, _ = request_builder.build_query_request(query_statment, project=['id'], row_format='tuple')
+        assert isinstance(req.deserializer, TupleRowDeserializer)
+        assert isinstance(req.deserializer.deserializer, ProjectingDeserializer)
+        for invalid in ([], 'id', ['id', 1], ['geo.'], ['.lat'], ['geo..lat'], ['']):
+            with pytest.raises(ValueError):
+                request_builder.build_query_request(query_statment, project=invalid)
+
     def test_options_raw(self,
                          query_statment: str,
                          request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
@@ -251,6 +453,40 @@ class QueryOptionsTestSuite:
         assert req.database_name == query_ctx.database_name
         assert req.scope_name == query_ctx.scope_name
 
+    def test_options_retry_policy(self,
+                                  query_statment: str,
+                                  request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                                  query_ctx: QueryContext) -> None:
+        policy = RetryPolicy(max_attempts=5)
+        q_opts = QueryOptions(retry_policy=policy, read_only=True)
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'retry_policy': policy, 'readonly': True}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        # retries are handled by the SDK, not the C++ core
+        assert 'retry_policy' not in req.to_req_dict()['query_args']
+        with pytest.raises(ValueError):
+            request_builder.build_query_request(query_statment, retry_policy={'max_attempts': 5})
+
+    def test_options_tenant(self,
+                            query_statment: str,
+                            request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
+                            query_ctx: QueryContext) -> None:
+        q_opts = QueryOptions(tenant='tenant-a')
+        req, cancel_token = request_builder.build_query_request(query_statment, q_opts)
+        exp_opts = {'tenant': 'tenant-a'}
+        assert cancel_token is None
+        assert req.options == exp_opts
+        assert req.database_name == query_ctx.database_name
+        assert req.scope_name == query_ctx.scope_name
+        assert get_tenant(req.options) == 'tenant-a'
+        # tenant throttling is handled by the SDK, not the C++ core
+        assert 'tenant' not in req.to_req_dict()['query_args']
+        with pytest.raises(ValueError):
+            request_builder.build_query_request(query_statment, tenant=1)
+
     def test_options_timeout(self,
                              query_statment: str,
                              request_builder: Union[ClusterRequestBuilder, ScopeRequestBuilder],
@@ -25,10 +25,10 @@ import pytest
 
 from couchbase_columnar.common.streaming import StreamingState
 from couchbase_columnar.deserializer import PassthroughDeserializer
-from couchbase_columnar.errors import QueryError
+from couchbase_columnar.errors import QueryError, ResultLimitExceededError
 from couchbase_columnar.options import QueryOptions
 from couchbase_columnar.query import CancelToken, QueryScanConsistency
-from couchbase_columnar.result import BlockingQueryResult
+from couchbase_columnar.result import BlockingQueryResult, SpillableRowSequence
 from tests import YieldFixture
 
 if TYPE_CHECKING:
@@ -61,6 +61,12 @@ class QueryTestSuite:
         'test_query_with_lazy_execution',
         'test_query_with_lazy_execution_raises_exception',
         'test_query_passthrough_deserializer',
+        'test_query_get_all_rows',
+        'test_query_get_all_rows_max_memory',
+        'test_query_get_all_rows_max_memory_invalid',
+        'test_query_max_result_bytes_exceeded',
+        'test_query_max_rows_exceeded',
+        'test_query_max_rows_not_exceeded',
     ]
 
     @pytest.fixture(scope='class')
@@ -419,6 +425,71 @@ class QueryTestSuite:
             assert isinstance(row, bytes)
             assert json.loads(row) == {'num': idx}
 
+    def test_query_get_all_rows(self, test_env: BlockingTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = test_env.cluster_or_scope.execute_query(statement)
+        rows = result.get_all_rows()
+        assert isinstance(rows, list)
+        assert rows == [{'num': idx} for idx in range(100)]
+
+    def test_query_get_all_rows_max_memory(self, test_env: BlockingTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = test_env.cluster_or_scope.execute_query(statement)
+        rows = result.get_all_rows(max_memory=100)
+        assert isinstance(rows, SpillableRowSequence)
+        with rows:
+            assert rows.spilled is True
+            assert 0 < rows.spilled_count < 100
+            assert rows.memory_used <= 100
+            # the retained rows are kept as they were received, memory_used is the memory they actually use
+            assert rows.memory_used == sum(map(len, rows._rows))
+            assert len(rows) == 100
+            assert rows[0] == {'num': 0}
+            assert rows[99] == {'num': 99}
+            assert rows[-1] == {'num': 99}
+            assert rows[50:53] == [{'num': 50}, {'num': 51}, {'num': 52}]
+            assert list(rows) == [{'num': idx} for idx in range(100)]
+            with pytest.raises(IndexError):
+                rows[100]
+
+    @pytest.mark.parametrize('max_memory', [0, -1, 1.5, '100'])
+    def test_query_get_all_rows_max_memory_invalid(self,
+                                                   test_env: BlockingTestEnvironment,
+                                                   max_memory: object) -> None:
+        statement = 'FROM range(0, 10) AS num SELECT *'
+        result = test_env.cluster_or_scope.execute_query(statement)
+        with pytest.raises(ValueError):
+            result.get_all_rows(max_memory=max_memory)  # type: ignore[arg-type]
+
+    def test_query_max_result_bytes_exceeded(self, test_env: BlockingTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = test_env.cluster_or_scope.execute_query(statement, QueryOptions(max_result_bytes=50))
+        rows = []
+        with pytest.raises(ResultLimitExceededError) as ex:
+            for row in result.rows():
+                rows.append(row)
+        assert ex.value.limit_name == 'max_result_bytes'
+        assert ex.value.limit == 50
+        assert 0 < len(rows) < 100
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    def test_query_max_rows_exceeded(self, test_env: BlockingTestEnvironment) -> None:
+        statement = 'FROM range(0, 100) AS num SELECT *'
+        result = test_env.cluster_or_scope.execute_query(statement, max_rows=10)
+        rows = []
+        with pytest.raises(ResultLimitExceededError) as ex:
+            for row in result.rows():
+                rows.append(row)
+        assert ex.value.limit_name == 'max_rows'
+        assert ex.value.limit == 10
+        assert rows == [{'num': idx} for idx in range(10)]
+        assert result._executor.streaming_state == StreamingState.Cancelled
+
+    def test_query_max_rows_not_exceeded(self, test_env: BlockingTestEnvironment) -> None:
+        statement = 'FROM range(0, 10) AS num SELECT *'
+        result = test_env.cluster_or_scope.execute_query(statement, QueryOptions(max_rows=10))
+        assert result.get_all_rows() == [{'num': idx} for idx in range(10)]
+
 
 class ClusterQueryTests(QueryTestSuite):
 
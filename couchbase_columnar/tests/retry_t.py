@@ -0,0 +1,155 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import (Any,
+                    Dict,
+                    List)
+
+import pytest
+
+from couchbase_columnar.common.errors import (InvalidCredentialError,
+                                              QueryError,
+                                              TimeoutError)
+from couchbase_columnar.metrics import RetryStats
+from couchbase_columnar.options import RetryPolicy
+from couchbase_columnar.protocol.options import QueryOptionsTransformedKwargs
+from couchbase_columnar.protocol.retry import RetryEngine
+
+
+class TemporaryFailure(Exception):
+    error_properties = {'code': 23007, 'server_message': 'Job queue is full'}
+
+
+def temporary_failure() -> QueryError:
+    return QueryError(base=TemporaryFailure())
+
+
+class RetryTestSuite:
+    TEST_MANIFEST = [
+        'test_backoff',
+        'test_backoff_jitter',
+        'test_budget_exhausted',
+        'test_is_retriable',
+        'test_max_attempts',
+        'test_policy_invalid',
+        'test_query_policy_overrides_cluster_policy',
+        'test_stats',
+    ]
+
+    def test_backoff(self) -> None:
+        policy = RetryPolicy(initial_backoff=timedelta(milliseconds=100),
+                             max_backoff=timedelta(milliseconds=500),
+                             jitter=False)
+        assert [policy.backoff(retry) for retry in range(1, 6)] == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+    def test_backoff_jitter(self) -> None:
+        policy = RetryPolicy(initial_backoff=timedelta(milliseconds=100))
+        backoffs = [policy.backoff(2) for _ in range(100)]
+        assert all(0 <= b <= 0.2 for b in backoffs)
+        # clients must not retry in lockstep
+        assert len(set(backoffs)) > 1
+
+    def test_budget_exhausted(self) -> None:
+        # the budget holds at most a single retry
+        engine = RetryEngine(RetryPolicy(max_attempts=5, jitter=False), budget=0.01)
+        retries = [engine.start_query({'readonly': True}) for _ in range(2)]
+        assert retries[0] is not None and retries[0].next_delay(TimeoutError()) is not None
+        assert retries[1] is not None and retries[1].next_delay(TimeoutError()) is None
+        assert engine.stats().budget_exhausted == 1
+        # every query deposits a fraction of a retry
+        for _ in range(99):
+            engine.start_query(None)
+        retry = engine.start_query({'readonly': True})
+        assert retry is not None and retry.next_delay(TimeoutError()) is not None
+
+    def test_is_retriable(self) -> None:
+        policy = RetryPolicy()
+        assert policy.is_retriable(temporary_failure(), read_only=False) is True
+        assert policy.is_retriable(QueryError(), read_only=True) is False
+        # the server might have executed a query that timed out
+        assert policy.is_retriable(TimeoutError(), read_only=True) is True
+        assert policy.is_retriable(TimeoutError(), read_only=False) is False
+        assert policy.is_retriable(InvalidCredentialError(), read_only=True) is False
+        policy = RetryPolicy(retriable_errors=[InvalidCredentialError], retriable_error_codes=[])
+        assert policy.is_retriable(InvalidCredentialError(), read_only=False) is True
+        assert policy.is_retriable(temporary_failure(), read_only=False) is False
+
+    def test_max_attempts(self) -> None:
+        engine = RetryEngine(RetryPolicy(max_attempts=3), budget=1)
+        for _ in range(10):
+            engine.start_query(None)
+        retries = engine.start_query(None)
+        assert retries is not None
+        assert retries.next_delay(temporary_failure()) is not None
+        assert retries.next_delay(temporary_failure()) is not None
+        assert retries.attempts == 3
+        assert retries.next_delay(temporary_failure()) is None
+        assert RetryEngine(RetryPolicy(max_attempts=1)).start_query(None) is None
+
+    def test_policy_invalid(self) -> None:
+        invalid_opts: List[Dict[str, Any]] = [{'max_attempts': 0},
+                                              {'max_attempts': True},
+                                              {'initial_backoff': 0.1},
+                                              {'max_backoff': timedelta(seconds=-1)},
+                                              {'backoff_multiplier': 0.5},
+                                              {'retriable_errors': ['TimeoutError']}]
+        for invalid in invalid_opts:
+            with pytest.raises(ValueError):
+                RetryPolicy(**invalid)
+
+    def test_query_policy_overrides_cluster_policy(self) -> None:
+        engine = RetryEngine(RetryPolicy(max_attempts=3))
+        opts: QueryOptionsTransformedKwargs = {'retry_policy': RetryPolicy(max_attempts=1)}
+        assert engine.start_query(opts) is None
+        opts = {'retry_policy': RetryPolicy(max_attempts=5)}
+        retries = engine.start_query(opts)
+        assert retries is not None
+        assert retries._policy.max_attempts == 5
+        assert RetryEngine().start_query(None) is None
+
+    def test_stats(self) -> None:
+        engine = RetryEngine(RetryPolicy(max_attempts=2), budget=1)
+        succeeded = engine.start_query(None)
+        failed = engine.start_query(None)
+        not_retried = engine.start_query(None)
+        assert succeeded is not None and failed is not None and not_retried is not None
+        assert succeeded.next_delay(temporary_failure()) is not None
+        succeeded.dispatch_succeeded()
+        assert failed.next_delay(temporary_failure()) is not None
+        assert failed.next_delay(temporary_failure()) is None
+        not_retried.dispatch_succeeded()
+        stats = engine.stats()
+        assert isinstance(stats, RetryStats)
+        assert stats == RetryStats(queries=3,
+                                   retries=2,
+                                   succeeded_after_retry=1,
+                                   failed_after_retry=1,
+                                   budget_exhausted=0)
+
+
+class RetryTests(RetryTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(RetryTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(RetryTests) if valid_test_method(meth)]
+        test_list = set(RetryTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -0,0 +1,204 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+from functools import partial
+from threading import Barrier, Thread
+from typing import List
+
+import pytest
+
+from couchbase_columnar.errors import QueryRejectedError
+from couchbase_columnar.metrics import TenantStats
+from couchbase_columnar.protocol import tenancy
+from couchbase_columnar.protocol.tenancy import TenantPermit, TenantThrottle
+
+
+class TenancyTestSuite:
+    TEST_MANIFEST = [
+        'test_acquire_waits_for_tenant_slot',
+        'test_idle_tenants_evicted',
+        'test_new_tenant_rejected_when_full',
+        'test_permit_release_concurrently',
+        'test_permit_release_idempotent',
+        'test_quota_per_tenant',
+        'test_rate_limit_delay',
+        'test_rate_limit_rejected',
+        'test_stats',
+        'test_tenant_queue_fifo',
+        'test_tenant_queue_timeout',
+    ]
+
+    def test_acquire_waits_for_tenant_slot(self) -> None:
+        throttle = TenantThrottle(max_concurrent=1, queue_timeout=5)
+        permit = throttle.acquire('tenant-a')
+        permits: List[TenantPermit] = []
+        t = Thread(target=lambda: permits.append(throttle.acquire('tenant-a')))
+        t.start()
+        t.join(0.1)
+        # the second query is queued until the tenant's first query releases its slot
+        assert permits == []
+        permit.release()
+        t.join(5)
+        assert len(permits) == 1
+        assert permits[0].queue_wait_ns >= 100 * 10**6
+
+    def test_idle_tenants_evicted(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(tenancy, 'MAX_TENANTS', 2)
+        throttle = TenantThrottle(max_concurrent=1)
+        busy = throttle.acquire('tenant-a')
+        throttle.acquire('tenant-b').release()
+        throttle.acquire('tenant-c')
+        # only idle tenants are forgotten
+        assert [s.tenant for s in throttle.stats()] == ['tenant-a', 'tenant-c']
+        busy.release()
+
+    def test_new_tenant_rejected_when_full(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(tenancy, 'MAX_TENANTS', 2)
+        throttle = TenantThrottle(max_concurrent=1)
+        busy = [throttle.acquire('tenant-a'), throttle.acquire('tenant-b')]
+        # none of the tenants can be forgotten
+        with pytest.raises(QueryRejectedError, match='tenant-c'):
+            throttle.acquire('tenant-c')
+        with pytest.raises(QueryRejectedError):
+            throttle.try_acquire('tenant-d', time.perf_counter_ns())
+        assert [s.tenant for s in throttle.stats()] == ['tenant-a', 'tenant-b']
+        # the tenants' queries are not affected
+        assert throttle.try_acquire('tenant-a', time.perf_counter_ns()) is None
+        busy[1].release()
+        throttle.acquire('tenant-c').release()
+        assert [s.tenant for s in throttle.stats()] == ['tenant-a', 'tenant-c']
+        busy[0].release()
+
+    def test_permit_release_concurrently(self) -> None:
+        for _ in range(20):
+            throttle = TenantThrottle(max_concurrent=2)
+            permit = throttle.acquire('tenant-a')
+            throttle.acquire('tenant-a')
+            # e.g. the async API's core callback and a cancel on the event loop
+            barrier = Barrier(4)
+
+            def release() -> None:
+                barrier.wait()
+                permit.release()
+            threads = [Thread(target=release) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert throttle.stats()[0].in_flight == 1
+
+    def test_permit_release_idempotent(self) -> None:
+        throttle = TenantThrottle(max_concurrent=1)
+        permit = throttle.acquire('tenant-a')
+        permit.release()
+        permit.release()
+        assert throttle.stats()[0].in_flight == 0
+
+    def test_quota_per_tenant(self) -> None:
+        throttle = TenantThrottle(max_concurrent=2)
+        permits = [throttle.try_acquire('tenant-a', time.perf_counter_ns()) for _ in range(2)]
+        assert all(p is not None for p in permits)
+        assert throttle.try_acquire('tenant-a', time.perf_counter_ns()) is None
+        # a tenant at its quota does not affect other tenants
+        assert throttle.try_acquire('tenant-b', time.perf_counter_ns()) is not None
+
+    def test_rate_limit_delay(self) -> None:
+        throttle = TenantThrottle(rate=10, burst=2)
+        # the burst is available immediately, further queries are spaced out at the tenant's rate
+        assert throttle.reserve('tenant-a') == 0
+        assert throttle.reserve('tenant-a') == 0
+        assert throttle.reserve('tenant-a') == pytest.approx(0.1, abs=0.01)
+        assert throttle.reserve('tenant-a') == pytest.approx(0.2, abs=0.01)
+        assert throttle.reserve('tenant-b') == 0
+        start = time.perf_counter()
+        throttle.acquire('tenant-b')
+        throttle.acquire('tenant-b')
+        assert time.perf_counter() - start >= 0.09
+
+    def test_rate_limit_rejected(self) -> None:
+        throttle = TenantThrottle(rate=10, burst=1, queue_timeout=0.15)
+        throttle.reserve('tenant-a')
+        throttle.reserve('tenant-a')
+        with pytest.raises(QueryRejectedError):
+            throttle.reserve('tenant-a')
+        stats = throttle.stats()[0]
+        assert stats.rejected == 1
+        # the rejected query did not use up a token
+        time.sleep(0.1)
+        assert throttle.reserve('tenant-a') == pytest.approx(0.1, abs=0.03)
+
+    def test_stats(self) -> None:
+        throttle = TenantThrottle(max_concurrent=1)
+        permit = throttle.acquire('tenant-a')
+        granted: List[TenantPermit] = []
+        throttle.enqueue('tenant-a', granted.append, time.perf_counter_ns())
+        stats = throttle.stats()
+        assert len(stats) == 1
+        assert isinstance(stats[0], TenantStats)
+        assert stats[0].tenant == 'tenant-a'
+        assert stats[0].in_flight == 1
+        assert stats[0].queued == 1
+        assert stats[0].admitted == 1
+        permit.release()
+        stats = throttle.stats()
+        assert stats[0].queued == 0
+        assert stats[0].admitted == 2
+        assert stats[0].queue_wait.count == 2
+
+    def test_tenant_queue_fifo(self) -> None:
+        throttle = TenantThrottle(max_concurrent=1)
+        permit = throttle.acquire('tenant-a')
+        granted: List[int] = []
+        permits: List[TenantPermit] = []
+
+        def grant(idx: int, p: TenantPermit) -> None:
+            granted.append(idx)
+            permits.append(p)
+
+        for idx in range(3):
+            throttle.enqueue('tenant-a', partial(grant, idx), time.perf_counter_ns())
+        permit.release()
+        assert granted == [0]
+        # releasing a granted permit hands the slot to the tenant's next waiting query
+        permits[0].release()
+        permits[1].release()
+        assert granted == [0, 1, 2]
+
+    def test_tenant_queue_timeout(self) -> None:
+        throttle = TenantThrottle(max_concurrent=1, queue_timeout=0)
+        permit = throttle.acquire('tenant-a')
+        with pytest.raises(QueryRejectedError):
+            throttle.acquire('tenant-a')
+        stats = throttle.stats()[0]
+        assert stats.rejected == 1
+        assert stats.queued == 0
+        permit.release()
+        throttle.acquire('tenant-a')
+
+
+class TenancyTests(TenancyTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(TenancyTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(TenancyTests) if valid_test_method(meth)]
+        test_list = set(TenancyTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -0,0 +1,145 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import time
+from threading import Event
+
+import pytest
+
+from couchbase_columnar.errors import IdleRowTimeoutError, TimeoutError
+from couchbase_columnar.protocol.watchdog import (StreamWatchdog,
+                                                  get_idle_row_timeout,
+                                                  get_stream_watchdog,
+                                                  idle_row_timeout_error)
+
+
+class WatchdogTestSuite:
+    TEST_MANIFEST = [
+        'test_check',
+        'test_closed_watches_removed',
+        'test_deadline_watch',
+        'test_get_idle_row_timeout',
+        'test_idle_row_timeout_error',
+        'test_idle_stream_cancelled',
+        'test_shared_watchdog',
+        'test_unwatched_stream',
+        'test_waiting_resets',
+    ]
+
+    def test_check(self) -> None:
+        watchdog = StreamWatchdog()
+        # not waiting for a row, the stream cannot be idle before a full timeout has elapsed
+        watch = watchdog.watch(1, lambda: None)
+        now_ns = time.perf_counter_ns()
+        idle, next_check_ns = watchdog._check(now_ns)
+        assert idle == []
+        assert next_check_ns is not None and now_ns < next_check_ns <= now_ns + watch.timeout_ns
+        # still not waiting once the check is due
+        now_ns = next_check_ns
+        idle, next_check_ns = watchdog._check(now_ns)
+        assert idle == []
+        assert next_check_ns == now_ns + watch.timeout_ns
+        # a stream that started waiting after the last check is checked once its timeout could have elapsed
+        watch.waiting_since_ns = now_ns + watch.timeout_ns // 2
+        now_ns = next_check_ns
+        idle, next_check_ns = watchdog._check(now_ns)
+        assert idle == []
+        assert next_check_ns == now_ns + watch.timeout_ns // 2
+        now_ns = next_check_ns
+        idle, next_check_ns = watchdog._check(now_ns)
+        assert idle == [watch]
+        assert next_check_ns is None
+        # an idle stream is only reported once
+        assert watchdog._check(now_ns) == ([], None)
+
+    def test_closed_watches_removed(self) -> None:
+        watchdog = StreamWatchdog()
+        watches = [watchdog.watch(60, lambda: None) for _ in range(10)]
+        for watch in watches[:5]:
+            watch.close()
+        assert len(watchdog._heap) == 10
+        # once most of the watches are closed, the heap is compacted
+        watches[5].close()
+        assert sorted(id(entry[2]) for entry in watchdog._heap) == sorted(map(id, watches[6:]))
+        for watch in watches[6:]:
+            watch.close()
+        # closed watches are never reported
+        assert watchdog._check(time.perf_counter_ns() + watches[0].timeout_ns) == ([], None)
+
+    def test_deadline_watch(self) -> None:
+        expired = Event()
+        # a deadline watch is always waiting, it expires once the time remaining has elapsed
+        watch = StreamWatchdog().watch_deadline(0.05, expired.set)
+        assert watch.waiting_since_ns is not None
+        assert expired.wait(2) is True
+        assert watch.expired is True
+
+    def test_get_idle_row_timeout(self) -> None:
+        assert get_idle_row_timeout(None) is None
+        assert get_idle_row_timeout({'timeout': 1000000}) is None
+        assert get_idle_row_timeout({'idle_row_timeout': 250000}) == 0.25
+
+    def test_idle_row_timeout_error(self) -> None:
+        err = idle_row_timeout_error(0.2)
+        assert isinstance(err, IdleRowTimeoutError)
+        assert isinstance(err, TimeoutError)
+        assert 'idle_row_timeout of 0.200s' in repr(err)
+
+    def test_idle_stream_cancelled(self) -> None:
+        cancelled = Event()
+        watch = StreamWatchdog().watch(0.05, cancelled.set)
+        watch.waiting()
+        assert cancelled.wait(2) is True
+        assert watch.expired is True
+
+    def test_shared_watchdog(self) -> None:
+        assert get_stream_watchdog() is get_stream_watchdog()
+
+    def test_unwatched_stream(self) -> None:
+        cancelled = Event()
+        watch = StreamWatchdog().watch(0.05, cancelled.set)
+        watch.close()
+        # closing a watch more than once is a no-op
+        watch.close()
+        watch.waiting()
+        assert cancelled.wait(0.2) is False
+        assert watch.expired is False
+
+    def test_waiting_resets(self) -> None:
+        cancelled = Event()
+        watch = StreamWatchdog().watch(0.1, cancelled.set)
+        # rows keep arriving within the timeout, time between rows (the application processing them) does not count
+        for _ in range(5):
+            watch.waiting()
+            time.sleep(0.02)
+            watch.received()
+            time.sleep(0.1)
+        assert cancelled.is_set() is False
+        watch.close()
+
+
+class WatchdogTests(WatchdogTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def validate_test_manifest(self) -> None:
+        def valid_test_method(meth: str) -> bool:
+            attr = getattr(WatchdogTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(WatchdogTests) if valid_test_method(meth)]
+        test_list = set(WatchdogTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest invalid.  Missing/extra tests: {test_list}.')
@@ -137,18 +137,51 @@ close_connection_callback(PyObject* pyObj_conn,
 void
 create_connection_callback(PyObject* pyObj_conn,
                            std::error_code ec,
+                           PyObject* pyObj_callback,
+                           PyObject* pyObj_errback,
                            std::shared_ptr<std::promise<PyObject*>> barrier)
 {
   PyObject* pyObj_exc = nullptr;
+  PyObject* pyObj_args = nullptr;
+  PyObject* pyObj_func = nullptr;
+  PyObject* pyObj_callback_res = nullptr;
 
   PyGILState_STATE state = PyGILState_Ensure();
   if (ec.value()) {
     auto error = couchbase::core::columnar::error{ ec, ec.message() };
     pyObj_exc = pycbcc_build_exception(error, __FILE__, __LINE__);
-    barrier->set_value(pyObj_exc);
+    if (pyObj_errback == nullptr) {
+      barrier->set_value(pyObj_exc);
+    } else {
+      pyObj_func = pyObj_errback;
+      pyObj_args = PyTuple_New(1);
+      // the tuple steals the reference to the exception
+      PyTuple_SET_ITEM(pyObj_args, 0, pyObj_exc);
+    }
   } else {
-    barrier->set_value(pyObj_conn);
+    if (pyObj_callback == nullptr) {
+      barrier->set_value(pyObj_conn);
+    } else {
+      pyObj_func = pyObj_callback;
+      pyObj_args = PyTuple_New(1);
+      Py_INCREF(pyObj_conn);
+      PyTuple_SET_ITEM(pyObj_args, 0, pyObj_conn);
+    }
+  }
+
+  if (pyObj_func != nullptr) {
+    pyObj_callback_res = PyObject_CallObject(pyObj_func, pyObj_args);
+    CB_LOG_DEBUG("{}: return from create conn callback.", "PYCBCC");
+    if (pyObj_callback_res) {
+      Py_DECREF(pyObj_callback_res);
+    } else {
+      pycbcc_set_python_exception(
+        CoreClientErrors::INTERNAL_SDK, __FILE__, __LINE__, "Create connection callback failed.");
+    }
+    Py_DECREF(pyObj_args);
   }
+  Py_XDECREF(pyObj_callback);
+  Py_XDECREF(pyObj_errback);
   Py_DECREF(pyObj_conn);
   CB_LOG_DEBUG("{}: create conn callback completed", "PYCBCC");
   PyGILState_Release(state);
@@ -509,13 +542,15 @@ handle_create_connection([[maybe_unused]] PyObject* self, PyObject* args, PyObje
   PyObject* pyObj_credential = nullptr;
   PyObject* pyObj_options = nullptr;
   PyObject* pyObj_connstr_timeout_opts = nullptr;
+  PyObject* pyObj_callback = nullptr;
+  PyObject* pyObj_errback = nullptr;
   PyObject* pyObj_result = nullptr;
 
   static const char* kw_list[] = {
-    "", "credential", "options", "connstr_timeout_options", nullptr
+    "", "credential", "options", "connstr_timeout_options", "callback", "errback", nullptr
   };
 
-  const char* kw_format = "s|OOO";
+  const char* kw_format = "s|OOOOO";
   int ret = PyArg_ParseTupleAndKeywords(args,
                                         kwargs,
                                         kw_format,
@@ -523,7 +558,9 @@ handle_create_connection([[maybe_unused]] PyObject* self, PyObject* args, PyObje
                                         &conn_str,
                                         &pyObj_credential,
                                         &pyObj_options,
-                                        &pyObj_connstr_timeout_opts);
+                                        &pyObj_connstr_timeout_opts,
+                                        &pyObj_callback,
+                                        &pyObj_errback);
 
   if (!ret) {
     std::string msg = "Cannot create connection. Unable to parse args/kwargs.";
@@ -554,6 +591,13 @@ handle_create_connection([[maybe_unused]] PyObject* self, PyObject* args, PyObje
     return nullptr;
   }
 
+  // a callback and errback must both be provided to open the connection w/o blocking
+  if (nullptr == pyObj_callback || nullptr == pyObj_errback) {
+    pyObj_callback = nullptr;
+    pyObj_errback = nullptr;
+  }
+  Py_XINCREF(pyObj_callback);
+  Py_XINCREF(pyObj_errback);
   Py_XINCREF(pyObj_conn);
   auto barrier = std::make_shared<std::promise<PyObject*>>();
   auto f = barrier->get_future();
@@ -561,14 +605,21 @@ handle_create_connection([[maybe_unused]] PyObject* self, PyObject* args, PyObje
   Py_BEGIN_ALLOW_THREADS conn->cluster_.open_in_background(
     couchbase::core::origin(std::get<1>(connection_config.value()),
                             std::get<0>(connection_config.value())),
-    [pyObj_conn, callback_count, barrier](std::error_code ec) mutable {
+    [pyObj_conn, pyObj_callback, pyObj_errback, callback_count, barrier](std::error_code ec) mutable {
       if (callback_count == 0) {
-        create_connection_callback(pyObj_conn, ec, barrier);
+        create_connection_callback(pyObj_conn, ec, pyObj_callback, pyObj_errback, barrier);
       }
       callback_count++;
     });
-  pyObj_result = f.get();
-  Py_END_ALLOW_THREADS return pyObj_result;
+  Py_END_ALLOW_THREADS
+
+  if (nullptr == pyObj_callback) {
+    Py_BEGIN_ALLOW_THREADS pyObj_result = f.get();
+    Py_END_ALLOW_THREADS return pyObj_result;
+  }
+  // the connection is handed to the callback, release the reference held by this function
+  Py_DECREF(pyObj_conn);
+  Py_RETURN_NONE;
 }
 
 PyObject*
@@ -31,10 +31,18 @@ pycbcc_logger__configure_logging_sink__(PyObject* self, PyObject* args, PyObject
   auto logger = reinterpret_cast<pycbcc_logger*>(self);
   PyObject* pyObj_logger = nullptr;
   PyObject* pyObj_level = nullptr;
-  const char* kw_list[] = { "logger", "level", nullptr };
-  const char* kw_format = "OO";
-  if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, kw_format, const_cast<char**>(kw_list), &pyObj_logger, &pyObj_level)) {
+  Py_ssize_t queue_size = static_cast<Py_ssize_t>(pycbcc_logger_sink::DEFAULT_QUEUE_SIZE);
+  char* overflow_policy = nullptr;
+  const char* kw_list[] = { "logger", "level", "queue_size", "overflow_policy", nullptr };
+  const char* kw_format = "OO|ns";
+  if (!PyArg_ParseTupleAndKeywords(args,
+                                   kwargs,
+                                   kw_format,
+                                   const_cast<char**>(kw_list),
+                                   &pyObj_logger,
+                                   &pyObj_level,
+                                   &queue_size,
+                                   &overflow_policy)) {
     pycbcc_set_python_exception(CoreClientErrors::VALUE,
                                 __FILE__,
                                 __LINE__,
@@ -50,8 +58,32 @@ pycbcc_logger__configure_logging_sink__(PyObject* self, PyObject* args, PyObject
     return nullptr;
   }
 
+  if (queue_size <= 0) {
+    pycbcc_set_python_exception(CoreClientErrors::VALUE,
+                                __FILE__,
+                                __LINE__,
+                                "Cannot set pycbcc_logger sink.  queue_size must be greater than 0.");
+    return nullptr;
+  }
+
+  auto policy = pycbcc_log_overflow_policy::drop;
+  if (overflow_policy != nullptr) {
+    auto policy_str = std::string{ overflow_policy };
+    if (policy_str == "block") {
+      policy = pycbcc_log_overflow_policy::block;
+    } else if (policy_str != "drop") {
+      pycbcc_set_python_exception(
+        CoreClientErrors::VALUE,
+        __FILE__,
+        __LINE__,
+        "Cannot set pycbcc_logger sink.  overflow_policy must be either 'drop' or 'block'.");
+      return nullptr;
+    }
+  }
+
   if (pyObj_logger != nullptr) {
-    logger->logger_sink_ = std::make_shared<pycbcc_logger_sink>(pyObj_logger);
+    logger->logger_sink_ = std::make_shared<pycbcc_logger_sink>(
+      pyObj_logger, static_cast<std::size_t>(queue_size), policy);
   }
 
   couchbase::core::logger::configuration logger_settings;
@@ -119,6 +151,28 @@ pycbcc_logger__enable_protocol_logger__(PyObject* self, PyObject* args, PyObject
   Py_RETURN_NONE;
 }
 
+PyObject*
+pycbcc_logger__dropped_log_messages__(PyObject* self, PyObject* Py_UNUSED(ignored))
+{
+  auto logger = reinterpret_cast<pycbcc_logger*>(self);
+  if (logger->logger_sink_ == nullptr) {
+    return PyLong_FromUnsignedLongLong(0);
+  }
+  return PyLong_FromUnsignedLongLong(logger->logger_sink_->dropped_count());
+}
+
+PyObject*
+pycbcc_logger__shutdown_logging_sink__(PyObject* self, PyObject* Py_UNUSED(ignored))
+{
+  auto logger = reinterpret_cast<pycbcc_logger*>(self);
+  if (logger->logger_sink_ != nullptr) {
+    // hands any queued messages to the Python logger, releases the GIL while waiting on the drain
+    // thread
+    logger->logger_sink_->shutdown();
+  }
+  Py_RETURN_NONE;
+}
+
 static PyMethodDef pycbcc_logger_methods[] = {
   { "configure_logging_sink",
     (PyCFunction)pycbcc_logger__configure_logging_sink__,
@@ -132,6 +186,14 @@ static PyMethodDef pycbcc_logger_methods[] = {
     (PyCFunction)pycbcc_logger__enable_protocol_logger__,
     METH_VARARGS | METH_KEYWORDS,
     PyDoc_STR("Enables the protocol logger") },
+  { "dropped_log_messages",
+    (PyCFunction)pycbcc_logger__dropped_log_messages__,
+    METH_NOARGS,
+    PyDoc_STR("Number of log messages dropped by the logging sink") },
+  { "shutdown_logging_sink",
+    (PyCFunction)pycbcc_logger__shutdown_logging_sink__,
+    METH_NOARGS,
+    PyDoc_STR("Flush queued log messages and stop the logging sink's drain thread") },
   { NULL }
 };
 
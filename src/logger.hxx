@@ -21,9 +21,17 @@
 #include <core/logger/configuration.hxx>
 #include <core/logger/logger.hxx>
 #include <core/transactions.hxx>
-#include <queue>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <memory>
+#include <mutex>
 #include <spdlog/details/log_msg.h>
 #include <spdlog/sinks/base_sink.h>
+#include <string>
+#include <thread>
+#include <vector>
 
 // gh-108014 added Py_IsFinalizing() to Python 3.13.0a1
 //    PR: https://github.com/python/cpython/pull/108032/files
@@ -47,11 +55,13 @@ Py_IsFinalizing(void)
 // so lets copy into this struct.
 
 struct log_msg_copy {
-  std::string logger_name;
-  spdlog::level::level_enum level;
-  std::chrono::system_clock::time_point time;
-  spdlog::source_loc source;
-  std::string payload;
+  std::string logger_name{};
+  spdlog::level::level_enum level{ spdlog::level::level_enum::off };
+  std::chrono::system_clock::time_point time{};
+  spdlog::source_loc source{};
+  std::string payload{};
+
+  log_msg_copy() = default;
 
   log_msg_copy(const spdlog::details::log_msg& msg)
   {
@@ -69,24 +79,137 @@ convert_spdlog_level(spdlog::level::level_enum lvl);
 couchbase::core::logger::level
 convert_python_log_level(PyObject* level);
 
-// Moved to implementing a spdlog::sinks::sink instead of a base_sink.  Allows us to not
-// worry about the mutex w/in the base_sink.  The GIL is the locking mechanism that makes
-// sure logging is thread safe as we acquire the GIL prior to passing the log message to
-// Python's Logging module.
-//
-// Still probably the better way to do logging: asynchronous logger (see note below).
+// Bounded, lock-free multi-producer/multi-consumer queue (Dmitry Vyukov's array based queue).
+// Producers are the IO (and any other) threads emitting log messages, the single consumer is the
+// logging sink's drain thread.  Pushing never blocks, if the queue is full try_push() returns false
+// and the sink's overflow policy decides what to do with the message.
+template<typename T>
+class pycbcc_log_queue
+{
+public:
+  explicit pycbcc_log_queue(std::size_t capacity)
+  {
+    // capacity must be a power of 2 so that we can mask the position instead of using modulo
+    std::size_t size = 2;
+    while (size < capacity) {
+      size <<= 1;
+    }
+    mask_ = size - 1;
+    buffer_ = std::make_unique<cell[]>(size);
+    for (std::size_t i = 0; i < size; ++i) {
+      buffer_[i].sequence.store(i, std::memory_order_relaxed);
+    }
+    enqueue_pos_.store(0, std::memory_order_relaxed);
+    dequeue_pos_.store(0, std::memory_order_relaxed);
+  }
+
+  pycbcc_log_queue(const pycbcc_log_queue&) = delete;
+  pycbcc_log_queue& operator=(const pycbcc_log_queue&) = delete;
+
+  // value is only moved from if the push succeeds
+  bool try_push(T& value)
+  {
+    cell* c;
+    auto pos = enqueue_pos_.load(std::memory_order_relaxed);
+    for (;;) {
+      c = &buffer_[pos & mask_];
+      auto seq = c->sequence.load(std::memory_order_acquire);
+      auto diff = static_cast<std::intptr_t>(seq) - static_cast<std::intptr_t>(pos);
+      if (diff == 0) {
+        if (enqueue_pos_.compare_exchange_weak(pos, pos + 1, std::memory_order_relaxed)) {
+          break;
+        }
+      } else if (diff < 0) {
+        // full
+        return false;
+      } else {
+        pos = enqueue_pos_.load(std::memory_order_relaxed);
+      }
+    }
+    c->data = std::move(value);
+    c->sequence.store(pos + 1, std::memory_order_release);
+    return true;
+  }
+
+  bool try_pop(T& value)
+  {
+    cell* c;
+    auto pos = dequeue_pos_.load(std::memory_order_relaxed);
+    for (;;) {
+      c = &buffer_[pos & mask_];
+      auto seq = c->sequence.load(std::memory_order_acquire);
+      auto diff = static_cast<std::intptr_t>(seq) - static_cast<std::intptr_t>(pos + 1);
+      if (diff == 0) {
+        if (dequeue_pos_.compare_exchange_weak(pos, pos + 1, std::memory_order_relaxed)) {
+          break;
+        }
+      } else if (diff < 0) {
+        // empty
+        return false;
+      } else {
+        pos = dequeue_pos_.load(std::memory_order_relaxed);
+      }
+    }
+    value = std::move(c->data);
+    c->sequence.store(pos + mask_ + 1, std::memory_order_release);
+    return true;
+  }
+
+  // true if the next message has been published, i.e. try_pop() would succeed.  A producer that has
+  // claimed a position but not yet published its message does not count (unlike comparing the positions).
+  bool ready() const
+  {
+    auto pos = dequeue_pos_.load(std::memory_order_seq_cst);
+    return buffer_[pos & mask_].sequence.load(std::memory_order_seq_cst) == pos + 1;
+  }
+
+private:
+  struct cell {
+    std::atomic<std::size_t> sequence{ 0 };
+    T data{};
+  };
+
+  std::unique_ptr<cell[]> buffer_{};
+  std::size_t mask_{ 0 };
+  // keep the producer and consumer positions on separate cache lines
+  alignas(64) std::atomic<std::size_t> enqueue_pos_{ 0 };
+  alignas(64) std::atomic<std::size_t> dequeue_pos_{ 0 };
+};
+
+enum class pycbcc_log_overflow_policy {
+  // drop the message (and count it), never stalls the thread emitting the log message
+  drop,
+  // wait for the drain thread to make room, no messages are lost but the emitting thread can stall.  A
+  // thread holding the GIL does not wait, it logs the message synchronously.
+  block
+};
+
+// Asynchronous logging sink.  spdlog calls log() from whichever thread emitted the message (most
+// often an IO thread), the message is copied into a bounded lock-free queue and a single drain thread
+// takes the GIL once per batch of messages and hands them to the Python logger.  This keeps IO
+// threads from contending on the GIL when DEBUG/TRACE logging is enabled.
 //
-// A third way would be to use asynchronous logger.   However the txns lib only creates synchronous
-// loggers now.   This is probably the best solution, which we can do when we merge the txn lib
-// into the client lib.
+// The txns lib only creates synchronous loggers, which is why we do not use spdlog's async logger
+// and instead make the sink itself asynchronous.
 //
 class pycbcc_logger_sink : public spdlog::sinks::sink
 {
 public:
-  pycbcc_logger_sink(PyObject* pyObj_logger)
+  static constexpr std::size_t DEFAULT_QUEUE_SIZE = 8192;
+  static constexpr std::size_t MAX_BATCH_SIZE = 256;
+  static constexpr std::chrono::milliseconds DRAIN_INTERVAL{ 50 };
+
+  pycbcc_logger_sink(PyObject* pyObj_logger,
+                     std::size_t queue_size = DEFAULT_QUEUE_SIZE,
+                     pycbcc_log_overflow_policy overflow_policy = pycbcc_log_overflow_policy::drop)
     : pyObj_logger_(pyObj_logger)
+    , queue_(queue_size)
+    , overflow_policy_(overflow_policy)
   {
     Py_INCREF(pyObj_logger_);
+    drain_thread_ = std::thread([this]() {
+      drain_();
+    });
   }
 
   // no copy or move constructor or assignment
@@ -98,6 +221,7 @@ public:
 
   ~pycbcc_logger_sink()
   {
+    shutdown();
     if (0 == Py_IsFinalizing()) {
       auto state = PyGILState_Ensure();
       Py_DECREF(pyObj_logger_);
@@ -107,8 +231,30 @@ public:
 
   void log(const spdlog::details::log_msg& msg) final
   {
-    if (0 == Py_IsFinalizing()) {
-      log_it_(msg);
+    if (0 != Py_IsFinalizing() || stopped_.load(std::memory_order_acquire)) {
+      dropped_.fetch_add(1, std::memory_order_relaxed);
+      return;
+    }
+
+    log_msg_copy msg_copy{ msg };
+    while (!queue_.try_push(msg_copy)) {
+      if (overflow_policy_ == pycbcc_log_overflow_policy::drop ||
+          stopped_.load(std::memory_order_acquire)) {
+        dropped_.fetch_add(1, std::memory_order_relaxed);
+        return;
+      }
+      if (PyGILState_Check()) {
+        // The drain thread needs the GIL to make room, spinning while this thread holds the GIL would
+        // deadlock.  Hand the message to the Python logger directly instead (it is not ordered w/
+        // the messages still on the queue).
+        log_it_(msg_copy);
+        return;
+      }
+      wake_drain_thread_();
+      std::this_thread::yield();
+    }
+    if (drain_waiting_.load(std::memory_order_seq_cst)) {
+      wake_drain_thread_();
     }
   }
 
@@ -117,40 +263,90 @@ public:
   void set_pattern(const std::string& pattern) final {};
   void set_formatter(std::unique_ptr<spdlog::formatter> sink_formatter) final {};
 
+  std::uint64_t dropped_count() const
+  {
+    return dropped_.load(std::memory_order_relaxed);
+  }
+
+  // Stops the drain thread after the queued messages have been handed to the Python logger.  The
+  // drain thread needs the GIL, so if the calling thread holds the GIL it is released while waiting.
+  void shutdown()
+  {
+    if (stopped_.exchange(true, std::memory_order_acq_rel)) {
+      return;
+    }
+    wake_drain_thread_();
+    if (!drain_thread_.joinable()) {
+      return;
+    }
+    if (drain_thread_.get_id() == std::this_thread::get_id()) {
+      drain_thread_.detach();
+      return;
+    }
+    if (0 == Py_IsFinalizing() && PyGILState_Check()) {
+      Py_BEGIN_ALLOW_THREADS drain_thread_.join();
+      Py_END_ALLOW_THREADS
+    } else {
+      drain_thread_.join();
+    }
+  }
+
 protected:
-  void log_it_(const spdlog::details::log_msg& msg)
+  void wake_drain_thread_()
   {
+    std::lock_guard<std::mutex> lock(drain_mutex_);
+    drain_cv_.notify_one();
+  }
+
+  void drain_()
+  {
+    std::vector<log_msg_copy> batch;
+    batch.reserve(MAX_BATCH_SIZE);
+    std::uint64_t reported_dropped = 0;
+    for (;;) {
+      log_msg_copy msg;
+      while (batch.size() < MAX_BATCH_SIZE && queue_.try_pop(msg)) {
+        batch.emplace_back(std::move(msg));
+      }
+      auto dropped = dropped_.load(std::memory_order_relaxed);
+      if (!batch.empty() || dropped != reported_dropped) {
+        log_batch_(batch, dropped - reported_dropped);
+        reported_dropped = dropped;
+        batch.clear();
+        continue;
+      }
+      if (stopped_.load(std::memory_order_acquire)) {
+        return;
+      }
+      std::unique_lock<std::mutex> lock(drain_mutex_);
+      drain_waiting_.store(true, std::memory_order_seq_cst);
+      drain_cv_.wait_for(lock, DRAIN_INTERVAL, [this]() {
+        return stopped_.load(std::memory_order_acquire) || queue_.ready();
+      });
+      drain_waiting_.store(false, std::memory_order_relaxed);
+    }
+  }
+
+  void log_batch_(const std::vector<log_msg_copy>& batch, std::uint64_t newly_dropped)
+  {
+    if (0 != Py_IsFinalizing()) {
+      dropped_.fetch_add(batch.size(), std::memory_order_relaxed);
+      return;
+    }
     PyGILState_STATE state = PyGILState_Ensure();
     try {
-
-      // static initialize the type and method once.   These 'leak' a single
-      // object, but that is fine.  Same for an empty tuple we will on each call.
-      static PyObject* pyObj_log_record_type = init_log_record_type();
-      static PyObject* pyObj_logger_handle_method = init_logger_handle_method();
-
-      // convert the log_msg_copy to a dict first...
-      auto pyObj_log_record_details = convert_log_msg(msg);
-
-      // now, create an actual LogRecord from it...
-      auto pyObj_log_record = PyObject_CallObject(pyObj_log_record_type, pyObj_log_record_details);
-      Py_DECREF(pyObj_log_record_details);
-      if (nullptr != pyObj_log_record) {
-        // we need to fixup the created time, which cannot be passed in the constructor...
-        // The created member is a float containing a float expressed as seconds since the epoch, in
-        // UTC.
-        PyObject* log_time = convert_time_to_float(msg.time);
-        PyObject_SetAttrString(pyObj_log_record, "created", log_time);
-        Py_DECREF(log_time);
-
-        // now, we want to hand this record to the logger...
-        PyObject* pyObj_args = PyTuple_Pack(1, pyObj_log_record);
-        PyObject_CallObject(pyObj_logger_handle_method, pyObj_args);
-
-        // that's it, now cleanup.
-        Py_DECREF(pyObj_log_record);
-        Py_DECREF(pyObj_args);
-      } else {
-        PyErr_Print();
+      for (const auto& msg : batch) {
+        log_it_(msg);
+      }
+      if (newly_dropped > 0) {
+        log_msg_copy dropped_msg{};
+        dropped_msg.logger_name = "pycbcc";
+        dropped_msg.level = spdlog::level::level_enum::warn;
+        dropped_msg.time = std::chrono::system_clock::now();
+        dropped_msg.payload = "Logging sink queue full, dropped " + std::to_string(newly_dropped) +
+                              " log message(s) (total dropped: " +
+                              std::to_string(dropped_count()) + ").";
+        log_it_(dropped_msg);
       }
       PyGILState_Release(state);
     } catch (...) {
@@ -161,6 +357,44 @@ protected:
     }
   }
 
+  // assumes the GIL is held
+  void log_it_(const log_msg_copy& msg)
+  {
+    // static initialize the type and method once.   These 'leak' a single
+    // object, but that is fine.  Same for an empty tuple we will on each call.
+    static PyObject* pyObj_log_record_type = init_log_record_type();
+    static PyObject* pyObj_logger_handle_method = init_logger_handle_method();
+
+    // convert the log_msg_copy to a dict first...
+    auto pyObj_log_record_details = convert_log_msg(msg);
+
+    // now, create an actual LogRecord from it...
+    auto pyObj_log_record = PyObject_CallObject(pyObj_log_record_type, pyObj_log_record_details);
+    Py_DECREF(pyObj_log_record_details);
+    if (nullptr != pyObj_log_record) {
+      // we need to fixup the created time, which cannot be passed in the constructor...
+      // The created member is a float containing a float expressed as seconds since the epoch, in
+      // UTC.
+      PyObject* log_time = convert_time_to_float(msg.time);
+      PyObject_SetAttrString(pyObj_log_record, "created", log_time);
+      Py_DECREF(log_time);
+
+      // now, we want to hand this record to the logger...
+      PyObject* pyObj_args = PyTuple_Pack(1, pyObj_log_record);
+      PyObject* pyObj_ret = PyObject_CallObject(pyObj_logger_handle_method, pyObj_args);
+      if (nullptr == pyObj_ret) {
+        PyErr_Print();
+      }
+      Py_XDECREF(pyObj_ret);
+
+      // that's it, now cleanup.
+      Py_DECREF(pyObj_log_record);
+      Py_DECREF(pyObj_args);
+    } else {
+      PyErr_Print();
+    }
+  }
+
   PyObject* convert_time_to_float(std::chrono::system_clock::time_point tm)
   {
     auto duration_us = std::chrono::duration_cast<std::chrono::microseconds>(tm.time_since_epoch());
@@ -237,6 +471,14 @@ protected:
 
 private:
   PyObject* pyObj_logger_;
+  pycbcc_log_queue<log_msg_copy> queue_;
+  pycbcc_log_overflow_policy overflow_policy_;
+  std::atomic<std::uint64_t> dropped_{ 0 };
+  std::atomic<bool> stopped_{ false };
+  std::atomic<bool> drain_waiting_{ false };
+  std::mutex drain_mutex_{};
+  std::condition_variable drain_cv_{};
+  std::thread drain_thread_{};
 };
 
 struct pycbcc_logger {
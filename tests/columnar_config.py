@@ -43,6 +43,7 @@ class ColumnarConfig:
         self._collection_name = ''
         self._disable_server_certificate_verification = False
         self._create_keyspace = True
+        self._use_emulator = False
 
     @property
     def database_name(self) -> str:
@@ -56,6 +57,10 @@ class ColumnarConfig:
     def create_keyspace(self) -> bool:
         return self._create_keyspace
 
+    @property
+    def use_emulator(self) -> bool:
+        return self._use_emulator
+
     @property
     def fqdn(self) -> str:
         return f'`{self._database_name}`.`{self._scope_name}`.`{self._collection_name}`'
@@ -113,6 +118,9 @@ class ColumnarConfig:
                                                                                 fallback='ON'))
             if disable_cert_verification.lower() in ENV_TRUE:
                 columnar_config._disable_server_certificate_verification = True
+            use_emulator = os.environ.get('PYCBCC_EMULATOR', test_config_columnar.get('emulator', fallback='OFF'))
+            if use_emulator.lower() in ENV_TRUE:
+                columnar_config._use_emulator = True
             fqdn = os.environ.get('PYCBCC_FQDN', test_config_columnar.get('fqdn', fallback=None))
             if fqdn is not None:
                 fqdn_tokens = fqdn.split('.')
@@ -124,6 +132,9 @@ class ColumnarConfig:
                 columnar_config._scope_name = f'{fqdn_tokens[1]}'
                 columnar_config._collection_name = f'{fqdn_tokens[2]}'
                 columnar_config._create_keyspace = False
+            elif columnar_config._use_emulator is True:
+                # the emulator serves the test data, there is no keyspace to create
+                columnar_config._create_keyspace = False
             else:
                 # lets make the database unique (enough)
                 columnar_config._database_name = f'travel-sample-{str(uuid4())[:8]}'
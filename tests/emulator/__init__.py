@@ -0,0 +1,20 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+# NOTE: the transport (tests.emulator.transport) is not imported here, the emulator itself does not depend on the SDK
+from tests.emulator.server import EMULATOR_CERT_PATH as EMULATOR_CERT_PATH  # noqa: F401
+from tests.emulator.server import ColumnarEmulator as ColumnarEmulator  # noqa: F401
+from tests.emulator.server import EmulatorResponse as EmulatorResponse  # noqa: F401
+from tests.emulator.server import QueryContext as QueryContext  # noqa: F401
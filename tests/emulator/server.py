@@ -0,0 +1,490 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""In-process emulator of the Columnar query service.
+
+The emulator answers ``POST /api/v1/request`` with a streamed (chunked) Columnar query response.  How a statement is
+answered is determined, in order, by:
+
+1. An :class:`EmulatorResponse` provided in the request body (i.e. via the ``raw`` query option, see
+   :meth:`EmulatorResponse.to_raw`).
+2. Handlers registered with :meth:`ColumnarEmulator.add_handler`.
+3. The built-in handlers: ``SELECT <int>``, ``FROM range(start, end) AS alias SELECT *``, ``SELECT * FROM <dataset>
+   [WHERE field = value] [LIMIT n]`` for datasets registered with :meth:`ColumnarEmulator.add_dataset` and DDL/DML
+   statements (which return no rows).  Any other statement fails with a syntax error.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import pathlib
+import re
+import select
+import socket
+import ssl
+import time
+from collections import deque
+from dataclasses import (asdict,
+                         dataclass,
+                         field)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path
+from threading import Lock, Thread
+from typing import (Any,
+                    Callable,
+                    Deque,
+                    Dict,
+                    List,
+                    Optional,
+                    Tuple,
+                    Union)
+from uuid import uuid4
+
+QUERY_PATH = '/api/v1/request'
+EMULATOR_CERT_PATH = path.join(pathlib.Path(__file__).parent.parent, 'test_data', 'emulator_cert.pem')
+EMULATOR_KEY_PATH = path.join(pathlib.Path(__file__).parent.parent, 'test_data', 'emulator_key.pem')
+
+AUTHENTICATION_ERROR_CODE = 20001
+TIMEOUT_ERROR_CODE = 21002
+SYNTAX_ERROR_CODE = 24000
+DATASET_NOT_FOUND_ERROR_CODE = 24045
+# the emulated cost of producing a row of a range() query, large ranges exceed short query timeouts
+RANGE_ROW_COST = 2e-7
+MAX_RECORDED_REQUESTS = 1000
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ns|us|µs|ms|s|m|h)')
+_DURATION_TO_NS = {'ns': 1, 'us': 1e3, 'µs': 1e3, 'ms': 1e6, 's': 1e9, 'm': 60e9, 'h': 3600e9}
+_LITERAL_PATTERN = re.compile(r'^\s*SELECT\s+(?P<value>-?\d+)\s*;?\s*$', re.IGNORECASE)
+_RANGE_PATTERN = re.compile(r'^\s*FROM\s+range\(\s*(?P<start>-?\d+)\s*,\s*(?P<end>-?\d+)\s*\)\s+AS\s+(?P<alias>\w+)'
+                            r'\s+SELECT\s+\*\s*;?\s*$', re.IGNORECASE)
+_SELECT_PATTERN = re.compile(r'^\s*SELECT\s+\*\s+FROM\s+(?P<name>[\w`.\-]+)'
+                             r'(?:\s+WHERE\s+(?P<field>\w+)\s*=\s*(?P<value>\$\w+|"[^"]*"|\'[^\']*\'|-?\d+))?'
+                             r'(?:\s+LIMIT\s+(?P<limit>\$\w+|\d+))?\s*;?\s*$', re.IGNORECASE)
+_NO_RESULTS_PATTERN = re.compile(r'^\s*(?:CREATE|DROP|ALTER|USE|UPSERT|INSERT|DELETE|CONNECT|DISCONNECT)\b',
+                                 re.IGNORECASE)
+
+
+def format_duration(seconds: float) -> str:
+    """Formats a duration the same way as the Columnar service (e.g. ``12.5ms``)."""
+    if seconds >= 1:
+        return f'{seconds:.6f}s'
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.6f}ms'
+    return f'{seconds * 1e6:.3f}µs'
+
+
+def parse_duration_ns(value: Any) -> int:
+    """Parses a Columnar service duration (e.g. ``1.5ms``) to nanoseconds."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return 0
+    return int(sum(float(num) * _DURATION_TO_NS[unit] for num, unit in _DURATION_PATTERN.findall(value)))
+
+
+def build_row(idx: int, row_size: int) -> Dict[str, Any]:
+    """Builds a row that is (roughly) ``row_size`` bytes once JSON encoded."""
+    row: Dict[str, Any] = {'id': idx, 'name': f'row-{idx}', 'active': idx % 2 == 0, 'score': idx * 1.5, 'payload': ''}
+    encoded = json.dumps(row, separators=(',', ':'))
+    row['payload'] = 'x' * max(0, row_size - len(encoded))
+    return row
+
+
+@dataclass
+class EmulatorResponse:
+    """How the emulator answers a query.
+
+    Args:
+        rows (Optional[List[Any]]): Rows to return.  If not provided, ``row_count`` rows of ``row_size`` bytes are
+            generated.
+        row_count (int): Number of rows to generate.
+        row_size (int): Approximate size, in bytes, of each generated (JSON encoded) row.
+        rows_per_chunk (int): Number of rows written to the socket per chunk.
+        chunk_delay (float): Seconds to wait between chunks.
+        first_row_delay (float): Seconds to wait before the first row is written (i.e. server execution time).
+        errors (List[Dict[str, Any]]): Errors (``code``, ``msg``) to return.  If there are no rows, the errors are
+            returned prior to the results, otherwise they follow the rows.
+        warnings (List[Dict[str, Any]]): Warnings (``code``, ``msg``) to return.
+        processed_objects (Optional[int]): Value of the ``processedObjects`` metric.  Defaults to the number of rows.
+        disconnect_after_rows (Optional[int]): If set, the connection is closed (without completing the response)
+            after the provided number of rows.
+        http_status (int): The HTTP status of the response.
+    """
+    rows: Optional[List[Any]] = None
+    row_count: int = 0
+    row_size: int = 256
+    rows_per_chunk: int = 100
+    chunk_delay: float = 0.0
+    first_row_delay: float = 0.0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[Dict[str, Any]] = field(default_factory=list)
+    processed_objects: Optional[int] = None
+    disconnect_after_rows: Optional[int] = None
+    http_status: int = 200
+
+    def to_raw(self) -> Dict[str, Any]:
+        """Returns the value to pass via the ``raw`` query option."""
+        return {'emulator_response': asdict(self)}
+
+    @classmethod
+    def from_raw(cls, value: Any) -> Optional[EmulatorResponse]:
+        if not isinstance(value, dict):
+            return None
+        return cls(**{k: v for k, v in value.items() if k in cls.__dataclass_fields__})
+
+    @property
+    def total_rows(self) -> int:
+        return len(self.rows) if self.rows is not None else self.row_count
+
+    def encoded_rows(self, start: int, count: int) -> List[bytes]:
+        if self.rows is not None:
+            return [json.dumps(r, separators=(',', ':')).encode('utf-8') for r in self.rows[start:start + count]]
+        return [json.dumps(build_row(idx, self.row_size), separators=(',', ':')).encode('utf-8')
+                for idx in range(start, start + count)]
+
+
+@dataclass
+class QueryContext:
+    """The query request received by the emulator."""
+    statement: str
+    body: Dict[str, Any]
+
+    def get_parameter(self, name: str) -> Any:
+        """Returns the value of a positional (``$1``) or named (``$name``) parameter."""
+        if name[1:].isdigit():
+            args = self.body.get('args', [])
+            idx = int(name[1:]) - 1
+            return args[idx] if 0 <= idx < len(args) else None
+        return self.body.get(name, None)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        timeout = self.body.get('timeout', None)
+        if timeout is None:
+            return None
+        return parse_duration_ns(timeout) / 1e9
+
+
+QueryHandler = Callable[[QueryContext], Optional[EmulatorResponse]]
+
+
+def error_response(code: int, msg: str, http_status: int = 400) -> EmulatorResponse:
+    return EmulatorResponse(errors=[{'code': code, 'msg': msg}], http_status=http_status)
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: ColumnarEmulator
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # keep test and benchmark output clean
+        pass
+
+    def setup(self) -> None:
+        if isinstance(self.request, ssl.SSLSocket):
+            # handshake in the handler's thread so a slow (or failed) handshake does not block accepting connections
+            self.request.do_handshake()
+        super().setup()
+
+    def do_POST(self) -> None:
+        if self.path.split('?')[0] != QUERY_PATH:
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', '0'))
+        body: Dict[str, Any] = json.loads(self.rfile.read(length) or b'{}')
+        self.server.record_request(body)
+        if not self.server.is_authorized(self.headers.get('Authorization', None)):
+            self._send_response(error_response(AUTHENTICATION_ERROR_CODE, 'Unauthorised user.', http_status=401))
+            return
+        ctx = QueryContext(body.get('statement', ''), body)
+        self._send_response(self.server.resolve(ctx), ctx.timeout)
+
+    def _client_disconnected(self) -> bool:
+        # the client does not send anything after the request, so a readable socket means the client went away
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        return len(readable) > 0
+
+    def _sleep(self, seconds: float) -> bool:
+        """Sleeps (in small increments) for the provided duration, returns `False` if the client disconnected."""
+        deadline = time.perf_counter() + seconds
+        while True:
+            if self._client_disconnected():
+                return False
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.01))
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f'{len(data):X}\r\n'.encode('ascii') + data + b'\r\n')
+
+    def _send_response(self, response: EmulatorResponse, timeout: Optional[float] = None) -> None:
+        try:
+            self._stream_response(response, timeout)
+        except (BrokenPipeError, ConnectionResetError, ssl.SSLError):
+            self.server.record_cancelled()
+            self.close_connection = True
+
+    def _stream_response(self, response: EmulatorResponse, timeout: Optional[float]) -> None:  # noqa: C901
+        start = time.perf_counter()
+        request_id = str(uuid4())
+        self.send_response(response.http_status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        errors = list(response.errors)
+        first_row_delay = response.first_row_delay
+        timed_out = timeout is not None and first_row_delay >= timeout
+        if timed_out and timeout is not None:
+            first_row_delay = timeout
+        if not self._sleep(first_row_delay):
+            self.server.record_cancelled()
+            self.close_connection = True
+            return
+
+        if timed_out:
+            errors.append({'code': TIMEOUT_ERROR_CODE, 'msg': 'Request timed out and will be cancelled'})
+        header = {'requestID': request_id, 'signature': {'*': '*'}}
+        # errors returned prior to any rows means the results are never started
+        stream_rows = not (errors and response.total_rows == 0) and not timed_out
+        if stream_rows:
+            self._write_chunk(json.dumps(header)[:-1].encode('utf-8') + b',"results":[')
+        else:
+            self._write_chunk(json.dumps(header)[:-1].encode('utf-8'))
+
+        result_size = 0
+        rows_written = 0
+        chunk_rows = max(1, response.rows_per_chunk)
+        total_rows = response.total_rows if stream_rows else 0
+        if response.disconnect_after_rows is not None:
+            total_rows = min(total_rows, response.disconnect_after_rows)
+        while rows_written < total_rows:
+            count = min(chunk_rows, total_rows - rows_written)
+            rows = response.encoded_rows(rows_written, count)
+            chunk = b','.join(rows)
+            self._write_chunk(chunk if rows_written == 0 else b',' + chunk)
+            result_size += sum(len(r) for r in rows)
+            rows_written += count
+            if timeout is not None and time.perf_counter() - start >= timeout:
+                errors.append({'code': TIMEOUT_ERROR_CODE, 'msg': 'Request timed out and will be cancelled'})
+                break
+            if response.chunk_delay > 0 and rows_written < total_rows and not self._sleep(response.chunk_delay):
+                self.server.record_cancelled()
+                self.close_connection = True
+                return
+
+        if response.disconnect_after_rows is not None:
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+
+        elapsed = time.perf_counter() - start
+        trailer: Dict[str, Any] = {'plans': {}}
+        if errors:
+            trailer['errors'] = errors
+        if response.warnings:
+            trailer['warnings'] = response.warnings
+        trailer['status'] = 'success' if not errors else ('timeout' if timed_out else 'fatal')
+        trailer['metrics'] = {'elapsedTime': format_duration(elapsed),
+                              'executionTime': format_duration(elapsed),
+                              'resultCount': rows_written,
+                              'resultSize': result_size,
+                              'processedObjects': (response.processed_objects
+                                                   if response.processed_objects is not None else rows_written),
+                              'errorCount': len(errors),
+                              'warningCount': len(response.warnings)}
+        encoded_trailer = json.dumps(trailer)[1:].encode('utf-8')
+        self._write_chunk((b'],' if stream_rows else b',') + encoded_trailer)
+        self._write_chunk(b'')
+        self.wfile.flush()
+
+
+class ColumnarEmulator(ThreadingHTTPServer):
+    """Threaded HTTP(S) server that emulates the Columnar query service.
+
+    Can be used as a context manager, the emulator is started on enter and stopped on exit.
+
+    Args:
+        host (str): Address to bind to.
+        port (int): Port to bind to, ``0`` binds to an available port.
+        username (Optional[str]): Expected username.  If not provided, requests are not authenticated.
+        password (Optional[str]): Expected password.
+        use_tls (bool): Serve HTTPS using the certificate at ``certfile``.
+        certfile (str): Path to the server's certificate (defaults to the test certificate).
+        keyfile (str): Path to the server's private key (defaults to the test certificate's key).
+    """
+
+    daemon_threads = True
+    # the default backlog (5) drops connections when the benchmarks run with high concurrency
+    request_queue_size = 1024
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 username: Optional[str] = None,
+                 password: Optional[str] = None,
+                 use_tls: bool = False,
+                 certfile: str = EMULATOR_CERT_PATH,
+                 keyfile: str = EMULATOR_KEY_PATH) -> None:
+        super().__init__((host, port), _QueryHandler)
+        self.use_tls = use_tls
+        if use_tls:
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ctx.load_cert_chain(certfile, keyfile)
+            self.socket = ctx.wrap_socket(self.socket, server_side=True, do_handshake_on_connect=False)
+        self._authorization: Optional[str] = None
+        if username is not None:
+            token = base64.b64encode(f'{username}:{password or ""}'.encode('utf-8')).decode('ascii')
+            self._authorization = f'Basic {token}'
+        self._handlers: List[Tuple[re.Pattern[str], Union[EmulatorResponse, QueryHandler]]] = []
+        self._datasets: Dict[str, List[Any]] = {}
+        self._lock = Lock()
+        self.request_count = 0
+        self.cancelled_count = 0
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=MAX_RECORDED_REQUESTS)
+        self._thread: Optional[Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self.server_address[:2]
+        return str(host), int(port)
+
+    @property
+    def connection_string(self) -> str:
+        """The connection string to provide to ``Cluster.create_instance()``.
+
+        The SDK requires the ``couchbases`` scheme, whether TLS is actually used is up to the emulator transport.
+        """
+        return f'couchbases://localhost:{self.address[1]}'
+
+    def add_dataset(self, name: str, docs: List[Any]) -> None:
+        """Registers documents returned by ``SELECT * FROM <name>`` statements."""
+        self._datasets[name] = docs
+
+    def add_handler(self, pattern: str, handler: Union[EmulatorResponse, QueryHandler]) -> None:
+        """Registers a response (or a callable returning a response) for statements that match the ``pattern`` regex.
+
+        Handlers are checked in the order they were added, a callable can return `None` to defer to the next handler.
+        """
+        self._handlers.append((re.compile(pattern, re.IGNORECASE | re.DOTALL), handler))
+
+    def clear_handlers(self) -> None:
+        self._handlers.clear()
+
+    def is_authorized(self, authorization: Optional[str]) -> bool:
+        return self._authorization is None or authorization == self._authorization
+
+    def record_request(self, body: Dict[str, Any]) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.requests.append(body)
+
+    def record_cancelled(self) -> None:
+        with self._lock:
+            self.cancelled_count += 1
+
+    def resolve(self, ctx: QueryContext) -> EmulatorResponse:
+        response = EmulatorResponse.from_raw(ctx.body.get('emulator_response', None))
+        if response is not None:
+            return response
+        for pattern, handler in self._handlers:
+            if pattern.search(ctx.statement) is None:
+                continue
+            if isinstance(handler, EmulatorResponse):
+                return handler
+            response = handler(ctx)
+            if response is not None:
+                return response
+        return self._builtin_response(ctx)
+
+    def _builtin_response(self, ctx: QueryContext) -> EmulatorResponse:
+        match = _LITERAL_PATTERN.match(ctx.statement)
+        if match is not None:
+            return EmulatorResponse(rows=[{'$1': int(match.group('value'))}])
+        match = _RANGE_PATTERN.match(ctx.statement)
+        if match is not None:
+            start, end, alias = int(match.group('start')), int(match.group('end')), match.group('alias')
+            rows = [{alias: idx} for idx in range(start, end)]
+            return EmulatorResponse(rows=rows, first_row_delay=len(rows) * RANGE_ROW_COST)
+        match = _SELECT_PATTERN.match(ctx.statement)
+        if match is not None:
+            return self._select_response(ctx, match)
+        if _NO_RESULTS_PATTERN.match(ctx.statement) is not None:
+            return EmulatorResponse()
+        return error_response(SYNTAX_ERROR_CODE, f'Syntax error: In line 1 >>{ctx.statement}<<')
+
+    def _get_value(self, ctx: QueryContext, value: str) -> Any:
+        if value.startswith('$'):
+            return ctx.get_parameter(value)
+        if value[0] in ('"', "'"):
+            return value[1:-1]
+        return int(value)
+
+    def _select_response(self, ctx: QueryContext, match: re.Match[str]) -> EmulatorResponse:
+        name = match.group('name').replace('`', '').split('.')[-1]
+        docs = self._datasets.get(name, None)
+        if docs is None:
+            return error_response(DATASET_NOT_FOUND_ERROR_CODE, f'Cannot find analytics collection with name {name}')
+        rows = docs
+        if match.group('field') is not None:
+            expected = self._get_value(ctx, match.group('value'))
+            rows = [d for d in rows if isinstance(d, dict) and d.get(match.group('field'), None) == expected]
+        if match.group('limit') is not None:
+            limit = self._get_value(ctx, match.group('limit'))
+            rows = rows[:int(limit)] if isinstance(limit, int) else rows
+        return EmulatorResponse(rows=[{name: d} for d in rows], processed_objects=len(docs))
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # failed handshakes and abandoned connections are expected (e.g. cancellation, certificate tests)
+        pass
+
+    def start(self) -> ColumnarEmulator:
+        self._thread = Thread(target=self.serve_forever, name='columnar-emulator', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> ColumnarEmulator:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description='Columnar query service emulator.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--tls', action='store_true', help='Serve HTTPS using the test certificate.')
+    args = parser.parse_args()
+    emulator = ColumnarEmulator(args.host, args.port, use_tls=args.tls)
+    host, port = emulator.address
+    print(f'Columnar emulator listening on {"https" if args.tls else "http"}://{host}:{port}{QUERY_PATH}', flush=True)
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.server_close()
@@ -0,0 +1,450 @@
+#  Copyright 2016-2024. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""HTTP transport that stands in for the C++ core's query path.
+
+The C++ core bootstraps against the cluster's KV service before it issues any query, so it cannot be pointed at the
+(HTTP-only) emulator.  :class:`EmulatorCoreClient` implements the same interface as
+:class:`~couchbase_columnar.protocol.core.client._CoreClient` on top of ``http.client``, which allows ``Cluster`` and
+``AsyncCluster`` (options, streaming executors, deserializers, instrumentation and the event loop hand-off) to be
+driven against the emulator.  Use :func:`emulator_transport` while creating the cluster instance.
+"""
+
+from __future__ import annotations
+
+import base64
+import codecs
+import json
+import re
+import socket
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from http.client import (HTTPConnection,
+                         HTTPResponse,
+                         HTTPSConnection)
+from threading import Event
+from typing import (Any,
+                    Callable,
+                    Dict,
+                    Iterator,
+                    List,
+                    Optional,
+                    Tuple,
+                    Union)
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+from couchbase_columnar.common.core.query import QueryMetadataCore, QueryMetricsCore
+from couchbase_columnar.protocol.errors import CoreColumnarError
+from tests.emulator.server import (QUERY_PATH,
+                                   TIMEOUT_ERROR_CODE,
+                                   parse_duration_ns)
+
+DEFAULT_QUERY_TIMEOUT = 600.0
+READ_SIZE = 64 * 1024
+SOCKET_TIMEOUT_MARGIN = 1.0
+
+# emulates the C++ core's IO threads, rows for the async API are read (and callbacks called) from these threads
+_IO_POOL = ThreadPoolExecutor(max_workers=64, thread_name_prefix='emulator-core-io')
+
+_SEPARATOR_PATTERN = re.compile(r'[\s,]*')
+_RESULTS_START_PATTERN = re.compile(r'"results"\s*:\s*\[')
+
+CORE_ERROR_GENERIC = 1
+CORE_ERROR_INVALID_CREDENTIAL = 2
+CORE_ERROR_TIMEOUT = 3
+CORE_ERROR_QUERY = 4
+CLIENT_ERROR_CANCELED = 3
+
+
+class _EmulatorCoreError:
+    """Duck types the bindings' ``core_error`` so that :class:`.ErrorMapper` can map the error."""
+
+    def __init__(self, details: Dict[str, Any]) -> None:
+        self._details = details
+
+    def error_details(self) -> Optional[Dict[str, Any]]:
+        return self._details
+
+
+def build_core_error(error_code: int,
+                     message: str,
+                     server_code: Optional[int] = None,
+                     client_error: Optional[bool] = False) -> CoreColumnarError:
+    key = 'client_error_code' if client_error is True else 'core_error_code'
+    details: Dict[str, Any] = {key: error_code,
+                               'message': message,
+                               'context': json.dumps({'server_code': server_code}),
+                               'file': __file__,
+                               'line': 0}
+    if server_code is not None:
+        details['properties'] = {'code': server_code, 'server_message': message}
+    return CoreColumnarError(_EmulatorCoreError(details))  # type: ignore[arg-type]
+
+
+class StreamingResponseParser:
+    """Incrementally splits a Columnar query response into its raw rows and the trailing metadata.
+
+    Rows are located with the ``json`` module's C scanner, which is considerably faster than scanning for the end of
+    each row in Python.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buf = ''
+        # rows are sliced out of the buffer by offset, the buffer is only compacted when more data is fed
+        self._pos = 0
+        self._header: Optional[str] = None
+        self._trailer: Optional[str] = None
+
+    @property
+    def in_results(self) -> bool:
+        return self._header is not None and self._trailer is None
+
+    @property
+    def results_started(self) -> bool:
+        return self._header is not None
+
+    def feed(self, data: bytes) -> None:
+        text = self._decoder.decode(data)
+        if self._trailer is not None:
+            self._trailer += text
+            return
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        if self._header is None:
+            match = _RESULTS_START_PATTERN.search(self._buf)
+            if match is not None:
+                self._header = self._buf[:match.start()]
+                self._pos = match.end()
+
+    def next_row(self) -> Optional[bytes]:
+        """Returns the next complete row, `None` if more data is needed (or the results have ended)."""
+        if not self.in_results:
+            return None
+        buf = self._buf
+        sep = _SEPARATOR_PATTERN.match(buf, self._pos)
+        pos = sep.end() if sep else self._pos
+        if pos >= len(buf):
+            return None
+        first = buf[pos]
+        if first == ']':
+            self._trailer = buf[pos + 1:]
+            self._buf = ''
+            self._pos = 0
+            return None
+        try:
+            _, end = self._json_decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # the row is incomplete
+            return None
+        if end == len(buf) and first not in '{["':
+            # a scalar at the end of the buffer might continue in the next chunk
+            return None
+        self._pos = end
+        return buf[pos:end].encode('utf-8')
+
+    def metadata(self) -> Dict[str, Any]:
+        """Returns the response, minus the results, once the complete response has been fed."""
+        if self._header is None:
+            body = self._buf[self._pos:]
+            return json.loads(body) if body.strip() else {}
+        parsed: Dict[str, Any] = json.loads(self._header + '"results":[]' + (self._trailer or ''))
+        return parsed
+
+
+def build_query_body(query_args: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    """Converts the C++ bindings' query arguments to a Columnar query service request body."""
+    body: Dict[str, Any] = {'statement': query_args['statement']}
+    if 'positional_parameters' in query_args:
+        body['args'] = [json.loads(arg) for arg in query_args['positional_parameters']]
+    for key, value in query_args.get('named_parameters', {}).items():
+        body[key] = json.loads(value)
+    for key, value in query_args.get('raw', {}).items():
+        body[key] = json.loads(value)
+    if 'readonly' in query_args:
+        body['readonly'] = query_args['readonly']
+    if 'scan_consistency' in query_args:
+        body['scan_consistency'] = query_args['scan_consistency']
+    if 'database_name' in query_args and 'scope_name' in query_args:
+        body['query_context'] = f'default:`{query_args["database_name"]}`.`{query_args["scope_name"]}`'
+    elif 'query_context' in query_args:
+        body['query_context'] = query_args['query_context']
+    timeout = DEFAULT_QUERY_TIMEOUT
+    if 'timeout' in query_args:
+        # timeout is transformed to microseconds
+        timeout = query_args['timeout'] / 1e6
+    body['timeout'] = f'{int(timeout * 1e6)}us'
+    return body, timeout
+
+
+class EmulatorQueryIterator:
+    """Implements the bindings' ``columnar_query_iterator`` interface on top of an HTTP response."""
+
+    def __init__(self,
+                 connection: HTTPConnection,
+                 headers: Dict[str, str],
+                 body: Dict[str, Any],
+                 callback: Optional[Callable[..., None]] = None,
+                 row_callback: Optional[Callable[..., None]] = None) -> None:
+        self._connection = connection
+        self._headers = headers
+        self._body = body
+        self._callback = callback
+        self._row_callback = row_callback
+        self._parser = StreamingResponseParser()
+        self._response: Optional[HTTPResponse] = None
+        self._metadata: Optional[QueryMetadataCore] = None
+        self._error: Optional[CoreColumnarError] = None
+        self._eof = False
+        self._done = False
+        self._cancelled = Event()
+        self._result_ready = Event()
+        self._core_result: Union[bool, CoreColumnarError] = False
+        self._send()
+        if self._callback is not None:
+            _IO_POOL.submit(self._async_wait_for_core_query_result)
+        else:
+            _IO_POOL.submit(self._read_until_results)
+
+    def _send(self) -> None:
+        try:
+            self._connection.request('POST', QUERY_PATH, body=json.dumps(self._body).encode('utf-8'),
+                                     headers=self._headers)
+        except Exception as ex:
+            self._error = self._build_error(ex)
+
+    def _build_error(self, ex: Exception) -> CoreColumnarError:
+        if self._cancelled.is_set():
+            return build_core_error(CLIENT_ERROR_CANCELED, 'Query was canceled.', client_error=True)
+        if isinstance(ex, (socket.timeout, TimeoutError)):
+            return build_core_error(CORE_ERROR_TIMEOUT, 'Query timed out.')
+        return build_core_error(CORE_ERROR_GENERIC, f'Connection error: {ex}')
+
+    def _read_more(self) -> bool:
+        if self._response is None or self._eof:
+            return False
+        data = self._response.read1(READ_SIZE)
+        if not data:
+            self._eof = True
+            return False
+        self._parser.feed(data)
+        return True
+
+    def _read_until_results(self) -> None:
+        try:
+            if self._error is None:
+                self._response = self._connection.getresponse()
+                if self._response.status == 401:
+                    self._error = build_core_error(CORE_ERROR_INVALID_CREDENTIAL, 'Invalid credentials.')
+                else:
+                    while not self._parser.results_started and self._read_more():
+                        pass
+                    if not self._parser.results_started:
+                        self._complete()
+        except Exception as ex:
+            self._error = self._build_error(ex)
+        self._core_result = self._error if self._error is not None else True
+        self._result_ready.set()
+
+    def _async_wait_for_core_query_result(self) -> None:
+        self._read_until_results()
+        if self._callback is not None:
+            self._callback(self._core_result)
+
+    def _complete(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        response = self._parser.metadata()
+        errors = response.get('errors', None)
+        if errors and self._error is None:
+            first = errors[0]
+            code, msg = first.get('code', 0), first.get('msg', '')
+            if code == TIMEOUT_ERROR_CODE:
+                self._error = build_core_error(CORE_ERROR_TIMEOUT, msg)
+            else:
+                self._error = build_core_error(CORE_ERROR_QUERY, msg, server_code=code)
+        metrics = response.get('metrics', {})
+        metrics_core: QueryMetricsCore = {
+            'elapsed_time': parse_duration_ns(metrics.get('elapsedTime')),
+            'execution_time': parse_duration_ns(metrics.get('executionTime')),
+            'result_count': metrics.get('resultCount', 0),
+            'result_size': metrics.get('resultSize', 0),
+            'processed_objects': metrics.get('processedObjects', 0),
+        }
+        self._metadata = {'request_id': response.get('requestID', ''),
+                          'warnings': [{'code': w.get('code', 0), 'message': w.get('msg', '')}
+                                       for w in response.get('warnings', [])],
+                          'metrics': metrics_core}
+        self._connection.close()
+
+    def _next_row(self) -> Union[bytes, CoreColumnarError, None]:
+        try:
+            while self._error is None and not self._done:
+                row = self._parser.next_row()
+                if row is not None:
+                    return row
+                if not self._parser.in_results and self._eof:
+                    self._complete()
+                elif not self._read_more():
+                    if self._parser.in_results:
+                        # the server closed the connection mid-stream
+                        self._error = build_core_error(CORE_ERROR_GENERIC, 'Connection closed while streaming.')
+                    else:
+                        self._complete()
+        except Exception as ex:
+            self._error = self._build_error(ex)
+        if self._error is not None:
+            self._connection.close()
+            return self._error
+        return None
+
+    def _async_next_row(self) -> None:
+        row = self._next_row()
+        if self._row_callback is not None:
+            self._row_callback(row)
+
+    def wait_for_core_query_result(self) -> Union[bool, CoreColumnarError]:
+        self._result_ready.wait()
+        return self._core_result
+
+    def metadata(self) -> Optional[QueryMetadataCore]:
+        return self._metadata
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        try:
+            if self._connection.sock is not None:
+                self._connection.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def __iter__(self) -> EmulatorQueryIterator:
+        return self
+
+    def __next__(self) -> Union[bytes, CoreColumnarError, None]:
+        if self._row_callback is not None:
+            _IO_POOL.submit(self._async_next_row)
+            return None
+        self._result_ready.wait()
+        return self._next_row()
+
+
+class EmulatorCoreClient:
+    """Implements the :class:`~couchbase_columnar.protocol.core.client._CoreClient` interface over HTTP(S).
+
+    The SDK requires a ``couchbases://`` connection string, ``use_tls`` determines whether the query service is
+    actually reached over HTTPS.
+    """
+
+    def __init__(self, use_tls: Optional[bool] = False) -> None:
+        self._use_tls = use_tls is True
+        self._connection: Optional[Dict[str, Any]] = None
+
+    @property
+    def has_connection(self) -> bool:
+        return self._connection is not None
+
+    @property
+    def connection(self) -> Optional[Dict[str, Any]]:
+        return self._connection
+
+    @connection.setter
+    def connection(self, conn: Dict[str, Any]) -> None:
+        self._connection = conn
+
+    def connect(self, req: Any) -> Dict[str, Any]:
+        req_dict = req.to_req_dict()
+        parsed = urlparse(req_dict['connection_str'])
+        use_tls = self._use_tls
+        credential = req_dict.get('credential', {})
+        token = base64.b64encode(f'{credential.get("username", "")}:{credential.get("password", "")}'.encode('utf-8'))
+        return {'host': parsed.hostname or 'localhost',
+                'port': parsed.port or (18095 if use_tls else 8095),
+                'ssl_context': self._build_ssl_context(req_dict.get('options', None) or {}) if use_tls else None,
+                'headers': {'Authorization': f'Basic {token.decode("ascii")}',
+                            'Content-Type': 'application/json'}}
+
+    def connect_in_background(self,
+                              req: Any,
+                              callback: Callable[[Dict[str, Any]], None],
+                              errback: Callable[[Any], None]) -> None:
+        def _connect() -> None:
+            try:
+                conn = self.connect(req)
+            except Exception as ex:
+                errback(build_core_error(CORE_ERROR_GENERIC, str(ex)))
+                return
+            callback(conn)
+
+        _IO_POOL.submit(_connect)
+
+    def _build_ssl_context(self, options: Dict[str, Any]) -> ssl.SSLContext:
+        security_options = options.get('security_options', None) or {}
+        ctx = ssl.create_default_context()
+        if 'trust_only_pem_file' in security_options:
+            ctx.load_verify_locations(cafile=security_options['trust_only_pem_file'])
+        certificates: List[str] = list(security_options.get('trust_only_certificates', None) or [])
+        if 'trust_only_pem_str' in security_options:
+            certificates.append(security_options['trust_only_pem_str'])
+        if certificates:
+            ctx.load_verify_locations(cadata='\n'.join(certificates))
+        if security_options.get('disable_server_certificate_verification', False) is True:
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+        return ctx
+
+    def close_connection(self, req: Any) -> bool:
+        self._connection = None
+        return True
+
+    def columnar_query_op(self,
+                          req: Any,
+                          callback: Optional[Callable[..., None]] = None,
+                          row_callback: Optional[Callable[..., None]] = None,
+                          run_in_background: Optional[bool] = None) -> EmulatorQueryIterator:
+        if self._connection is None:
+            raise build_core_error(CORE_ERROR_GENERIC, 'Cluster does not have a connection.')
+        body, timeout = build_query_body(req.to_req_dict()['query_args'])
+        # the server enforces the query timeout, the socket timeout only guards against an unresponsive server
+        timeout += SOCKET_TIMEOUT_MARGIN
+        conn: HTTPConnection
+        if self._connection['ssl_context'] is not None:
+            conn = HTTPSConnection(self._connection['host'],
+                                   self._connection['port'],
+                                   timeout=timeout,
+                                   context=self._connection['ssl_context'])
+        else:
+            conn = HTTPConnection(self._connection['host'], self._connection['port'], timeout=timeout)
+        return EmulatorQueryIterator(conn,
+                                     self._connection['headers'],
+                                     body,
+                                     callback=callback,
+                                     row_callback=row_callback)
+
+
+@contextmanager
+def emulator_transport(use_tls: Optional[bool] = False) -> Iterator[None]:
+    """Clusters created within the context use :class:`EmulatorCoreClient` instead of the C++ core."""
+    import acouchbase_columnar.protocol.core.client_adapter as async_client_adapter
+    import couchbase_columnar.protocol.core.client_adapter as blocking_client_adapter
+    client_factory = partial(EmulatorCoreClient, use_tls=use_tls)
+    with patch.object(blocking_client_adapter, '_CoreClient', client_factory), \
+            patch.object(async_client_adapter, '_CoreClient', client_factory):
+        yield
@@ -19,9 +19,11 @@ import json
 import pathlib
 import sys
 from asyncio import AbstractEventLoop
+from contextlib import nullcontext
 from os import path
 from typing import (TYPE_CHECKING,
                     Any,
+                    ContextManager,
                     Dict,
                     List,
                     Optional,
@@ -46,6 +48,8 @@ from couchbase_columnar.options import ClusterOptions, SecurityOptions
 from couchbase_columnar.result import BlockingQueryResult
 from couchbase_columnar.scope import Scope
 from tests import ColumnarTestEnvironmentError, YieldFixture
+from tests.emulator import EMULATOR_CERT_PATH, ColumnarEmulator
+from tests.emulator.transport import emulator_transport
 
 if TYPE_CHECKING:
     from tests.columnar_config import ColumnarConfig
@@ -57,11 +61,47 @@ class TestEnvironmentOptionsKwargs(TypedDict, total=False):
     database_name: Optional[str]
     scope_name: Optional[str]
     collection_name: Optional[str]
+    emulator: Optional[ColumnarEmulator]
 
 
 TEST_AIRLINE_DATA_PATH = path.join(pathlib.Path(__file__).parent.parent,
                                    'test_data',
                                    'airline.json')
+TEST_DATA_LIMIT = 100
+
+
+def start_emulator(config: ColumnarConfig) -> ColumnarEmulator:
+    """Starts a (TLS) Columnar query service emulator that serves the test airline data."""
+    username, pw = config.get_username_and_pw()
+    emulator = ColumnarEmulator(username=username, password=pw, use_tls=True)
+    with open(TEST_AIRLINE_DATA_PATH) as json_file:
+        json_data: List[Dict[str, Any]] = json.load(json_file)
+    emulator.add_dataset(config.collection_name, json_data[:TEST_DATA_LIMIT])
+    return emulator.start()
+
+
+def get_security_options(config: ColumnarConfig, emulator: Optional[ColumnarEmulator]) -> Optional[SecurityOptions]:
+    if emulator is not None:
+        return SecurityOptions.trust_only_pem_file(EMULATOR_CERT_PATH)
+
+    sec_opts: Optional[SecurityOptions] = None
+    if config.nonprod is True:
+        from couchbase_columnar.common.core._certificates import _Certificates
+        sec_opts = SecurityOptions.trust_only_certificates(_Certificates.get_nonprod_certificates())
+
+    if config.disable_server_certificate_verification is True:
+        if sec_opts is not None:
+            sec_opts['disable_server_certificate_verification'] = True
+        else:
+            sec_opts = SecurityOptions(disable_server_certificate_verification=True)
+    return sec_opts
+
+
+def cluster_transport(emulator: Optional[ColumnarEmulator]) -> ContextManager[None]:
+    """Clusters targeting the emulator need to be created with the emulator's transport."""
+    if emulator is None:
+        return nullcontext()
+    return emulator_transport(use_tls=emulator.use_tls)
 
 
 class TestEnvironment:
@@ -73,6 +113,7 @@ class TestEnvironment:
         self._database_name = kwargs.pop('database_name', None)
         self._scope_name = kwargs.pop('scope_name', None)
         self._collection_name = kwargs.pop('collection_name', None)
+        self._emulator = kwargs.pop('emulator', None)
         self._async_scope: Optional[AsyncScope] = None
         self._scope: Optional[Scope] = None
         self._use_scope = False
@@ -85,6 +126,16 @@ class TestEnvironment:
     def fqdn(self) -> str:
         return self.config.fqdn
 
+    @property
+    def emulator(self) -> Optional[ColumnarEmulator]:
+        return self._emulator
+
+    @property
+    def connection_string(self) -> str:
+        if self._emulator is not None:
+            return self._emulator.connection_string
+        return self.config.get_connection_string()
+
     @property
     def collection_name(self) -> Optional[str]:
         return self._collection_name
@@ -93,6 +144,11 @@ class TestEnvironment:
     def use_scope(self) -> bool:
         return self._use_scope
 
+    def stop_emulator(self) -> None:
+        if self._emulator is not None:
+            self._emulator.stop()
+            self._emulator = None
+
     def load_collection_data_from_file(self, file_path: str, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
         with open(file_path, mode='+r') as json_file:
             json_data: List[Dict[str, Any]] = json.load(json_file)
@@ -157,27 +213,18 @@ class BlockingTestEnvironment(TestEnvironment):
                                     connstr: Optional[str] = None,
                                     credential: Optional[Credential] = None) -> Cluster:
         if connstr is None:
-            connstr = self.config.get_connection_string()
+            connstr = self.connection_string
         if credential is None:
             username, pw = self.config.get_username_and_pw()
             credential = Credential.from_username_and_password(username, pw)
 
-        sec_opts = None
-        if self.config.nonprod is True:
-            from couchbase_columnar.common.core._certificates import _Certificates
-            sec_opts = SecurityOptions.trust_only_certificates(_Certificates.get_nonprod_certificates())
-
-        if self.config.disable_server_certificate_verification is True:
+        sec_opts = get_security_options(self.config, self._emulator)
+        with cluster_transport(self._emulator):
             if sec_opts is not None:
-                sec_opts['disable_server_certificate_verification'] = True
+                opts = ClusterOptions(security_options=sec_opts)
+                return Cluster.create_instance(connstr, credential, opts)
             else:
-                sec_opts = SecurityOptions(disable_server_certificate_verification=True)
-
-        if sec_opts is not None:
-            opts = ClusterOptions(security_options=sec_opts)
-            return Cluster.create_instance(connstr, credential, opts)
-        else:
-            return Cluster.create_instance(connstr, credential)
+                return Cluster.create_instance(connstr, credential)
 
     def setup(self) -> None:
         if self.config.create_keyspace is False:
@@ -236,26 +283,19 @@ class BlockingTestEnvironment(TestEnvironment):
         if config is None:
             raise ColumnarTestEnvironmentError('No test config provided.')
 
-        connstr = config.get_connection_string()
+        emulator = start_emulator(config) if config.use_emulator is True else None
+        connstr = emulator.connection_string if emulator is not None else config.get_connection_string()
         username, pw = config.get_username_and_pw()
         cred = Credential.from_username_and_password(username, pw)
-        sec_opts: Optional[SecurityOptions] = None
-        if config.nonprod is True:
-            from couchbase_columnar.common.core._certificates import _Certificates
-            sec_opts = SecurityOptions.trust_only_certificates(_Certificates.get_nonprod_certificates())
+        sec_opts = get_security_options(config, emulator)
 
-        if config.disable_server_certificate_verification is True:
+        env_opts: TestEnvironmentOptionsKwargs = {'emulator': emulator}
+        with cluster_transport(emulator):
             if sec_opts is not None:
-                sec_opts['disable_server_certificate_verification'] = True
+                opts = ClusterOptions(security_options=sec_opts)
+                env_opts['cluster'] = Cluster.create_instance(connstr, cred, opts)
             else:
-                sec_opts = SecurityOptions(disable_server_certificate_verification=True)
-
-        env_opts: TestEnvironmentOptionsKwargs = {}
-        if sec_opts is not None:
-            opts = ClusterOptions(security_options=sec_opts)
-            env_opts['cluster'] = Cluster.create_instance(connstr, cred, opts)
-        else:
-            env_opts['cluster'] = Cluster.create_instance(connstr, cred)
+                env_opts['cluster'] = Cluster.create_instance(connstr, cred)
 
         env_opts['database_name'] = config.database_name
         env_opts['scope_name'] = config.scope_name
@@ -319,27 +359,18 @@ class AsyncTestEnvironment(TestEnvironment):
                                     connstr: Optional[str] = None,
                                     credential: Optional[Credential] = None) -> AsyncCluster:
         if connstr is None:
-            connstr = self.config.get_connection_string()
+            connstr = self.connection_string
         if credential is None:
             username, pw = self.config.get_username_and_pw()
             credential = Credential.from_username_and_password(username, pw)
 
-        sec_opts = None
-        if self.config.nonprod is True:
-            from couchbase_columnar.common.core._certificates import _Certificates
-            sec_opts = SecurityOptions.trust_only_certificates(_Certificates.get_nonprod_certificates())
-
-        if self.config.disable_server_certificate_verification is True:
+        sec_opts = get_security_options(self.config, self._emulator)
+        with cluster_transport(self._emulator):
             if sec_opts is not None:
-                sec_opts['disable_server_certificate_verification'] = True
+                opts = ClusterOptions(security_options=sec_opts)
+                return AsyncCluster.create_instance(connstr, credential, opts)
             else:
-                sec_opts = SecurityOptions(disable_server_certificate_verification=True)
-
-        if sec_opts is not None:
-            opts = ClusterOptions(security_options=sec_opts)
-            return AsyncCluster.create_instance(connstr, credential, opts)
-        else:
-            return AsyncCluster.create_instance(connstr, credential)
+                return AsyncCluster.create_instance(connstr, credential)
 
     async def setup(self) -> None:
         if self.config.create_keyspace is False:
@@ -398,26 +429,19 @@ class AsyncTestEnvironment(TestEnvironment):
         if config is None:
             raise ColumnarTestEnvironmentError('No test config provided.')
 
-        connstr = config.get_connection_string()
+        emulator = start_emulator(config) if config.use_emulator is True else None
+        connstr = emulator.connection_string if emulator is not None else config.get_connection_string()
         username, pw = config.get_username_and_pw()
         cred = Credential.from_username_and_password(username, pw)
-        sec_opts: Optional[SecurityOptions] = None
-        if config.nonprod is True:
-            from couchbase_columnar.common.core._certificates import _Certificates
-            sec_opts = SecurityOptions.trust_only_certificates(_Certificates.get_nonprod_certificates())
+        sec_opts = get_security_options(config, emulator)
 
-        if config.disable_server_certificate_verification is True:
+        env_opts: TestEnvironmentOptionsKwargs = {'emulator': emulator}
+        with cluster_transport(emulator):
             if sec_opts is not None:
-                sec_opts['disable_server_certificate_verification'] = True
+                opts = ClusterOptions(security_options=sec_opts)
+                env_opts['async_cluster'] = AsyncCluster.create_instance(connstr, cred, opts)
             else:
-                sec_opts = SecurityOptions(disable_server_certificate_verification=True)
-
-        env_opts: TestEnvironmentOptionsKwargs = {}
-        if sec_opts is not None:
-            opts = ClusterOptions(security_options=sec_opts)
-            env_opts['async_cluster'] = AsyncCluster.create_instance(connstr, cred, opts)
-        else:
-            env_opts['async_cluster'] = AsyncCluster.create_instance(connstr, cred)
+                env_opts['async_cluster'] = AsyncCluster.create_instance(connstr, cred)
 
         env_opts['database_name'] = config.database_name
         env_opts['scope_name'] = config.scope_name
@@ -433,10 +457,14 @@ def event_loop() -> YieldFixture[AbstractEventLoop]:
 
 
 @pytest.fixture(scope='session', name='sync_test_env')
-def base_test_environment(columnar_config: ColumnarConfig) -> BlockingTestEnvironment:
-    return BlockingTestEnvironment.get_environment(columnar_config)
+def base_test_environment(columnar_config: ColumnarConfig) -> YieldFixture[BlockingTestEnvironment]:
+    test_env = BlockingTestEnvironment.get_environment(columnar_config)
+    yield test_env
+    test_env.stop_emulator()
 
 
 @pytest.fixture(scope='session', name='async_test_env')
-def base_async_test_environment(columnar_config: ColumnarConfig) -> AsyncTestEnvironment:
-    return AsyncTestEnvironment.get_environment(columnar_config)
+def base_async_test_environment(columnar_config: ColumnarConfig) -> YieldFixture[AsyncTestEnvironment]:
+    test_env = AsyncTestEnvironment.get_environment(columnar_config)
+    yield test_env
+    test_env.stop_emulator()